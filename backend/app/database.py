@@ -2,6 +2,11 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import Engine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+import asyncio
+import contextvars
+import functools
 import os
 import time
 import logging
@@ -82,3 +87,31 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Thread offload for synchronous Session work inside async code.
+# Plain `def` routes already run in FastAPI's threadpool; async routes and
+# tasks that must await something (request bodies, streaming, LLM calls)
+# use run_db for their queries so the event loop keeps serving requests.
+# Sized to the connection pool: more threads would only queue on it.
+DB_OFFLOAD_THREADS = int(os.getenv("DB_OFFLOAD_THREADS", "15"))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_OFFLOAD_THREADS, thread_name_prefix="db-offload")
+
+T = TypeVar("T")
+
+
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run blocking database work on the DB offload threads and await the result.
+
+    Usage:
+        user = await run_db(lambda: db.query(User).filter(User.id == user_id).first())
+        await run_db(save_message, db, message)
+
+    The session must not be used concurrently: await each call before
+    touching the same session again.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(_db_executor, call)
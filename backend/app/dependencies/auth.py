@@ -244,7 +244,7 @@ def verify_clerk_jwt(token: str) -> dict:
         )
 
 
-async def get_current_user(
+def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
@@ -308,7 +308,7 @@ async def get_current_user(
     return user
 
 
-async def get_current_user_optional(
+def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
@@ -319,7 +319,7 @@ async def get_current_user_optional(
     Use for endpoints that work both with and without authentication.
     """
     try:
-        return await get_current_user(credentials, authorization, db)
+        return get_current_user(credentials, authorization, db)
     except HTTPException:
         return None
 
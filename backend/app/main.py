@@ -13,6 +13,7 @@ from app.dependencies.auth import get_admin_user
 from app.database import engine, Base
 from app.routers import questions, analytics, users, reviews, chat, adaptive_engine, auth, profile, sessions, subscription, content_quality, study_plan, content, batch_generation, testing_qa, study_modes, flagged, admin, admin_analytics, payments, webhooks, email, learning_engine, score_predictor, gamification, notifications, self_assessment, curriculum
 from app.middleware.rate_limiter import RateLimitMiddleware
+from app.middleware.performance_monitor import PerformanceMonitorMiddleware, get_event_loop_monitor
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +36,15 @@ if sentry_dsn:
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Local SQLite gets its full-text search index here; PostgreSQL adds it via
+# migrations/add_question_search_index.py (ALTER TABLE on a large table)
+if engine.dialect.name == "sqlite":
+    try:
+        from app.services.question_search import ensure_search_index
+        ensure_search_index(engine)
+    except Exception as e:
+        logger.warning("Question search index setup failed, using ILIKE: %s", e)
+
 
 async def _background_pool_warming():
     """Initialize pool in background after app is ready to serve."""
@@ -53,6 +63,9 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler - runs on startup and shutdown."""
     logger.info("Starting ShelfSense API...")
 
+    # Sample event loop lag (reported by /api/admin/performance)
+    get_event_loop_monitor().start()
+
     # STARTUP: Initialize the massive question pool (in background to not block healthcheck)
     if os.getenv("ENABLE_POOL_WARMING", "false").lower() == "true":
         # Run pool warming in background after app is ready
@@ -120,6 +133,36 @@ async def lifespan(app: FastAPI):
     # SHUTDOWN: Cleanup if needed
     logger.info("Shutting down...")
 
+    # Flush queued post-answer side-effects before the process exits
+    try:
+        from app.services.answer_pipeline import get_answer_pipeline
+        get_answer_pipeline().shutdown()
+    except Exception as e:
+        logger.warning("Post-answer pipeline shutdown failed: %s", e)
+
+    # Stop question generation stage workers and close their sessions
+    try:
+        from app.services.generation_executor import get_generation_executor
+        get_generation_executor().shutdown()
+    except Exception as e:
+        logger.warning("Generation executor shutdown failed: %s", e)
+
+    # Write buffered rate-limit usage into DailyUsage
+    try:
+        from app.services.usage_counters import get_usage_counters
+        get_usage_counters().shutdown()
+    except Exception as e:
+        logger.warning("Usage counter flush failed: %s", e)
+
+    await get_event_loop_monitor().stop()
+
+    # Close pooled keep-alive connections to Ollama/OpenAI
+    try:
+        from app.utils.http_clients import close_async_http_clients
+        await close_async_http_clients()
+    except Exception as e:
+        logger.warning("HTTP client pool shutdown failed: %s", e)
+
 # OpenAPI tag metadata for organized documentation
 tags_metadata = [
     {
@@ -228,6 +271,10 @@ app.add_middleware(
 # Rate limiting middleware
 app.add_middleware(RateLimitMiddleware)
 
+# Per-endpoint latency tracking (reported by /api/admin/performance)
+if os.getenv("PERFORMANCE_MONITORING_ENABLED", "false").lower() == "true":
+    app.add_middleware(PerformanceMonitorMiddleware)
+
 # Include routers
 app.include_router(auth.router)  # Authentication
 app.include_router(profile.router)  # User profile & settings
@@ -6,6 +6,7 @@ Tracks API endpoint latency and provides metrics for:
 - Slow query detection (> 3s)
 - Average response times
 - 95th percentile latency
+- Event loop lag (how late the loop runs a scheduled callback)
 
 Helps identify performance bottlenecks and ensures:
 - AI generation < 3s target
@@ -13,14 +14,19 @@ Helps identify performance bottlenecks and ensures:
 - Overall API responsiveness
 """
 
+import asyncio
+import logging
+import os
 import time
-from typing import Callable, Dict, List
-from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+logger = logging.getLogger(__name__)
+
 
 class PerformanceStats:
     """Store and calculate performance statistics"""
@@ -120,9 +126,98 @@ class PerformanceStats:
         return sorted(slow, key=lambda x: x['duration_ms'], reverse=True)
 
 
+class EventLoopLagMonitor:
+    """
+    Measure event loop responsiveness.
+
+    A background task sleeps for `interval` seconds and records how much
+    later than requested it woke up. Any synchronous work on the loop
+    (a blocking query, a sync HTTP call) shows up as lag; sustained lag
+    above `stall_threshold` means every in-flight request was stalled.
+    """
+
+    def __init__(self, interval: float = 0.5, stall_threshold: float = 0.1, max_samples: int = 1200):
+        """
+        Args:
+            interval: Seconds between samples
+            stall_threshold: Lag (seconds) counted and logged as a stall
+            max_samples: Samples kept for avg/p95 (default 10 minutes at 0.5s)
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._samples = deque(maxlen=max_samples)
+        self._max_lag = 0.0
+        self._stalls = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag: float):
+        """Record one lag sample (seconds)"""
+        self._samples.append(lag)
+        self._max_lag = max(self._max_lag, lag)
+        if lag > self.stall_threshold:
+            self._stalls += 1
+            logger.warning(f"Event loop stalled for {lag * 1000:.0f}ms")
+
+    def reset(self):
+        """Clear recorded samples (sampling continues)"""
+        self._samples.clear()
+        self._max_lag = 0.0
+        self._stalls = 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - start - self.interval))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start sampling on the running event loop (idempotent)"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict:
+        """Lag statistics in milliseconds"""
+        samples = list(self._samples)
+        sorted_samples = sorted(samples)
+        p95_index = min(int(len(sorted_samples) * 0.95), len(sorted_samples) - 1)
+
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": len(samples),
+            "current_ms": round(samples[-1] * 1000, 2) if samples else 0,
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else 0,
+            "p95_ms": round(sorted_samples[p95_index] * 1000, 2) if samples else 0,
+            "max_ms": round(self._max_lag * 1000, 2),
+            "stalls": self._stalls,
+            "stall_threshold_ms": round(self.stall_threshold * 1000, 2)
+        }
+
+
 # Global performance stats instance
 _performance_stats = PerformanceStats(window_minutes=60)
 
+# Global event loop lag monitor (started in the app lifespan)
+_event_loop_monitor = EventLoopLagMonitor(
+    interval=float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5")),
+    stall_threshold=float(os.getenv("EVENT_LOOP_STALL_THRESHOLD_MS", "100")) / 1000
+)
+
 
 class PerformanceMonitorMiddleware(BaseHTTPMiddleware):
     """Middleware to monitor API performance"""
@@ -173,7 +268,27 @@ def get_slow_requests(threshold_seconds: float = 3.0) -> List[Dict]:
     return _performance_stats.get_slow_requests(threshold_seconds)
 
 
+def get_event_loop_monitor() -> EventLoopLagMonitor:
+    """Get the global event loop lag monitor"""
+    return _event_loop_monitor
+
+
+def get_event_loop_lag_stats() -> Dict:
+    """Get event loop lag statistics"""
+    return _event_loop_monitor.get_stats()
+
+
+def get_performance_summary(slow_threshold_seconds: float = 3.0) -> Dict:
+    """Endpoint latency, slow requests and event loop lag in one report"""
+    return {
+        "endpoints": get_performance_stats(),
+        "slow_requests": get_slow_requests(slow_threshold_seconds),
+        "event_loop": get_event_loop_lag_stats()
+    }
+
+
 def reset_stats():
     """Reset all performance statistics"""
     global _performance_stats
     _performance_stats = PerformanceStats(window_minutes=60)
+    _event_loop_monitor.reset()
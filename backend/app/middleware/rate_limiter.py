@@ -6,13 +6,16 @@ Enforces daily usage limits based on subscription tier:
 - Student: 50 AI questions/day, 200 chat messages/day, unlimited questions
 - Premium: Unlimited everything
 
-Uses DailyUsage model to track and enforce limits.
+Counts live in a shared counter backend (Redis, or in-process without
+REDIS_URL) and are written behind into the DailyUsage model periodically,
+so allowed requests do no SQL. See app/services/usage_counters.py.
 """
 
 from datetime import datetime, date
 from typing import Optional, Dict, Callable, Tuple
 from functools import wraps
-from collections import defaultdict
+from types import SimpleNamespace
+import threading
 import time
 
 from fastapi import Request, HTTPException, Depends
@@ -20,8 +23,14 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
 
-from app.database import get_db, SessionLocal
+from app.database import get_db, run_db
 from app.models.models import DailyUsage, Subscription, User
+from app.services.usage_counters import (
+    TokenBucket,
+    UsageCounters,
+    get_usage_counters,
+    next_reset_at,
+)
 
 
 # ============================================================================
@@ -71,6 +80,10 @@ ENDPOINT_USAGE_MAP = {
     "/api/curriculum/upload": "curriculum_uploads",  # StudySync AI file uploads
 }
 
+# Only these methods count toward daily limits; reads such as
+# GET /api/chat/history/{id} share a prefix but produce nothing
+USAGE_COUNTED_METHODS = {"POST"}
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -177,7 +190,10 @@ def check_rate_limit(
     usage_type: str
 ) -> Dict[str, any]:
     """
-    Check if user has exceeded their rate limit.
+    Check if user has exceeded their rate limit (without recording usage).
+
+    Reads the shared usage counters; the database is only touched when the
+    user's tier is not cached.
 
     Returns:
         {
@@ -188,16 +204,13 @@ def check_rate_limit(
             "reset_at": datetime
         }
     """
-    tier = get_user_tier(db, user_id)
+    counters = get_usage_counters()
+    tier = counters.get_tier(user_id, db)
+    counters.seed_today(user_id, db)
     limit = RATE_LIMITS.get(tier, RATE_LIMITS["free"]).get(usage_type)
 
-    usage = get_or_create_daily_usage(db, user_id)
-    current = getattr(usage, usage_type, 0)
-
-    # Calculate reset time (midnight UTC)
-    tomorrow = date.today()
-    from datetime import timedelta
-    reset_at = datetime.combine(tomorrow + timedelta(days=1), datetime.min.time())
+    current = counters.get_usage(user_id, [usage_type])[usage_type]
+    reset_at = next_reset_at()
 
     if limit is None:
         # Unlimited
@@ -221,19 +234,33 @@ def check_rate_limit(
     }
 
 
-def increment_usage(db: Session, user_id: str, usage_type: str, amount: int = 1):
-    """Increment the usage counter for a user."""
-    usage = get_or_create_daily_usage(db, user_id)
-    current = getattr(usage, usage_type, 0)
-    setattr(usage, usage_type, current + amount)
-    usage.updated_at = datetime.utcnow()
-    db.commit()
+def increment_usage(user_id: str, usage_type: str, amount: int = 1):
+    """
+    Increment the usage counter for a user.
+
+    DailyUsage is updated by the counters' write-behind flush.
+    """
+    get_usage_counters().add(user_id, usage_type, amount)
 
 
 # ============================================================================
 # MIDDLEWARE
 # ============================================================================
 
+def _consume_request(counters, user_id: str, usage_type: str) -> Tuple[Optional[int], bool, Optional[int]]:
+    """
+    Look up the user's limit and record one use against it.
+
+    Returns:
+        (limit, allowed, current count)
+    """
+    counters.seed_today(user_id)
+    tier = counters.get_tier(user_id)
+    limit = RATE_LIMITS.get(tier, RATE_LIMITS["free"]).get(usage_type)
+    allowed, current = counters.consume(user_id, usage_type, limit)
+    return limit, allowed, current
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     FastAPI middleware to enforce rate limits on specific endpoints.
@@ -245,10 +272,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         # Check if this endpoint has rate limiting
         usage_type = None
-        for endpoint_prefix, u_type in ENDPOINT_USAGE_MAP.items():
-            if path.startswith(endpoint_prefix):
-                usage_type = u_type
-                break
+        if request.method in USAGE_COUNTED_METHODS:
+            for endpoint_prefix, u_type in ENDPOINT_USAGE_MAP.items():
+                if path.startswith(endpoint_prefix):
+                    usage_type = u_type
+                    break
 
         if not usage_type:
             # No rate limiting for this endpoint
@@ -261,47 +289,57 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             # No user ID, allow request (auth will handle it)
             return await call_next(request)
 
-        # Check rate limit
-        db = SessionLocal()
-        try:
-            result = check_rate_limit(db, user_id, usage_type)
+        # Check and record usage in one atomic counter operation. A tier cache
+        # miss queries Subscription, the first request of the day seeds the
+        # counters from DailyUsage and the counters themselves may be a Redis
+        # round trip; keep all of it off the event loop
+        counters = get_usage_counters()
+        limit, allowed, current = await run_db(_consume_request, counters, user_id, usage_type)
+        reset_at = next_reset_at()
 
-            if not result["allowed"]:
-                # Calculate seconds until reset
-                seconds_until_reset = int(
-                    (result["reset_at"] - datetime.utcnow()).total_seconds()
-                )
+        if not allowed:
+            # Calculate seconds until reset
+            seconds_until_reset = int(
+                (reset_at - datetime.utcnow()).total_seconds()
+            )
 
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "message": f"You have exceeded your daily limit for this action",
-                        "limit": result["limit"],
-                        "current": result["current"],
-                        "reset_at": result["reset_at"].isoformat(),
-                        "retry_after": seconds_until_reset
-                    },
-                    headers={
-                        "Retry-After": str(seconds_until_reset),
-                        "X-RateLimit-Limit": str(result["limit"]),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str(int(result["reset_at"].timestamp()))
-                    }
-                )
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "error": "Rate limit exceeded",
+                    "message": f"You have exceeded your daily limit for this action",
+                    "limit": limit,
+                    "current": current,
+                    "reset_at": reset_at.isoformat(),
+                    "retry_after": seconds_until_reset
+                },
+                headers={
+                    "Retry-After": str(seconds_until_reset),
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(int(reset_at.timestamp()))
+                }
+            )
 
-            # Add rate limit headers to response
+        try:
             response = await call_next(request)
+        except Exception:
+            await run_db(counters.refund, user_id, usage_type, limited=limit is not None)
+            raise
 
-            if result["limit"]:
-                response.headers["X-RateLimit-Limit"] = str(result["limit"])
-                response.headers["X-RateLimit-Remaining"] = str(result["remaining"])
-                response.headers["X-RateLimit-Reset"] = str(int(result["reset_at"].timestamp()))
+        # Failed requests don't count against the daily limit
+        if response.status_code >= 400:
+            await run_db(counters.refund, user_id, usage_type, limited=limit is not None)
+            if current is not None:
+                current -= 1
 
-            return response
+        # Add rate limit headers to response
+        if limit:
+            response.headers["X-RateLimit-Limit"] = str(limit)
+            response.headers["X-RateLimit-Remaining"] = str(max(0, limit - current))
+            response.headers["X-RateLimit-Reset"] = str(int(reset_at.timestamp()))
 
-        finally:
-            db.close()
+        return response
 
     def _extract_user_id(self, request: Request) -> Optional[str]:
         """
@@ -391,7 +429,7 @@ def rate_limit(usage_type: str):
                 # Can't check rate limit without these
                 return await func(*args, **kwargs)
 
-            result = check_rate_limit(db, user_id, usage_type)
+            result = await run_db(check_rate_limit, db, user_id, usage_type)
 
             if not result["allowed"]:
                 seconds_until_reset = int(
@@ -413,7 +451,7 @@ def rate_limit(usage_type: str):
             response = await func(*args, **kwargs)
 
             # Increment usage after successful execution
-            increment_usage(db, user_id, usage_type)
+            await run_db(increment_usage, user_id, usage_type)
 
             return response
 
@@ -443,7 +481,7 @@ class RateLimitChecker:
     def __init__(self, usage_type: str):
         self.usage_type = usage_type
 
-    async def __call__(
+    def __call__(
         self,
         user_id: str = None,
         db: Session = Depends(get_db)
@@ -463,8 +501,10 @@ class OpenAIBurstLimiter:
     Per-minute rate limiting to prevent hitting OpenAI rate limits.
     Complements daily limits with short-term burst protection.
 
-    This is an in-memory limiter that resets on server restart.
-    For distributed systems, use Redis-backed implementation.
+    Each process keeps a local token bucket per user as a fast path: an
+    empty bucket rejects without touching the counter backend. Otherwise
+    the shared per-minute window (Redis when configured) decides, so the
+    limit holds across workers.
 
     Usage:
         allowed, wait_time = openai_burst_limiter.can_make_request(user_id, tier)
@@ -481,9 +521,23 @@ class OpenAIBurstLimiter:
         "premium": 30
     }
 
-    def __init__(self):
-        # Store request timestamps per user: {user_id: [timestamp1, timestamp2, ...]}
-        self._requests: Dict[str, list] = defaultdict(list)
+    def __init__(self, counters: Optional[UsageCounters] = None):
+        self._counters = counters
+        # Local buckets per user: {user_id: TokenBucket}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def counters(self) -> UsageCounters:
+        return self._counters or get_usage_counters()
+
+    def _bucket(self, user_id: str, limit: Optional[int] = None) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(user_id)
+            if bucket is None or (limit is not None and bucket.capacity != limit):
+                bucket = TokenBucket(limit or self.REQUESTS_PER_MINUTE["free"])
+                self._buckets[user_id] = bucket
+            return bucket
 
     def can_make_request(self, user_id: str, tier: str = "free") -> Tuple[bool, int]:
         """
@@ -499,39 +553,39 @@ class OpenAIBurstLimiter:
             If allowed=False, seconds_to_wait indicates when to retry
         """
         limit = self.REQUESTS_PER_MINUTE.get(tier, 5)
-        now = time.time()
 
-        # Clean old requests (older than 60 seconds)
-        self._requests[user_id] = [
-            t for t in self._requests[user_id]
-            if now - t < 60
-        ]
+        bucket = self._bucket(user_id, limit)
+        with self._lock:
+            if bucket.available() < 1:
+                return False, bucket.wait_time()
 
-        if len(self._requests[user_id]) >= limit:
-            # Calculate wait time based on oldest request
-            oldest = min(self._requests[user_id])
-            wait_time = int(60 - (now - oldest)) + 1
-            return False, wait_time
+        if self.counters.get_burst_count(user_id) >= limit:
+            # Shared window is full - wait for the next minute
+            return False, 60 - int(time.time()) % 60 + 1
 
         return True, 0
 
     def record_request(self, user_id: str):
         """Record a successful request for rate limiting."""
-        self._requests[user_id].append(time.time())
+        bucket = self._bucket(user_id)
+        with self._lock:
+            bucket.take()
+        self.counters.add_burst(user_id)
 
     def get_remaining(self, user_id: str, tier: str = "free") -> int:
         """Get remaining requests in current minute."""
         limit = self.REQUESTS_PER_MINUTE.get(tier, 5)
-        now = time.time()
-
-        # Count recent requests
-        recent = [t for t in self._requests[user_id] if now - t < 60]
-        return max(0, limit - len(recent))
+        shared_remaining = limit - self.counters.get_burst_count(user_id)
+        bucket = self._bucket(user_id, limit)
+        with self._lock:
+            local_remaining = int(bucket.available())
+        return max(0, min(local_remaining, shared_remaining))
 
     def clear_user(self, user_id: str):
         """Clear rate limit history for a user (admin function)."""
-        if user_id in self._requests:
-            del self._requests[user_id]
+        with self._lock:
+            self._buckets.pop(user_id, None)
+        self.counters.clear_burst(user_id)
 
 
 # Global singleton instance
@@ -549,7 +603,7 @@ def check_openai_burst_limit(user_id: str, db: Session) -> Tuple[bool, int]:
     Returns:
         Tuple of (allowed: bool, seconds_to_wait: int)
     """
-    tier = get_user_tier(db, user_id)
+    tier = get_usage_counters().get_tier(user_id, db)
     return openai_burst_limiter.can_make_request(user_id, tier)
 
 
@@ -557,7 +611,7 @@ def check_openai_burst_limit(user_id: str, db: Session) -> Tuple[bool, int]:
 # UTILITY FUNCTIONS FOR ROUTES
 # ============================================================================
 
-async def get_user_usage_summary(
+def get_user_usage_summary(
     user_id: str,
     db: Session = Depends(get_db)
 ) -> Dict:
@@ -566,13 +620,13 @@ async def get_user_usage_summary(
 
     Returns all usage types with their limits and current values.
     """
-    tier = get_user_tier(db, user_id)
-    usage = get_or_create_daily_usage(db, user_id)
+    counters = get_usage_counters()
+    tier = counters.get_tier(user_id, db)
+    counters.seed_today(user_id, db)
+    usage = SimpleNamespace(**counters.get_usage(user_id))
     limits = RATE_LIMITS.get(tier, RATE_LIMITS["free"])
 
-    tomorrow = date.today()
-    from datetime import timedelta
-    reset_at = datetime.combine(tomorrow + timedelta(days=1), datetime.min.time())
+    reset_at = next_reset_at()
 
     return {
         "user_id": user_id,
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, JSON, ForeignKey, Text, Index, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Float, Boolean, Date, DateTime, JSON, ForeignKey, Text, Index, UniqueConstraint
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import uuid
 from app.database import Base
@@ -7,6 +7,15 @@ from app.database import Base
 def generate_uuid():
     return str(uuid.uuid4())
 
+
+def parse_reminder_hour(reminder_time):
+    """Hour (0-23) of an "HH:MM" reminder time, or None if unset/invalid."""
+    try:
+        hour = int(reminder_time.split(":")[0])
+    except (ValueError, AttributeError):
+        return None
+    return hour if 0 <= hour <= 23 else None
+
 class User(Base):
     __tablename__ = "users"
 
@@ -79,6 +88,11 @@ class Question(Base):
     expert_reviewed_at = Column(DateTime, nullable=True)
     expert_reviewer_id = Column(String, ForeignKey("users.id"), nullable=True)
 
+    # Massive pool membership (claimed atomically, see massive_pool.claim_pool_questions)
+    pool_status = Column(String, nullable=True)  # "pooled" (ready to serve), "claimed"; NULL = not a pool question
+    pool_claimed_by = Column(String, nullable=True)  # User the question was served to
+    pool_claimed_at = Column(DateTime, nullable=True)
+
     # Relationships
     attempts = relationship("QuestionAttempt", back_populates="question")
     ratings = relationship("QuestionRating", back_populates="question")
@@ -91,6 +105,7 @@ class Question(Base):
         Index('ix_questions_source_rejected_specialty', 'source', 'rejected', 'specialty'),
         Index('ix_questions_specialty_difficulty_rejected', 'specialty', 'difficulty_level', 'rejected'),
         Index('ix_questions_status_specialty', 'content_status', 'specialty', 'rejected'),
+        Index('ix_questions_pool_bucket', 'pool_status', 'specialty', 'difficulty_level'),
     )
 
 
@@ -148,6 +163,9 @@ class ScheduledReview(Base):
     question_id = Column(String, ForeignKey("questions.id"), nullable=False, index=True)
     scheduled_for = Column(DateTime, nullable=False, index=True)  # When to review
     review_interval = Column(String, nullable=False)  # "1d", "3d", "7d", "14d", "30d"
+    interval_days = Column(Float, nullable=True)  # Numeric interval behind review_interval
+    ease_factor = Column(Float, nullable=True)  # SM-2 ease factor (NULL = default 2.5)
+    stability = Column(Float, nullable=True)  # Memory stability in days (R = e^(-t/S))
     times_reviewed = Column(Integer, default=0)  # How many times reviewed
     learning_stage = Column(String, default="New", index=True)  # "New", "Learning", "Review", "Mastered"
     source = Column(String, nullable=True)  # Topic/source for filtering
@@ -331,6 +349,7 @@ class UserSettings(Base):
     email_notifications = Column(Boolean, default=True)
     daily_reminder = Column(Boolean, default=False)
     reminder_time = Column(String, nullable=True)  # e.g., "09:00"
+    reminder_hour = Column(Integer, nullable=True, index=True)  # UTC hour of reminder_time, kept in sync below
 
     # Display
     theme = Column(String, default="dark")  # "dark", "light", "system"
@@ -343,6 +362,12 @@ class UserSettings(Base):
     # Relationships
     user = relationship("User", back_populates="settings")
 
+    @validates("reminder_time")
+    def _sync_reminder_hour(self, key, value):
+        """Keep the indexed reminder_hour in step with reminder_time."""
+        self.reminder_hour = parse_reminder_hour(value)
+        return value
+
 
 class PasswordResetToken(Base):
     """Stores password reset tokens"""
@@ -388,6 +413,57 @@ class UserBadge(Base):
     )
 
 
+class UserBadgeCounters(Base):
+    """
+    Running per-user answer counters for incremental badge evaluation.
+    Updated with one atomic UPDATE per answer so badge checks never scan
+    question_attempts. Rebuilt from attempts by the backfill migration
+    (or lazily for a user with no row).
+    """
+    __tablename__ = "user_badge_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+
+    total_answered = Column(Integer, nullable=False, default=0)
+    total_correct = Column(Integer, nullable=False, default=0)
+    current_correct_run = Column(Integer, nullable=False, default=0)  # Consecutive correct, latest first
+    best_correct_run = Column(Integer, nullable=False, default=0)
+
+    # First answer inside each time-of-day window (UTC), NULL if never
+    night_owl_at = Column(DateTime, nullable=True)  # 00:00-05:00
+    early_bird_at = Column(DateTime, nullable=True)  # 05:00-07:00
+
+    # Latest attempted_at folded in by a rebuild; increments for attempts at
+    # or before it are already counted and skipped
+    counted_through = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UserDailyActivity(Base):
+    """
+    Per-user, per-day, per-specialty rollup of question attempts.
+    Maintained in the same transaction as each attempt and read by the
+    time-series analytics (trends, heatmap, streaks, weekly digest) so they
+    never group question_attempts by date. Rebuilt from attempts by the
+    backfill migration.
+    """
+    __tablename__ = "user_daily_activity"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC date of attempted_at
+    specialty = Column(String, primary_key=True, default="")  # Question.specialty, "" if unset
+
+    questions_answered = Column(Integer, nullable=False, default=0)
+    questions_correct = Column(Integer, nullable=False, default=0)
+    total_time_seconds = Column(Integer, nullable=False, default=0)
+    timed_answers = Column(Integer, nullable=False, default=0)  # Answers with a time_spent_seconds value
+    confidence_sum = Column(Integer, nullable=False, default=0)
+    confidence_answers = Column(Integer, nullable=False, default=0)  # Answers with a confidence_level value
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 class PushSubscription(Base):
     """
     Stores web push notification subscriptions for users.
@@ -178,7 +178,7 @@ class ComprehensiveReportResponse(BaseModel):
 # =========================================================================
 
 @router.get("/weak-areas", response_model=WeakAreasResponse)
-async def get_weak_areas(
+def get_weak_areas(
     threshold: float = Query(0.6, ge=0, le=1, description="Accuracy threshold for weak areas"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -199,7 +199,7 @@ async def get_weak_areas(
 
 
 @router.get("/next-question", response_model=QuestionResponse)
-async def get_next_adaptive_question(
+def get_next_adaptive_question(
     prefer_weak_areas: bool = Query(True, description="Prioritize weak areas"),
     difficulty_adjustment: float = Query(0.0, ge=-1, le=1, description="Difficulty adjustment (-1 to 1)"),
     current_user: User = Depends(get_current_user),
@@ -235,7 +235,7 @@ async def get_next_adaptive_question(
 
 
 @router.get("/time-analysis", response_model=TimeAnalysisResponse)
-async def get_time_analysis(
+def get_time_analysis(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -254,7 +254,7 @@ async def get_time_analysis(
 
 
 @router.get("/confidence", response_model=ConfidenceAnalysisResponse)
-async def get_confidence_analysis(
+def get_confidence_analysis(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -273,7 +273,7 @@ async def get_confidence_analysis(
 
 
 @router.get("/velocity", response_model=LearningVelocityResponse)
-async def get_learning_velocity(
+def get_learning_velocity(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -292,7 +292,7 @@ async def get_learning_velocity(
 
 
 @router.get("/prediction", response_model=PredictionResponse)
-async def get_performance_prediction(
+def get_performance_prediction(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -311,7 +311,7 @@ async def get_performance_prediction(
 
 
 @router.get("/report", response_model=ComprehensiveReportResponse)
-async def get_comprehensive_report(
+def get_comprehensive_report(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -336,7 +336,7 @@ async def get_comprehensive_report(
 # =========================================================================
 
 @router.get("/validate-explanation/{question_id}", response_model=ExplanationValidationResponse)
-async def validate_explanation(
+def validate_explanation(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -360,7 +360,7 @@ async def validate_explanation(
 
 
 @router.post("/improve-explanation/{question_id}", response_model=ImprovedExplanationResponse)
-async def generate_improved_explanation(
+def generate_improved_explanation(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -377,7 +377,7 @@ async def generate_improved_explanation(
 
 
 @router.post("/batch-validate", response_model=BatchValidationResponse)
-async def batch_validate_explanations(
+def batch_validate_explanations(
     limit: int = Query(100, ge=1, le=1000, description="Maximum questions to validate"),
     source_filter: Optional[str] = Query(None, description="Filter by source (e.g., 'Internal Medicine')"),
     db: Session = Depends(get_db)
@@ -395,7 +395,7 @@ async def batch_validate_explanations(
 
 
 @router.post("/apply-explanation/{question_id}")
-async def apply_improved_explanation(
+def apply_improved_explanation(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -436,7 +436,7 @@ async def apply_improved_explanation(
 # =========================================================================
 
 @router.get("/validate-choices/{question_id}", response_model=AnswerChoiceValidationResponse)
-async def validate_answer_choices(
+def validate_answer_choices(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -460,7 +460,7 @@ async def validate_answer_choices(
 
 
 @router.post("/improve-choices/{question_id}", response_model=ImprovedChoicesResponse)
-async def generate_improved_choices(
+def generate_improved_choices(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -477,7 +477,7 @@ async def generate_improved_choices(
 
 
 @router.post("/apply-choices/{question_id}")
-async def apply_improved_choices(
+def apply_improved_choices(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -535,7 +535,7 @@ async def apply_improved_choices(
 # =========================================================================
 
 @router.post("/bulk-improve-explanations")
-async def bulk_improve_explanations(
+def bulk_improve_explanations(
     limit: int = Query(10, ge=1, le=50, description="Maximum questions to improve"),
     source_filter: Optional[str] = Query(None, description="Filter by source"),
     auto_apply: bool = Query(False, description="Automatically apply improvements"),
@@ -607,7 +607,7 @@ async def bulk_improve_explanations(
 
 
 @router.get("/explanation-stats")
-async def get_explanation_stats(
+def get_explanation_stats(
     source_filter: Optional[str] = Query(None, description="Filter by source"),
     db: Session = Depends(get_db)
 ):
@@ -2,6 +2,7 @@
 Admin Router
 Handles admin dashboard operations: user management, content management, and audit logs.
 """
+import os
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
@@ -12,7 +13,9 @@ from typing import Optional, List
 from app.database import get_db
 from app.models.models import User, Question, QuestionAttempt, AdminAuditLog, ReviewQueue, FlaggedQuestion, generate_uuid
 from app.routers.auth import get_admin_user, get_client_info
+from app.middleware.performance_monitor import get_performance_summary
 from app.services.openai_service import openai_service
+from app.services.question_search import match_terms, search_questions
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -349,7 +352,7 @@ def log_security_event(
 # ==================== Dashboard Endpoints ====================
 
 @router.get("/stats", response_model=DashboardStatsResponse)
-async def get_dashboard_stats(
+def get_dashboard_stats(
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
@@ -404,7 +407,7 @@ async def get_dashboard_stats(
 # ==================== User Management Endpoints ====================
 
 @router.get("/users", response_model=UserListResponse)
-async def list_users(
+def list_users(
     search: Optional[str] = Query(None, description="Search by name or email"),
     is_admin: Optional[bool] = Query(None, description="Filter by admin status"),
     page: int = Query(1, ge=1),
@@ -450,7 +453,7 @@ async def list_users(
 
 
 @router.get("/users/{user_id}", response_model=UserDetailResponse)
-async def get_user_detail(
+def get_user_detail(
     user_id: str,
     req: Request,
     admin: User = Depends(get_admin_user),
@@ -561,7 +564,7 @@ async def get_user_detail(
 
 
 @router.get("/users/{user_id}/attempts", response_model=UserAttemptsResponse)
-async def get_user_attempts(
+def get_user_attempts(
     user_id: str,
     req: Request,
     page: int = Query(1, ge=1),
@@ -622,7 +625,7 @@ async def get_user_attempts(
 
 
 @router.put("/users/{user_id}/admin", response_model=MessageResponse)
-async def toggle_user_admin(
+def toggle_user_admin(
     user_id: str,
     request: ToggleAdminRequest,
     req: Request,
@@ -666,7 +669,7 @@ async def toggle_user_admin(
 # ==================== Content Management Endpoints ====================
 
 @router.get("/questions", response_model=QuestionListResponse)
-async def list_questions(
+def list_questions(
     search: Optional[str] = Query(None, description="Search in vignette"),
     specialty: Optional[str] = Query(None, description="Filter by specialty"),
     content_status: Optional[str] = Query(None, description="Filter by status"),
@@ -675,23 +678,30 @@ async def list_questions(
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List questions with filtering and pagination"""
-    query = db.query(Question)
+    """List questions with filtering and pagination; search results are ranked by relevance"""
+    filters = []
 
     if search:
-        query = query.filter(Question.vignette.ilike(f"%{search}%"))
+        filters.append(match_terms(db, [search]))
 
     if specialty:
-        query = query.filter(Question.specialty == specialty)
+        filters.append(Question.specialty == specialty)
 
     if content_status:
-        query = query.filter(Question.content_status == content_status)
+        filters.append(Question.content_status == content_status)
 
+    query = db.query(Question).filter(*filters)
     total = query.count()
 
-    questions = query.order_by(desc(Question.created_at)).offset(
-        (page - 1) * per_page
-    ).limit(per_page).all()
+    ranked = search_questions(db, search, limit=page * per_page, filters=filters) if search else []
+    if ranked:
+        page_ids = [qid for qid, _ in ranked[(page - 1) * per_page:]]
+        by_id = {q.id: q for q in db.query(Question).filter(Question.id.in_(page_ids))}
+        questions = [by_id[qid] for qid in page_ids if qid in by_id]
+    else:
+        questions = query.order_by(desc(Question.created_at)).offset(
+            (page - 1) * per_page
+        ).limit(per_page).all()
 
     return QuestionListResponse(
         questions=[
@@ -712,7 +722,7 @@ async def list_questions(
 
 
 @router.get("/questions/{question_id}")
-async def get_question_detail(
+def get_question_detail(
     question_id: str,
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -752,7 +762,7 @@ async def get_question_detail(
 
 
 @router.put("/questions/{question_id}", response_model=MessageResponse)
-async def update_question(
+def update_question(
     question_id: str,
     request: QuestionUpdateRequest,
     req: Request,
@@ -818,7 +828,7 @@ async def update_question(
 
 
 @router.delete("/questions/{question_id}", response_model=MessageResponse)
-async def delete_question(
+def delete_question(
     question_id: str,
     req: Request,
     admin: User = Depends(get_admin_user),
@@ -856,7 +866,7 @@ async def delete_question(
 # ==================== Audit Log Endpoints ====================
 
 @router.get("/audit", response_model=AuditLogResponse)
-async def get_audit_logs(
+def get_audit_logs(
     action_type: Optional[str] = Query(None, description="Filter by action type"),
     target_type: Optional[str] = Query(None, description="Filter by target type"),
     page: int = Query(1, ge=1),
@@ -926,8 +936,23 @@ async def get_openai_status(
     return OpenAIStatusResponse(**status)
 
 
+@router.get("/performance")
+async def get_performance(
+    admin: User = Depends(get_admin_user)
+):
+    """
+    Get API performance statistics.
+
+    Returns:
+        - endpoints: Latency per endpoint (needs PERFORMANCE_MONITORING_ENABLED=true)
+        - slow_requests: Requests slower than SLOW_REQUEST_THRESHOLD_SECONDS
+        - event_loop: Event loop lag (current/avg/p95/max) and stall count
+    """
+    return get_performance_summary(float(os.getenv("SLOW_REQUEST_THRESHOLD_SECONDS", "3.0")))
+
+
 @router.post("/openai-reset-circuit", response_model=MessageResponse)
-async def reset_circuit_breaker(
+def reset_circuit_breaker(
     req: Request,
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -968,7 +993,7 @@ async def reset_circuit_breaker(
 # ==================== Moderation Queue Endpoints ====================
 
 @router.get("/moderation", response_model=ModerationQueueResponse)
-async def get_moderation_queue(
+def get_moderation_queue(
     status: Optional[str] = Query(None, description="Filter by status: pending, in_review, approved, rejected, needs_revision"),
     priority: Optional[int] = Query(None, ge=1, le=10, description="Filter by priority (1=highest, 10=lowest)"),
     submission_source: Optional[str] = Query(None, description="Filter by source: ai_generated, community, import, admin"),
@@ -1026,7 +1051,7 @@ async def get_moderation_queue(
 
 
 @router.get("/moderation/{item_id}", response_model=ModerationDetailResponse)
-async def get_moderation_item(
+def get_moderation_item(
     item_id: str,
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -1082,7 +1107,7 @@ async def get_moderation_item(
 
 
 @router.post("/moderation", response_model=MessageResponse)
-async def submit_to_moderation(
+def submit_to_moderation(
     request: SubmitToQueueRequest,
     req: Request,
     admin: User = Depends(get_admin_user),
@@ -1138,7 +1163,7 @@ async def submit_to_moderation(
 
 
 @router.put("/moderation/{item_id}/assign", response_model=MessageResponse)
-async def assign_moderation_item(
+def assign_moderation_item(
     item_id: str,
     req: Request,
     admin: User = Depends(get_admin_user),
@@ -1175,7 +1200,7 @@ async def assign_moderation_item(
 
 
 @router.put("/moderation/{item_id}/decision", response_model=MessageResponse)
-async def make_moderation_decision(
+def make_moderation_decision(
     item_id: str,
     request: ModerationDecisionRequest,
     req: Request,
@@ -1256,7 +1281,7 @@ async def make_moderation_decision(
 # ==================== Flagged Questions Endpoints ====================
 
 @router.get("/flagged", response_model=FlaggedQuestionsResponse)
-async def get_flagged_questions(
+def get_flagged_questions(
     flag_reason: Optional[str] = Query(None, description="Filter by flag reason"),
     specialty: Optional[str] = Query(None, description="Filter by specialty"),
     question_id: Optional[str] = Query(None, description="Filter by question ID"),
@@ -1315,7 +1340,7 @@ async def get_flagged_questions(
 
 
 @router.get("/flagged/stats", response_model=FlaggedQuestionStats)
-async def get_flagged_stats(
+def get_flagged_stats(
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
@@ -1376,7 +1401,7 @@ async def get_flagged_stats(
 
 
 @router.get("/flagged/question/{question_id}")
-async def get_question_flags(
+def get_question_flags(
     question_id: str,
     admin: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -28,6 +28,8 @@ from app.services.admin_analytics_service import (
     run_cohort_retention_batch,
     get_historical_metrics
 )
+from app.services.retention_decay import decay_concept_retentions
+from app.services.irt_bank_calibration import calibrate_item_bank
 
 
 router = APIRouter(prefix="/api/admin/analytics", tags=["admin-analytics"])
@@ -87,6 +89,7 @@ class BatchJobResponse(BaseModel):
     distribution: Optional[dict] = None
     cohorts_processed: Optional[int] = None
     records_updated: Optional[int] = None
+    records_scanned: Optional[int] = None
 
 
 # =============================================================================
@@ -279,6 +282,37 @@ def trigger_cohort_retention(
     return run_cohort_retention_batch(db, weeks)
 
 
+@router.post("/batch/concept-retention", response_model=BatchJobResponse)
+def trigger_concept_retention_decay(
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Manually trigger the concept retention decay batch job.
+
+    Refreshes stored predicted retention for every user's concepts from the
+    forgetting curve (readers compute it on the fly, so this only keeps the
+    stored columns current). Safe to run multiple times.
+    """
+    return decay_concept_retentions(db)
+
+
+@router.post("/batch/irt-calibration")
+def trigger_irt_calibration(
+    fit_2pl: bool = Query(default=False, description="Also fit 2PL discrimination/difficulty"),
+    admin: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Manually trigger item bank IRT calibration.
+
+    Recomputes p-value, discrimination and confidence intervals for every
+    question with enough responses from one pass over question attempts,
+    and updates difficulty levels. Reports throughput in items/sec.
+    """
+    return {"status": "success", **calibrate_item_bank(db, fit_2pl=fit_2pl).to_dict()}
+
+
 @router.post("/batch/all")
 def trigger_all_batch_jobs(
     admin: User = Depends(get_admin_user),
@@ -292,12 +326,14 @@ def trigger_all_batch_jobs(
     daily_result = run_daily_metrics_batch(db)
     engagement_result = run_user_engagement_batch(db)
     cohort_result = run_cohort_retention_batch(db, 12)
+    retention_result = decay_concept_retentions(db)
 
     return {
         "status": "success",
         "jobs_completed": {
             "daily_metrics": daily_result,
             "user_engagement": engagement_result,
-            "cohort_retention": cohort_result
+            "cohort_retention": cohort_result,
+            "concept_retention": retention_result
         }
     }
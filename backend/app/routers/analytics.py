@@ -29,6 +29,12 @@ from app.services.analytics_agent import (
     calculate_predicted_score_detailed,
     calculate_readiness
 )
+from app.services.daily_activity import get_current_streak, get_daily_activity
+from app.services.peer_distribution import (
+    PEER_SPECIALTIES,
+    get_peer_distribution,
+    specialties_for_source
+)
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
@@ -37,38 +43,7 @@ def calculate_streak(db: Session, user_id: str) -> int:
     """
     Calculate user's current study streak (consecutive days with activity)
     """
-    # Get all unique dates user has answered questions
-    attempts = db.query(
-        func.date(QuestionAttempt.attempted_at).label('date')
-    ).filter(
-        QuestionAttempt.user_id == user_id
-    ).distinct().order_by(
-        func.date(QuestionAttempt.attempted_at).desc()
-    ).all()
-
-    if not attempts:
-        return 0
-
-    # Convert to list of dates
-    dates = [datetime.strptime(str(attempt.date), '%Y-%m-%d').date() for attempt in attempts]
-
-    # Check if user studied today or yesterday (to maintain streak)
-    today = datetime.now().date()
-    yesterday = today - timedelta(days=1)
-
-    if dates[0] not in [today, yesterday]:
-        return 0  # Streak broken
-
-    # Count consecutive days backward from most recent
-    streak = 1
-    for i in range(1, len(dates)):
-        expected_date = dates[i-1] - timedelta(days=1)
-        if dates[i] == expected_date:
-            streak += 1
-        else:
-            break
-
-    return streak
+    return get_current_streak(db, user_id)
 
 
 def calculate_score_confidence(total_questions: int) -> int:
@@ -344,34 +319,20 @@ def get_activity_heatmap(
     """
     # IDOR protection
     verify_user_access(current_user, user_id)
-    from sqlalchemy import Integer
 
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
 
-    # Get daily activity data
-    daily_data = db.query(
-        func.date(QuestionAttempt.attempted_at).label('date'),
-        func.count(QuestionAttempt.id).label('count'),
-        func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-    ).filter(
-        QuestionAttempt.user_id == user_id,
-        func.date(QuestionAttempt.attempted_at) >= start_date,
-        func.date(QuestionAttempt.attempted_at) <= end_date
-    ).group_by(
-        func.date(QuestionAttempt.attempted_at)
-    ).order_by(
-        func.date(QuestionAttempt.attempted_at)
-    ).all()
+    # Get daily activity data (one indexed range read of the daily rollup)
+    daily_data = get_daily_activity(db, user_id, start_day=start_date, end_day=end_date)
 
     # Format response
     heatmap_data = []
     for row in daily_data:
-        accuracy = round((row.correct or 0) / row.count * 100, 1) if row.count > 0 else 0
         heatmap_data.append({
-            "date": str(row.date),
-            "count": row.count,
-            "accuracy": accuracy
+            "date": str(row.day),
+            "count": row.questions_answered,
+            "accuracy": round(row.accuracy * 100, 1)
         })
 
     # Calculate summary stats
@@ -526,7 +487,7 @@ def get_peer_comparison(
     """
     # IDOR protection
     verify_user_access(current_user, user_id)
-    from sqlalchemy import Integer, distinct
+    from sqlalchemy import Integer
 
     # Get user's stats
     user_attempts = db.query(
@@ -546,18 +507,11 @@ def get_peer_comparison(
     # Get user's streak
     user_streak = calculate_streak(db, user_id)
 
-    # Get all users' stats for comparison (anonymized)
-    all_users_stats = db.query(
-        QuestionAttempt.user_id,
-        func.count(QuestionAttempt.id).label('total'),
-        func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-    ).group_by(
-        QuestionAttempt.user_id
-    ).having(
-        func.count(QuestionAttempt.id) >= 10  # Only users with 10+ questions
-    ).all()
+    # Peer distributions come from the precomputed store (no attempts scan here)
+    peers = get_peer_distribution(db)
+    total_peers = peers.peer_count("accuracy")
 
-    if not all_users_stats:
+    if total_peers == 0:
         return {
             "user_stats": {
                 "total_questions": user_total,
@@ -571,55 +525,20 @@ def get_peer_comparison(
             }
         }
 
-    # Calculate peer statistics
-    peer_accuracies = []
-    peer_totals = []
-
-    for peer_user_id, total, correct in all_users_stats:
-        if total > 0:
-            peer_accuracy = (correct or 0) / total * 100
-            peer_accuracies.append(peer_accuracy)
-            peer_totals.append(total)
-
-    # Calculate percentiles
-    def calculate_percentile(value, data_list):
-        if not data_list:
-            return 50
-        sorted_data = sorted(data_list)
-        count_below = sum(1 for x in sorted_data if x < value)
-        return round((count_below / len(sorted_data)) * 100)
-
-    accuracy_percentile = calculate_percentile(user_accuracy, peer_accuracies)
-    questions_percentile = calculate_percentile(user_total, peer_totals)
+    accuracy_percentile = peers.percentile("accuracy", user_accuracy)
+    questions_percentile = peers.percentile("questions_answered", user_total)
 
     # Calculate platform averages
-    avg_accuracy = round(sum(peer_accuracies) / len(peer_accuracies), 1) if peer_accuracies else 0
-    avg_questions = round(sum(peer_totals) / len(peer_totals), 1) if peer_totals else 0
-    median_accuracy = sorted(peer_accuracies)[len(peer_accuracies) // 2] if peer_accuracies else 0
+    accuracy_summary = peers.summary("accuracy")
+    questions_summary = peers.summary("questions_answered")
+    avg_accuracy = round(accuracy_summary["mean"], 1)
+    avg_questions = round(questions_summary["mean"], 1)
+    median_accuracy = accuracy_summary["median"]
 
     # Create accuracy distribution buckets
-    accuracy_distribution = {
-        "0-50": 0,
-        "50-60": 0,
-        "60-70": 0,
-        "70-80": 0,
-        "80-90": 0,
-        "90-100": 0
-    }
-
-    for acc in peer_accuracies:
-        if acc < 50:
-            accuracy_distribution["0-50"] += 1
-        elif acc < 60:
-            accuracy_distribution["50-60"] += 1
-        elif acc < 70:
-            accuracy_distribution["60-70"] += 1
-        elif acc < 80:
-            accuracy_distribution["70-80"] += 1
-        elif acc < 90:
-            accuracy_distribution["80-90"] += 1
-        else:
-            accuracy_distribution["90-100"] += 1
+    bucket_labels = ["0-50", "50-60", "60-70", "70-80", "80-90", "90-100"]
+    bucket_counts = peers.bucket_counts("accuracy", [0, 50, 60, 70, 80, 90])
+    accuracy_distribution = dict(zip(bucket_labels, bucket_counts))
 
     # Determine user's bucket for highlighting
     user_bucket = "0-50"
@@ -634,39 +553,32 @@ def get_peer_comparison(
     elif user_accuracy >= 50:
         user_bucket = "50-60"
 
-    # Get specialty comparison
-    specialties = ["Internal Medicine", "Surgery", "Pediatrics", "Psychiatry",
-                   "Obstetrics and Gynecology", "Emergency Medicine"]
+    # User's per-source totals in one query, folded into the compared specialties
+    user_sources = db.query(
+        Question.source,
+        func.count(QuestionAttempt.id).label('total'),
+        func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
+    ).join(
+        Question, QuestionAttempt.question_id == Question.id
+    ).filter(
+        QuestionAttempt.user_id == user_id
+    ).group_by(
+        Question.source
+    ).all()
+
+    user_specialty_totals = {specialty: [0, 0] for specialty in PEER_SPECIALTIES}
+    for source, total, correct in user_sources:
+        for specialty in specialties_for_source(source):
+            user_specialty_totals[specialty][0] += total
+            user_specialty_totals[specialty][1] += correct or 0
 
     specialty_comparison = {}
-    for specialty in specialties:
-        # User's performance in this specialty
-        user_spec = db.query(
-            func.count(QuestionAttempt.id).label('total'),
-            func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-        ).join(
-            Question, QuestionAttempt.question_id == Question.id
-        ).filter(
-            QuestionAttempt.user_id == user_id,
-            Question.source.ilike(f"%{specialty}%")
-        ).first()
-
-        user_spec_total = user_spec.total or 0
-        user_spec_correct = user_spec.correct or 0
+    for specialty in PEER_SPECIALTIES:
+        user_spec_total, user_spec_correct = user_specialty_totals[specialty]
         user_spec_accuracy = round((user_spec_correct / user_spec_total * 100), 1) if user_spec_total > 0 else None
 
         # Platform average for this specialty
-        platform_spec = db.query(
-            func.count(QuestionAttempt.id).label('total'),
-            func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-        ).join(
-            Question, QuestionAttempt.question_id == Question.id
-        ).filter(
-            Question.source.ilike(f"%{specialty}%")
-        ).first()
-
-        platform_spec_total = platform_spec.total or 0
-        platform_spec_correct = platform_spec.correct or 0
+        platform_spec_total, platform_spec_correct = peers.platform_totals(specialty)
         platform_spec_accuracy = round((platform_spec_correct / platform_spec_total * 100), 1) if platform_spec_total > 0 else None
 
         specialty_comparison[specialty] = {
@@ -685,7 +597,7 @@ def get_peer_comparison(
             "streak": user_streak
         },
         "comparison": {
-            "total_peers": len(all_users_stats),
+            "total_peers": total_peers,
             "percentiles": {
                 "accuracy": accuracy_percentile,
                 "questions_answered": questions_percentile,
@@ -5,14 +5,14 @@ Handles user registration, login, logout, and token management.
 import os
 import asyncio
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime, timedelta
 from typing import Optional
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models.models import User, UserSession, UserSettings, PasswordResetToken
 from app.dependencies.auth import get_current_user, verify_clerk_jwt
 from app.services.auth import (
@@ -141,7 +141,43 @@ def create_token_response(access_token: str, refresh_token: str) -> TokenRespons
     )
 
 
-async def get_current_user(
+def send_welcome_email_task(user_id: str) -> None:
+    """
+    Background task: send the welcome email from a session of its own.
+
+    Takes the user id rather than the request's session, which get_db has
+    closed by the time background tasks run. A plain `def`, so Starlette
+    runs it in the threadpool and the send never blocks the event loop.
+    """
+    from app.services.email.email_service import get_email_service
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            asyncio.run(get_email_service().send_welcome_email(db, user))
+    except Exception as e:
+        logger.warning(f"Failed to send welcome email to user {user_id}: {e}")
+    finally:
+        db.close()
+
+
+def send_password_reset_email_task(user_id: str, raw_token: str, expire_hours: int) -> None:
+    """Background task: send the password reset email from a session of its own."""
+    from app.services.email.email_service import get_email_service
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            asyncio.run(get_email_service().send_password_reset_email(db, user, raw_token, expire_hours))
+    except Exception as e:
+        logger.error(f"Failed to send password reset email to user {user_id}: {e}")
+    finally:
+        db.close()
+
+
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -175,7 +211,7 @@ async def get_current_user(
     return user
 
 
-async def get_optional_user(
+def get_optional_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> Optional[User]:
@@ -211,9 +247,10 @@ async def get_admin_user(
 # ==================== Auth Endpoints ====================
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     request: RegisterRequest,
     req: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -300,14 +337,8 @@ async def register(
     db.add(session)
     db.commit()
 
-    # Send welcome email (non-blocking)
-    try:
-        from app.services.email.email_service import get_email_service
-        email_service = get_email_service()
-        asyncio.create_task(email_service.send_welcome_email(db, new_user))
-    except Exception as e:
-        logger.warning(f"Failed to queue welcome email: {e}")
-        # Don't fail registration if email fails
+    # Send welcome email (non-blocking; failures are logged, registration still succeeds)
+    background_tasks.add_task(send_welcome_email_task, new_user.id)
 
     return AuthResponse(
         user=create_user_response(new_user),
@@ -316,7 +347,7 @@ async def register(
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(
+def login(
     request: LoginRequest,
     req: Request,
     db: Session = Depends(get_db)
@@ -399,7 +430,7 @@ async def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_tokens(
+def refresh_tokens(
     request: RefreshRequest,
     req: Request,
     db: Session = Depends(get_db)
@@ -464,7 +495,7 @@ async def refresh_tokens(
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(
+def logout(
     request: RefreshRequest,
     db: Session = Depends(get_db)
 ):
@@ -494,7 +525,7 @@ async def logout(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -504,7 +535,7 @@ async def get_current_user_info(
 
 
 @router.put("/me/password", response_model=MessageResponse)
-async def change_password(
+def change_password(
     request: PasswordChangeRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -544,8 +575,9 @@ MAX_RESET_REQUESTS_PER_HOUR = 3
 
 
 @router.post("/forgot-password", response_model=MessageResponse)
-async def forgot_password(
+def forgot_password(
     request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -601,23 +633,16 @@ async def forgot_password(
     db.commit()
 
     # Send email (non-blocking)
-    try:
-        from app.services.email.email_service import get_email_service
-        email_service = get_email_service()
-        asyncio.create_task(
-            email_service.send_password_reset_email(
-                db, user, raw_token, PASSWORD_RESET_EXPIRE_HOURS
-            )
-        )
-    except Exception as e:
-        logger.error(f"Failed to queue password reset email: {e}")
+    background_tasks.add_task(
+        send_password_reset_email_task, user.id, raw_token, PASSWORD_RESET_EXPIRE_HOURS
+    )
 
     logger.info(f"Password reset email queued for user: {user.id}")
     return MessageResponse(message=success_message)
 
 
 @router.post("/reset-password", response_model=MessageResponse)
-async def reset_password(
+def reset_password(
     request: ResetPasswordRequest,
     db: Session = Depends(get_db)
 ):
@@ -693,7 +718,7 @@ class SimpleUserResponse(BaseModel):
 
 
 @router.post("/simple-register", response_model=SimpleUserResponse)
-async def simple_register(
+def simple_register(
     request: SimpleRegisterRequest,
     db: Session = Depends(get_db)
 ):
@@ -769,8 +794,9 @@ class ClerkSyncResponse(BaseModel):
 
 
 @router.post("/clerk-sync", response_model=ClerkSyncResponse)
-async def clerk_sync(
+def clerk_sync(
     request: ClerkSyncRequest,
+    background_tasks: BackgroundTasks,
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
@@ -891,12 +917,7 @@ async def clerk_sync(
     db.commit()
 
     # Send welcome email for new Clerk users (non-blocking)
-    try:
-        from app.services.email.email_service import get_email_service
-        email_service = get_email_service()
-        asyncio.create_task(email_service.send_welcome_email(db, new_user))
-    except Exception as e:
-        logger.warning(f"Failed to queue welcome email for Clerk user: {e}")
+    background_tasks.add_task(send_welcome_email_task, new_user.id)
 
     return ClerkSyncResponse(
         user_id=new_user.id,
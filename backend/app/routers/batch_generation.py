@@ -107,7 +107,7 @@ def job_to_response(job: GenerationJob) -> JobResponse:
 # ============================================================================
 
 @router.post("/generate", response_model=JobResponse)
-async def start_batch_generation_endpoint(
+def start_batch_generation_endpoint(
     request: BatchGenerateRequest,
     user_id: str = Query(..., description="User ID"),
     db: Session = Depends(get_db)
@@ -198,7 +198,7 @@ async def start_batch_generation_endpoint(
 
 
 @router.get("/status/{job_id}", response_model=JobResponse)
-async def get_job_status(
+def get_job_status(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -215,7 +215,7 @@ async def get_job_status(
 
 
 @router.get("/jobs/{user_id}", response_model=JobListResponse)
-async def list_user_jobs(
+def list_user_jobs(
     user_id: str,
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(20, ge=1, le=100, description="Max jobs to return"),
@@ -248,7 +248,7 @@ async def list_user_jobs(
 
 
 @router.delete("/cancel/{job_id}")
-async def cancel_generation_job(
+def cancel_generation_job(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -279,7 +279,7 @@ async def cancel_generation_job(
 
 
 @router.get("/stats/{user_id}", response_model=GenerationStatsResponse)
-async def get_user_generation_stats(
+def get_user_generation_stats(
     user_id: str,
     db: Session = Depends(get_db)
 ):
@@ -298,7 +298,7 @@ async def get_user_generation_stats(
 
 
 @router.get("/running/{user_id}")
-async def get_running_generation_jobs(
+def get_running_generation_jobs(
     user_id: str,
     db: Session = Depends(get_db)
 ):
@@ -321,7 +321,7 @@ async def get_running_generation_jobs(
 
 
 @router.post("/cleanup")
-async def cleanup_stale_generation_jobs(
+def cleanup_stale_generation_jobs(
     max_age_hours: int = Query(24, ge=1, le=168, description="Max job age in hours"),
     db: Session = Depends(get_db)
 ):
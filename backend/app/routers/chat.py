@@ -18,7 +18,7 @@ import json
 
 logger = logging.getLogger(__name__)
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models.models import Question, ChatMessage, ErrorAnalysis, QuestionAttempt, User
 from app.dependencies.auth import get_current_user, verify_user_access
 from app.services.clinical_reasoning import (
@@ -289,19 +289,10 @@ RULES:
         raise HTTPException(status_code=503, detail="AI service temporarily unavailable")
 
 
-@router.post("/question/stream")
-async def chat_about_question_stream(
-    request: ChatRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _prepare_stream_chat(request: ChatRequest, current_user: User, db: Session) -> List[dict]:
     """
-    Stream chat response about a specific question using Server-Sent Events.
-
-    SECURITY: Requires authentication. Users can only chat as themselves.
-
-    Provides real-time streaming of AI responses for better UX.
-    First token arrives in <500ms, full response streams progressively.
+    Load the question context, build the prompt messages and save the
+    user's message. Synchronous: the streaming route runs it via run_db.
     """
     # IDOR protection
     verify_user_access(current_user, request.user_id)
@@ -422,6 +413,38 @@ RULES:
     db.add(user_msg)
     db.commit()
 
+    return messages
+
+
+def _save_assistant_message(db: Session, request: ChatRequest, message: str) -> None:
+    """Persist an assistant reply for the streaming route (runs via run_db)."""
+    db.add(ChatMessage(
+        user_id=request.user_id,
+        question_id=request.question_id,
+        message=message,
+        role="assistant",
+        created_at=datetime.utcnow()
+    ))
+    db.commit()
+
+
+@router.post("/question/stream")
+async def chat_about_question_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream chat response about a specific question using Server-Sent Events.
+
+    SECURITY: Requires authentication. Users can only chat as themselves.
+
+    Provides real-time streaming of AI responses for better UX.
+    First token arrives in <500ms, full response streams progressively.
+    """
+    # Queries and the user-message insert run off the event loop
+    messages = await run_db(_prepare_stream_chat, request, current_user, db)
+
     async def generate_stream():
         """Generate SSE stream of AI response chunks."""
         full_response = []
@@ -441,16 +464,7 @@ RULES:
             yield f"data: {json.dumps({'done': True})}\n\n"
 
             # Save complete AI response to database
-            ai_message = "".join(full_response)
-            ai_msg = ChatMessage(
-                user_id=request.user_id,
-                question_id=request.question_id,
-                message=ai_message,
-                role="assistant",
-                created_at=datetime.utcnow()
-            )
-            db.add(ai_msg)
-            db.commit()
+            await run_db(_save_assistant_message, db, request, "".join(full_response))
 
         except CircuitBreakerOpenError:
             # Send error in SSE format
@@ -458,15 +472,7 @@ RULES:
             yield f"data: {json.dumps({'error': error_msg})}\n\n"
 
             # Save fallback message
-            ai_msg = ChatMessage(
-                user_id=request.user_id,
-                question_id=request.question_id,
-                message=error_msg,
-                role="assistant",
-                created_at=datetime.utcnow()
-            )
-            db.add(ai_msg)
-            db.commit()
+            await run_db(_save_assistant_message, db, request, error_msg)
 
         except Exception as e:
             logger.error("Streaming chat error: %s", e, exc_info=True)
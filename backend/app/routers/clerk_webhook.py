@@ -23,7 +23,7 @@ import os
 import logging
 from datetime import datetime
 
-from app.database import get_db
+from app.database import SessionLocal, get_db, run_db
 from app.models.models import User, generate_uuid
 
 logger = logging.getLogger(__name__)
@@ -136,8 +136,12 @@ async def clerk_webhook(
     event_type = payload.get('type')
     data = payload.get('data', {})
 
+    return await run_db(_process_clerk_event, event_type, data)
+
+
+def _process_clerk_event(event_type: Optional[str], data: dict) -> dict:
+    """Apply a verified Clerk event to the users table (runs off the event loop)."""
     # Get database session
-    from app.database import SessionLocal
     db = SessionLocal()
 
     try:
@@ -87,7 +87,7 @@ class SourceBreakdownResponse(BaseModel):
 # =========================================================================
 
 @router.get("/overview", response_model=QualityOverviewResponse)
-async def get_quality_overview(db: Session = Depends(get_db)):
+def get_quality_overview(db: Session = Depends(get_db)):
     """
     Get comprehensive quality overview for all questions.
 
@@ -102,7 +102,7 @@ async def get_quality_overview(db: Session = Depends(get_db)):
 
 
 @router.get("/attention-needed", response_model=AttentionNeededResponse)
-async def get_questions_needing_attention(
+def get_questions_needing_attention(
     limit: int = Query(50, ge=1, le=500, description="Max questions per category"),
     db: Session = Depends(get_db)
 ):
@@ -120,7 +120,7 @@ async def get_questions_needing_attention(
 
 
 @router.get("/report", response_model=QualityReportResponse)
-async def get_quality_report(db: Session = Depends(get_db)):
+def get_quality_report(db: Session = Depends(get_db)):
     """
     Generate comprehensive quality report with recommendations.
 
@@ -133,7 +133,7 @@ async def get_quality_report(db: Session = Depends(get_db)):
 
 
 @router.get("/source-breakdown", response_model=SourceBreakdownResponse)
-async def get_source_quality_breakdown(db: Session = Depends(get_db)):
+def get_source_quality_breakdown(db: Session = Depends(get_db)):
     """
     Get quality breakdown by question source (specialty/exam).
 
@@ -149,7 +149,7 @@ async def get_source_quality_breakdown(db: Session = Depends(get_db)):
 # =========================================================================
 
 @router.post("/validate", response_model=ValidationResultsResponse)
-async def validate_questions(
+def validate_questions(
     question_ids: Optional[List[str]] = None,
     limit: int = Query(50, ge=1, le=500, description="Max questions to validate"),
     log_results: bool = Query(True, description="Save results to database"),
@@ -175,7 +175,7 @@ async def validate_questions(
 
 
 @router.get("/validate/{question_id}")
-async def validate_single_question(
+def validate_single_question(
     question_id: str,
     db: Session = Depends(get_db)
 ):
@@ -200,7 +200,7 @@ async def validate_single_question(
 # =========================================================================
 
 @router.post("/improve/{question_id}")
-async def improve_single_question(
+def improve_single_question(
     question_id: str,
     auto_apply: bool = Query(False, description="Automatically save improvement"),
     db: Session = Depends(get_db)
@@ -231,7 +231,7 @@ async def improve_single_question(
 
 
 @router.post("/batch-improve", response_model=ImprovementResultsResponse)
-async def batch_improve_questions_endpoint(
+def batch_improve_questions_endpoint(
     max_questions: int = Query(10, ge=1, le=50, description="Max questions to improve"),
     priority: str = Query("missing", description="Priority: missing, text_only, low_quality, all"),
     auto_apply: bool = Query(False, description="Automatically save improvements"),
@@ -258,7 +258,7 @@ async def batch_improve_questions_endpoint(
 
 
 @router.post("/batch-improve-background")
-async def batch_improve_background(
+def batch_improve_background(
     background_tasks: BackgroundTasks,
     max_questions: int = Query(50, ge=1, le=200, description="Max questions to improve"),
     priority: str = Query("all", description="Priority: missing, text_only, low_quality, all"),
@@ -292,7 +292,7 @@ async def batch_improve_background(
 # =========================================================================
 
 @router.post("/quick-check")
-async def quick_quality_check(
+def quick_quality_check(
     limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
@@ -305,7 +305,7 @@ async def quick_quality_check(
 
 
 @router.get("/stats")
-async def get_quality_stats(db: Session = Depends(get_db)):
+def get_quality_stats(db: Session = Depends(get_db)):
     """
     Get quick quality statistics.
 
@@ -131,7 +131,7 @@ async def upload_curriculum_file(
 
 
 @router.get("/uploads")
-async def list_uploads(
+def list_uploads(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     limit: int = Query(default=20, le=100)
@@ -162,7 +162,7 @@ async def list_uploads(
 
 
 @router.get("/uploads/{upload_id}")
-async def get_upload_detail(
+def get_upload_detail(
     upload_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -214,7 +214,7 @@ async def get_upload_detail(
 
 
 @router.delete("/uploads/{upload_id}")
-async def delete_upload(
+def delete_upload(
     upload_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -242,7 +242,7 @@ async def delete_upload(
 # ============================================================================
 
 @router.get("/focus", response_model=StudyFocusSummary)
-async def get_study_focus(
+def get_study_focus(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -271,7 +271,7 @@ async def get_study_focus(
 
 
 @router.post("/focus/reset")
-async def reset_study_focus(
+def reset_study_focus(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -291,7 +291,7 @@ async def reset_study_focus(
 
 
 @router.put("/focus/settings")
-async def update_focus_settings(
+def update_focus_settings(
     daily_target: int = Query(ge=5, le=200),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -318,7 +318,7 @@ async def update_focus_settings(
 # ============================================================================
 
 @router.get("/questions")
-async def get_personalized_questions(
+def get_personalized_questions(
     count: int = Query(default=10, ge=1, le=50),
     specialty: Optional[str] = None,
     current_user: User = Depends(get_current_user),
@@ -360,7 +360,7 @@ async def get_personalized_questions(
 # ============================================================================
 
 @router.get("/topics")
-async def list_topics(
+def list_topics(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     specialty: Optional[str] = None,
@@ -408,7 +408,7 @@ async def list_topics(
 
 
 @router.get("/topics/{topic_id}/questions")
-async def get_topic_questions(
+def get_topic_questions(
     topic_id: str,
     count: int = Query(default=10, ge=1, le=50),
     current_user: User = Depends(get_current_user),
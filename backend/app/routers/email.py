@@ -13,7 +13,7 @@ from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models.models import EmailLog, UserSettings, UnsubscribeToken, User
 from app.routers.auth import get_admin_user
 
@@ -58,6 +58,11 @@ async def resend_webhook(request: Request, db: Session = Depends(get_db)):
     if not message_id:
         return {"status": "ignored", "reason": "no message_id"}
 
+    return await run_db(_apply_email_event, db, event_type, email_data, message_id)
+
+
+def _apply_email_event(db: Session, event_type: str, email_data: dict, message_id: str) -> dict:
+    """Record a Resend event on its EmailLog (runs off the event loop)."""
     # Find the email log
     log = db.query(EmailLog).filter(
         EmailLog.provider_message_id == message_id
@@ -89,13 +94,13 @@ async def resend_webhook(request: Request, db: Session = Depends(get_db)):
         # Disable emails for hard bounces
         bounce_type = bounce_data.get("bounce_type", "")
         if bounce_type == "hard":
-            await _disable_email_for_user(db, log.user_id)
+            _disable_email_for_user(db, log.user_id)
             logger.info(f"Disabled emails for user {log.user_id} due to hard bounce")
 
     elif event_type == "email.complained":
         log.status = "complained"
         # Auto-unsubscribe users who mark as spam
-        await _disable_email_for_user(db, log.user_id)
+        _disable_email_for_user(db, log.user_id)
         logger.info(f"Disabled emails for user {log.user_id} due to spam complaint")
 
     db.commit()
@@ -104,7 +109,7 @@ async def resend_webhook(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/unsubscribe/{token}", response_class=HTMLResponse)
-async def unsubscribe(token: str, db: Session = Depends(get_db)):
+def unsubscribe(token: str, db: Session = Depends(get_db)):
     """
     One-click unsubscribe handler.
     Disables email notifications for the user associated with the token.
@@ -149,7 +154,7 @@ async def unsubscribe(token: str, db: Session = Depends(get_db)):
     return _render_unsubscribe_page(success=True, message=message)
 
 
-async def _disable_email_for_user(db: Session, user_id: str):
+def _disable_email_for_user(db: Session, user_id: str):
     """Disable all email notifications for a user."""
     settings = db.query(UserSettings).filter(
         UserSettings.user_id == user_id
@@ -163,20 +168,26 @@ async def _disable_email_for_user(db: Session, user_id: str):
 
 @router.post("/admin/send-digests")
 async def admin_send_digests(
+    dry_run: bool = False,
     admin_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
     Admin endpoint to manually trigger weekly digest emails.
-    Useful for testing or re-sending missed digests.
+    Useful for testing or re-sending missed digests: users already sent
+    this week's digest are skipped.
+
+    With dry_run=true digests are prepared and rendered but not sent,
+    and the response reports pipeline throughput (digests_per_second).
     """
-    from app.services.email.weekly_digest import send_weekly_digests
+    from app.services.email.weekly_digest import run_weekly_digests
 
     try:
-        sent_count = await send_weekly_digests()
+        result = await run_weekly_digests(db, dry_run=dry_run)
         return {
             "status": "success",
-            "digests_sent": sent_count
+            "digests_sent": result.sent,
+            **result.to_dict()
         }
     except Exception as e:
         logger.error(f"Failed to send digests: {e}")
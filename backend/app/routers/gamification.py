@@ -87,7 +87,7 @@ class BadgesResponse(BaseModel):
 # ============================================================================
 
 @router.get("/streaks", response_model=StreakData)
-async def get_streak_data(
+def get_streak_data(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -97,7 +97,7 @@ async def get_streak_data(
 
 
 @router.get("/streaks/leaderboard", response_model=StreakLeaderboardResponse)
-async def get_streak_leaderboard(
+def get_streak_leaderboard(
     limit: int = 10,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -115,7 +115,7 @@ async def get_streak_leaderboard(
 # ============================================================================
 
 @router.get("/badges", response_model=BadgesResponse)
-async def get_user_badges(
+def get_user_badges(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -139,7 +139,7 @@ async def get_all_badges():
 
 
 @router.post("/badges/check")
-async def check_badges(
+def check_badges(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -157,7 +157,7 @@ async def check_badges(
 
 
 @router.get("/summary")
-async def get_gamification_summary(
+def get_gamification_summary(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -344,10 +344,7 @@ def get_learning_dashboard(
 
     Useful for frontend to display learning progress and recommendations.
     """
-    # Update concept retentions first
-    update_all_concept_retentions(db, user_id)
-
-    # Gather all data
+    # Gather all data (concept retention decays at read time)
     specialty_difficulties = get_all_specialty_difficulties(db, user_id)
     retention_metrics = get_or_create_retention_metrics(db, user_id)
     session_mix = calculate_optimal_mix(db, user_id)
@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.routers.auth import get_current_user
 from app.models.models import User, PushSubscription, UserSettings, ScheduledReview, UserEngagementScore
 from app.services.push_notification_service import get_push_notification_service
@@ -75,7 +75,7 @@ async def get_vapid_public_key():
 
 
 @router.post("/subscribe", response_model=PushSubscriptionResponse)
-async def subscribe_to_push(
+def subscribe_to_push(
     subscription: PushSubscriptionRequest,
     request: Request,
     current_user: User = Depends(get_current_user),
@@ -120,7 +120,7 @@ async def subscribe_to_push(
 
 
 @router.delete("/unsubscribe")
-async def unsubscribe_from_push(
+def unsubscribe_from_push(
     endpoint: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -139,7 +139,7 @@ async def unsubscribe_from_push(
 
 
 @router.get("/subscriptions", response_model=List[PushSubscriptionResponse])
-async def list_subscriptions(
+def list_subscriptions(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -168,10 +168,10 @@ async def send_test_notification(
         )
 
     # Get all active subscriptions for user
-    subs = db.query(PushSubscription).filter(
+    subs = await run_db(lambda: db.query(PushSubscription).filter(
         PushSubscription.user_id == current_user.id,
         PushSubscription.is_active == True
-    ).all()
+    ).all())
 
     if not subs:
         raise HTTPException(
@@ -204,7 +204,7 @@ async def send_test_notification(
             if sub.failed_attempts >= 3:
                 sub.is_active = False
 
-    db.commit()
+    await run_db(db.commit)
 
     return {
         "status": "sent",
@@ -214,7 +214,7 @@ async def send_test_notification(
 
 
 @router.get("/preferences", response_model=NotificationPreferences)
-async def get_notification_preferences(
+def get_notification_preferences(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -248,7 +248,7 @@ async def get_notification_preferences(
 
 
 @router.put("/preferences")
-async def update_notification_preferences(
+def update_notification_preferences(
     preferences: NotificationPreferences,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -97,7 +97,7 @@ class ExamCountdownResponse(BaseModel):
 # ==================== Profile Endpoints ====================
 
 @router.get("/me", response_model=ProfileResponse)
-async def get_profile(
+def get_profile(
     current_user: User = Depends(get_current_user)
 ):
     """Get current user's profile"""
@@ -117,7 +117,7 @@ async def get_profile(
 
 
 @router.put("/me", response_model=ProfileResponse)
-async def update_profile(
+def update_profile(
     request: ProfileUpdateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -158,7 +158,7 @@ async def update_profile(
 
 
 @router.put("/me/target", response_model=MessageResponse)
-async def update_target_score(
+def update_target_score(
     request: TargetUpdateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -171,7 +171,7 @@ async def update_target_score(
 
 
 @router.put("/me/exam-date", response_model=MessageResponse)
-async def update_exam_date(
+def update_exam_date(
     request: ExamDateUpdateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -190,7 +190,7 @@ async def update_exam_date(
 
 
 @router.get("/me/countdown", response_model=ExamCountdownResponse)
-async def get_exam_countdown(
+def get_exam_countdown(
     current_user: User = Depends(get_current_user)
 ):
     """Get exam countdown and target score"""
@@ -207,7 +207,7 @@ async def get_exam_countdown(
 
 
 @router.delete("/me", response_model=MessageResponse)
-async def delete_account(
+def delete_account(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -225,7 +225,7 @@ async def delete_account(
 # ==================== Settings Endpoints ====================
 
 @router.get("/me/settings", response_model=SettingsResponse)
-async def get_settings(
+def get_settings(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -255,7 +255,7 @@ async def get_settings(
 
 
 @router.put("/me/settings", response_model=SettingsResponse)
-async def update_settings(
+def update_settings(
     request: SettingsUpdateRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -334,7 +334,7 @@ async def update_settings(
 # ==================== Data Export (GDPR) ====================
 
 @router.get("/me/export")
-async def export_user_data(
+def export_user_data(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
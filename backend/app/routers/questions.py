@@ -27,12 +27,14 @@ from app.services.question_agent import (
     generate_optimal_question
 )
 from app.services.question_pool import get_instant_question, get_pool_stats, warm_pool_async
+from app.services.pool_index import get_pool_index
+from app.services.question_index import get_question_index
+from app.services.learning_snapshot import record_attempt_in_snapshot, get_error_counts
+from app.services.peer_distribution import get_peer_distribution_store
+from app.services.daily_activity import record_daily_activity
+from app.services.answer_pipeline import AnswerEvent, get_answer_pipeline, get_answer_effects
 from app.services.adaptive import get_user_difficulty_target, get_user_weakness_profile
-from app.services.error_categorization import categorize_error
 from app.services.weakness_teaching import get_weakness_intervention
-from app.services.streak_service import get_streak_service
-from app.services.badge_service import get_badge_service
-from app.services.score_predictor import save_daily_prediction_snapshot
 from app.services.ai_question_analytics import (
     get_ai_question_performance,
     get_question_actual_difficulty,
@@ -42,12 +44,6 @@ from app.services.ai_question_analytics import (
     get_generation_recommendations,
     update_content_freshness
 )
-from app.services.learning_engine import (
-    update_specialty_difficulty,
-    schedule_personalized_review,
-    update_concept_retention
-)
-import threading
 
 router = APIRouter(prefix="/api/questions", tags=["questions"])
 
@@ -107,6 +103,15 @@ class AnswerFeedback(BaseModel):
     weakness_intervention: Optional[WeaknessIntervention] = None
     streak: Optional[StreakInfo] = None
     badges_awarded: Optional[List[BadgeAward]] = None
+    attempt_id: Optional[str] = None
+    effects_pending: bool = False  # streak/badges deferred - poll /submit/{attempt_id}/effects
+
+
+class AnswerEffectsResponse(BaseModel):
+    attempt_id: str
+    status: str  # pending, done, failed
+    streak: Optional[StreakInfo] = None
+    badges_awarded: Optional[List[BadgeAward]] = None
 
 
 class ErrorAnalysisResponse(BaseModel):
@@ -198,158 +203,70 @@ def submit_answer(
     )
 
     db.add(attempt)
+    record_daily_activity(
+        db, request.user_id, question.specialty, is_correct,
+        request.time_spent_seconds, request.confidence_level, attempt.attempted_at
+    )
     db.commit()
     db.refresh(attempt)  # Get the attempt ID
 
-    # === STREAK TRACKING ===
-    streak_update = None
-    try:
-        streak_service = get_streak_service()
-        streak_update = streak_service.update_streak_on_activity(db, request.user_id)
-    except Exception as e:
-        logger.warning("Streak update failed: %s", e)
-
-    # === DAILY PREDICTION SNAPSHOT ===
-    try:
-        save_daily_prediction_snapshot(db, request.user_id)
-    except Exception as e:
-        logger.warning("Daily prediction snapshot failed: %s", e)
-
-    # === BADGE CHECKING ===
-    newly_awarded_badges = []
-    try:
-        badge_service = get_badge_service()
-        newly_awarded_badges = badge_service.check_and_award_badges(
-            db,
-            request.user_id,
-            trigger_context={"question_answered": True, "is_correct": is_correct}
-        )
-    except Exception as e:
-        logger.warning("Badge check failed: %s", e)
-
-    # === ADVANCED LEARNING ENGINE INTEGRATION ===
-    # Gap 1: Update per-specialty difficulty
-    if question.specialty:
-        try:
-            update_specialty_difficulty(db, request.user_id, question.specialty, is_correct)
-        except Exception as e:
-            logger.warning("Specialty difficulty update failed: %s", e)
-
-    # Gap 2: Schedule personalized review (replaces basic spaced repetition)
-    try:
-        schedule_personalized_review(
-            db=db,
-            user_id=request.user_id,
-            question_id=request.question_id,
-            is_correct=is_correct,
-            source=question.source,
-            specialty=question.specialty,
-            confidence_level=request.confidence_level
-        )
-    except Exception as e:
-        logger.warning("Personalized review scheduling failed: %s", e)
-        # Fallback to basic spaced repetition
-        from app.services.spaced_repetition import schedule_review
-        schedule_review(
-            db=db,
-            user_id=request.user_id,
-            question_id=request.question_id,
-            is_correct=is_correct,
-            source=question.source
-        )
-
-    # Gap 4: Update concept retention (if question has concepts/topics)
+    # Keep the in-memory indexes, cached learning snapshot and peer distributions current
+    get_pool_index().record_answer(request.user_id, request.question_id)
+    get_question_index().record_answer(request.user_id, request.question_id, attempt.attempted_at)
+    record_attempt_in_snapshot(request.user_id, question.source, question.specialty, is_correct)
+    get_peer_distribution_store().record_answer(request.user_id, is_correct, question.source)
+
+    # === POST-ANSWER SIDE-EFFECTS ===
+    # Streak, prediction snapshot, badges, specialty difficulty, review
+    # scheduling, concept retention and error analysis run on the
+    # post-answer pipeline; results are polled via /submit/{attempt_id}/effects
+    concepts = []
     if question.extra_data and isinstance(question.extra_data, dict):
         concepts = question.extra_data.get("concepts") or question.extra_data.get("topics")
-        if concepts and isinstance(concepts, list):
-            try:
-                for concept in concepts[:5]:  # Limit to 5 concepts
-                    update_concept_retention(
-                        db=db,
-                        user_id=request.user_id,
-                        concept=concept,
-                        is_correct=is_correct,
-                        specialty=question.specialty,
-                        question_id=question.id
-                    )
-            except Exception as e:
-                logger.warning("Concept retention update failed: %s", e)
+        if not isinstance(concepts, list):
+            concepts = []
+
+    effects = get_answer_pipeline().submit(db, AnswerEvent(
+        attempt_id=attempt.id,
+        user_id=request.user_id,
+        question_id=request.question_id,
+        is_correct=is_correct,
+        user_answer=request.user_answer,
+        source=question.source,
+        specialty=question.specialty,
+        confidence_level=request.confidence_level,
+        time_spent_seconds=request.time_spent_seconds,
+        concepts=concepts,
+        attempted_at=attempt.attempted_at,
+        vignette=question.vignette,
+        answer_key=question.answer_key,
+        choices=question.choices
+    ))
 
-    # Trigger error analysis asynchronously if incorrect
     weakness_intervention = None
     if not is_correct:
-        def analyze_error_async():
-            """Background task to analyze error without blocking response"""
-            from app.database import SessionLocal
-            db_async = SessionLocal()
-            try:
-                error_analysis = categorize_error(
-                    question_text=question.vignette,
-                    correct_answer=question.answer_key,
-                    user_answer=request.user_answer,
-                    choices=question.choices,
-                    time_spent=request.time_spent_seconds
-                )
-
-                # Save to database
-                error_record = ErrorAnalysis(
-                    attempt_id=attempt.id,
-                    user_id=request.user_id,
-                    question_id=request.question_id,
-                    error_type=error_analysis.get("error_type", "knowledge_gap"),
-                    confidence=error_analysis.get("confidence", 0.5),
-                    explanation=error_analysis.get("explanation", ""),
-                    missed_detail=error_analysis.get("missed_detail", ""),
-                    correct_reasoning=error_analysis.get("correct_reasoning", ""),
-                    coaching_question=error_analysis.get("coaching_question", "")
-                )
-
-                db_async.add(error_record)
-                db_async.commit()
-                logger.info("Error analysis complete for attempt_id=%s, error_type=%s", attempt.id, error_analysis.get('error_type'))
-
-            except Exception as e:
-                logger.error("Error in background error analysis: %s", str(e), exc_info=True)
-                db_async.rollback()
-            finally:
-                db_async.close()
-
-        # Launch in background thread
-        thread = threading.Thread(target=analyze_error_async)
-        thread.daemon = True
-        thread.start()
-
         # Check for weakness pattern match (uses existing error history)
-        # This runs sync but is fast since it just queries existing data
+        # Error counts come from the stored learning snapshot; a cold snapshot
+        # costs one error-analysis query here, never a full rebuild
         try:
-            # Get user's most common error type from history
-            from sqlalchemy import func
-            most_common_error = db.query(
-                ErrorAnalysis.error_type,
-                func.count(ErrorAnalysis.id).label('count')
-            ).filter(
-                ErrorAnalysis.user_id == request.user_id
-            ).group_by(
-                ErrorAnalysis.error_type
-            ).order_by(
-                func.count(ErrorAnalysis.id).desc()
-            ).first()
-
-            if most_common_error and most_common_error.count >= 3:
-                # User has a pattern - check if this question's source is weak
-                intervention = get_weakness_intervention(
-                    db=db,
-                    user_id=request.user_id,
-                    error_type=most_common_error.error_type,
-                    source=question.source or "Unknown"
-                )
-                if intervention:
-                    weakness_intervention = WeaknessIntervention(
-                        triggered=intervention["triggered"],
-                        priority=intervention["priority"],
-                        message=intervention["message"],
-                        pattern_count=intervention["pattern_count"]
+            error_counts = get_error_counts(db, request.user_id)
+            if error_counts:
+                error_type, count = max(error_counts.items(), key=lambda item: item[1])
+                if count >= 3:
+                    # User has a pattern - check if this question's source is weak
+                    intervention = get_weakness_intervention(
+                        db=db,
+                        user_id=request.user_id,
+                        error_type=error_type,
+                        source=question.source or "Unknown"
                     )
+                    if intervention:
+                        weakness_intervention = WeaknessIntervention(
+                            triggered=intervention["triggered"],
+                            priority=intervention["priority"],
+                            message=intervention["message"],
+                            pattern_count=intervention["pattern_count"]
+                        )
         except Exception as e:
             logger.warning("Weakness intervention check failed: %s", e)
 
@@ -370,23 +287,12 @@ def submit_answer(
                     "distractor_explanations": {}
                 }
 
-    # Build streak info if available
+    # Streak/badge results are only known here if the side-effects ran inline
     streak_info = None
-    if streak_update:
-        streak_info = StreakInfo(
-            current_streak=streak_update.get("current_streak", 0),
-            best_streak=streak_update.get("best_streak", 0),
-            streak_increased=streak_update.get("streak_increased", False),
-            new_best=streak_update.get("new_best", False),
-            celebrations=streak_update.get("celebrations")
-        )
-
-    # Build badge awards list
     badge_awards = None
-    if newly_awarded_badges:
-        badge_awards = [
-            BadgeAward(**badge) for badge in newly_awarded_badges
-        ]
+    if effects is not None:
+        streak_info = _build_streak_info(effects.get("streak"))
+        badge_awards = _build_badge_awards(effects.get("badges_awarded"))
 
     return AnswerFeedback(
         is_correct=is_correct,
@@ -395,10 +301,69 @@ def submit_answer(
         source=question.source or "Unknown",
         weakness_intervention=weakness_intervention,
         streak=streak_info,
-        badges_awarded=badge_awards
+        badges_awarded=badge_awards,
+        attempt_id=attempt.id,
+        effects_pending=effects is None
+    )
+
+
+def _build_streak_info(streak_update: Optional[Dict[str, Any]]) -> Optional[StreakInfo]:
+    """Build streak info if available"""
+    if not streak_update:
+        return None
+    return StreakInfo(
+        current_streak=streak_update.get("current_streak", 0),
+        best_streak=streak_update.get("best_streak", 0),
+        streak_increased=streak_update.get("streak_increased", False),
+        new_best=streak_update.get("new_best", False),
+        celebrations=streak_update.get("celebrations")
+    )
+
+
+def _build_badge_awards(newly_awarded_badges: Optional[List[Dict[str, Any]]]) -> Optional[List[BadgeAward]]:
+    """Build badge awards list"""
+    if not newly_awarded_badges:
+        return None
+    return [BadgeAward(**badge) for badge in newly_awarded_badges]
+
+
+@router.get("/submit/{attempt_id}/effects", response_model=AnswerEffectsResponse)
+def get_submit_effects(
+    attempt_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Poll the deferred side-effects of an answer submission.
+
+    /submit returns `effects_pending=true` when streak and badge updates were
+    handed to the post-answer pipeline; poll here until status is "done".
+
+    SECURITY: Requires authentication. Users can only read their own attempts.
+    """
+    result = get_answer_effects(attempt_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="No pending results for this attempt")
+
+    verify_user_access(current_user, result["user_id"])
+
+    return AnswerEffectsResponse(
+        attempt_id=attempt_id,
+        status=result["status"],
+        streak=_build_streak_info(result.get("streak")),
+        badges_awarded=_build_badge_awards(result.get("badges_awarded"))
     )
 
 
+@router.get("/submit/pipeline/stats")
+def get_submit_pipeline_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Get post-answer pipeline metrics (queue depth, backpressure, batch sizes).
+
+    SECURITY: Requires admin access.
+    """
+    return get_answer_pipeline().get_stats()
+
+
 @router.get("/random", response_model=QuestionResponse)
 def get_random_question(
     specialty: Optional[str] = None,
@@ -515,7 +480,9 @@ def get_question_pool_stats(db: Session = Depends(get_db)):
             "status": detailed_stats.get("health", "unknown"),
             "total": detailed_stats.get("total", 0),
             "by_specialty": detailed_stats.get("by_specialty", {}),
-            "low_stock": detailed_stats.get("low_stock", [])
+            "low_stock": detailed_stats.get("low_stock", []),
+            "serving_index": get_pool_index().get_stats(),
+            "sampling_index": get_question_index().get_stats()
         }
     except Exception as e:
         logger.warning("Massive pool stats failed, using legacy: %s", e)
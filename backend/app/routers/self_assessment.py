@@ -16,7 +16,6 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
-import random
 
 
 class AssessmentStatus(str, Enum):
@@ -33,10 +32,18 @@ from app.models.models import (
 )
 from app.services.score_predictor import calculate_nbme_calibrated_score
 from app.dependencies.auth import get_current_user, verify_user_access
+from app.services.learning_snapshot import invalidate_learning_snapshot
+from app.services.badge_service import get_badge_service
+from app.services.peer_distribution import get_peer_distribution, get_peer_distribution_store
+from app.services.daily_activity import record_daily_activity
+from app.services.question_index import get_question_index
 
 
 router = APIRouter(prefix="/api/self-assessment", tags=["self-assessment"])
 
+# Completed assessments needed before percentiles come from real scores
+MIN_ASSESSMENT_PEERS = 30
+
 
 # =============================================================================
 # REQUEST/RESPONSE MODELS
@@ -189,53 +196,16 @@ class AssessmentResultsResponse(BaseModel):
 # HELPER FUNCTIONS
 # =============================================================================
 
-def select_assessment_questions(db: Session, count: int) -> List[str]:
-    """
-    Select questions for an assessment block.
-    Mixes different difficulty levels and sources for NBME-like distribution.
+def select_assessment_questions(db: Session, count: int, user_id: Optional[str] = None) -> List[str]:
     """
-    # Get all available questions (not rejected)
-    all_questions = db.query(Question.id, Question.difficulty_level, Question.source).filter(
-        Question.rejected == False,
-        Question.content_status == "active"
-    ).all()
-
-    if len(all_questions) < count:
-        # Fallback: use all available
-        return [q.id for q in all_questions]
-
-    # Target distribution (NBME-like)
-    # 20% easy, 50% medium, 30% hard
-    easy_count = int(count * 0.2)
-    medium_count = int(count * 0.5)
-    hard_count = count - easy_count - medium_count
-
-    easy_qs = [q.id for q in all_questions if q.difficulty_level == "easy"]
-    medium_qs = [q.id for q in all_questions if q.difficulty_level == "medium"]
-    hard_qs = [q.id for q in all_questions if q.difficulty_level == "hard"]
-    other_qs = [q.id for q in all_questions if q.difficulty_level not in ["easy", "medium", "hard"]]
-
-    selected = []
-
-    # Select from each category
-    random.shuffle(easy_qs)
-    random.shuffle(medium_qs)
-    random.shuffle(hard_qs)
-    random.shuffle(other_qs)
+    Select questions for an assessment.
 
-    selected.extend(easy_qs[:easy_count])
-    selected.extend(medium_qs[:medium_count])
-    selected.extend(hard_qs[:hard_count])
-
-    # Fill remaining with other questions
-    remaining = count - len(selected)
-    if remaining > 0:
-        filler = other_qs + easy_qs[easy_count:] + medium_qs[medium_count:] + hard_qs[hard_count:]
-        random.shuffle(filler)
-        selected.extend(filler[:remaining])
-
-    random.shuffle(selected)
-    return selected[:count]
+    Mixes difficulty levels for an NBME-like distribution (20% easy, 50%
+    medium, 30% hard), preferring questions the user has not attempted.
+    Sampled from the cached question index, so the cost does not grow
+    with the size of the question bank.
+    """
+    return get_question_index().select_assessment(db, count, user_id=user_id)
 
 
 def calculate_percentile(db: Session, percentage_score: float) -> int:
@@ -262,6 +232,11 @@ def calculate_percentile(db: Session, percentage_score: float) -> int:
     if comparison:
         return int(comparison.percentile)
 
+    # Otherwise rank against completed assessments once there are enough of them
+    peers = get_peer_distribution(db)
+    if peers.peer_count("assessment_score") >= MIN_ASSESSMENT_PEERS:
+        return peers.percentile("assessment_score", percentage_score)
+
     # Default percentile estimation if no data
     # Based on typical NBME score distribution (centered around 65%, SD ~10%)
     if percentage_score >= 90:
@@ -360,7 +335,7 @@ def create_assessment(
     total_questions = request.total_blocks * request.questions_per_block
 
     # Select questions for all blocks
-    all_question_ids = select_assessment_questions(db, total_questions)
+    all_question_ids = select_assessment_questions(db, total_questions, user_id=user_id)
 
     if len(all_question_ids) < total_questions:
         raise HTTPException(
@@ -840,6 +815,10 @@ def complete_block(
                 time_spent_seconds=answer_data.get("time_spent", 0)
             )
             db.add(attempt)
+            record_daily_activity(
+                db, user_id, q.specialty if q else None, is_correct,
+                attempt.time_spent_seconds
+            )
 
         question_results.append({
             "question_id": qid,
@@ -875,6 +854,12 @@ def complete_block(
 
     db.commit()
 
+    # Block attempts were recorded in bulk; rebuild the snapshot, badge
+    # counters and sampling history on next read
+    invalidate_learning_snapshot(user_id)
+    get_question_index().invalidate_user(user_id)
+    get_badge_service().invalidate_counters(db, user_id)
+
     return BlockResultsResponse(
         block_number=block_number,
         questions_total=len(block.question_ids),
@@ -960,6 +945,8 @@ def _finalize_assessment(db: Session, assessment: SelfAssessment):
     assessment.performance_by_system = performance_by_system
     assessment.performance_by_difficulty = performance_by_difficulty
 
+    get_peer_distribution_store().record_assessment(assessment.id, assessment.percentage_score)
+
 
 # =============================================================================
 # RESULTS ENDPOINTS
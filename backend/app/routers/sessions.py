@@ -43,7 +43,7 @@ class MessageResponse(BaseModel):
 # ==================== Session Management Endpoints ====================
 
 @router.get("/", response_model=SessionListResponse)
-async def list_sessions(
+def list_sessions(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -80,7 +80,7 @@ async def list_sessions(
 
 
 @router.delete("/{session_id}", response_model=MessageResponse)
-async def terminate_session(
+def terminate_session(
     session_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -107,7 +107,7 @@ async def terminate_session(
 
 
 @router.delete("/", response_model=MessageResponse)
-async def terminate_all_sessions(
+def terminate_all_sessions(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -137,7 +137,7 @@ async def terminate_all_sessions(
 
 
 @router.post("/cleanup", response_model=MessageResponse)
-async def cleanup_expired_sessions(
+def cleanup_expired_sessions(
     db: Session = Depends(get_db)
 ):
     """
@@ -164,7 +164,7 @@ async def cleanup_expired_sessions(
 # ==================== Session Stats (Debug) ====================
 
 @router.get("/stats")
-async def get_session_stats(
+def get_session_stats(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -91,7 +91,7 @@ class UntestedModules(BaseModel):
 # ==================== Endpoints ====================
 
 @router.post("/validate-question", response_model=ValidationResult)
-async def validate_question(
+def validate_question(
     request: QuestionValidationRequest,
     db: Session = Depends(get_db)
 ):
@@ -111,7 +111,7 @@ async def validate_question(
 
 
 @router.post("/validate-batch", response_model=BatchValidationResult)
-async def validate_batch(
+def validate_batch(
     request: BatchValidationRequest,
     db: Session = Depends(get_db)
 ):
@@ -132,7 +132,7 @@ async def validate_batch(
 
 
 @router.get("/coverage", response_model=CoverageReport)
-async def get_coverage():
+def get_coverage():
     """
     Get test coverage report.
 
@@ -151,7 +151,7 @@ async def get_coverage():
 
 
 @router.get("/quality-overview", response_model=QualityOverview)
-async def get_quality_overview(db: Session = Depends(get_db)):
+def get_quality_overview(db: Session = Depends(get_db)):
     """
     Get an overview of question quality across the database.
 
@@ -165,7 +165,7 @@ async def get_quality_overview(db: Session = Depends(get_db)):
 
 
 @router.get("/untested", response_model=UntestedModules)
-async def get_untested_modules(db: Session = Depends(get_db)):
+def get_untested_modules(db: Session = Depends(get_db)):
     """
     List modules that don't have corresponding test files.
 
@@ -178,7 +178,7 @@ async def get_untested_modules(db: Session = Depends(get_db)):
 
 
 @router.post("/run-suite", response_model=TestSuiteResult)
-async def run_test_suite(
+def run_test_suite(
     request: RunTestsRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -198,7 +198,7 @@ async def run_test_suite(
 
 
 @router.get("/report")
-async def get_full_qa_report(db: Session = Depends(get_db)):
+def get_full_qa_report(db: Session = Depends(get_db)):
     """
     Get a comprehensive QA report.
 
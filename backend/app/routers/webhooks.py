@@ -21,7 +21,7 @@ from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.services.stripe_service import (
     handle_checkout_completed,
     sync_subscription_from_stripe,
@@ -72,6 +72,13 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
     logger.info("Processing Stripe webhook: event_type=%s", event_type)
 
+    await run_db(_process_stripe_event, db, event_type, data_object)
+
+    return {"status": "success", "event_type": event_type}
+
+
+def _process_stripe_event(db: Session, event_type: str, data_object: dict) -> None:
+    """Sync local subscription state from a verified event (runs off the event loop)."""
     try:
         if event_type == "checkout.session.completed":
             # New subscription via checkout
@@ -113,5 +120,3 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
         logger.error("Webhook processing error for event_type=%s: %s", event_type, str(e), exc_info=True)
         # Don't raise - let Stripe think it succeeded to prevent infinite retries
         # Error is captured by Sentry via exc_info=True
-
-    return {"status": "success", "event_type": event_type}
@@ -30,6 +30,7 @@ from app.services.question_validators import (
     check_vague_terms,
     check_testwiseness,
     check_distractor_quality,
+    validate_many,
 )
 
 # IRT Calibration (Issue #9)
@@ -67,6 +68,7 @@ __all__ = [
     "check_vague_terms",
     "check_testwiseness",
     "check_distractor_quality",
+    "validate_many",
     # IRT
     "IRTCalibrator",
     "IRTParameters",
@@ -13,11 +13,11 @@ import logging
 import random
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, Integer
 
 logger = logging.getLogger(__name__)
 from app.models.models import Question, QuestionAttempt
 from app.services.question_generator import generate_and_save_question
+from app.services.learning_snapshot import get_learning_snapshot
 
 
 def get_user_difficulty_target(db: Session, user_id: str) -> Dict:
@@ -43,15 +43,9 @@ def get_user_difficulty_target(db: Session, user_id: str) -> Dict:
     - New users (< 10 questions): Default to medium
     """
     # Get user's overall accuracy
-    attempts = db.query(
-        func.count(QuestionAttempt.id).label('total'),
-        func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-    ).filter(
-        QuestionAttempt.user_id == user_id
-    ).first()
-
-    total = attempts.total or 0
-    correct = attempts.correct or 0
+    snapshot = get_learning_snapshot(db, user_id)
+    total = snapshot.total
+    correct = snapshot.correct
 
     # Default for new users
     if total < 10:
@@ -103,27 +97,7 @@ def get_weak_areas(db: Session, user_id: str, threshold: float = 0.6) -> List[st
     Identify sources where user has < 60% accuracy
     Returns list of source names
     """
-    # Get all attempts with their questions
-    attempts_by_source = db.query(
-        Question.source,
-        func.count(QuestionAttempt.id).label('total'),
-        func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-    ).join(
-        QuestionAttempt, Question.id == QuestionAttempt.question_id
-    ).filter(
-        QuestionAttempt.user_id == user_id
-    ).group_by(
-        Question.source
-    ).all()
-
-    weak_sources = []
-    for source, total, correct in attempts_by_source:
-        if total > 0:
-            accuracy = (correct or 0) / total
-            if accuracy < threshold:
-                weak_sources.append(source)
-
-    return weak_sources
+    return get_learning_snapshot(db, user_id).weak_sources(threshold)
 
 
 def get_unanswered_questions(
@@ -277,28 +251,7 @@ def get_performance_by_source(db: Session, user_id: str) -> Dict[str, Dict]:
     Get accuracy breakdown by source
     Returns dict of {source: {total, correct, accuracy}}
     """
-    results = db.query(
-        Question.source,
-        func.count(QuestionAttempt.id).label('total'),
-        func.sum(func.cast(QuestionAttempt.is_correct, Integer)).label('correct')
-    ).join(
-        QuestionAttempt, Question.id == QuestionAttempt.question_id
-    ).filter(
-        QuestionAttempt.user_id == user_id
-    ).group_by(
-        Question.source
-    ).all()
-
-    performance = {}
-    for source, total, correct in results:
-        accuracy = (correct or 0) / total if total > 0 else 0.0
-        performance[source] = {
-            'total': total,
-            'correct': correct or 0,
-            'accuracy': round(accuracy, 3)
-        }
-
-    return performance
+    return get_learning_snapshot(db, user_id).performance_by_source()
 
 
 def get_user_weakness_profile(db: Session, user_id: str) -> Dict:
@@ -368,17 +321,7 @@ def get_user_weakness_profile(db: Session, user_id: str) -> Dict:
     profile["weak_specialties"].sort(key=lambda x: x['accuracy'])
 
     # 2. Get error patterns from error_analyses
-    error_counts = db.query(
-        ErrorAnalysis.error_type,
-        func.count(ErrorAnalysis.id).label('count')
-    ).filter(
-        ErrorAnalysis.user_id == user_id
-    ).group_by(
-        ErrorAnalysis.error_type
-    ).all()
-
-    for error_type, count in error_counts:
-        profile["error_patterns"][error_type] = count
+    profile["error_patterns"] = dict(get_learning_snapshot(db, user_id).error_counts)
 
     if profile["error_patterns"]:
         profile["most_common_error"] = max(
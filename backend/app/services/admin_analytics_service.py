@@ -12,11 +12,12 @@ Includes:
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, and_, Integer, cast
+from sqlalchemy import func, distinct, and_, Integer, cast, case
 
 from app.models.models import (
     User, QuestionAttempt, DailyUsage, StudySession, UserSession,
-    DailyPlatformMetrics, UserEngagementScore, CohortRetention, ChatMessage
+    DailyPlatformMetrics, UserEngagementScore, CohortRetention, ChatMessage,
+    generate_uuid
 )
 
 
@@ -295,14 +296,17 @@ def calculate_cohort_retention(db: Session, weeks_back: int = 12) -> List[Dict]:
 def get_user_health_distribution(db: Session) -> Dict[str, Any]:
     """Get distribution of user engagement health."""
     # First check if we have pre-computed scores
-    scores = db.query(UserEngagementScore).all()
+    status_counts = db.query(
+        UserEngagementScore.engagement_status,
+        func.count(UserEngagementScore.id)
+    ).group_by(UserEngagementScore.engagement_status).all()
 
-    if scores:
+    if status_counts:
         # Use pre-computed scores
         distribution = {"active": 0, "at_risk": 0, "churned": 0, "new": 0}
-        for score in scores:
-            status = score.engagement_status or "new"
-            distribution[status] = distribution.get(status, 0) + 1
+        for status, count in status_counts:
+            status = status or "new"
+            distribution[status] = distribution.get(status, 0) + count
     else:
         # Calculate on the fly
         distribution = _calculate_health_distribution(db)
@@ -317,39 +321,84 @@ def get_user_health_distribution(db: Session) -> Dict[str, Any]:
 
 
 def _calculate_health_distribution(db: Session) -> Dict[str, int]:
-    """Calculate health distribution from scratch."""
+    """Calculate health distribution from scratch (one grouped attempts query)."""
     now = datetime.utcnow()
     distribution = {"active": 0, "at_risk": 0, "churned": 0, "new": 0}
 
-    users = db.query(User).all()
+    activity = _attempt_activity(db, now)
+    for stats in activity.values():
+        distribution[_classify_engagement(stats, now)] += 1
 
-    for user in users:
-        status = _classify_user_engagement(db, user.id, now)
-        distribution[status] += 1
+    # Users without attempts are "new"
+    total_users = db.query(func.count(User.id)).scalar() or 0
+    distribution["new"] = max(0, total_users - len(activity))
 
     return distribution
 
 
-def _classify_user_engagement(db: Session, user_id: str, now: datetime) -> str:
-    """Classify a single user's engagement status."""
-    # Get last activity
-    last_attempt = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == user_id
-    ).order_by(QuestionAttempt.attempted_at.desc()).first()
+def _attempt_activity(
+    db: Session,
+    now: datetime,
+    user_ids: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    First/last attempt and 7/30-day attempt counts for every user with attempts.
+
+    One GROUP BY over question_attempts; pass user_ids to restrict it.
+    """
+    query = db.query(
+        QuestionAttempt.user_id,
+        func.min(QuestionAttempt.attempted_at),
+        func.max(QuestionAttempt.attempted_at),
+        func.sum(case((QuestionAttempt.attempted_at >= now - timedelta(days=7), 1), else_=0)),
+        func.sum(case((QuestionAttempt.attempted_at >= now - timedelta(days=30), 1), else_=0))
+    )
+    if user_ids is not None:
+        query = query.filter(QuestionAttempt.user_id.in_(user_ids))
 
-    if not last_attempt:
-        return "new"
+    return {
+        user_id: {
+            "first_activity_at": first_at,
+            "last_activity_at": last_at,
+            "questions_7d": int(questions_7d or 0),
+            "questions_30d": int(questions_30d or 0)
+        }
+        for user_id, first_at, last_at, questions_7d, questions_30d
+        in query.group_by(QuestionAttempt.user_id)
+    }
 
-    days_since_last = (now - last_attempt.attempted_at).days
 
-    # Count questions in last 7 days
-    questions_7d = db.query(func.count(QuestionAttempt.id)).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.attempted_at >= now - timedelta(days=7)
-    ).scalar() or 0
+def _session_activity(
+    db: Session,
+    now: datetime,
+    user_ids: Optional[List[str]] = None
+) -> Dict[str, tuple]:
+    """(sessions in last 7 days, sessions in last 30 days) per user, in one GROUP BY."""
+    query = db.query(
+        StudySession.user_id,
+        func.sum(case((StudySession.started_at >= now - timedelta(days=7), 1), else_=0)),
+        func.count(StudySession.id)
+    ).filter(
+        StudySession.started_at >= now - timedelta(days=30)
+    )
+    if user_ids is not None:
+        query = query.filter(StudySession.user_id.in_(user_ids))
+
+    return {
+        user_id: (int(sessions_7d or 0), int(sessions_30d or 0))
+        for user_id, sessions_7d, sessions_30d in query.group_by(StudySession.user_id)
+    }
+
+
+def _classify_engagement(stats: Optional[Dict[str, Any]], now: datetime) -> str:
+    """Classify a user's engagement status from their attempt activity."""
+    if not stats:
+        return "new"
+
+    days_since_last = (now - stats["last_activity_at"]).days
 
     # Classification logic
-    if days_since_last <= 3 and questions_7d >= 5:
+    if days_since_last <= 3 and stats["questions_7d"] >= 5:
         return "active"
     elif days_since_last <= 7:
         return "active"
@@ -359,52 +408,122 @@ def _classify_user_engagement(db: Session, user_id: str, now: datetime) -> str:
         return "churned"
 
 
+def _score_engagement(
+    stats: Optional[Dict[str, Any]],
+    sessions: tuple,
+    now: datetime
+) -> Dict[str, Any]:
+    """Engagement status, score and churn risk from pre-aggregated activity."""
+    questions_7d = stats["questions_7d"] if stats else 0
+    questions_30d = stats["questions_30d"] if stats else 0
+    sessions_7d, sessions_30d = sessions
+
+    days_since_last = None
+    if stats:
+        days_since_last = (now - stats["last_activity_at"]).days
+
+    # Calculate engagement status and score
+    status = _classify_engagement(stats, now)
+    if status == "new":
+        score = 0
+    elif status == "active" and days_since_last <= 3 and questions_7d >= 5:
+        score = 80 + min(questions_7d, 20)
+    elif status == "active":
+        score = 60 + min(questions_7d * 2, 20)
+    elif status == "at_risk":
+        score = 30 + min(questions_30d, 20)
+    else:
+        score = max(0, 30 - days_since_last)
+
+    # Churn risk factors
+    risk_factors = []
+    if days_since_last and days_since_last > 5:
+        risk_factors.append(f"no_activity_{days_since_last}_days")
+    if questions_7d < 3:
+        risk_factors.append("low_weekly_activity")
+    if sessions_7d == 0:
+        risk_factors.append("no_sessions_this_week")
+
+    return {
+        "engagement_status": status,
+        "engagement_score": min(100, score),
+        "questions_last_7_days": questions_7d,
+        "questions_last_30_days": questions_30d,
+        "sessions_last_7_days": sessions_7d,
+        "sessions_last_30_days": sessions_30d,
+        "days_since_last_activity": days_since_last,
+        "first_activity_at": stats["first_activity_at"] if stats else None,
+        "last_activity_at": stats["last_activity_at"] if stats else None,
+        "churn_risk_score": round(1.0 - (score / 100), 2),
+        "churn_risk_factors": risk_factors
+    }
+
+
 def get_users_at_risk(db: Session, limit: int = 50) -> List[Dict[str, Any]]:
     """Get list of at-risk users for outreach."""
     now = datetime.utcnow()
 
-    # Check pre-computed scores first
-    at_risk_scores = db.query(UserEngagementScore).filter(
+    # Check pre-computed scores first (users joined in the same query)
+    at_risk_scores = db.query(UserEngagementScore, User).join(
+        User, User.id == UserEngagementScore.user_id
+    ).filter(
         UserEngagementScore.engagement_status == "at_risk"
     ).order_by(UserEngagementScore.churn_risk_score.desc()).limit(limit).all()
 
     if at_risk_scores:
-        result = []
-        for score in at_risk_scores:
-            user = db.query(User).filter(User.id == score.user_id).first()
-            if user:
-                result.append({
-                    "user_id": user.id,
-                    "email": user.email,
-                    "full_name": user.full_name,
-                    "days_since_activity": score.days_since_last_activity,
-                    "questions_last_7_days": score.questions_last_7_days,
-                    "churn_risk_score": score.churn_risk_score,
-                    "risk_factors": score.churn_risk_factors or []
-                })
-        return result
+        return [
+            {
+                "user_id": user.id,
+                "email": user.email,
+                "full_name": user.full_name,
+                "days_since_activity": score.days_since_last_activity,
+                "questions_last_7_days": score.questions_last_7_days,
+                "churn_risk_score": score.churn_risk_score,
+                "risk_factors": score.churn_risk_factors or []
+            }
+            for score, user in at_risk_scores
+        ]
 
     # Calculate on the fly
-    users = db.query(User).all()
+    activity = _attempt_activity(db, now)
+    at_risk_ids = [
+        user_id for user_id, stats in activity.items()
+        if _classify_engagement(stats, now) == "at_risk"
+    ]
+    if not at_risk_ids:
+        return []
+
+    sessions = _session_activity(db, now, at_risk_ids)
     at_risk = []
+    for user_id in at_risk_ids:
+        engagement = _score_engagement(activity[user_id], sessions.get(user_id, (0, 0)), now)
+        at_risk.append({
+            "user_id": user_id,
+            "days_since_activity": engagement["days_since_last_activity"],
+            "questions_last_7_days": engagement["questions_last_7_days"],
+            "churn_risk_score": engagement["churn_risk_score"],
+            "risk_factors": engagement["churn_risk_factors"]
+        })
 
-    for user in users:
-        status = _classify_user_engagement(db, user.id, now)
-        if status == "at_risk":
-            engagement = calculate_user_engagement_score(db, user.id)
-            at_risk.append({
+    # Sort by risk score and limit, then fetch the users in one query
+    at_risk.sort(key=lambda x: x.get("churn_risk_score", 0), reverse=True)
+    at_risk = at_risk[:limit]
+    users = {
+        user.id: user for user in
+        db.query(User).filter(User.id.in_([entry["user_id"] for entry in at_risk]))
+    }
+
+    result = []
+    for entry in at_risk:
+        user = users.get(entry["user_id"])
+        if user:
+            result.append({
                 "user_id": user.id,
                 "email": user.email,
                 "full_name": user.full_name,
-                "days_since_activity": engagement.get("days_since_last_activity"),
-                "questions_last_7_days": engagement.get("questions_last_7_days", 0),
-                "churn_risk_score": engagement.get("churn_risk_score", 0.5),
-                "risk_factors": engagement.get("churn_risk_factors", [])
+                **{k: v for k, v in entry.items() if k != "user_id"}
             })
-
-    # Sort by risk score and limit
-    at_risk.sort(key=lambda x: x.get("churn_risk_score", 0), reverse=True)
-    return at_risk[:limit]
+    return result
 
 
 def calculate_user_engagement_score(db: Session, user_id: str) -> Dict[str, Any]:
@@ -416,81 +535,17 @@ def calculate_user_engagement_score(db: Session, user_id: str) -> Dict[str, Any]
     if not user:
         return {"error": "User not found"}
 
-    # Activity counts
-    questions_7d = db.query(func.count(QuestionAttempt.id)).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.attempted_at >= now - timedelta(days=7)
-    ).scalar() or 0
-
-    questions_30d = db.query(func.count(QuestionAttempt.id)).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.attempted_at >= now - timedelta(days=30)
-    ).scalar() or 0
-
-    sessions_7d = db.query(func.count(StudySession.id)).filter(
-        StudySession.user_id == user_id,
-        StudySession.started_at >= now - timedelta(days=7)
-    ).scalar() or 0
-
-    sessions_30d = db.query(func.count(StudySession.id)).filter(
-        StudySession.user_id == user_id,
-        StudySession.started_at >= now - timedelta(days=30)
-    ).scalar() or 0
-
-    # Last activity
-    last_attempt = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == user_id
-    ).order_by(QuestionAttempt.attempted_at.desc()).first()
-
-    first_attempt = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == user_id
-    ).order_by(QuestionAttempt.attempted_at.asc()).first()
-
-    days_since_last = None
-    if last_attempt:
-        days_since_last = (now - last_attempt.attempted_at).days
-
-    # Calculate engagement status and score
-    if days_since_last is None:
-        status = "new"
-        score = 0
-    elif days_since_last <= 3 and questions_7d >= 5:
-        status = "active"
-        score = 80 + min(questions_7d, 20)
-    elif days_since_last <= 7:
-        status = "active"
-        score = 60 + min(questions_7d * 2, 20)
-    elif days_since_last <= 14:
-        status = "at_risk"
-        score = 30 + min(questions_30d, 20)
-    else:
-        status = "churned"
-        score = max(0, 30 - days_since_last)
-
-    # Churn risk factors
-    risk_factors = []
-    if days_since_last and days_since_last > 5:
-        risk_factors.append(f"no_activity_{days_since_last}_days")
-    if questions_7d < 3:
-        risk_factors.append("low_weekly_activity")
-    if sessions_7d == 0:
-        risk_factors.append("no_sessions_this_week")
+    stats = _attempt_activity(db, now, [user_id]).get(user_id)
+    sessions = _session_activity(db, now, [user_id]).get(user_id, (0, 0))
+    engagement = _score_engagement(stats, sessions, now)
 
     return {
         "user_id": user_id,
         "email": user.email,
         "full_name": user.full_name,
-        "engagement_status": status,
-        "engagement_score": min(100, score),
-        "questions_last_7_days": questions_7d,
-        "questions_last_30_days": questions_30d,
-        "sessions_last_7_days": sessions_7d,
-        "sessions_last_30_days": sessions_30d,
-        "days_since_last_activity": days_since_last,
-        "first_activity_at": first_attempt.attempted_at.isoformat() if first_attempt else None,
-        "last_activity_at": last_attempt.attempted_at.isoformat() if last_attempt else None,
-        "churn_risk_score": round(1.0 - (score / 100), 2),
-        "churn_risk_factors": risk_factors
+        **engagement,
+        "first_activity_at": stats["first_activity_at"].isoformat() if stats else None,
+        "last_activity_at": stats["last_activity_at"].isoformat() if stats else None
     }
 
 
@@ -575,56 +630,47 @@ def run_daily_metrics_batch(db: Session) -> Dict[str, Any]:
     }
 
 
-def run_user_engagement_batch(db: Session) -> Dict[str, Any]:
-    """Batch update all user engagement scores."""
-    users = db.query(User).all()
-    updated = 0
+def run_user_engagement_batch(db: Session, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Batch update all user engagement scores.
+
+    Activity comes from two grouped queries (attempts, sessions) for every
+    user at once; scores are written with bulk update/insert mappings.
+    """
     now = datetime.utcnow()
+    activity = _attempt_activity(db, now)
+    sessions = _session_activity(db, now)
+    existing = dict(db.query(UserEngagementScore.user_id, UserEngagementScore.id))
 
-    for user in users:
-        engagement = calculate_user_engagement_score(db, user.id)
+    updates: List[Dict[str, Any]] = []
+    inserts: List[Dict[str, Any]] = []
+    updated = 0
 
-        if "error" in engagement:
-            continue
+    for (user_id,) in db.query(User.id).yield_per(batch_size):
+        row = _score_engagement(activity.get(user_id), sessions.get(user_id, (0, 0)), now)
+        row["user_id"] = user_id
+        row["calculated_at"] = now
 
-        # Upsert engagement score
-        existing = db.query(UserEngagementScore).filter(
-            UserEngagementScore.user_id == user.id
-        ).first()
-
-        if existing:
-            existing.engagement_status = engagement["engagement_status"]
-            existing.engagement_score = engagement["engagement_score"]
-            existing.questions_last_7_days = engagement["questions_last_7_days"]
-            existing.questions_last_30_days = engagement["questions_last_30_days"]
-            existing.sessions_last_7_days = engagement["sessions_last_7_days"]
-            existing.sessions_last_30_days = engagement["sessions_last_30_days"]
-            existing.days_since_last_activity = engagement["days_since_last_activity"]
-            existing.churn_risk_score = engagement["churn_risk_score"]
-            existing.churn_risk_factors = engagement["churn_risk_factors"]
-            existing.first_activity_at = datetime.fromisoformat(engagement["first_activity_at"]) if engagement["first_activity_at"] else None
-            existing.last_activity_at = datetime.fromisoformat(engagement["last_activity_at"]) if engagement["last_activity_at"] else None
-            existing.calculated_at = now
+        if user_id in existing:
+            row["id"] = existing[user_id]
+            updates.append(row)
         else:
-            score = UserEngagementScore(
-                user_id=user.id,
-                engagement_status=engagement["engagement_status"],
-                engagement_score=engagement["engagement_score"],
-                questions_last_7_days=engagement["questions_last_7_days"],
-                questions_last_30_days=engagement["questions_last_30_days"],
-                sessions_last_7_days=engagement["sessions_last_7_days"],
-                sessions_last_30_days=engagement["sessions_last_30_days"],
-                days_since_last_activity=engagement["days_since_last_activity"],
-                churn_risk_score=engagement["churn_risk_score"],
-                churn_risk_factors=engagement["churn_risk_factors"],
-                first_activity_at=datetime.fromisoformat(engagement["first_activity_at"]) if engagement["first_activity_at"] else None,
-                last_activity_at=datetime.fromisoformat(engagement["last_activity_at"]) if engagement["last_activity_at"] else None,
-                calculated_at=now
-            )
-            db.add(score)
-
+            row["id"] = generate_uuid()
+            inserts.append(row)
         updated += 1
 
+        if len(updates) >= batch_size:
+            db.bulk_update_mappings(UserEngagementScore, updates)
+            updates = []
+        if len(inserts) >= batch_size:
+            db.bulk_insert_mappings(UserEngagementScore, inserts)
+            inserts = []
+
+    if updates:
+        db.bulk_update_mappings(UserEngagementScore, updates)
+    if inserts:
+        db.bulk_insert_mappings(UserEngagementScore, inserts)
+
     db.commit()
 
     # Get distribution summary
@@ -18,6 +18,7 @@ from collections import defaultdict
 from app.models.models import (
     QuestionAttempt, Question, User, ErrorAnalysis, UserPerformance
 )
+from app.services.daily_activity import get_current_streak, get_daily_activity
 
 
 def get_performance_trends(db: Session, user_id: str, days: int = 30, specialty: Optional[str] = None) -> Dict[str, Any]:
@@ -37,42 +38,22 @@ def get_performance_trends(db: Session, user_id: str, days: int = 30, specialty:
     """
     start_date = datetime.utcnow() - timedelta(days=days)
 
-    # Build base query for daily aggregated data
-    base_query = db.query(
-        func.date(QuestionAttempt.attempted_at).label('date'),
-        func.count(QuestionAttempt.id).label('questions_answered'),
-        func.sum(cast(QuestionAttempt.is_correct, Integer)).label('correct'),
-        func.avg(QuestionAttempt.time_spent_seconds).label('avg_time')
-    ).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.attempted_at >= start_date
-    )
-
-    # Add specialty filter if provided
-    if specialty:
-        base_query = base_query.join(
-            Question, QuestionAttempt.question_id == Question.id
-        ).filter(Question.specialty == specialty)
-
-    daily_stats = base_query.group_by(
-        func.date(QuestionAttempt.attempted_at)
-    ).order_by(
-        func.date(QuestionAttempt.attempted_at)
-    ).all()
+    # Daily aggregates come from the per-user daily rollup
+    daily_stats = get_daily_activity(db, user_id, start_day=start_date.date(), specialty=specialty)
 
     daily_data = []
     for stat in daily_stats:
-        accuracy = (stat.correct or 0) / stat.questions_answered if stat.questions_answered > 0 else 0
+        accuracy = stat.accuracy
         # Simplified score calculation for daily trend
         predicted_score = int(194 + (accuracy - 0.6) * 265) if accuracy > 0 else None
         predicted_score = max(194, min(300, predicted_score)) if predicted_score else None
 
         daily_data.append({
-            "date": str(stat.date),
+            "date": str(stat.day),
             "questions_answered": stat.questions_answered,
-            "correct": stat.correct or 0,
+            "correct": stat.questions_correct,
             "accuracy": round(accuracy * 100, 1),
-            "avg_time_seconds": round(stat.avg_time or 0, 1),
+            "avg_time_seconds": round(stat.avg_time_seconds, 1),
             "predicted_score": predicted_score
         })
 
@@ -643,33 +624,7 @@ def get_dashboard_data(db: Session, user_id: str, specialty: Optional[str] = Non
 
 def _calculate_streak(db: Session, user_id: str) -> int:
     """Calculate current study streak (consecutive days)."""
-    attempts = db.query(
-        func.date(QuestionAttempt.attempted_at).label('date')
-    ).filter(
-        QuestionAttempt.user_id == user_id
-    ).distinct().order_by(
-        func.date(QuestionAttempt.attempted_at).desc()
-    ).all()
-
-    if not attempts:
-        return 0
-
-    dates = [datetime.strptime(str(a.date), '%Y-%m-%d').date() for a in attempts]
-    today = datetime.now().date()
-    yesterday = today - timedelta(days=1)
-
-    if dates[0] not in [today, yesterday]:
-        return 0
-
-    streak = 1
-    for i in range(1, len(dates)):
-        expected_date = dates[i-1] - timedelta(days=1)
-        if dates[i] == expected_date:
-            streak += 1
-        else:
-            break
-
-    return streak
+    return get_current_streak(db, user_id)
 
 
 def calculate_readiness(db: Session, user_id: str, specialty: str) -> Dict[str, Any]:
@@ -0,0 +1,569 @@
+"""
+Post-Answer Pipeline
+
+Moves the side-effects of /questions/submit off the request path. The
+request commits the attempt, grades it and returns; an AnswerEvent is
+queued here and a small pool of worker threads applies the rest:
+
+- streak update
+- daily prediction snapshot
+- badge sweep
+- per-specialty difficulty
+- personalized review scheduling (basic spaced repetition fallback),
+  done once per batch with schedule_answer_reviews
+- concept retention (up to 5 concepts)
+
+Events are sharded by user: each worker owns one queue, and a user's
+events always hash to the same queue, so they are applied one at a time
+and in submit order. The streak update and the specialty difficulty
+read-modify-write therefore never race with another event for the same
+user.
+
+Workers drain their queue in batches and apply each batch inside ONE
+database transaction: every handler's own commit() only releases a
+SAVEPOINT, and a failing event rolls back to its savepoint without
+affecting the rest of the batch. On SQLite the batch opens with BEGIN
+IMMEDIATE and runs on a single worker, since there is only one writer.
+
+Error analysis for wrong answers is an LLM call, so it runs on a separate
+bounded executor instead of a raw thread per answer.
+
+Backpressure: the queues are bounded. When the user's queue is full the
+caller runs the side-effects inline on its own session (so nothing is
+dropped) and the event counts as `inline` in the stats. The inline run
+holds the shard's lock, which the shard's worker also holds while it
+applies a batch, so it still cannot overlap another event for that user. Streak/badge results are stored
+per attempt and can be fetched with GET /api/questions/submit/{attempt_id}/effects.
+
+Configuration (env):
+    POST_ANSWER_PIPELINE_ENABLED      default "true"; "false" runs everything inline
+    POST_ANSWER_WORKERS               worker threads (default 2; always 1 on SQLite)
+    POST_ANSWER_QUEUE_SIZE            bounded capacity, split across the worker queues (default 1000)
+    POST_ANSWER_BATCH_SIZE            max events per transaction (default 25)
+    POST_ANSWER_BATCH_WAIT_MS         how long a worker waits to fill a batch (default 20)
+    POST_ANSWER_ANALYSIS_WORKERS      error-analysis threads (default 2)
+    POST_ANSWER_ANALYSIS_MAX_PENDING  queued analyses before new ones are skipped (default 200)
+    POST_ANSWER_RESULT_TTL_SECONDS    how long poll results are kept (default 600)
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models.models import ErrorAnalysis
+from app.utils.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_ENABLED = os.getenv("POST_ANSWER_PIPELINE_ENABLED", "true").lower() == "true"
+WORKER_COUNT = int(os.getenv("POST_ANSWER_WORKERS", "2"))
+QUEUE_SIZE = int(os.getenv("POST_ANSWER_QUEUE_SIZE", "1000"))
+BATCH_SIZE = int(os.getenv("POST_ANSWER_BATCH_SIZE", "25"))
+BATCH_WAIT_MS = int(os.getenv("POST_ANSWER_BATCH_WAIT_MS", "20"))
+ANALYSIS_WORKERS = int(os.getenv("POST_ANSWER_ANALYSIS_WORKERS", "2"))
+ANALYSIS_MAX_PENDING = int(os.getenv("POST_ANSWER_ANALYSIS_MAX_PENDING", "200"))
+RESULT_TTL_SECONDS = int(os.getenv("POST_ANSWER_RESULT_TTL_SECONDS", "600"))
+
+CACHE_PREFIX = "post_answer"
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class AnswerEvent:
+    """Everything the post-answer side-effects need, captured at submit time."""
+
+    attempt_id: str
+    user_id: str
+    question_id: str
+    is_correct: bool
+    user_answer: str
+    source: Optional[str] = None
+    specialty: Optional[str] = None
+    confidence_level: Optional[int] = None
+    time_spent_seconds: Optional[int] = None
+    concepts: List[str] = field(default_factory=list)
+    attempted_at: Optional[datetime] = None
+    # Only needed for error analysis of wrong answers
+    vignette: Optional[str] = None
+    answer_key: Optional[str] = None
+    choices: Optional[List[str]] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+def _result_key(attempt_id: str) -> str:
+    return f"{CACHE_PREFIX}:{attempt_id}"
+
+
+def _store_result(event: AnswerEvent, status: str, effects: Optional[Dict[str, Any]] = None):
+    effects = effects or {}
+    cache.set(_result_key(event.attempt_id), {
+        "attempt_id": event.attempt_id,
+        "user_id": event.user_id,
+        "status": status,
+        "streak": effects.get("streak"),
+        "badges_awarded": effects.get("badges_awarded") or [],
+    }, RESULT_TTL_SECONDS)
+
+
+def get_answer_effects(attempt_id: str) -> Optional[Dict[str, Any]]:
+    """Poll the side-effect results for an attempt (None if unknown or expired)."""
+    return cache.get(_result_key(attempt_id))
+
+
+def schedule_answer_reviews(db: Session, events: List[AnswerEvent]):
+    """
+    Schedule reviews for answered questions in one transaction.
+
+    Uses personalized scheduling, falling back to basic spaced repetition
+    for the whole batch if that fails.
+    """
+    from app.services.learning_engine import schedule_personalized_reviews
+    from app.services.spaced_repetition import ReviewEvent, schedule_reviews
+
+    review_events = [
+        ReviewEvent(
+            user_id=event.user_id,
+            question_id=event.question_id,
+            is_correct=event.is_correct,
+            source=event.source,
+            specialty=event.specialty,
+            time_seconds=event.time_spent_seconds or 0,
+            confidence_level=event.confidence_level
+        )
+        for event in events
+    ]
+    if not review_events:
+        return
+
+    try:
+        schedule_personalized_reviews(db, review_events)
+    except Exception as e:
+        logger.warning("Personalized review scheduling failed: %s", e)
+        db.rollback()
+        # Fallback to basic spaced repetition
+        schedule_reviews(db, review_events)
+
+
+def apply_answer_effects(db: Session, event: AnswerEvent, schedule_review: bool = True) -> Dict[str, Any]:
+    """
+    Run the post-answer side-effects for one event on the given session.
+
+    Each step is isolated the same way submit_answer always handled them:
+    a failing step is logged and the rest still run. Batches pass
+    schedule_review=False and schedule all their reviews together.
+
+    Returns:
+        {"streak": dict or None, "badges_awarded": list of badge dicts}
+    """
+    from app.services.streak_service import get_streak_service
+    from app.services.badge_service import get_badge_service
+    from app.services.score_predictor import save_daily_prediction_snapshot
+    from app.services.learning_engine import update_specialty_difficulty, update_concept_retention
+
+    # === STREAK TRACKING ===
+    streak_update = None
+    try:
+        streak_update = get_streak_service().update_streak_on_activity(db, event.user_id)
+    except Exception as e:
+        logger.warning("Streak update failed: %s", e)
+
+    # === DAILY PREDICTION SNAPSHOT ===
+    try:
+        save_daily_prediction_snapshot(db, event.user_id)
+    except Exception as e:
+        logger.warning("Daily prediction snapshot failed: %s", e)
+
+    # === BADGE CHECKING ===
+    newly_awarded_badges = []
+    try:
+        newly_awarded_badges = get_badge_service().check_and_award_badges(
+            db,
+            event.user_id,
+            trigger_context={
+                "question_answered": True,
+                "is_correct": event.is_correct,
+                "attempted_at": event.attempted_at,
+                "streak_current": streak_update.get("current_streak") if streak_update else None
+            }
+        )
+    except Exception as e:
+        logger.warning("Badge check failed: %s", e)
+
+    # === ADVANCED LEARNING ENGINE INTEGRATION ===
+    # Gap 1: Update per-specialty difficulty
+    if event.specialty:
+        try:
+            update_specialty_difficulty(db, event.user_id, event.specialty, event.is_correct)
+        except Exception as e:
+            logger.warning("Specialty difficulty update failed: %s", e)
+
+    # Gap 2: Schedule personalized review (replaces basic spaced repetition)
+    if schedule_review:
+        schedule_answer_reviews(db, [event])
+
+    # Gap 4: Update concept retention (if question has concepts/topics)
+    if event.concepts:
+        try:
+            for concept in event.concepts[:5]:  # Limit to 5 concepts
+                update_concept_retention(
+                    db=db,
+                    user_id=event.user_id,
+                    concept=concept,
+                    is_correct=event.is_correct,
+                    specialty=event.specialty,
+                    question_id=event.question_id
+                )
+        except Exception as e:
+            logger.warning("Concept retention update failed: %s", e)
+
+    return {"streak": streak_update, "badges_awarded": newly_awarded_badges}
+
+
+def analyze_answer_error(event: AnswerEvent):
+    """Categorize a wrong answer with the LLM and store the ErrorAnalysis."""
+    from app.services.error_categorization import categorize_error
+    from app.services.learning_snapshot import record_error_in_snapshot
+
+    db = SessionLocal()
+    try:
+        error_analysis = categorize_error(
+            question_text=event.vignette,
+            correct_answer=event.answer_key,
+            user_answer=event.user_answer,
+            choices=event.choices,
+            time_spent=event.time_spent_seconds
+        )
+
+        error_record = ErrorAnalysis(
+            attempt_id=event.attempt_id,
+            user_id=event.user_id,
+            question_id=event.question_id,
+            error_type=error_analysis.get("error_type", "knowledge_gap"),
+            confidence=error_analysis.get("confidence", 0.5),
+            explanation=error_analysis.get("explanation", ""),
+            missed_detail=error_analysis.get("missed_detail", ""),
+            correct_reasoning=error_analysis.get("correct_reasoning", ""),
+            coaching_question=error_analysis.get("coaching_question", "")
+        )
+
+        db.add(error_record)
+        db.commit()
+        record_error_in_snapshot(event.user_id, error_record.error_type)
+        logger.info("Error analysis complete for attempt_id=%s, error_type=%s", event.attempt_id, error_record.error_type)
+
+    except Exception as e:
+        logger.error("Error in background error analysis: %s", str(e), exc_info=True)
+        db.rollback()
+    finally:
+        db.close()
+
+
+class PostAnswerPipeline:
+    """
+    Bounded queue + worker pool for post-answer side-effects.
+
+    Workers start lazily on the first submit so importing the module (or
+    running tests with the pipeline disabled) doesn't spawn threads.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = PIPELINE_ENABLED,
+        workers: int = WORKER_COUNT,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        batch_wait_ms: int = BATCH_WAIT_MS,
+        analysis_workers: int = ANALYSIS_WORKERS,
+        analysis_max_pending: int = ANALYSIS_MAX_PENDING,
+        session_factory=None,
+        bind=None
+    ):
+        self.enabled = enabled
+        self._bind = bind or engine
+        # SQLite has a single writer; concurrent batch transactions would just
+        # fail lock upgrades, so one worker drains the queue there
+        if self._bind.dialect.name == "sqlite":
+            workers = 1
+        self.worker_count = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait_ms / 1000.0
+        self.analysis_max_pending = analysis_max_pending
+        self._session_factory = session_factory or SessionLocal
+
+        # One queue per worker; _shard() keeps each user on one of them
+        shard_size = max(1, queue_size // self.worker_count)
+        self._queues: List["queue.Queue[AnswerEvent]"] = [
+            queue.Queue(maxsize=shard_size) for _ in range(self.worker_count)
+        ]
+        self._shard_locks = [threading.Lock() for _ in range(self.worker_count)]
+        self._analysis_workers = max(1, analysis_workers)
+        self._analysis_executor: Optional[ThreadPoolExecutor] = None
+        self._workers: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "processed": 0,
+            "failed": 0,
+            "inline": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+            "total_queue_wait_ms": 0.0,
+            "max_queue_wait_ms": 0.0,
+            "total_batch_ms": 0.0,
+            "analysis_submitted": 0,
+            "analysis_pending": 0,
+            "analysis_skipped": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, db: Session, event: AnswerEvent) -> Optional[Dict[str, Any]]:
+        """
+        Hand an answer's side-effects to the pipeline.
+
+        Returns:
+            None when the event was queued (results arrive via
+            get_answer_effects), or the effects dict when they had to run
+            inline (pipeline disabled or queue full).
+        """
+        if not event.is_correct:
+            self._submit_analysis(event)
+
+        shard = self._shard(event.user_id)
+        if self.enabled:
+            self._ensure_started()
+            _store_result(event, STATUS_PENDING)
+            try:
+                self._queues[shard].put_nowait(event)
+            except queue.Full:
+                logger.warning("Post-answer queue %d full (%d), running side-effects inline",
+                               shard, self._queues[shard].maxsize)
+            else:
+                with self._stats_lock:
+                    self._stats["enqueued"] += 1
+                    depth = self._queue_depth()
+                    if depth > self._stats["max_queue_depth"]:
+                        self._stats["max_queue_depth"] = depth
+                return None
+
+        with self._stats_lock:
+            self._stats["inline"] += 1
+        with self._shard_locks[shard]:
+            effects = apply_answer_effects(db, event)
+        _store_result(event, STATUS_DONE, effects)
+        return effects
+
+    def _shard(self, user_id: str) -> int:
+        """Queue (and worker) index for a user; stable across processes."""
+        return zlib.crc32(user_id.encode()) % self.worker_count
+
+    def _queue_depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def _submit_analysis(self, event: AnswerEvent):
+        """Queue LLM error analysis on the bounded analysis executor."""
+        with self._stats_lock:
+            if self._stats["analysis_pending"] >= self.analysis_max_pending:
+                self._stats["analysis_skipped"] += 1
+                logger.warning("Error analysis backlog full, skipping attempt_id=%s", event.attempt_id)
+                return
+            self._stats["analysis_pending"] += 1
+            self._stats["analysis_submitted"] += 1
+
+        if self._analysis_executor is None:
+            with self._start_lock:
+                if self._analysis_executor is None:
+                    self._analysis_executor = ThreadPoolExecutor(
+                        max_workers=self._analysis_workers,
+                        thread_name_prefix="error-analysis"
+                    )
+
+        def run():
+            try:
+                analyze_answer_error(event)
+            finally:
+                with self._stats_lock:
+                    self._stats["analysis_pending"] -= 1
+
+        self._analysis_executor.submit(run)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._workers:
+            return
+        with self._start_lock:
+            if self._workers:
+                return
+            self._stop.clear()
+            for i in range(self.worker_count):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(i,),
+                    name=f"post-answer-{i}",
+                    daemon=True
+                )
+                thread.start()
+                self._workers.append(thread)
+            logger.info("Post-answer pipeline started with %d worker(s)", self.worker_count)
+
+    def _next_batch(self, events: "queue.Queue[AnswerEvent]") -> List[AnswerEvent]:
+        """Block for one event, then gather up to batch_size within batch_wait."""
+        try:
+            first = events.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.perf_counter() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(events.get(timeout=remaining))
+                else:
+                    batch.append(events.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker_loop(self, shard: int):
+        events = self._queues[shard]
+        while not (self._stop.is_set() and events.empty()):
+            batch = self._next_batch(events)
+            if batch:
+                with self._shard_locks[shard]:
+                    self.process_batch(batch)
+                for _ in batch:
+                    events.task_done()
+
+    def process_batch(self, batch: List[AnswerEvent]):
+        """Apply a batch of events inside one outer transaction."""
+        started = time.perf_counter()
+        wait_ms = [(started - event.enqueued_at) * 1000 for event in batch]
+
+        results = []
+        connection = self._bind.connect()
+        transaction = connection.begin()
+        if connection.dialect.name == "sqlite":
+            # pysqlite defers BEGIN until the first write; take the write lock
+            # up front so request writes wait on the busy timeout instead of
+            # deadlocking on a lock upgrade, and so savepoints nest properly
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        db = self._session_factory(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            for event in batch:
+                try:
+                    results.append((event, STATUS_DONE, apply_answer_effects(db, event, schedule_review=False)))
+                    if not db.is_active:
+                        # A step left the session mid-rollback; discard that
+                        # event's savepoint so the rest of the batch can proceed
+                        db.rollback()
+                except Exception as e:
+                    logger.error("Post-answer effects failed for attempt_id=%s: %s", event.attempt_id, e, exc_info=True)
+                    db.rollback()
+                    results.append((event, STATUS_FAILED, None))
+
+            # Reviews for the whole batch: one load, one savepoint
+            try:
+                schedule_answer_reviews(db, [event for event, status, _ in results if status == STATUS_DONE])
+            except Exception as e:
+                logger.error("Review scheduling failed for batch of %d: %s", len(batch), e, exc_info=True)
+                db.rollback()
+            db.commit()
+            transaction.commit()
+        except Exception as e:
+            logger.error("Post-answer batch commit failed (%d events): %s", len(batch), e, exc_info=True)
+            transaction.rollback()
+            results = [(event, STATUS_FAILED, None) for event in batch]
+        finally:
+            db.close()
+            connection.close()
+
+        failed = 0
+        for event, status, effects in results:
+            _store_result(event, status, effects)
+            if status == STATUS_FAILED:
+                failed += 1
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["processed"] += len(batch) - failed
+            self._stats["failed"] += failed
+            self._stats["total_queue_wait_ms"] += sum(wait_ms)
+            self._stats["max_queue_wait_ms"] = max(self._stats["max_queue_wait_ms"], max(wait_ms))
+            self._stats["total_batch_ms"] += (time.perf_counter() - started) * 1000
+
+    # ------------------------------------------------------------------
+    # Lifecycle / metrics
+    # ------------------------------------------------------------------
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait until every queued event has been applied. Returns False on timeout."""
+        deadline = time.perf_counter() + timeout
+        while any(q.unfinished_tasks for q in self._queues):
+            if time.perf_counter() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop workers after the queue drains and wait for pending analyses."""
+        self._stop.set()
+        for thread in self._workers:
+            thread.join(timeout=timeout)
+        self._workers = []
+        if self._analysis_executor is not None:
+            self._analysis_executor.shutdown(wait=True)
+            self._analysis_executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        handled = stats["processed"] + stats["failed"]
+        total_wait = stats.pop("total_queue_wait_ms")
+        total_batch = stats.pop("total_batch_ms")
+        stats.update({
+            "enabled": self.enabled,
+            "workers": len(self._workers),
+            "queue_depth": self._queue_depth(),
+            "queue_capacity": sum(q.maxsize for q in self._queues),
+            "avg_batch_size": round(handled / stats["batches"], 2) if stats["batches"] else 0.0,
+            "avg_queue_wait_ms": round(total_wait / handled, 2) if handled else 0.0,
+            "max_queue_wait_ms": round(stats["max_queue_wait_ms"], 2),
+            "avg_batch_ms": round(total_batch / stats["batches"], 2) if stats["batches"] else 0.0,
+        })
+        return stats
+
+
+# Singleton instance
+_answer_pipeline: Optional[PostAnswerPipeline] = None
+
+
+def get_answer_pipeline() -> PostAnswerPipeline:
+    """Get or create the singleton post-answer pipeline."""
+    global _answer_pipeline
+    if _answer_pipeline is None:
+        _answer_pipeline = PostAnswerPipeline()
+    return _answer_pipeline
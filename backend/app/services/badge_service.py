@@ -5,15 +5,15 @@ Defines, tracks, and awards badges for user milestones.
 
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
-from sqlalchemy import func, and_
+from sqlalchemy import and_, case, func, or_, update
 from sqlalchemy.orm import Session
 
 from app.models.models import (
     UserBadge, User, QuestionAttempt, UserEngagementScore,
-    StudySession, UserPerformance
+    StudySession, UserPerformance, UserBadgeCounters
 )
 
 logger = logging.getLogger(__name__)
@@ -261,6 +261,96 @@ BADGE_DEFINITIONS: Dict[str, BadgeDefinition] = {
 }
 
 
+# Time-of-day windows (UTC hours, end exclusive) for the special badges
+NIGHT_OWL_HOURS = (0, 5)
+EARLY_BIRD_HOURS = (5, 7)
+
+# Badges a trigger event can affect. An answer moves the counters, the
+# streak and (via the daily snapshot) the predicted score; only session
+# completion can produce a perfect session. A check without a trigger
+# (manual /badges/check) evaluates everything.
+ANSWER_TRIGGERED_BADGES = [
+    badge_id for badge_id, definition in BADGE_DEFINITIONS.items()
+    if definition.category in ("streak", "volume", "accuracy", "milestone")
+    or badge_id in ("first_question", "night_owl", "early_bird")
+]
+SESSION_TRIGGERED_BADGES = ["first_perfect_session"]
+
+
+def _badges_for_trigger(trigger_context: Optional[Dict[str, Any]]) -> List[str]:
+    """Badge ids to evaluate for a trigger event."""
+    if not trigger_context:
+        return list(BADGE_DEFINITIONS)
+
+    badge_ids = []
+    if trigger_context.get("question_answered"):
+        badge_ids.extend(ANSWER_TRIGGERED_BADGES)
+    if trigger_context.get("session_completed"):
+        badge_ids.extend(SESSION_TRIGGERED_BADGES)
+    return badge_ids
+
+
+def _in_window(moment: Optional[datetime], hours: Tuple[int, int]) -> bool:
+    return moment is not None and hours[0] <= moment.hour < hours[1]
+
+
+class _CounterAccumulator:
+    """Folds one user's attempts (oldest first) into counter values."""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.total_answered = 0
+        self.total_correct = 0
+        self.current_correct_run = 0
+        self.best_correct_run = 0
+        self.night_owl_at = None
+        self.early_bird_at = None
+        self.counted_through = None
+
+    def add(self, is_correct: bool, attempted_at: Optional[datetime]):
+        self.total_answered += 1
+        if is_correct:
+            self.total_correct += 1
+            self.current_correct_run += 1
+            self.best_correct_run = max(self.best_correct_run, self.current_correct_run)
+        else:
+            self.current_correct_run = 0
+        if self.night_owl_at is None and _in_window(attempted_at, NIGHT_OWL_HOURS):
+            self.night_owl_at = attempted_at
+        if self.early_bird_at is None and _in_window(attempted_at, EARLY_BIRD_HOURS):
+            self.early_bird_at = attempted_at
+        if attempted_at is not None:
+            self.counted_through = max(self.counted_through or attempted_at, attempted_at)
+
+    def to_mapping(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "total_answered": self.total_answered,
+            "total_correct": self.total_correct,
+            "current_correct_run": self.current_correct_run,
+            "best_correct_run": self.best_correct_run,
+            "night_owl_at": self.night_owl_at,
+            "early_bird_at": self.early_bird_at,
+            "counted_through": self.counted_through,
+            "updated_at": datetime.utcnow(),
+        }
+
+
+def _attempt_stream(db: Session, user_id: Optional[str] = None, chunk_size: int = 10000):
+    """Stream (user_id, is_correct, attempted_at) in per-user answer order."""
+    query = db.query(
+        QuestionAttempt.user_id,
+        QuestionAttempt.is_correct,
+        QuestionAttempt.attempted_at
+    )
+    if user_id is not None:
+        query = query.filter(QuestionAttempt.user_id == user_id)
+    return query.order_by(
+        QuestionAttempt.user_id,
+        QuestionAttempt.attempted_at
+    ).yield_per(chunk_size)
+
+
 class BadgeService:
     """Service for managing achievement badges."""
 
@@ -291,6 +381,7 @@ class BadgeService:
         ).all()
 
         earned_ids = {b.badge_id for b in earned_badges}
+        counters = self.get_counters(db, user_id)
 
         earned = []
         in_progress = []
@@ -313,7 +404,7 @@ class BadgeService:
                 earned.append(badge_info)
             else:
                 # Calculate progress
-                progress = self._calculate_badge_progress(db, user_id, definition)
+                progress = self._calculate_badge_progress(db, user_id, definition, counters)
                 badge_info["earned"] = False
                 badge_info["progress"] = progress
                 if progress > 0:  # Only show badges with some progress
@@ -336,7 +427,8 @@ class BadgeService:
         self,
         db: Session,
         user_id: str,
-        badge: BadgeDefinition
+        badge: BadgeDefinition,
+        counters: Optional[UserBadgeCounters] = None
     ) -> float:
         """Calculate progress (0-1) towards earning a badge."""
         if badge.category == "streak":
@@ -352,17 +444,17 @@ class BadgeService:
             return min(1.0, current / target)
 
         elif badge.category == "volume":
-            count = db.query(func.count(QuestionAttempt.id)).filter(
-                QuestionAttempt.user_id == user_id
-            ).scalar() or 0
+            count = counters.total_answered if counters else 0
 
             target = int(badge.id.split("_")[1])
             return min(1.0, count / target)
 
         elif badge.category == "accuracy" and "accuracy_streak" in badge.id:
-            # For accuracy streak badges, we'd need to calculate current streak
-            # This is a simplified version
-            return 0
+            if not counters:
+                return 0
+
+            target = int(badge.id.split("_")[2])
+            return min(1.0, counters.current_correct_run / target)
 
         elif badge.category == "milestone":
             performance = db.query(UserPerformance).filter(
@@ -379,6 +471,135 @@ class BadgeService:
 
         return 0
 
+    # ------------------------------------------------------------------
+    # Running counters
+    # ------------------------------------------------------------------
+
+    def get_counters(self, db: Session, user_id: str) -> UserBadgeCounters:
+        """Get the user's badge counters, building them from attempts if missing."""
+        counters = db.query(UserBadgeCounters).populate_existing().filter(
+            UserBadgeCounters.user_id == user_id
+        ).first()
+
+        if counters is None:
+            counters = self.rebuild_counters(db, user_id)
+
+        return counters
+
+    def rebuild_counters(self, db: Session, user_id: str) -> UserBadgeCounters:
+        """Recompute one user's counters from question_attempts."""
+        accumulator = _CounterAccumulator(user_id)
+        for _, is_correct, attempted_at in _attempt_stream(db, user_id):
+            accumulator.add(bool(is_correct), attempted_at)
+
+        counters = db.merge(UserBadgeCounters(**accumulator.to_mapping()))
+        db.commit()
+        return counters
+
+    def record_answer(
+        self,
+        db: Session,
+        user_id: str,
+        is_correct: bool,
+        attempted_at: Optional[datetime] = None
+    ) -> UserBadgeCounters:
+        """
+        Fold one new (already committed) attempt into the user's counters.
+
+        A single atomic UPDATE, so concurrent answers can't lose increments.
+        A user without a counters row is rebuilt from attempts instead, which
+        already includes this attempt. The UPDATE only applies to attempts
+        newer than the last rebuild's counted_through, so a rebuild that ran
+        after the attempt committed isn't counted twice.
+        """
+        attempted_at = attempted_at or datetime.utcnow()
+        next_run = UserBadgeCounters.current_correct_run + 1
+
+        values = {
+            "total_answered": UserBadgeCounters.total_answered + 1,
+            "total_correct": UserBadgeCounters.total_correct + (1 if is_correct else 0),
+            "current_correct_run": next_run if is_correct else 0,
+            "updated_at": datetime.utcnow(),
+        }
+        if is_correct:
+            values["best_correct_run"] = case(
+                (next_run > UserBadgeCounters.best_correct_run, next_run),
+                else_=UserBadgeCounters.best_correct_run
+            )
+        if _in_window(attempted_at, NIGHT_OWL_HOURS):
+            values["night_owl_at"] = func.coalesce(UserBadgeCounters.night_owl_at, attempted_at)
+        if _in_window(attempted_at, EARLY_BIRD_HOURS):
+            values["early_bird_at"] = func.coalesce(UserBadgeCounters.early_bird_at, attempted_at)
+
+        result = db.execute(
+            update(UserBadgeCounters)
+            .where(
+                UserBadgeCounters.user_id == user_id,
+                or_(
+                    UserBadgeCounters.counted_through.is_(None),
+                    UserBadgeCounters.counted_through < attempted_at
+                )
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount == 0:
+            db.commit()
+            # Either no row yet, or a rebuild already folded this attempt in
+            return self.get_counters(db, user_id)
+
+        db.commit()
+        return self.get_counters(db, user_id)
+
+    def invalidate_counters(self, db: Session, user_id: str):
+        """Drop a user's counters (e.g. after bulk-recorded attempts); rebuilt on next use."""
+        db.query(UserBadgeCounters).filter(
+            UserBadgeCounters.user_id == user_id
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def backfill_counters(self, db: Session, batch_size: int = 1000) -> int:
+        """
+        Rebuild every user's counters from question_attempts in one streaming pass.
+
+        Attempts are read in (user_id, attempted_at) order so only one user's
+        running state is held in memory; counters are written in batches.
+
+        Returns:
+            Number of users with counters
+        """
+        db.query(UserBadgeCounters).delete(synchronize_session=False)
+
+        users = 0
+        pending: List[Dict[str, Any]] = []
+        accumulator: Optional[_CounterAccumulator] = None
+
+        for user_id, is_correct, attempted_at in _attempt_stream(db):
+            if accumulator is None or accumulator.user_id != user_id:
+                if accumulator is not None:
+                    pending.append(accumulator.to_mapping())
+                accumulator = _CounterAccumulator(user_id)
+                users += 1
+            accumulator.add(bool(is_correct), attempted_at)
+
+            if len(pending) >= batch_size:
+                db.bulk_insert_mappings(UserBadgeCounters, pending)
+                pending = []
+
+        if accumulator is not None:
+            pending.append(accumulator.to_mapping())
+        if pending:
+            db.bulk_insert_mappings(UserBadgeCounters, pending)
+
+        db.commit()
+        logger.info(f"Backfilled badge counters for {users} users")
+        return users
+
+    # ------------------------------------------------------------------
+    # Awarding
+    # ------------------------------------------------------------------
+
     def check_and_award_badges(
         self,
         db: Session,
@@ -386,33 +607,51 @@ class BadgeService:
         trigger_context: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Check all badge conditions and award any newly earned badges.
+        Check badge conditions and award any newly earned badges.
+
+        Only badges the trigger can affect are evaluated (see
+        _badges_for_trigger). An answer trigger carrying "is_correct" is
+        also folded into the user's running counters first.
 
         Args:
             db: Database session
             user_id: User to check
-            trigger_context: Optional context about what triggered the check
+            trigger_context: Optional context about what triggered the check,
+                e.g. {"question_answered": True, "is_correct": True,
+                "attempted_at": datetime, "streak_current": 4}
+                or {"session_completed": True}
 
         Returns:
             List of newly awarded badges
         """
         newly_awarded = []
 
+        counters = None
+        if trigger_context and trigger_context.get("question_answered") and "is_correct" in trigger_context:
+            counters = self.record_answer(
+                db, user_id,
+                trigger_context["is_correct"],
+                trigger_context.get("attempted_at")
+            )
+
         # Get already earned badges
-        earned_ids = set(
-            db.query(UserBadge.badge_id).filter(
+        earned_ids = {
+            badge_id for (badge_id,) in db.query(UserBadge.badge_id).filter(
                 UserBadge.user_id == user_id
             ).all()
-        )
-        earned_ids = {e[0] for e in earned_ids}
+        }
 
-        for badge_id, definition in BADGE_DEFINITIONS.items():
+        for badge_id in _badges_for_trigger(trigger_context):
             if badge_id in earned_ids:
                 continue
 
+            definition = BADGE_DEFINITIONS[badge_id]
+            if counters is None and self._uses_counters(definition):
+                counters = self.get_counters(db, user_id)
+
             # Check if badge is earned
             is_earned, context = self._check_badge_condition(
-                db, user_id, definition, trigger_context
+                db, user_id, definition, trigger_context, counters
             )
 
             if is_earned:
@@ -439,41 +678,49 @@ class BadgeService:
 
         return newly_awarded
 
+    @staticmethod
+    def _uses_counters(badge: BadgeDefinition) -> bool:
+        return badge.category in ("volume", "accuracy") or badge.id in (
+            "first_question", "night_owl", "early_bird"
+        )
+
     def _check_badge_condition(
         self,
         db: Session,
         user_id: str,
         badge: BadgeDefinition,
-        trigger_context: Optional[Dict[str, Any]] = None
+        trigger_context: Optional[Dict[str, Any]] = None,
+        counters: Optional[UserBadgeCounters] = None
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
         """Check if a badge condition is met. Returns (is_earned, context)."""
 
         if badge.category == "streak":
-            return self._check_streak_badge(db, user_id, badge)
+            streak = (trigger_context or {}).get("streak_current")
+            return self._check_streak_badge(db, user_id, badge, streak)
 
         elif badge.category == "volume":
-            return self._check_volume_badge(db, user_id, badge)
+            return self._check_volume_badge(counters, badge)
 
         elif badge.category == "accuracy" and badge.id.startswith("accuracy_streak"):
-            return self._check_accuracy_streak_badge(db, user_id, badge)
+            return self._check_accuracy_streak_badge(counters, badge)
 
         elif badge.category == "accuracy":
-            return self._check_overall_accuracy_badge(db, user_id, badge)
+            return self._check_overall_accuracy_badge(counters, badge)
 
         elif badge.category == "milestone":
             return self._check_score_badge(db, user_id, badge)
 
         elif badge.id == "first_question":
-            return self._check_first_question_badge(db, user_id)
+            return self._check_first_question_badge(counters)
 
         elif badge.id == "first_perfect_session":
             return self._check_perfect_session_badge(db, user_id)
 
         elif badge.id == "night_owl":
-            return self._check_time_badge(db, user_id, 0, 5)
+            return self._check_time_badge(counters.night_owl_at)
 
         elif badge.id == "early_bird":
-            return self._check_time_badge(db, user_id, 5, 7)
+            return self._check_time_badge(counters.early_bird_at)
 
         return False, None
 
@@ -481,18 +728,21 @@ class BadgeService:
         self,
         db: Session,
         user_id: str,
-        badge: BadgeDefinition
+        badge: BadgeDefinition,
+        current: Optional[int] = None
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
-        """Check streak badge conditions."""
-        engagement = db.query(UserEngagementScore).filter(
-            UserEngagementScore.user_id == user_id
-        ).first()
+        """Check streak badge conditions (current streak from the trigger if known)."""
+        if current is None:
+            engagement = db.query(UserEngagementScore).filter(
+                UserEngagementScore.user_id == user_id
+            ).first()
 
-        if not engagement:
-            return False, None
+            if not engagement:
+                return False, None
+
+            current = engagement.streak_current or 0
 
         target = int(badge.id.split("_")[1])
-        current = engagement.streak_current or 0
 
         if current >= target:
             return True, {"streak": current}
@@ -501,15 +751,11 @@ class BadgeService:
 
     def _check_volume_badge(
         self,
-        db: Session,
-        user_id: str,
+        counters: UserBadgeCounters,
         badge: BadgeDefinition
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
         """Check question volume badge conditions."""
-        count = db.query(func.count(QuestionAttempt.id)).filter(
-            QuestionAttempt.user_id == user_id
-        ).scalar() or 0
-
+        count = counters.total_answered
         target = int(badge.id.split("_")[1])
 
         if count >= target:
@@ -519,33 +765,20 @@ class BadgeService:
 
     def _check_accuracy_streak_badge(
         self,
-        db: Session,
-        user_id: str,
+        counters: UserBadgeCounters,
         badge: BadgeDefinition
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
         """Check consecutive correct answers badge."""
         target = int(badge.id.split("_")[2])
 
-        # Get recent attempts ordered by time
-        recent = db.query(QuestionAttempt).filter(
-            QuestionAttempt.user_id == user_id
-        ).order_by(QuestionAttempt.attempted_at.desc()).limit(target).all()
-
-        if len(recent) < target:
-            return False, None
-
-        # Check if all are correct
-        all_correct = all(a.is_correct for a in recent)
-
-        if all_correct:
+        if counters.current_correct_run >= target:
             return True, {"consecutive_correct": target}
 
         return False, None
 
     def _check_overall_accuracy_badge(
         self,
-        db: Session,
-        user_id: str,
+        counters: UserBadgeCounters,
         badge: BadgeDefinition
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
         """Check overall accuracy badge conditions."""
@@ -554,21 +787,12 @@ class BadgeService:
         # Minimum questions required
         min_questions = {70: 100, 80: 200, 90: 300}.get(target_accuracy, 100)
 
-        total = db.query(func.count(QuestionAttempt.id)).filter(
-            QuestionAttempt.user_id == user_id
-        ).scalar() or 0
+        total = counters.total_answered
 
         if total < min_questions:
             return False, None
 
-        correct = db.query(func.count(QuestionAttempt.id)).filter(
-            and_(
-                QuestionAttempt.user_id == user_id,
-                QuestionAttempt.is_correct == True
-            )
-        ).scalar() or 0
-
-        accuracy = (correct / total) * 100 if total > 0 else 0
+        accuracy = (counters.total_correct / total) * 100 if total > 0 else 0
 
         if accuracy >= target_accuracy:
             return True, {"accuracy": round(accuracy, 1), "total_questions": total}
@@ -598,13 +822,10 @@ class BadgeService:
 
     def _check_first_question_badge(
         self,
-        db: Session,
-        user_id: str
+        counters: UserBadgeCounters
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
         """Check if user answered their first question."""
-        count = db.query(func.count(QuestionAttempt.id)).filter(
-            QuestionAttempt.user_id == user_id
-        ).scalar() or 0
+        count = counters.total_answered
 
         if count >= 1:
             return True, {"questions_answered": count}
@@ -636,25 +857,11 @@ class BadgeService:
 
     def _check_time_badge(
         self,
-        db: Session,
-        user_id: str,
-        start_hour: int,
-        end_hour: int
+        studied_at: Optional[datetime]
     ) -> tuple[bool, Optional[Dict[str, Any]]]:
-        """Check if user studied during specific hours."""
-        # Get attempts in the time range
-        from sqlalchemy import extract
-
-        attempt = db.query(QuestionAttempt).filter(
-            and_(
-                QuestionAttempt.user_id == user_id,
-                extract('hour', QuestionAttempt.attempted_at) >= start_hour,
-                extract('hour', QuestionAttempt.attempted_at) < end_hour
-            )
-        ).first()
-
-        if attempt:
-            return True, {"studied_at": attempt.attempted_at.strftime("%H:%M")}
+        """Check if user studied during a time-of-day window (first answer in it)."""
+        if studied_at:
+            return True, {"studied_at": studied_at.strftime("%H:%M")}
 
         return False, None
 
@@ -20,11 +20,12 @@ Usage:
 
 import asyncio
 import logging
+import os
 import random
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
 import numpy as np
 from difflib import SequenceMatcher
 
@@ -34,6 +35,7 @@ from app.services.question_validators import QuestionQualityValidator
 from app.services.multi_model_validator import MultiModelValidator, ValidationStatus
 from app.services.elite_quality_validator import elite_validator
 from app.services.item_response_theory import IRTCalibrator
+from app.utils.fanout import gather_until
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +111,10 @@ class BatchValidationPipeline:
     OVERALL_ACCEPT_THRESHOLD = 0.85
     MAX_CRITICAL_ISSUES = 10
     MAX_REJECT_STREAK = 20
+    STAGE1_GATE_WINDOW = 100
+
+    # Questions validated concurrently per batch
+    VALIDATION_CONCURRENCY = int(os.getenv("BATCH_VALIDATION_CONCURRENCY", "16"))
 
     # Sampling parameters
     SAMPLE_CONFIDENCE_LEVEL = 0.95
@@ -124,15 +130,22 @@ class BatchValidationPipeline:
         self,
         questions: List[Dict],
         enable_gates: bool = True,
-        human_review_sample_size: Optional[int] = None
+        human_review_sample_size: Optional[int] = None,
+        concurrency: Optional[int] = None
     ) -> BatchValidationReport:
         """
         Validate a batch of questions through all stages.
 
+        Questions are validated concurrently (Stage 2 calls are further capped
+        per model by the MultiModelValidator). Quality gates are evaluated over
+        results as they complete; a STOP_GENERATION gate cancels in-flight
+        validations and skips the rest of the batch. Results keep input order.
+
         Args:
             questions: List of question dicts
             enable_gates: Whether to enforce quality gates
             human_review_sample_size: Sample size for Stage 5 (defaults to calculated)
+            concurrency: Questions in flight (default VALIDATION_CONCURRENCY)
 
         Returns:
             BatchValidationReport with comprehensive results
@@ -140,151 +153,97 @@ class BatchValidationPipeline:
 
         start_time = datetime.utcnow()
 
-        results = []
         critical_issues_count = 0
         reject_streak = 0
+        completed = 0
+        stage1_window = deque(maxlen=self.STAGE1_GATE_WINDOW)
         quality_gate_failures = []
 
         logger.info(f"Starting batch validation of {len(questions)} questions")
 
-        for i, question in enumerate(questions):
-
-            # Stage 1: Automated Pre-Flight Checks
-            stage1_result = self._run_stage1(question)
-
-            if not stage1_result["passed"]:
-                results.append(ValidationResult(
-                    question_id=question.get("id", f"q_{i}"),
-                    status="REJECTED",
-                    overall_score=0,
-                    is_elite=False,
-                    stage1_passed=False,
-                    stage2_passed=False,
-                    stage3_score=0,
-                    critical_issues=stage1_result["issues"],
-                    warnings=[],
-                    red_flags=[],
-                    recommendations=stage1_result["suggestions"],
-                    validated_at=datetime.utcnow(),
-                    validation_time_ms=stage1_result["time_ms"]
-                ))
-                reject_streak += 1
-
-                # Quality Gate: Stage 1 pass rate
-                if enable_gates and i > 100 and i % 100 == 0:
-                    recent_pass_rate = sum(
-                        1 for r in results[-100:] if r.stage1_passed
-                    ) / 100
-
-                    if recent_pass_rate < self.STAGE1_PASS_THRESHOLD:
-                        quality_gate_failures.append({
-                            "gate": "stage1_pass_rate",
-                            "at_question": i,
-                            "pass_rate": recent_pass_rate,
-                            "threshold": self.STAGE1_PASS_THRESHOLD,
-                            "action": "PAUSE_FOR_INVESTIGATION"
-                        })
-                        logger.warning(
-                            f"Quality gate failure: Stage 1 pass rate {recent_pass_rate:.1%} "
-                            f"below threshold {self.STAGE1_PASS_THRESHOLD:.1%}"
-                        )
-
-                continue
-
-            # Stage 2: AI Medical Validation
-            stage2_result = await self._run_stage2(question)
-
-            if not stage2_result["passed"]:
-                results.append(ValidationResult(
-                    question_id=question.get("id", f"q_{i}"),
-                    status="REJECTED",
-                    overall_score=stage2_result["score"],
-                    is_elite=False,
-                    stage1_passed=True,
-                    stage2_passed=False,
-                    stage3_score=0,
-                    critical_issues=stage2_result["issues"],
-                    warnings=[],
-                    red_flags=[],
-                    recommendations=stage2_result["suggestions"],
-                    validated_at=datetime.utcnow(),
-                    validation_time_ms=stage1_result["time_ms"] + stage2_result["time_ms"]
-                ))
-                reject_streak += 1
-
-                # Check for dangerous misinformation
-                if stage2_result.get("dangerous_misinformation"):
-                    critical_issues_count += 1
-                    logger.error(
-                        f"CRITICAL: Dangerous misinformation detected in question {i}"
-                    )
+        async def validate(item: Tuple[int, Dict]) -> Tuple[ValidationResult, bool]:
+            return await self._validate_question(*item)
 
-                # Quality Gate: Critical issues
-                if enable_gates and critical_issues_count > self.MAX_CRITICAL_ISSUES:
-                    quality_gate_failures.append({
-                        "gate": "max_critical_issues",
-                        "at_question": i,
-                        "critical_count": critical_issues_count,
-                        "action": "STOP_GENERATION"
-                    })
-                    logger.critical(
-                        f"STOPPING: {critical_issues_count} critical issues detected. "
-                        f"Review generation process immediately."
-                    )
-                    break
+        def on_result(index: int, outcome: Tuple[ValidationResult, bool]) -> bool:
+            """Apply quality gates in completion order; True stops the batch."""
+            nonlocal critical_issues_count, reject_streak, completed
+            result, dangerous = outcome
+            completed += 1
+            stage1_window.append(result.stage1_passed)
+
+            if completed % 100 == 0:
+                logger.info(f"Validated {completed}/{len(questions)} questions")
 
-                # Quality Gate: Reject streak
-                if enable_gates and reject_streak >= self.MAX_REJECT_STREAK:
+            # Quality Gate: Stage 1 pass rate over the last window of completed results
+            if (
+                enable_gates
+                and len(stage1_window) == self.STAGE1_GATE_WINDOW
+                and completed % self.STAGE1_GATE_WINDOW == 0
+            ):
+                recent_pass_rate = sum(stage1_window) / self.STAGE1_GATE_WINDOW
+
+                if recent_pass_rate < self.STAGE1_PASS_THRESHOLD:
                     quality_gate_failures.append({
-                        "gate": "max_reject_streak",
-                        "at_question": i,
-                        "streak": reject_streak,
-                        "action": "INVESTIGATE_GENERATOR"
+                        "gate": "stage1_pass_rate",
+                        "at_question": index,
+                        "pass_rate": recent_pass_rate,
+                        "threshold": self.STAGE1_PASS_THRESHOLD,
+                        "action": "PAUSE_FOR_INVESTIGATION"
                     })
-                    logger.error(
-                        f"Quality gate: {reject_streak} consecutive rejections. "
-                        f"Pausing for investigation."
+                    logger.warning(
+                        f"Quality gate failure: Stage 1 pass rate {recent_pass_rate:.1%} "
+                        f"below threshold {self.STAGE1_PASS_THRESHOLD:.1%}"
                     )
-                    # Don't break, just flag for review
-
-                continue
 
-            reject_streak = 0  # Reset on pass
+            if result.stage2_passed:
+                reject_streak = 0  # Reset on pass
+                return False
+            reject_streak += 1
 
-            # Stage 3: Elite Explanation Validation
-            stage3_result = self._run_stage3(question)
-
-            # Determine final status
-            if stage3_result["is_elite"]:
-                status = "ACCEPTED"
-            elif stage3_result["score"] >= 70:
-                status = "ACCEPTED"  # Acceptable but not elite
-            else:
-                status = "REJECTED"
+            # Check for dangerous misinformation
+            if dangerous:
+                critical_issues_count += 1
+                logger.error(
+                    f"CRITICAL: Dangerous misinformation detected in question {index}"
+                )
 
-            results.append(ValidationResult(
-                question_id=question.get("id", f"q_{i}"),
-                status=status,
-                overall_score=stage3_result["score"],
-                is_elite=stage3_result["is_elite"],
-                stage1_passed=True,
-                stage2_passed=True,
-                stage3_score=stage3_result["score"],
-                critical_issues=[],
-                warnings=stage3_result["issues"],
-                red_flags=[],
-                recommendations=stage3_result["recommendations"],
-                validated_at=datetime.utcnow(),
-                validation_time_ms=(
-                    stage1_result["time_ms"] +
-                    stage2_result["time_ms"] +
-                    stage3_result["time_ms"]
+            # Quality Gate: Critical issues (cancels in-flight validations)
+            if enable_gates and critical_issues_count > self.MAX_CRITICAL_ISSUES:
+                quality_gate_failures.append({
+                    "gate": "max_critical_issues",
+                    "at_question": index,
+                    "critical_count": critical_issues_count,
+                    "action": "STOP_GENERATION"
+                })
+                logger.critical(
+                    f"STOPPING: {critical_issues_count} critical issues detected. "
+                    f"Review generation process immediately."
                 )
-            ))
+                return True
+
+            # Quality Gate: Reject streak
+            if enable_gates and reject_streak % self.MAX_REJECT_STREAK == 0:
+                quality_gate_failures.append({
+                    "gate": "max_reject_streak",
+                    "at_question": index,
+                    "streak": reject_streak,
+                    "action": "INVESTIGATE_GENERATOR"
+                })
+                logger.error(
+                    f"Quality gate: {reject_streak} consecutive rejections. "
+                    f"Pausing for investigation."
+                )
+                # Don't stop, just flag for review
 
-            # Progress logging
-            if (i + 1) % 100 == 0:
-                logger.info(f"Validated {i + 1}/{len(questions)} questions")
+            return False
+
+        outcomes = await gather_until(
+            list(enumerate(questions)),
+            validate,
+            concurrency or self.VALIDATION_CONCURRENCY,
+            on_result=on_result
+        )
+        results = [outcome[0] for outcome in outcomes if outcome is not None]
 
         # Calculate batch metrics
         end_time = datetime.utcnow()
@@ -326,6 +285,84 @@ class BatchValidationPipeline:
 
         return report
 
+    async def _validate_question(self, i: int, question: Dict) -> Tuple[ValidationResult, bool]:
+        """
+        Run one question through Stages 1-3.
+
+        Returns:
+            (result, dangerous_misinformation)
+        """
+        # Stage 1: Automated Pre-Flight Checks
+        stage1_result = self._run_stage1(question)
+
+        if not stage1_result["passed"]:
+            return ValidationResult(
+                question_id=question.get("id", f"q_{i}"),
+                status="REJECTED",
+                overall_score=0,
+                is_elite=False,
+                stage1_passed=False,
+                stage2_passed=False,
+                stage3_score=0,
+                critical_issues=stage1_result["issues"],
+                warnings=[],
+                red_flags=[],
+                recommendations=stage1_result["suggestions"],
+                validated_at=datetime.utcnow(),
+                validation_time_ms=stage1_result["time_ms"]
+            ), False
+
+        # Stage 2: AI Medical Validation
+        stage2_result = await self._run_stage2(question)
+
+        if not stage2_result["passed"]:
+            return ValidationResult(
+                question_id=question.get("id", f"q_{i}"),
+                status="REJECTED",
+                overall_score=stage2_result["score"],
+                is_elite=False,
+                stage1_passed=True,
+                stage2_passed=False,
+                stage3_score=0,
+                critical_issues=stage2_result["issues"],
+                warnings=[],
+                red_flags=[],
+                recommendations=stage2_result["suggestions"],
+                validated_at=datetime.utcnow(),
+                validation_time_ms=stage1_result["time_ms"] + stage2_result["time_ms"]
+            ), bool(stage2_result.get("dangerous_misinformation"))
+
+        # Stage 3: Elite Explanation Validation
+        stage3_result = self._run_stage3(question)
+
+        # Determine final status
+        if stage3_result["is_elite"]:
+            status = "ACCEPTED"
+        elif stage3_result["score"] >= 70:
+            status = "ACCEPTED"  # Acceptable but not elite
+        else:
+            status = "REJECTED"
+
+        return ValidationResult(
+            question_id=question.get("id", f"q_{i}"),
+            status=status,
+            overall_score=stage3_result["score"],
+            is_elite=stage3_result["is_elite"],
+            stage1_passed=True,
+            stage2_passed=True,
+            stage3_score=stage3_result["score"],
+            critical_issues=[],
+            warnings=stage3_result["issues"],
+            red_flags=[],
+            recommendations=stage3_result["recommendations"],
+            validated_at=datetime.utcnow(),
+            validation_time_ms=(
+                stage1_result["time_ms"] +
+                stage2_result["time_ms"] +
+                stage3_result["time_ms"]
+            )
+        ), False
+
     def _run_stage1(self, question: Dict) -> Dict:
         """Stage 1: Automated pre-flight checks"""
         start = datetime.utcnow()
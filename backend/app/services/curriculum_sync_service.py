@@ -34,6 +34,7 @@ from app.models.models import (
     User
 )
 from app.services.openai_service import openai_service
+from app.services.question_search import count_matching, match_terms
 from app.services.step2ck_content_outline import HIGH_YIELD_TOPICS, DISCIPLINE_DISTRIBUTION
 
 logger = logging.getLogger(__name__)
@@ -646,10 +647,10 @@ Known high-yield topics for reference (match these when possible):
         Count questions in the pool that match this topic.
         Uses specialty and fuzzy topic matching.
         """
-        query = db.query(func.count(Question.id)).filter(
+        criteria = [
             Question.rejected == False,
             Question.content_status == "active"
-        )
+        ]
 
         # Filter by specialty if available
         if topic.specialty:
@@ -657,19 +658,15 @@ Known high-yield topics for reference (match these when possible):
             specialty_normalized = topic.specialty.lower().replace(" ", "_")
             # SECURITY: Escape ILIKE pattern to prevent injection
             safe_specialty = escape_like_pattern(specialty_normalized)
-            query = query.filter(Question.specialty.ilike(f"%{safe_specialty}%"))
+            criteria.append(Question.specialty.ilike(f"%{safe_specialty}%"))
 
-        # Also try matching topic in vignette
+        # Also try matching topic in vignette (full-text index)
+        keywords = []
         if topic.topic_name:
             # Split topic into keywords for fuzzy match
-            keywords = topic.topic_name.split()
-            for kw in keywords[:3]:  # Use first 3 keywords
-                if len(kw) > 3:  # Skip short words
-                    # SECURITY: Escape ILIKE pattern
-                    safe_kw = escape_like_pattern(kw)
-                    query = query.filter(Question.vignette.ilike(f"%{safe_kw}%"))
+            keywords = [kw for kw in topic.topic_name.split()[:3] if len(kw) > 3]  # Skip short words
 
-        return query.scalar() or 0
+        return count_matching(db, keywords, *criteria)
 
     async def _update_study_focus(
         self,
@@ -805,8 +802,6 @@ Known high-yield topics for reference (match these when possible):
         exclude_ids: Optional[List[str]] = None
     ) -> List[Question]:
         """Get questions matching specific topics."""
-        from sqlalchemy import or_
-
         query = db.query(Question).filter(
             Question.rejected == False,
             Question.content_status == "active"
@@ -820,17 +815,14 @@ Known high-yield topics for reference (match these when possible):
             safe_specialty = escape_like_pattern(specialty_filter)
             query = query.filter(Question.specialty.ilike(f"%{safe_specialty}%"))
 
-        # Build topic filter - match any topic keyword in vignette
-        topic_filters = []
+        # Build topic filter - match any topic keyword in vignette (full-text index)
+        topic_keywords = []
         for topic in topics[:10]:  # Limit to 10 topics for performance
             keywords = [kw for kw in topic.split() if len(kw) > 3]
-            for kw in keywords[:2]:
-                # SECURITY: Escape ILIKE pattern
-                safe_kw = escape_like_pattern(kw)
-                topic_filters.append(Question.vignette.ilike(f"%{safe_kw}%"))
+            topic_keywords.extend(keywords[:2])
 
-        if topic_filters:
-            query = query.filter(or_(*topic_filters))
+        if topic_keywords:
+            query = query.filter(match_terms(db, topic_keywords, mode="any"))
 
         # Exclude questions user has already answered correctly
         answered_correctly = db.query(QuestionAttempt.question_id).filter(
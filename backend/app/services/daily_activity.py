@@ -0,0 +1,264 @@
+"""
+User Daily Activity Rollup
+
+Maintains user_daily_activity - one row per (user, UTC day, specialty)
+with answered/correct counts, total answer time and confidence sums - and
+serves the time-series reads that used to group question_attempts by
+func.date(attempted_at):
+
+- analytics_agent.get_performance_trends  (daily accuracy / time, per specialty)
+- analytics.get_activity_heatmap          (daily counts over up to 365 days)
+- analytics.calculate_streak / analytics_agent._calculate_streak
+- weekly_digest.get_weekly_stats and get_digest_recipients (week totals and study days)
+
+Every attempt writer calls record_daily_activity() before committing the
+attempt, so the rollup is updated in the same transaction. A range read
+is an index scan on the (user_id, day, specialty) primary key returning
+at most one row per day and specialty.
+
+Usage:
+    from app.services.daily_activity import get_daily_activity, record_daily_activity
+
+    record_daily_activity(db, user_id, question.specialty, is_correct, time_spent, confidence)
+    days = get_daily_activity(db, user_id, start_day=date.today() - timedelta(days=365))
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, update, Integer
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, UserDailyActivity
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DailyActivity:
+    """One user's activity on one day, summed across the requested specialties."""
+
+    day: date
+    questions_answered: int
+    questions_correct: int
+    total_time_seconds: int
+    timed_answers: int
+    confidence_sum: int
+    confidence_answers: int
+
+    @property
+    def accuracy(self) -> float:
+        return self.questions_correct / self.questions_answered if self.questions_answered > 0 else 0.0
+
+    @property
+    def avg_time_seconds(self) -> float:
+        return self.total_time_seconds / self.timed_answers if self.timed_answers > 0 else 0.0
+
+
+def _as_date(value) -> date:
+    """func.date() returns a date on PostgreSQL and an ISO string on SQLite."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+# =============================================================================
+# WRITES
+# =============================================================================
+
+def record_daily_activity(
+    db: Session,
+    user_id: str,
+    specialty: Optional[str],
+    is_correct: bool,
+    time_spent_seconds: Optional[int] = None,
+    confidence_level: Optional[int] = None,
+    attempted_at: Optional[datetime] = None
+):
+    """
+    Add one attempt to the user's rollup row for that day and specialty.
+
+    Does not commit - call it before the commit that stores the attempt so
+    both land in the same transaction.
+    """
+    key = (
+        UserDailyActivity.user_id == user_id,
+        UserDailyActivity.day == (attempted_at or datetime.utcnow()).date(),
+        UserDailyActivity.specialty == (specialty or "")
+    )
+    values = {
+        "questions_answered": UserDailyActivity.questions_answered + 1,
+        "questions_correct": UserDailyActivity.questions_correct + int(bool(is_correct)),
+        "updated_at": datetime.utcnow()
+    }
+    if time_spent_seconds is not None:
+        values["total_time_seconds"] = UserDailyActivity.total_time_seconds + int(time_spent_seconds)
+        values["timed_answers"] = UserDailyActivity.timed_answers + 1
+    if confidence_level is not None:
+        values["confidence_sum"] = UserDailyActivity.confidence_sum + int(confidence_level)
+        values["confidence_answers"] = UserDailyActivity.confidence_answers + 1
+
+    statement = update(UserDailyActivity).where(*key).values(**values).execution_options(
+        synchronize_session=False
+    )
+    if db.execute(statement).rowcount:
+        return
+
+    # First attempt of the day in this specialty; a concurrent writer may
+    # insert the same row first, in which case fall back to the update
+    row = UserDailyActivity(
+        user_id=user_id,
+        day=(attempted_at or datetime.utcnow()).date(),
+        specialty=specialty or "",
+        questions_answered=1,
+        questions_correct=int(bool(is_correct)),
+        total_time_seconds=int(time_spent_seconds or 0),
+        timed_answers=int(time_spent_seconds is not None),
+        confidence_sum=int(confidence_level or 0),
+        confidence_answers=int(confidence_level is not None),
+        updated_at=datetime.utcnow()
+    )
+    try:
+        with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        db.execute(statement)
+
+
+def backfill_daily_activity(db: Session, user_id: Optional[str] = None, batch_size: int = 1000) -> int:
+    """
+    Rebuild the rollup from question_attempts with one grouped query.
+
+    Args:
+        user_id: Rebuild only this user's rows (default: everyone)
+        batch_size: Rows per bulk insert
+
+    Returns:
+        Number of rollup rows written
+    """
+    existing = db.query(UserDailyActivity)
+    attempts = db.query(
+        QuestionAttempt.user_id,
+        func.date(QuestionAttempt.attempted_at),
+        Question.specialty,
+        func.count(QuestionAttempt.id),
+        func.sum(func.cast(QuestionAttempt.is_correct, Integer)),
+        func.coalesce(func.sum(QuestionAttempt.time_spent_seconds), 0),
+        func.count(QuestionAttempt.time_spent_seconds),
+        func.coalesce(func.sum(QuestionAttempt.confidence_level), 0),
+        func.count(QuestionAttempt.confidence_level)
+    ).join(
+        Question, QuestionAttempt.question_id == Question.id
+    )
+    if user_id is not None:
+        existing = existing.filter(UserDailyActivity.user_id == user_id)
+        attempts = attempts.filter(QuestionAttempt.user_id == user_id)
+    existing.delete(synchronize_session=False)
+
+    # Question.specialty NULL and "" share a rollup key, so merge before inserting
+    rows = {}
+    now = datetime.utcnow()
+    for uid, day, specialty, answered, correct, total_time, timed, confidence_sum, confident in attempts.group_by(
+        QuestionAttempt.user_id, func.date(QuestionAttempt.attempted_at), Question.specialty
+    ).yield_per(batch_size):
+        key = (uid, _as_date(day), specialty or "")
+        row = rows.get(key)
+        if row is None:
+            rows[key] = {
+                "user_id": key[0], "day": key[1], "specialty": key[2],
+                "questions_answered": answered, "questions_correct": correct or 0,
+                "total_time_seconds": total_time, "timed_answers": timed,
+                "confidence_sum": confidence_sum, "confidence_answers": confident,
+                "updated_at": now
+            }
+        else:
+            row["questions_answered"] += answered
+            row["questions_correct"] += correct or 0
+            row["total_time_seconds"] += total_time
+            row["timed_answers"] += timed
+            row["confidence_sum"] += confidence_sum
+            row["confidence_answers"] += confident
+
+    pending = list(rows.values())
+    for start in range(0, len(pending), batch_size):
+        db.bulk_insert_mappings(UserDailyActivity, pending[start:start + batch_size])
+
+    db.commit()
+    logger.info(f"Backfilled {len(pending)} daily activity rows")
+    return len(pending)
+
+
+# =============================================================================
+# READS
+# =============================================================================
+
+def get_daily_activity(
+    db: Session,
+    user_id: str,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    specialty: Optional[str] = None
+) -> List[DailyActivity]:
+    """
+    Per-day activity for a user, oldest first (days without activity omitted).
+
+    Args:
+        start_day: First day to include (inclusive)
+        end_day: Last day to include (inclusive)
+        specialty: Only count attempts on questions with this specialty
+    """
+    query = db.query(
+        UserDailyActivity.day,
+        func.sum(UserDailyActivity.questions_answered),
+        func.sum(UserDailyActivity.questions_correct),
+        func.sum(UserDailyActivity.total_time_seconds),
+        func.sum(UserDailyActivity.timed_answers),
+        func.sum(UserDailyActivity.confidence_sum),
+        func.sum(UserDailyActivity.confidence_answers)
+    ).filter(
+        UserDailyActivity.user_id == user_id
+    )
+    if start_day is not None:
+        query = query.filter(UserDailyActivity.day >= start_day)
+    if end_day is not None:
+        query = query.filter(UserDailyActivity.day <= end_day)
+    if specialty is not None:
+        query = query.filter(UserDailyActivity.specialty == specialty)
+
+    rows = query.group_by(UserDailyActivity.day).order_by(UserDailyActivity.day).all()
+    return [
+        DailyActivity(_as_date(day), *(int(value or 0) for value in sums))
+        for day, *sums in rows
+    ]
+
+
+def get_current_streak(db: Session, user_id: str) -> int:
+    """
+    Consecutive days with activity ending today or yesterday.
+
+    Reads active days newest first and stops at the first gap.
+    """
+    today = datetime.now().date()
+    expected = None
+    streak = 0
+
+    days = db.query(UserDailyActivity.day).filter(
+        UserDailyActivity.user_id == user_id
+    ).distinct().order_by(UserDailyActivity.day.desc()).all()
+
+    for (day,) in days:
+        day = _as_date(day)
+        if expected is None:
+            if day not in (today, today - timedelta(days=1)):
+                return 0  # Streak broken
+        elif day != expected:
+            break
+        streak += 1
+        expected = day - timedelta(days=1)
+
+    return streak
@@ -25,6 +25,8 @@ import logging
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
+from app.services.validation_rules import Rule, RuleSet
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,14 +79,20 @@ class EliteQualityValidator:
     )
 
     # Patterns indicating distractor psychology ("tempting because", "commonly confused")
-    DISTRACTOR_PSYCHOLOGY_PATTERNS = [
-        re.compile(r'tempting\s+because', re.IGNORECASE),
-        re.compile(r'commonly\s+(?:confused|mistaken)', re.IGNORECASE),
-        re.compile(r'students?\s+(?:often|commonly|frequently)\s+(?:choose|pick|select)', re.IGNORECASE),
-        re.compile(r'trap\s+(?:answer|choice)', re.IGNORECASE),
-        re.compile(r'might\s+(?:seem|appear|look)\s+(?:correct|right)', re.IGNORECASE),
-        re.compile(r'if\s+(?:you|one)\s+(?:forgot|missed|overlooked)', re.IGNORECASE),
-    ]
+    DISTRACTOR_PSYCHOLOGY_RULES = RuleSet([
+        Rule("tempting", r'tempting\s+because', ("tempting",)),
+        Rule("confused", r'commonly\s+(?:confused|mistaken)', ("commonly",)),
+        Rule("students_choose", r'students?\s+(?:often|commonly|frequently)\s+(?:choose|pick|select)', ("student",)),
+        Rule("trap", r'trap\s+(?:answer|choice)', ("trap",)),
+        Rule("seems_correct", r'might\s+(?:seem|appear|look)\s+(?:correct|right)', ("might",)),
+        Rule("overlooked", r'if\s+(?:you|one)\s+(?:forgot|missed|overlooked)', ("if",)),
+    ])
+
+    # First-sentence cues for pattern recognition
+    CLINICAL_TERM_PATTERN = re.compile(r'\b[a-z]+(?:emia|itis|osis|pathy|algia|uria|pnea|trophy|plasia|oma)\b')
+    SYMPTOM_TERM_PATTERN = re.compile(
+        r'\b(?:pain|fever|cough|swelling|weakness|fatigue|rash|bleeding|vomiting|diarrhea|dyspnea|chest|abdominal)\b'
+    )
 
     # Arrow patterns for mechanism chains
     ARROW_PATTERNS = ['→', '->', '➔', '➜', '⟶', '⇒', 'leads to', 'causes', 'results in']
@@ -205,8 +213,8 @@ class EliteQualityValidator:
         quick_answer_lower = quick_answer.lower()
 
         # Look for overlap in clinical terms
-        clinical_terms = re.findall(r'\b[a-z]+(?:emia|itis|osis|pathy|algia|uria|pnea|trophy|plasia|oma)\b', first_sentence_lower)
-        symptom_terms = re.findall(r'\b(?:pain|fever|cough|swelling|weakness|fatigue|rash|bleeding|vomiting|diarrhea|dyspnea|chest|abdominal)\b', first_sentence_lower)
+        clinical_terms = self.CLINICAL_TERM_PATTERN.findall(first_sentence_lower)
+        symptom_terms = self.SYMPTOM_TERM_PATTERN.findall(first_sentence_lower)
 
         relevant_terms = clinical_terms + symptom_terms
 
@@ -309,10 +317,7 @@ class EliteQualityValidator:
         )
 
         # Count psychology patterns
-        psychology_matches = 0
-        for pattern in self.DISTRACTOR_PSYCHOLOGY_PATTERNS:
-            if pattern.search(distractor_text):
-                psychology_matches += 1
+        psychology_matches = sum(1 for _ in self.DISTRACTOR_PSYCHOLOGY_RULES.search(distractor_text))
 
         if psychology_matches >= 3:
             return 1.0, None, "Excellent distractor psychology analysis"
@@ -6,18 +6,17 @@ Runs hourly to send daily review reminders to users at their preferred time.
 import asyncio
 import logging
 from datetime import datetime
-from typing import List, Tuple
+from typing import List
 
-from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
-from app.models.models import User, UserSettings, ScheduledReview
+from app.services.reminder_targeting import ReminderTarget, get_reminder_targets
 
 logger = logging.getLogger(__name__)
 
 
-def get_users_for_reminder(db: Session, current_hour: int) -> List[Tuple[User, int]]:
+def get_users_for_reminder(db: Session, current_hour: int) -> List[ReminderTarget]:
     """
     Get users who should receive a reminder at this hour.
 
@@ -26,48 +25,10 @@ def get_users_for_reminder(db: Session, current_hour: int) -> List[Tuple[User, i
         current_hour: Current UTC hour (0-23)
 
     Returns:
-        List of (user, review_count) tuples for users with due reviews
+        Targets (with due review counts) for users with email notifications
+        and daily reminders on, a reminder in this hour, and reviews due
     """
-    # Find users with:
-    # - email_notifications = True
-    # - daily_reminder = True
-    # - reminder_time hour matches current UTC hour
-    users_with_settings = db.query(User, UserSettings).join(
-        UserSettings, User.id == UserSettings.user_id
-    ).filter(
-        and_(
-            UserSettings.email_notifications == True,
-            UserSettings.daily_reminder == True,
-            UserSettings.reminder_time.isnot(None),
-            User.email.isnot(None)
-        )
-    ).all()
-
-    matching_users = []
-    now = datetime.utcnow()
-
-    for user, settings in users_with_settings:
-        # Parse reminder_time "HH:MM" and check hour
-        try:
-            reminder_hour = int(settings.reminder_time.split(":")[0])
-            if reminder_hour != current_hour:
-                continue
-        except (ValueError, AttributeError):
-            continue
-
-        # Count reviews due today
-        review_count = db.query(ScheduledReview).filter(
-            and_(
-                ScheduledReview.user_id == user.id,
-                ScheduledReview.scheduled_for <= now
-            )
-        ).count()
-
-        # Only add users who have reviews due
-        if review_count > 0:
-            matching_users.append((user, review_count))
-
-    return matching_users
+    return get_reminder_targets(db, current_hour, channel="email")
 
 
 async def send_reminders_for_hour(current_hour: int) -> int:
@@ -87,22 +48,12 @@ async def send_reminders_for_hour(current_hour: int) -> int:
     sent_count = 0
 
     try:
-        users = get_users_for_reminder(db, current_hour)
-        logger.info(f"Found {len(users)} users due for reminders at hour {current_hour}")
-
-        email_service = get_email_service()
-
-        for user, review_count in users:
-            try:
-                success = await email_service.send_review_reminder(
-                    db, user, review_count
-                )
-                if success:
-                    sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send reminder to {user.email}: {e}")
-
-        logger.info(f"Sent {sent_count}/{len(users)} reminders for hour {current_hour}")
+        targets = get_users_for_reminder(db, current_hour)
+        logger.info(f"Found {len(targets)} users due for reminders at hour {current_hour}")
+
+        sent_count = await get_email_service().send_review_reminders(db, targets)
+
+        logger.info(f"Sent {sent_count}/{len(targets)} reminders for hour {current_hour}")
 
     except Exception as e:
         logger.error(f"Error in reminder scheduler: {e}")
@@ -4,18 +4,28 @@ Handles sending and logging all email notifications.
 """
 
 import os
+import asyncio
 import logging
 import secrets
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 
-from app.models.models import User, UserSettings, EmailLog, UnsubscribeToken
+from app.models.models import User, UserSettings, EmailLog, UnsubscribeToken, generate_uuid
 from app.services.email.email_templates import render_template
+from app.utils.fanout import chunked, gather_bounded
+
+if TYPE_CHECKING:
+    from app.services.reminder_targeting import ReminderTarget
 
 logger = logging.getLogger(__name__)
 
+# Bulk sends: messages per Resend batch call (API maximum 100) and batch calls in flight
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "2"))
+
 # Lazy-loaded Resend client
 _resend = None
 
@@ -34,6 +44,16 @@ def get_resend():
     return _resend
 
 
+@dataclass
+class OutgoingEmail:
+    """One rendered message for send_bulk."""
+
+    user_id: str
+    to_email: str
+    subject: str
+    html_content: str
+
+
 class EmailService:
     """
     Email service for sending transactional emails.
@@ -246,6 +266,132 @@ class EmailService:
             html_content=html_content
         )
 
+    def _create_unsubscribe_tokens(
+        self,
+        db: Session,
+        user_ids: List[str],
+        email_type: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Generate unsubscribe tokens for many users with one bulk insert (not committed)."""
+        now = datetime.utcnow()
+        tokens = {user_id: secrets.token_urlsafe(32) for user_id in user_ids}
+        db.bulk_insert_mappings(UnsubscribeToken, [
+            {"id": generate_uuid(), "user_id": user_id, "token": token,
+             "email_type": email_type, "created_at": now}
+            for user_id, token in tokens.items()
+        ])
+        return tokens
+
+    async def send_review_reminders(self, db: Session, targets: List["ReminderTarget"]) -> int:
+        """
+        Send daily review reminders to pre-computed targets.
+
+        Targets come from reminder_targeting.get_reminder_targets, which
+        already applied the notification settings, so no per-user lookups
+        happen here. Returns the number of reminders sent.
+        """
+        targets = [t for t in targets if t.email]
+        if not targets:
+            return 0
+
+        tokens = self._create_unsubscribe_tokens(db, [t.user_id for t in targets], "reminder")
+        messages = []
+        for target in targets:
+            context = {
+                "first_name": target.first_name or "there",
+                "review_count": target.review_count,
+                "review_url": f"{self.frontend_url}/reviews",
+                "unsubscribe_url": self._get_unsubscribe_url(tokens[target.user_id])
+            }
+            messages.append(OutgoingEmail(
+                user_id=target.user_id,
+                to_email=target.email,
+                subject=f"You have {target.review_count} questions to review today",
+                html_content=render_template("review_reminder.html", context)
+            ))
+
+        results = await self.send_bulk(db, "reminder", messages)
+        return sum(results)
+
+    async def send_bulk(self, db: Session, email_type: str, messages: List[OutgoingEmail]) -> List[bool]:
+        """
+        Send many emails through Resend's batch API and log them in bulk.
+
+        Messages go out in batches of EMAIL_BATCH_SIZE with at most
+        EMAIL_SEND_CONCURRENCY batch calls in flight (each on a worker
+        thread, since the Resend client is blocking). EmailLog rows are
+        written once all batches finish.
+
+        Returns:
+            Per-message success flags, in input order
+        """
+        if not messages:
+            return []
+
+        resend = get_resend()
+        if resend:
+            batches = chunked(messages, EMAIL_BATCH_SIZE)
+            batch_outcomes = await gather_bounded(
+                batches,
+                lambda batch: asyncio.to_thread(self._send_batch, resend, batch),
+                EMAIL_SEND_CONCURRENCY
+            )
+            outcomes: List[Tuple[Optional[str], Optional[str]]] = []
+            for batch, result in zip(batches, batch_outcomes):
+                outcomes.extend(result or [(None, "Batch send failed")] * len(batch))
+        else:
+            outcomes = [(None, "Resend API key not configured")] * len(messages)
+
+        now = datetime.utcnow()
+        db.bulk_insert_mappings(EmailLog, [
+            {
+                "id": generate_uuid(),
+                "user_id": message.user_id,
+                "email_type": email_type,
+                "recipient_email": message.to_email,
+                "subject": message.subject,
+                "provider": "resend",
+                "provider_message_id": message_id,
+                "status": "failed" if error else "sent",
+                "sent_at": None if error else now,
+                "error_message": error,
+                "created_at": now
+            }
+            for message, (message_id, error) in zip(messages, outcomes)
+        ])
+        db.commit()
+
+        sent = [error is None for _, error in outcomes]
+        logger.info(f"Bulk {email_type} emails: {sum(sent)}/{len(messages)} sent")
+        return sent
+
+    def _send_batch(self, resend, batch: List[OutgoingEmail]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Send one batch; returns (provider message id, error) per message."""
+        payloads = [
+            {"from": self.from_email, "to": [m.to_email], "subject": m.subject, "html": m.html_content}
+            for m in batch
+        ]
+
+        batch_api = getattr(resend, "Batch", None)
+        if batch_api is not None and len(payloads) > 1:
+            try:
+                result = batch_api.send(payloads)
+                data = (result.get("data") if isinstance(result, dict) else result) or []
+                ids = [item.get("id") for item in data][:len(payloads)]
+                return [(message_id, None) for message_id in ids + [None] * (len(payloads) - len(ids))]
+            except Exception as e:
+                logger.error(f"Resend batch send failed: {e}")
+                return [(None, str(e))] * len(payloads)
+
+        outcomes = []
+        for payload in payloads:
+            try:
+                result = resend.Emails.send(payload)
+                outcomes.append((result.get("id"), None))
+            except Exception as e:
+                outcomes.append((None, str(e)))
+        return outcomes
+
     async def _send_and_log(
         self,
         db: Session,
@@ -1,44 +1,147 @@
 """
 Weekly Email Digest Service.
 Sends weekly progress reports to users every Sunday.
+
+The weekly job (send_weekly_digests / run_weekly_digests) is a pipeline
+rather than a per-user loop:
+
+1. Recipients: one grouped query over the daily activity rollup selects
+   every user with activity in the week, an address and email enabled,
+   excluding users who already have a digest EmailLog for this week.
+2. Details: per chunk of DIGEST_CHUNK_SIZE users, engagement, predicted
+   score, score change, weak areas and due reviews are each loaded with
+   one grouped query for the whole chunk.
+3. Render: templates are rendered on a pool of DIGEST_RENDER_WORKERS
+   threads so the event loop (shared with the API) stays responsive.
+4. Send: EmailService.send_bulk (Resend batch API, bounded concurrency),
+   which commits the chunk's EmailLog rows.
+
+The EmailLog commit after each chunk is the checkpoint: a rerun after a
+crash skips everyone already sent this week. With dry_run=True nothing
+is written or sent and the run reports throughput in digests/sec.
 """
 
+import os
 import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, case, exists, distinct
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.models.models import (
-    User, UserSettings, QuestionAttempt, ScheduledReview,
-    UserEngagementScore, UserPerformance, ScorePredictionHistory
+    User, UserSettings, QuestionAttempt, ScheduledReview, EmailLog, Question,
+    UserEngagementScore, UserPerformance, ScorePredictionHistory, UserDailyActivity
 )
-from app.services.email.email_service import get_email_service
+from app.services.daily_activity import get_daily_activity
+from app.services.email.email_service import EmailService, OutgoingEmail, get_email_service
 from app.services.email.email_templates import render_template
+from app.utils.fanout import chunked
 
 logger = logging.getLogger(__name__)
 
+DIGEST_EMAIL_TYPE = "digest"
+
+# Users per pipeline chunk (one set of detail queries and one checkpoint each)
+DIGEST_CHUNK_SIZE = int(os.getenv("DIGEST_CHUNK_SIZE", "500"))
+DIGEST_RENDER_WORKERS = int(os.getenv("DIGEST_RENDER_WORKERS", "4"))
+
+# EmailLog statuses that do not count as delivered for the resume checkpoint
+_UNSENT_STATUSES = ("queued", "failed")
+
+# Weak area thresholds: at least this many attempts and accuracy below this percentage
+WEAK_AREA_MIN_ATTEMPTS = 5
+WEAK_AREA_MAX_ACCURACY = 70
+MAX_WEAK_AREAS = 5
+
+_render_executor: Optional[ThreadPoolExecutor] = None
+
+
+@dataclass
+class DigestData:
+    """Everything one user's digest shows."""
+
+    user_id: str
+    email: str
+    first_name: Optional[str]
+    questions_answered: int
+    correct_count: int
+    study_days: int
+    current_streak: int = 0
+    best_streak: int = 0
+    streak_at_risk: bool = False
+    predicted_score: Optional[int] = None
+    score_change: Optional[int] = None
+    weak_areas: List[Dict[str, Any]] = field(default_factory=list)
+    reviews_due: int = 0
+
+    @property
+    def accuracy(self) -> int:
+        if not self.questions_answered:
+            return 0
+        return round((self.correct_count / self.questions_answered) * 100)
+
+
+@dataclass
+class DigestRunResult:
+    """Outcome of one weekly digest run."""
+
+    eligible: int = 0
+    already_sent: int = 0
+    rendered: int = 0
+    sent: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def digests_per_second(self) -> float:
+        return self.rendered / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "eligible": self.eligible,
+            "already_sent": self.already_sent,
+            "rendered": self.rendered,
+            "sent": self.sent,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "digests_per_second": round(self.digests_per_second, 1),
+            "dry_run": self.dry_run
+        }
+
+
+def digest_week(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """The digest window: the 7 whole UTC days before today's midnight."""
+    now = now or datetime.utcnow()
+    week_end = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return week_end - timedelta(days=7), week_end
+
 
 def get_weekly_stats(db: Session, user_id: str, week_start: datetime, week_end: datetime) -> Dict[str, Any]:
     """
     Calculate weekly statistics for a user.
 
+    Reads the daily activity rollup, so the window is whole UTC days:
+    week_start's day through the day before week_end (the digest passes
+    midnight boundaries).
+
     Returns:
         Dict with questions_answered, accuracy, study_days, etc.
     """
-    # Get all attempts for the week
-    attempts = db.query(QuestionAttempt).filter(
-        and_(
-            QuestionAttempt.user_id == user_id,
-            QuestionAttempt.attempted_at >= week_start,
-            QuestionAttempt.attempted_at < week_end
-        )
-    ).all()
+    days = get_daily_activity(
+        db, user_id,
+        start_day=week_start.date(),
+        end_day=(week_end - timedelta(microseconds=1)).date()
+    )
+    questions_answered = sum(day.questions_answered for day in days)
 
-    if not attempts:
+    if not questions_answered:
         return {
             "questions_answered": 0,
             "accuracy": 0,
@@ -46,20 +149,44 @@ def get_weekly_stats(db: Session, user_id: str, week_start: datetime, week_end:
             "correct_count": 0
         }
 
-    correct_count = sum(1 for a in attempts if a.is_correct)
-    accuracy = round((correct_count / len(attempts)) * 100) if attempts else 0
-
-    # Count unique study days
-    study_days = len(set(a.attempted_at.date() for a in attempts))
+    correct_count = sum(day.questions_correct for day in days)
+    accuracy = round((correct_count / questions_answered) * 100)
 
     return {
-        "questions_answered": len(attempts),
+        "questions_answered": questions_answered,
         "accuracy": accuracy,
-        "study_days": study_days,
+        "study_days": len(days),
         "correct_count": correct_count
     }
 
 
+def _area_label():
+    """SQL expression for the digest's area name: specialty, else source, else Unknown."""
+    return func.coalesce(
+        func.nullif(Question.specialty, ""),
+        func.nullif(Question.source, ""),
+        "Unknown"
+    )
+
+
+def _weak_areas_from_counts(counts: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+    """Turn (area, correct, total) counts into the weakest-first weak area list."""
+    weak_areas = []
+    for area, correct, total in counts:
+        if total >= WEAK_AREA_MIN_ATTEMPTS:
+            accuracy = round((correct / total) * 100)
+            if accuracy < WEAK_AREA_MAX_ACCURACY:
+                weak_areas.append({
+                    "name": area.replace("_", " ").title(),
+                    "accuracy": accuracy,
+                    "attempts": total
+                })
+
+    # Sort by accuracy ascending (weakest first)
+    weak_areas.sort(key=lambda x: x["accuracy"])
+    return weak_areas[:MAX_WEAK_AREAS]
+
+
 def get_weak_areas(db: Session, user_id: str, week_start: datetime, week_end: datetime) -> List[Dict[str, Any]]:
     """
     Get weak areas from the past week based on accuracy by specialty.
@@ -67,46 +194,66 @@ def get_weak_areas(db: Session, user_id: str, week_start: datetime, week_end: da
     Returns:
         List of {name, accuracy, attempts} dicts sorted by accuracy ascending
     """
-    from app.models.models import Question
-
-    # Get attempts with questions to get specialty
-    attempts = db.query(
-        QuestionAttempt, Question
+    return _get_weak_areas_by_user(db, [user_id], week_start, week_end).get(user_id, [])
+
+
+def _get_weak_areas_by_user(
+    db: Session,
+    user_ids: List[str],
+    week_start: datetime,
+    week_end: datetime
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Weak areas for many users from one grouped attempts query."""
+    area = _area_label()
+    rows = db.query(
+        QuestionAttempt.user_id,
+        area,
+        func.sum(case((QuestionAttempt.is_correct == True, 1), else_=0)),
+        func.count(QuestionAttempt.id)
     ).join(
         Question, QuestionAttempt.question_id == Question.id
     ).filter(
-        and_(
-            QuestionAttempt.user_id == user_id,
-            QuestionAttempt.attempted_at >= week_start,
-            QuestionAttempt.attempted_at < week_end
-        )
+        QuestionAttempt.user_id.in_(user_ids),
+        QuestionAttempt.attempted_at >= week_start,
+        QuestionAttempt.attempted_at < week_end
+    ).group_by(
+        QuestionAttempt.user_id, area
+    ).having(
+        func.count(QuestionAttempt.id) >= WEAK_AREA_MIN_ATTEMPTS
     ).all()
 
-    # Group by specialty
-    specialty_stats = {}
-    for attempt, question in attempts:
-        specialty = question.specialty or question.source or "Unknown"
-        if specialty not in specialty_stats:
-            specialty_stats[specialty] = {"correct": 0, "total": 0}
-        specialty_stats[specialty]["total"] += 1
-        if attempt.is_correct:
-            specialty_stats[specialty]["correct"] += 1
-
-    # Calculate accuracy and filter weak areas (< 70% with at least 5 attempts)
-    weak_areas = []
-    for specialty, stats in specialty_stats.items():
-        if stats["total"] >= 5:
-            accuracy = round((stats["correct"] / stats["total"]) * 100)
-            if accuracy < 70:
-                weak_areas.append({
-                    "name": specialty.replace("_", " ").title(),
-                    "accuracy": accuracy,
-                    "attempts": stats["total"]
-                })
-
-    # Sort by accuracy ascending (weakest first)
-    weak_areas.sort(key=lambda x: x["accuracy"])
-    return weak_areas[:5]  # Top 5 weak areas
+    counts: Dict[str, List[Tuple[str, int, int]]] = {}
+    for user_id, label, correct, total in rows:
+        counts.setdefault(user_id, []).append((label, correct or 0, total))
+    return {user_id: _weak_areas_from_counts(user_counts) for user_id, user_counts in counts.items()}
+
+
+def _latest_predictions(
+    db: Session,
+    user_ids: List[str],
+    start: datetime,
+    end: Optional[datetime] = None
+) -> Dict[str, int]:
+    """Each user's most recent ScorePredictionHistory score in [start, end)."""
+    window = [
+        ScorePredictionHistory.user_id.in_(user_ids),
+        ScorePredictionHistory.calculated_at >= start
+    ]
+    if end is not None:
+        window.append(ScorePredictionHistory.calculated_at < end)
+
+    latest = db.query(
+        ScorePredictionHistory.user_id.label("user_id"),
+        func.max(ScorePredictionHistory.calculated_at).label("calculated_at")
+    ).filter(*window).group_by(ScorePredictionHistory.user_id).subquery()
+
+    rows = db.query(
+        ScorePredictionHistory.user_id, ScorePredictionHistory.predicted_score
+    ).join(latest, and_(
+        ScorePredictionHistory.user_id == latest.c.user_id,
+        ScorePredictionHistory.calculated_at == latest.c.calculated_at
+    )).all()
+    return dict(rows)
 
 
 def get_score_change(db: Session, user_id: str) -> Optional[int]:
@@ -116,31 +263,206 @@ def get_score_change(db: Session, user_id: str) -> Optional[int]:
     Returns:
         Score change (positive or negative) or None if not enough data
     """
-    now = datetime.utcnow()
+    return _get_score_changes(db, [user_id], datetime.utcnow()).get(user_id)
+
+
+def _get_score_changes(db: Session, user_ids: List[str], now: datetime) -> Dict[str, int]:
+    """Predicted score change (this week's latest minus last week's latest) per user."""
     week_ago = now - timedelta(days=7)
-    two_weeks_ago = now - timedelta(days=14)
+    current = _latest_predictions(db, user_ids, week_ago)
+    previous = _latest_predictions(db, user_ids, now - timedelta(days=14), week_ago)
+    return {
+        user_id: score - previous[user_id]
+        for user_id, score in current.items()
+        if user_id in previous
+    }
+
 
-    # Get most recent prediction
-    current = db.query(ScorePredictionHistory).filter(
-        and_(
-            ScorePredictionHistory.user_id == user_id,
-            ScorePredictionHistory.calculated_at >= week_ago
+def _get_latest_performance_scores(db: Session, user_ids: List[str]) -> Dict[str, Optional[int]]:
+    """Predicted score from each user's most recent UserPerformance row."""
+    latest = db.query(
+        UserPerformance.user_id.label("user_id"),
+        func.max(UserPerformance.calculated_at).label("calculated_at")
+    ).filter(
+        UserPerformance.user_id.in_(user_ids)
+    ).group_by(UserPerformance.user_id).subquery()
+
+    rows = db.query(
+        UserPerformance.user_id, UserPerformance.predicted_score
+    ).join(latest, and_(
+        UserPerformance.user_id == latest.c.user_id,
+        UserPerformance.calculated_at == latest.c.calculated_at
+    )).all()
+    return dict(rows)
+
+
+def get_digest_recipients(db: Session, week_start: datetime, week_end: datetime) -> List[DigestData]:
+    """
+    Users due a digest this week, with their week totals.
+
+    One grouped query over user_daily_activity joined to users and their
+    settings. Users without activity, without an address or with email
+    notifications off are left out, as is anyone with a delivered digest
+    logged since week_end (the resume checkpoint). Ordered by user id.
+    """
+    already_sent = exists().where(and_(
+        EmailLog.user_id == User.id,
+        EmailLog.email_type == DIGEST_EMAIL_TYPE,
+        EmailLog.status.notin_(_UNSENT_STATUSES),
+        EmailLog.created_at >= week_end
+    ))
+
+    answered = func.sum(UserDailyActivity.questions_answered)
+    rows = db.query(
+        User.id,
+        User.email,
+        User.first_name,
+        answered,
+        func.sum(UserDailyActivity.questions_correct),
+        func.count(distinct(UserDailyActivity.day))
+    ).join(
+        UserDailyActivity, UserDailyActivity.user_id == User.id
+    ).outerjoin(
+        UserSettings, UserSettings.user_id == User.id
+    ).filter(
+        User.email.isnot(None),
+        or_(UserSettings.email_notifications.is_(None), UserSettings.email_notifications == True),
+        UserDailyActivity.day >= week_start.date(),
+        UserDailyActivity.day < week_end.date(),
+        ~already_sent
+    ).group_by(
+        User.id, User.email, User.first_name
+    ).having(answered > 0).order_by(User.id).all()
+
+    return [
+        DigestData(
+            user_id=user_id,
+            email=email,
+            first_name=first_name,
+            questions_answered=questions_answered,
+            correct_count=correct_count or 0,
+            study_days=study_days
         )
-    ).order_by(ScorePredictionHistory.calculated_at.desc()).first()
-
-    # Get prediction from a week ago
-    previous = db.query(ScorePredictionHistory).filter(
-        and_(
-            ScorePredictionHistory.user_id == user_id,
-            ScorePredictionHistory.calculated_at >= two_weeks_ago,
-            ScorePredictionHistory.calculated_at < week_ago
+        for user_id, email, first_name, questions_answered, correct_count, study_days in rows
+    ]
+
+
+def count_sent_digests(db: Session, week_end: datetime) -> int:
+    """Users whose digest for the week ending at week_end was already delivered."""
+    return db.query(func.count(distinct(EmailLog.user_id))).filter(
+        EmailLog.email_type == DIGEST_EMAIL_TYPE,
+        EmailLog.status.notin_(_UNSENT_STATUSES),
+        EmailLog.created_at >= week_end
+    ).scalar() or 0
+
+
+def load_digest_details(
+    db: Session,
+    digests: List[DigestData],
+    week_start: datetime,
+    week_end: datetime,
+    now: Optional[datetime] = None
+) -> List[DigestData]:
+    """
+    Fill in streaks, scores, weak areas and due reviews for a chunk of digests.
+
+    Each detail is one query for the whole chunk (keep chunks within
+    DIGEST_CHUNK_SIZE so the IN lists stay small). Updates in place.
+    """
+    if not digests:
+        return digests
+
+    now = now or datetime.utcnow()
+    user_ids = [d.user_id for d in digests]
+
+    engagement = {
+        e.user_id: e for e in db.query(UserEngagementScore).filter(
+            UserEngagementScore.user_id.in_(user_ids)
         )
-    ).order_by(ScorePredictionHistory.calculated_at.desc()).first()
+    }
+    predicted = _get_latest_performance_scores(db, user_ids)
+    score_changes = _get_score_changes(db, user_ids, now)
+    weak_areas = _get_weak_areas_by_user(db, user_ids, week_start, week_end)
+    reviews_due = dict(db.query(
+        ScheduledReview.user_id, func.count(ScheduledReview.id)
+    ).filter(
+        ScheduledReview.user_id.in_(user_ids),
+        ScheduledReview.scheduled_for <= now
+    ).group_by(ScheduledReview.user_id).all())
+
+    for digest in digests:
+        score = engagement.get(digest.user_id)
+        if score:
+            digest.current_streak = score.streak_current or 0
+            digest.best_streak = score.streak_best or 0
+            if score.last_activity_at:
+                days_since = (now - score.last_activity_at).days
+                digest.streak_at_risk = days_since >= 1 and digest.current_streak > 0
+        digest.predicted_score = predicted.get(digest.user_id)
+        digest.score_change = score_changes.get(digest.user_id)
+        digest.weak_areas = weak_areas.get(digest.user_id, [])
+        digest.reviews_due = reviews_due.get(digest.user_id, 0)
+
+    return digests
+
+
+def _digest_message(
+    email_service: EmailService,
+    digest: DigestData,
+    week_start: datetime,
+    week_end: datetime,
+    unsubscribe_url: str
+) -> Tuple[str, Dict[str, Any]]:
+    """Subject line and template context for one digest."""
+    context = {
+        "first_name": digest.first_name or "there",
+        "week_start": week_start.strftime("%b %d"),
+        "week_end": (week_end - timedelta(days=1)).strftime("%b %d"),
+        "questions_answered": digest.questions_answered,
+        "accuracy": digest.accuracy,
+        "current_streak": digest.current_streak,
+        "best_streak": digest.best_streak,
+        "streak_at_risk": digest.streak_at_risk,
+        "predicted_score": digest.predicted_score,
+        "score_change": digest.score_change,
+        "weak_areas": digest.weak_areas,
+        "reviews_due": digest.reviews_due,
+        "study_url": f"{email_service.frontend_url}/study",
+        "unsubscribe_url": unsubscribe_url
+    }
+    subject = f"Your Weekly Progress: {digest.questions_answered} questions, {digest.accuracy}% accuracy"
+    return subject, context
+
+
+def _get_render_executor() -> ThreadPoolExecutor:
+    """Lazily create the shared template rendering pool."""
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ThreadPoolExecutor(
+            max_workers=max(1, DIGEST_RENDER_WORKERS),
+            thread_name_prefix="digest-render"
+        )
+    return _render_executor
+
 
-    if current and previous:
-        return current.predicted_score - previous.predicted_score
+def _render_digest_batch(contexts: List[Dict[str, Any]]) -> List[str]:
+    return [render_template("weekly_digest.html", context) for context in contexts]
 
-    return None
+
+async def render_digests(contexts: List[Dict[str, Any]]) -> List[str]:
+    """Render digest templates on the worker pool, returning HTML in input order."""
+    if not contexts:
+        return []
+
+    loop = asyncio.get_running_loop()
+    executor = _get_render_executor()
+    # One slice per worker keeps executor overhead per chunk, not per message
+    slice_size = -(-len(contexts) // max(1, DIGEST_RENDER_WORKERS))
+    rendered = await asyncio.gather(*(
+        loop.run_in_executor(executor, _render_digest_batch, batch)
+        for batch in chunked(contexts, slice_size)
+    ))
+    return [html for batch in rendered for html in batch]
 
 
 async def send_weekly_digest(db: Session, user: User) -> bool:
@@ -162,11 +484,8 @@ async def send_weekly_digest(db: Session, user: User) -> bool:
         return False
 
     email_service = get_email_service()
-
-    # Calculate week range (last 7 days)
     now = datetime.utcnow()
-    week_end = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = week_end - timedelta(days=7)
+    week_start, week_end = digest_week(now)
 
     # Get weekly stats
     stats = get_weekly_stats(db, user.id, week_start, week_end)
@@ -176,112 +495,125 @@ async def send_weekly_digest(db: Session, user: User) -> bool:
         logger.info(f"Skipping digest for {user.email} - no activity")
         return False
 
-    # Get engagement data
-    engagement = db.query(UserEngagementScore).filter(
-        UserEngagementScore.user_id == user.id
-    ).first()
-
-    current_streak = engagement.streak_current if engagement else 0
-    best_streak = engagement.streak_best if engagement else 0
-    streak_at_risk = False
-
-    if engagement and engagement.last_activity_at:
-        days_since = (now - engagement.last_activity_at).days
-        streak_at_risk = days_since >= 1 and current_streak > 0
-
-    # Get performance data for predicted score
-    performance = db.query(UserPerformance).filter(
-        UserPerformance.user_id == user.id
-    ).order_by(UserPerformance.calculated_at.desc()).first()
-
-    predicted_score = performance.predicted_score if performance else None
-    score_change = get_score_change(db, user.id)
-
-    # Get weak areas
-    weak_areas = get_weak_areas(db, user.id, week_start, week_end)
-
-    # Count reviews due
-    reviews_due = db.query(ScheduledReview).filter(
-        and_(
-            ScheduledReview.user_id == user.id,
-            ScheduledReview.scheduled_for <= now
-        )
-    ).count()
+    digest = DigestData(
+        user_id=user.id,
+        email=user.email,
+        first_name=user.first_name,
+        questions_answered=stats["questions_answered"],
+        correct_count=stats["correct_count"],
+        study_days=stats["study_days"]
+    )
+    load_digest_details(db, [digest], week_start, week_end, now)
 
     # Generate unsubscribe token
-    unsub_token = email_service._generate_unsubscribe_token(db, user.id, "digest")
-    unsubscribe_url = email_service._get_unsubscribe_url(unsub_token)
-
-    # Render template
-    context = {
-        "first_name": user.first_name or "there",
-        "week_start": week_start.strftime("%b %d"),
-        "week_end": (week_end - timedelta(days=1)).strftime("%b %d"),
-        "questions_answered": stats["questions_answered"],
-        "accuracy": stats["accuracy"],
-        "current_streak": current_streak,
-        "best_streak": best_streak,
-        "streak_at_risk": streak_at_risk,
-        "predicted_score": predicted_score,
-        "score_change": score_change,
-        "weak_areas": weak_areas,
-        "reviews_due": reviews_due,
-        "study_url": f"{email_service.frontend_url}/study",
-        "unsubscribe_url": unsubscribe_url
-    }
-
-    html_content = render_template("weekly_digest.html", context)
-    subject = f"Your Weekly Progress: {stats['questions_answered']} questions, {stats['accuracy']}% accuracy"
+    unsub_token = email_service._generate_unsubscribe_token(db, user.id, DIGEST_EMAIL_TYPE)
+    subject, context = _digest_message(
+        email_service, digest, week_start, week_end,
+        email_service._get_unsubscribe_url(unsub_token)
+    )
 
     return await email_service._send_and_log(
         db=db,
         user_id=user.id,
-        email_type="digest",
+        email_type=DIGEST_EMAIL_TYPE,
         to_email=user.email,
         subject=subject,
-        html_content=html_content
+        html_content=render_template("weekly_digest.html", context)
     )
 
 
-async def send_weekly_digests() -> int:
+async def run_weekly_digests(
+    db: Session,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None
+) -> DigestRunResult:
+    """
+    Run the weekly digest pipeline for every eligible user.
+
+    Chunks run one after another; each chunk's send_bulk commits its
+    EmailLog rows, so an interrupted run resumes where it stopped. With
+    dry_run=True digests are prepared and rendered but nothing is sent or
+    written, which measures pipeline throughput.
+
+    Returns:
+        DigestRunResult with counts and digests/sec
+    """
+    email_service = get_email_service()
+    now = now or datetime.utcnow()
+    week_start, week_end = digest_week(now)
+    result = DigestRunResult(dry_run=dry_run)
+    started = time.perf_counter()
+
+    result.already_sent = count_sent_digests(db, week_end)
+    recipients = get_digest_recipients(db, week_start, week_end)
+    result.eligible = len(recipients)
+    logger.info(
+        f"Weekly digests: {result.eligible} to send, {result.already_sent} already sent this week"
+        + (" (dry run)" if dry_run else "")
+    )
+
+    for chunk in chunked(recipients, chunk_size or DIGEST_CHUNK_SIZE):
+        load_digest_details(db, chunk, week_start, week_end, now)
+
+        if dry_run:
+            tokens = {}
+        else:
+            tokens = email_service._create_unsubscribe_tokens(
+                db, [d.user_id for d in chunk], DIGEST_EMAIL_TYPE
+            )
+
+        subjects, contexts = [], []
+        for digest in chunk:
+            subject, context = _digest_message(
+                email_service, digest, week_start, week_end,
+                email_service._get_unsubscribe_url(tokens.get(digest.user_id, "dry-run"))
+            )
+            subjects.append(subject)
+            contexts.append(context)
+
+        html = await render_digests(contexts)
+        result.rendered += len(html)
+
+        if dry_run:
+            continue
+
+        sent = await email_service.send_bulk(db, DIGEST_EMAIL_TYPE, [
+            OutgoingEmail(user_id=d.user_id, to_email=d.email, subject=subject, html_content=content)
+            for d, subject, content in zip(chunk, subjects, html)
+        ])
+        result.sent += sum(sent)
+        result.failed += len(sent) - sum(sent)
+
+    result.elapsed_seconds = time.perf_counter() - started
+    logger.info(
+        f"Weekly digests: {result.sent} sent, {result.failed} failed, {result.rendered} rendered "
+        f"in {result.elapsed_seconds:.1f}s ({result.digests_per_second:.1f} digests/sec)"
+    )
+    return result
+
+
+async def send_weekly_digests(dry_run: bool = False) -> int:
     """
     Send weekly digests to all eligible users.
     Should be called once per week (e.g., Sunday morning).
 
     Returns:
-        Number of digests sent
+        Number of digests sent (rendered, for a dry run)
     """
     db = SessionLocal()
-    sent_count = 0
 
     try:
-        # Get all users with email notifications enabled
-        users = db.query(User).join(
-            UserSettings, User.id == UserSettings.user_id, isouter=True
-        ).filter(
-            User.email.isnot(None)
-        ).all()
-
-        logger.info(f"Sending weekly digests to {len(users)} users")
-
-        for user in users:
-            try:
-                success = await send_weekly_digest(db, user)
-                if success:
-                    sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send digest to {user.email}: {e}")
-
-        logger.info(f"Sent {sent_count} weekly digests")
+        result = await run_weekly_digests(db, dry_run=dry_run)
+        return result.rendered if dry_run else result.sent
 
     except Exception as e:
         logger.error(f"Error in weekly digest job: {e}")
+        return 0
 
     finally:
         db.close()
 
-    return sent_count
-
 
 async def run_weekly_digest_scheduler():
     """
@@ -0,0 +1,648 @@
+"""
+Pipelined Question Generation Executor
+
+Runs the six QuestionGenerationAgent steps for many questions at once.
+Each step is a stage with its own bounded thread pool, and a question
+moves to the next stage as soon as that stage's inputs are ready, so
+scenario writing for question 7 overlaps validation of question 2.
+
+Stage DAG (STAGE_DEPENDENCIES):
+
+    examples ─► analysis ─► scenario ─┬─► choices ─► explanation ─┐
+                (per specialty)       └─► vignette ───────────────┴─► validation
+
+- examples/analysis run once per specialty and are shared by every
+  question of that specialty for ANALYSIS_TTL_SECONDS (step 1 only
+  depends on the example set)
+- the vignette (step 4) needs only the scenario and analysis, so it is
+  written while the choices (step 3) are generated
+- the scenario, choices and vignette scoring checkpoints abort the attempt
+  early; in-flight work for an aborted attempt is discarded and the
+  question restarts from the scenario (analysis is kept), up to
+  max_retries times
+
+Every stage thread uses its own agent and SQLAlchemy session (only the
+examples stage queries the database, and it ends its transaction after
+each query). LLM stages share a token bucket of
+GENERATION_LLM_RPM calls per minute, so throughput grows with concurrency
+until that limit. Per-stage latency histograms are reported by get_stats().
+
+Configuration (env):
+    GENERATION_CONCURRENCY     threads per LLM stage (default 8)
+    GENERATION_LLM_RPM         LLM calls per minute across stages (default 300, 0 = unlimited)
+    GENERATION_ANALYSIS_TTL_SECONDS  reuse a specialty's step 1 analysis this long (default 3600)
+    GENERATION_TIMEOUT_SECONDS       wait this long for one question from generate_question_parallel (default 300)
+
+Usage:
+    from app.services.generation_executor import get_generation_executor
+
+    executor = get_generation_executor()
+    questions = executor.generate_batch(20, specialty="Surgery")
+    future = executor.submit(specialty="Pediatrics", difficulty="hard")
+    question = future.result()
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.database import SessionLocal
+from app.services.peer_distribution import FenwickHistogram
+from app.services.specialty_prompts import get_specialty_demographics
+from app.services.step2ck_content_outline import (
+    CLINICAL_SETTINGS,
+    get_high_yield_topic,
+    get_question_type,
+    get_weighted_specialty
+)
+from app.services.usage_counters import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "8"))
+LLM_RPM = int(os.getenv("GENERATION_LLM_RPM", "300"))
+ANALYSIS_TTL_SECONDS = float(os.getenv("GENERATION_ANALYSIS_TTL_SECONDS", "3600"))
+QUESTION_TIMEOUT_SECONDS = float(os.getenv("GENERATION_TIMEOUT_SECONDS", "300"))
+
+STAGES = ("examples", "analysis", "scenario", "choices", "vignette", "explanation", "validation")
+
+STAGE_DEPENDENCIES = {
+    "examples": (),
+    "analysis": ("examples",),
+    "scenario": ("analysis",),
+    "choices": ("scenario",),
+    "vignette": ("scenario", "analysis"),
+    "explanation": ("scenario", "choices"),
+    "validation": ("vignette", "choices", "explanation"),
+}
+
+# Stages that run once per specialty rather than once per question
+SHARED_STAGES = ("examples", "analysis")
+
+# Stages that make one LLM call (rate limited)
+LLM_STAGES = ("analysis", "scenario", "choices", "vignette", "explanation", "validation")
+
+# Scoring checkpoints: stage -> agent scoring method; scores below
+# ABORT_SCORE end the attempt early (same threshold as generate_question)
+CHECKPOINTS = {
+    "scenario": "score_clinical_scenario",
+    "choices": "score_answer_choices",
+    "vignette": "score_vignette",
+}
+ABORT_SCORE = 0.6
+
+# Stage latency histogram buckets (ms)
+LATENCY_EDGES_MS = [0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+_DEPENDENTS = {
+    stage: tuple(s for s in STAGES if stage in STAGE_DEPENDENCIES[s])
+    for stage in STAGES
+}
+
+
+def _resolve(future: Future, result: Any = None, error: Optional[BaseException] = None):
+    """Set a job's outcome unless the caller already cancelled it (e.g. after a timeout)."""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class EarlyAbort(Exception):
+    """A scoring checkpoint or validation rejected the current attempt."""
+
+    def __init__(self, stage: str, score: Optional[float], issues: List[str]):
+        self.stage = stage
+        self.score = score
+        self.issues = issues
+        super().__init__(f"{stage} rejected: {', '.join(issues) or 'no issues reported'}")
+
+
+class RateLimiter:
+    """Blocking token bucket shared by the LLM stage threads (bursts up to one second's calls)."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._bucket = None
+        if per_minute > 0:
+            burst = max(1, per_minute // 60)
+            self._bucket = TokenBucket(burst, 60.0 * burst / per_minute)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one call slot, sleeping until one is free. Returns seconds waited."""
+        if self._bucket is None:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                if self._bucket.take():
+                    return waited
+                delay = (1 - self._bucket.available()) / self._bucket.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class StageLatency:
+    """Latency histogram for one stage (quantiles are bucket lower edges)."""
+
+    def __init__(self):
+        self._hist = FenwickHistogram(LATENCY_EDGES_MS)
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ms: float):
+        with self._lock:
+            self._hist.add(ms)
+            self._max_ms = max(self._max_ms, ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hist = self._hist
+            buckets = {}
+            for i, edge in enumerate(LATENCY_EDGES_MS):
+                count = hist.count_below_bucket(i + 1) - hist.count_below_bucket(i)
+                upper = LATENCY_EDGES_MS[i + 1] if i + 1 < len(LATENCY_EDGES_MS) else None
+                buckets[f"{edge}-{upper}ms" if upper is not None else f"{edge}ms+"] = count
+            return {
+                "count": hist.count,
+                "mean_ms": round(hist.mean, 2) if hist.count else 0.0,
+                "p50_ms": hist.quantile(0.5) or 0,
+                "p95_ms": hist.quantile(0.95) or 0,
+                "max_ms": round(self._max_ms, 2),
+                "histogram": buckets,
+            }
+
+
+@dataclass
+class GenerationJob:
+    """One question moving through the stage DAG."""
+
+    index: int
+    specialty: str
+    topic: str
+    difficulty: str
+    question_type: str
+    clinical_setting: str
+    max_retries: int
+    future: Future = field(default_factory=Future)
+    attempt: int = 0
+    results: Dict[str, Any] = field(default_factory=dict)
+    started: set = field(default_factory=set)
+    quality_scores: Dict[str, float] = field(default_factory=dict)
+    step_times: Dict[str, float] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.perf_counter)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class GenerationExecutor:
+    """
+    Stage-pipelined generator for agent questions.
+
+    Pools start lazily on the first submit, like the post-answer pipeline.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = CONCURRENCY,
+        stage_workers: Optional[Dict[str, int]] = None,
+        llm_rpm: int = LLM_RPM,
+        model: str = "gpt-4o",
+        session_factory=None,
+        agent_factory: Optional[Callable] = None
+    ):
+        self.model = model
+        self.stage_workers = {stage: max(1, concurrency) for stage in LLM_STAGES}
+        self.stage_workers["examples"] = max(1, min(concurrency, 2))
+        self.stage_workers.update(stage_workers or {})
+        self.rate_limiter = RateLimiter(llm_rpm)
+        self._session_factory = session_factory or SessionLocal
+        self._agent_factory = agent_factory
+
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+        self._analyses: Dict[str, Tuple[Future, float]] = {}
+        self._analyses_lock = threading.Lock()
+        self._latency = {stage: StageLatency() for stage in STAGES}
+        self._next_index = 0
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "retries": 0,
+            "errors": 0,
+            "analyses_computed": 0,
+            "analyses_shared": 0,
+            "rate_limited_seconds": 0.0,
+            "aborts": {stage: 0 for stage in (*CHECKPOINTS, "validation")},
+        }
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, specialty: Optional[str] = None, topic: Optional[str] = None,
+               difficulty: str = "medium", max_retries: int = 2) -> Future:
+        """
+        Queue one question. The Future resolves to the same dict
+        QuestionGenerationAgent.generate_question returns, or raises once
+        max_retries + 1 attempts have failed.
+        """
+        self._ensure_started()
+        specialty = specialty or get_weighted_specialty()
+        demographics = get_specialty_demographics(specialty)
+        with self._stats_lock:
+            index = self._next_index
+            self._next_index += 1
+            self._stats["submitted"] += 1
+
+        job = GenerationJob(
+            index=index,
+            specialty=specialty,
+            topic=topic or get_high_yield_topic(specialty),
+            difficulty=difficulty,
+            question_type=get_question_type(),
+            clinical_setting=demographics.get('setting', random.choice(CLINICAL_SETTINGS)),
+            max_retries=max_retries
+        )
+        self._start_attempt(job)
+        return job.future
+
+    def generate_batch(self, count: int, specialty: Optional[str] = None,
+                       difficulty: str = "medium", max_retries: int = 1,
+                       timeout: Optional[float] = None) -> List[Dict]:
+        """Generate `count` questions concurrently; failed questions are skipped."""
+        futures = [self.submit(specialty, None, difficulty, max_retries) for _ in range(count)]
+        wait_futures(futures, timeout=timeout)
+
+        questions = []
+        for i, future in enumerate(futures):
+            if not future.done():
+                logger.warning("Pipelined question %d timed out", i + 1)
+            elif future.exception() is not None:
+                logger.warning("Pipelined question %d failed: %s", i + 1, future.exception())
+            else:
+                questions.append(future.result())
+        return questions
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._pools:
+            return
+        with self._start_lock:
+            if not self._pools:
+                self._pools = {
+                    stage: ThreadPoolExecutor(max_workers=self.stage_workers[stage],
+                                              thread_name_prefix=f"gen-{stage}")
+                    for stage in STAGES
+                }
+
+    def _agent(self):
+        """This thread's agent, bound to this thread's own session."""
+        agent = getattr(self._local, "agent", None)
+        if agent is None:
+            if self._agent_factory is None:
+                from app.services.question_agent import QuestionGenerationAgent
+                self._agent_factory = QuestionGenerationAgent
+            db = self._session_factory()
+            with self._start_lock:
+                self._sessions.append(db)
+            agent = self._local.agent = self._agent_factory(db, model=self.model)
+        return agent
+
+    @staticmethod
+    def _load_examples(agent, specialty: str) -> List[Dict[str, Any]]:
+        """Query example questions, then end the read transaction.
+
+        Examples threads sit idle between specialties; rolling back returns
+        the connection to the pool instead of leaving it idle in transaction.
+        """
+        try:
+            return agent._get_example_questions(specialty, limit=5)
+        finally:
+            agent.db.rollback()
+
+    def _run_stage(self, stage: str, work: Callable) -> Future:
+        """Run `work(agent)` on the stage pool, rate limited and timed."""
+        def run():
+            if stage in LLM_STAGES:
+                waited = self.rate_limiter.acquire()
+                if waited:
+                    with self._stats_lock:
+                        self._stats["rate_limited_seconds"] += waited
+            start = time.perf_counter()
+            try:
+                return work(self._agent()), time.perf_counter() - start
+            finally:
+                self._latency[stage].record((time.perf_counter() - start) * 1000)
+
+        pool = self._pools.get(stage)
+        if pool is None:
+            raise RuntimeError("Generation executor is shut down")
+        return pool.submit(run)
+
+    # ------------------------------------------------------------------
+    # Shared per-specialty analysis (step 1)
+    # ------------------------------------------------------------------
+
+    def _analysis_for(self, specialty: str) -> Future:
+        with self._analyses_lock:
+            shared, created = self._analyses.get(specialty, (None, 0.0))
+            if (shared is not None and time.monotonic() - created < ANALYSIS_TTL_SECONDS
+                    and not (shared.done() and shared.exception() is not None)):
+                with self._stats_lock:
+                    self._stats["analyses_shared"] += 1
+                return shared
+
+            shared = Future()
+            self._analyses[specialty] = (shared, time.monotonic())
+            with self._stats_lock:
+                self._stats["analyses_computed"] += 1
+
+        def on_examples(done: Future):
+            if done.cancelled():
+                shared.set_exception(CancelledError())
+                return
+            if done.exception() is not None:
+                shared.set_exception(done.exception())
+                return
+            examples, _ = done.result()
+            try:
+                analysis = self._run_stage(
+                    "analysis", lambda agent: agent.step1_analyze_examples(specialty, examples)
+                )
+            except RuntimeError as e:
+                shared.set_exception(e)
+                return
+            analysis.add_done_callback(on_analysis)
+
+        def on_analysis(done: Future):
+            if done.cancelled():
+                shared.set_exception(CancelledError())
+            elif done.exception() is not None:
+                shared.set_exception(done.exception())
+            else:
+                shared.set_result(done.result()[0])
+
+        try:
+            examples = self._run_stage("examples", lambda agent: self._load_examples(agent, specialty))
+        except RuntimeError as e:
+            shared.set_exception(e)
+            return shared
+        examples.add_done_callback(on_examples)
+        return shared
+
+    # ------------------------------------------------------------------
+    # DAG scheduling
+    # ------------------------------------------------------------------
+
+    def _start_attempt(self, job: GenerationJob):
+        with job.lock:
+            attempt = job.attempt
+            analysis = job.results.get("analysis")
+            job.results = {"analysis": analysis} if analysis is not None else {}
+            job.started = set(SHARED_STAGES) if analysis is not None else set()
+
+        if analysis is not None:
+            self._advance(job, attempt, "analysis")
+            return
+
+        def on_analysis(shared: Future):
+            if shared.exception() is not None:
+                self._attempt_failed(job, attempt, shared.exception())
+            else:
+                self._stage_done(job, attempt, "analysis", shared.result(), None)
+
+        self._analysis_for(job.specialty).add_done_callback(on_analysis)
+
+    def _stage_done(self, job: GenerationJob, attempt: int, stage: str,
+                    result: Any, seconds: Optional[float]):
+        with job.lock:
+            if job.attempt != attempt or job.future.done():
+                return  # Stale result from an aborted attempt
+            job.results[stage] = result
+            if seconds is not None:
+                job.step_times[stage] = round(seconds, 3)
+        self._advance(job, attempt, stage)
+
+    def _advance(self, job: GenerationJob, attempt: int, stage: str):
+        """Start every dependent stage whose inputs are now complete."""
+        with job.lock:
+            if job.attempt != attempt or job.future.done():
+                return
+            ready = [
+                s for s in _DEPENDENTS[stage]
+                if s not in job.started and all(d in job.results for d in STAGE_DEPENDENCIES[s])
+            ]
+            job.started.update(ready)
+            inputs = dict(job.results)
+
+        for s in ready:
+            try:
+                future = self._run_stage(s, lambda agent, s=s: self._execute(agent, job, attempt, s, inputs))
+            except RuntimeError as e:
+                _resolve(job.future, error=e)
+                return
+            future.add_done_callback(lambda done, s=s: self._on_stage_future(job, attempt, s, done))
+
+        if stage == "validation":
+            self._finish(job, attempt)
+
+    def _execute(self, agent, job: GenerationJob, attempt: int, stage: str,
+                 inputs: Dict[str, Any]) -> Any:
+        """Run one step for one question, then its scoring checkpoint."""
+        if job.attempt != attempt:
+            return None  # Attempt was aborted while queued; result is discarded
+        if stage == "scenario":
+            result = agent.step2_create_clinical_scenario(
+                job.specialty, job.topic, job.question_type, job.clinical_setting,
+                inputs["analysis"], job.difficulty
+            )
+        elif stage == "choices":
+            result = agent.step3_generate_answer_choices(inputs["scenario"], job.specialty, job.difficulty)
+        elif stage == "vignette":
+            result = agent.step4_write_vignette(inputs["scenario"], inputs["analysis"])
+        elif stage == "explanation":
+            result = agent.step5_create_explanation(inputs["scenario"], inputs["choices"])
+        elif stage == "validation":
+            passes, issues = agent.step6_quality_validation(
+                inputs["vignette"], inputs["choices"], inputs["explanation"],
+                inputs["scenario"], job.specialty
+            )
+            if not passes:
+                raise EarlyAbort(stage, None, issues)
+            return issues
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        if stage in CHECKPOINTS:
+            if stage == "scenario":
+                score, issues = agent.score_clinical_scenario(result, job.specialty)
+            elif stage == "vignette":
+                score, issues = agent.score_vignette(result, inputs["scenario"])
+            else:
+                score, issues = agent.score_answer_choices(result)
+            if score < ABORT_SCORE:
+                raise EarlyAbort(stage, score, issues)
+            with job.lock:
+                job.quality_scores[stage] = score
+        return result
+
+    def _on_stage_future(self, job: GenerationJob, attempt: int, stage: str, done: Future):
+        if done.cancelled():
+            return  # Dropped by shutdown(cancel_pending=True)
+        error = done.exception()
+        if error is not None:
+            self._attempt_failed(job, attempt, error)
+        else:
+            result, seconds = done.result()
+            self._stage_done(job, attempt, stage, result, seconds)
+
+    def _attempt_failed(self, job: GenerationJob, attempt: int, error: BaseException):
+        with job.lock:
+            if job.attempt != attempt or job.future.done():
+                return
+            job.attempt += 1
+            give_up = job.attempt > job.max_retries
+
+        with self._stats_lock:
+            if isinstance(error, EarlyAbort):
+                self._stats["aborts"][error.stage] += 1
+            else:
+                self._stats["errors"] += 1
+            if give_up:
+                self._stats["failed"] += 1
+            else:
+                self._stats["retries"] += 1
+
+        if isinstance(error, EarlyAbort):
+            logger.debug("Question %d attempt %d aborted at %s: %s",
+                         job.index, attempt + 1, error.stage, error)
+        else:
+            logger.warning("Question %d attempt %d failed: %s", job.index, attempt + 1, error)
+
+        if give_up:
+            if isinstance(error, EarlyAbort):
+                error = ValueError(f"Failed to generate quality question after "
+                                   f"{job.max_retries + 1} attempts: {error}")
+            _resolve(job.future, error=error)
+        else:
+            self._start_attempt(job)
+
+    def _finish(self, job: GenerationJob, attempt: int):
+        with job.lock:
+            if job.attempt != attempt or job.future.done():
+                return
+            results = job.results
+            quality_scores = dict(job.quality_scores)
+            step_times = dict(job.step_times)
+
+        choices_data = results["choices"]
+        _resolve(job.future, {
+            "vignette": results["vignette"].strip(),
+            "choices": choices_data['choices'],
+            "answer_key": choices_data['correct_answer_letter'],
+            "explanation": results["explanation"],
+            "source": f"AI Agent Generated - {job.specialty}",
+            "specialty": job.specialty,
+            "recency_weight": 1.0,
+            "metadata": {
+                "topic": job.topic,
+                "question_type": job.question_type,
+                "clinical_setting": job.clinical_setting,
+                "difficulty": job.difficulty,
+                "generation_method": "multi_step_agent_pipelined",
+                "quality_scores": quality_scores,
+                "generation_time_seconds": time.perf_counter() - job.started_at,
+                "step_times": step_times,
+                "attempts": attempt + 1
+            }
+        })
+        with self._stats_lock:
+            self._stats["completed"] += 1
+
+    # ------------------------------------------------------------------
+    # Lifecycle and stats
+    # ------------------------------------------------------------------
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop the stage pools and close the worker sessions.
+
+        With cancel_pending, queued stages are dropped instead of run. With
+        wait=False this returns at once; sessions are closed from a
+        background thread after the running stages finish, since those
+        may still be using them.
+        """
+        with self._start_lock:
+            pools, self._pools = self._pools, {}
+            sessions, self._sessions = self._sessions, []
+        for pool in pools.values():
+            pool.shutdown(wait=wait, cancel_futures=cancel_pending)
+        with self._analyses_lock:
+            self._analyses.clear()
+
+        if wait:
+            self._close_sessions(pools, sessions)
+        else:
+            threading.Thread(
+                target=self._close_sessions, args=(pools, sessions),
+                name="gen-shutdown", daemon=True
+            ).start()
+
+    @staticmethod
+    def _close_sessions(pools, sessions):
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+        for db in sessions:
+            db.close()
+
+    def __enter__(self) -> "GenerationExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats["aborts"] = dict(self._stats["aborts"])
+        stats["rate_limited_seconds"] = round(stats["rate_limited_seconds"], 2)
+        stats.update({
+            "in_flight": stats["submitted"] - stats["completed"] - stats["failed"],
+            "stage_workers": dict(self.stage_workers),
+            "llm_rpm": self.rate_limiter.per_minute,
+            "stages": {stage: self._latency[stage].get_stats() for stage in STAGES},
+        })
+        return stats
+
+
+# Singleton instance
+_generation_executor: Optional[GenerationExecutor] = None
+_singleton_lock = threading.Lock()
+
+
+def get_generation_executor() -> GenerationExecutor:
+    """Get or create the shared generation executor."""
+    global _generation_executor
+    if _generation_executor is None:
+        with _singleton_lock:
+            if _generation_executor is None:
+                _generation_executor = GenerationExecutor()
+    return _generation_executor
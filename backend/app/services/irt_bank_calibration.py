@@ -0,0 +1,404 @@
+"""
+Item Bank IRT Calibration
+
+Calibrates every question in one pass over question_attempts, replacing
+per-question calibrate_question() calls (each of which re-read the item's
+attempts plus an accuracy aggregate over all of its responders):
+
+1. Stream (user_id, question_id, is_correct) in chunks with a server-side
+   cursor and build a sparse user x item response matrix in coordinate form
+   (one entry per attempt, integer row/column indices).
+2. Compute every item's statistics with NumPy over that matrix:
+   p-value, upper-lower 27% discrimination (the stored "discrimination",
+   same definition as IRTCalibrator.calculate_discrimination_index, with
+   responders tied on accuracy at a group boundary sharing its credit),
+   point-biserial correlation against user accuracy and the Wilson 95%
+   interval.
+3. Optionally fit 2PL parameters (a, b) for all items at once with
+   batched Newton-Raphson steps, abilities fixed from user accuracy.
+4. Persist difficulty_level and extra_data["irt_calibration"] with bulk
+   UPDATEs.
+
+Usage:
+    from app.services.irt_bank_calibration import calibrate_item_bank
+
+    result = calibrate_item_bank(db, fit_2pl=True)
+    print(result.to_dict())   # items_calibrated, items_per_second, ...
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt
+from app.services.question_index import get_question_index
+from app.services.item_response_theory import DifficultyLevel, IRTCalibrator
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 50_000
+PERSIST_CHUNK_SIZE = 1_000
+
+# Upper-lower group share and minimum responses, as in IRTCalibrator
+GROUP_SHARE = 0.27
+MIN_RESPONSES_FOR_DISCRIMINATION = 20
+
+WILSON_Z = 1.96
+
+# 2PL fit: Newton iterations and a ridge pulling (a, intercept) towards (1, 0)
+# so items everyone (or no one) answers correctly stay finite
+NEWTON_ITERATIONS = 25
+NEWTON_TOLERANCE = 1e-6
+TWO_PL_RIDGE = 0.1
+MAX_DISCRIMINATION = 4.0
+
+DIFFICULTY_MAP = {
+    DifficultyLevel.VERY_EASY: "easy",
+    DifficultyLevel.EASY: "easy",
+    DifficultyLevel.MEDIUM: "medium",
+    DifficultyLevel.HARD: "hard",
+    DifficultyLevel.VERY_HARD: "hard",
+}
+
+
+@dataclass
+class ResponseMatrix:
+    """Sparse user x item response matrix in coordinate form (one entry per attempt)."""
+
+    user_ids: List[str]
+    item_ids: List[str]
+    rows: np.ndarray      # user index per attempt
+    cols: np.ndarray      # item index per attempt
+    correct: np.ndarray   # 1.0 / 0.0 per attempt
+
+    @property
+    def num_responses(self) -> int:
+        return len(self.rows)
+
+
+@dataclass
+class ItemStatistics:
+    """Per-item statistics, aligned with ResponseMatrix.item_ids."""
+
+    item_ids: List[str]
+    response_count: np.ndarray
+    p_value: np.ndarray
+    discrimination: np.ndarray
+    point_biserial: np.ndarray
+    ci_lower: np.ndarray
+    ci_upper: np.ndarray
+    difficulty_level: List[DifficultyLevel]
+    discrimination_2pl: Optional[np.ndarray] = None
+    difficulty_2pl: Optional[np.ndarray] = None
+
+
+@dataclass
+class BankCalibrationResult:
+    """Outcome of one item bank calibration run."""
+
+    responses_scanned: int = 0
+    items_seen: int = 0
+    items_calibrated: int = 0
+    elapsed_seconds: float = 0.0
+    fit_2pl: bool = False
+    difficulties: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items_seen / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "responses_scanned": self.responses_scanned,
+            "items_seen": self.items_seen,
+            "items_calibrated": self.items_calibrated,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1),
+            "fit_2pl": self.fit_2pl
+        }
+
+
+def stream_response_matrix(db: Session, chunk_size: int = STREAM_CHUNK_SIZE) -> ResponseMatrix:
+    """Read question_attempts once, in chunks, into a ResponseMatrix."""
+    user_index: Dict[str, int] = {}
+    item_index: Dict[str, int] = {}
+    rows, cols, correct = [], [], []
+
+    result = db.execute(
+        select(QuestionAttempt.user_id, QuestionAttempt.question_id, QuestionAttempt.is_correct)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    for chunk in result.partitions():
+        rows.append(np.fromiter(
+            (user_index.setdefault(r[0], len(user_index)) for r in chunk), dtype=np.int32, count=len(chunk)
+        ))
+        cols.append(np.fromiter(
+            (item_index.setdefault(r[1], len(item_index)) for r in chunk), dtype=np.int32, count=len(chunk)
+        ))
+        correct.append(np.fromiter((bool(r[2]) for r in chunk), dtype=np.float64, count=len(chunk)))
+
+    def concat(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    return ResponseMatrix(
+        user_ids=list(user_index),
+        item_ids=list(item_index),
+        rows=concat(rows, np.int32),
+        cols=concat(cols, np.int32),
+        correct=concat(correct, np.float64)
+    )
+
+
+def wilson_interval(p: np.ndarray, n: np.ndarray, z: float = WILSON_Z):
+    """Wilson score interval per item; (0, 1) where n is 0."""
+    n = np.asarray(n, dtype=np.float64)
+    safe_n = np.maximum(n, 1.0)
+    denominator = 1 + z ** 2 / safe_n
+    center = (p + z ** 2 / (2 * safe_n)) / denominator
+    spread = z * np.sqrt(np.maximum(p * (1 - p) + z ** 2 / (4 * safe_n), 0.0) / safe_n) / denominator
+    lower = np.where(n > 0, np.maximum(0.0, center - spread), 0.0)
+    upper = np.where(n > 0, np.minimum(1.0, center + spread), 1.0)
+    return lower, upper
+
+
+def classify_difficulties(p_value: np.ndarray) -> List[DifficultyLevel]:
+    """Vectorized IRTCalibrator.classify_difficulty."""
+    levels = list(IRTCalibrator.DIFFICULTY_THRESHOLDS.items())
+    choice = np.select(
+        [p_value >= threshold for _, threshold in levels],
+        list(range(len(levels))),
+        default=len(levels)
+    )
+    names = [level for level, _ in levels] + [DifficultyLevel.VERY_HARD]
+    return [names[i] for i in choice]
+
+
+def user_accuracy(matrix: ResponseMatrix) -> np.ndarray:
+    """Accuracy over all of each user's attempts (the ability proxy)."""
+    attempts = np.bincount(matrix.rows, minlength=len(matrix.user_ids))
+    correct = np.bincount(matrix.rows, weights=matrix.correct, minlength=len(matrix.user_ids))
+    return correct / np.maximum(attempts, 1)
+
+
+def item_statistics(matrix: ResponseMatrix) -> ItemStatistics:
+    """Classical test statistics for every item in the matrix."""
+    num_items = len(matrix.item_ids)
+    cols, y = matrix.cols, matrix.correct
+
+    n = np.bincount(cols, minlength=num_items).astype(np.float64)
+    safe_n = np.maximum(n, 1.0)
+    p = np.where(n > 0, np.bincount(cols, weights=y, minlength=num_items) / safe_n, 0.5)
+
+    score = user_accuracy(matrix)[matrix.rows]
+
+    # Upper-lower discrimination: rank each attempt within its item by the
+    # responder's accuracy, then compare the top and bottom 27%. Attempts
+    # with equal accuracy form one tie block; a block straddling a group
+    # boundary contributes its mean correctness times the overlap, so the
+    # result does not depend on the order rows were scanned in.
+    order = np.lexsort((score, cols))
+    sorted_cols, sorted_score, sorted_y = cols[order], score[order], y[order]
+    item_start = np.searchsorted(sorted_cols, np.arange(num_items))
+
+    new_block = np.ones(len(order), dtype=bool)
+    new_block[1:] = (sorted_cols[1:] != sorted_cols[:-1]) | (sorted_score[1:] != sorted_score[:-1])
+    block_first = np.flatnonzero(new_block)
+    block_size = np.diff(np.append(block_first, len(order)))
+    block_col = sorted_cols[block_first]
+    block_mean = np.add.reduceat(sorted_y, block_first) / block_size if len(order) else sorted_y
+
+    block_start = block_first - item_start[block_col]
+    block_end = block_start + block_size
+    block_n = n[block_col]
+    block_group = np.maximum(1, (block_n * GROUP_SHARE).astype(np.int64))
+    bottom_overlap = np.clip(np.minimum(block_end, block_group) - block_start, 0, None)
+    top_overlap = np.clip(block_end - np.maximum(block_start, block_n - block_group), 0, None)
+
+    group_per_item = np.maximum(1, (n * GROUP_SHARE).astype(np.int64))
+    top = np.bincount(block_col, weights=block_mean * top_overlap, minlength=num_items)
+    bottom = np.bincount(block_col, weights=block_mean * bottom_overlap, minlength=num_items)
+    discrimination = np.where(
+        n >= MIN_RESPONSES_FOR_DISCRIMINATION, (top - bottom) / group_per_item, 0.0
+    )
+
+    # Point-biserial: (mean score of correct - mean score overall) / sd * sqrt(p / q)
+    sum_score = np.bincount(cols, weights=score, minlength=num_items)
+    sum_score_sq = np.bincount(cols, weights=score * score, minlength=num_items)
+    sum_score_correct = np.bincount(cols, weights=score * y, minlength=num_items)
+    mean = sum_score / safe_n
+    sd = np.sqrt(np.maximum(sum_score_sq / safe_n - mean * mean, 0.0))
+    n_correct = p * n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_correct = sum_score_correct / n_correct
+        r_pb = (mean_correct - mean) / sd * np.sqrt(p / (1 - p))
+    point_biserial = np.where(np.isfinite(r_pb) & (n_correct > 0) & (p < 1), r_pb, 0.0)
+
+    lower, upper = wilson_interval(p, n)
+
+    return ItemStatistics(
+        item_ids=matrix.item_ids,
+        response_count=n.astype(np.int64),
+        p_value=p,
+        discrimination=discrimination,
+        point_biserial=point_biserial,
+        ci_lower=lower,
+        ci_upper=upper,
+        difficulty_level=classify_difficulties(p)
+    )
+
+
+def fit_two_pl(matrix: ResponseMatrix, iterations: int = NEWTON_ITERATIONS):
+    """
+    Fit 2PL (a, b) for every item with batched Newton-Raphson.
+
+    Abilities are held fixed at the standardized logit of each user's
+    smoothed accuracy, so every item's likelihood is independent and all
+    2x2 Newton systems are solved together each iteration.
+
+    Returns (a, b) arrays aligned with matrix.item_ids.
+    """
+    num_items = len(matrix.item_ids)
+    attempts = np.bincount(matrix.rows, minlength=len(matrix.user_ids))
+    correct = np.bincount(matrix.rows, weights=matrix.correct, minlength=len(matrix.user_ids))
+    logit = np.log((correct + 0.5) / (attempts - correct + 0.5))
+    theta_user = (logit - logit.mean()) / (logit.std() or 1.0)
+
+    theta = theta_user[matrix.rows]
+    cols, y = matrix.cols, matrix.correct
+    a = np.ones(num_items)
+    c = np.zeros(num_items)
+
+    for _ in range(iterations):
+        prob = 1.0 / (1.0 + np.exp(-(a[cols] * theta + c[cols])))
+        residual = y - prob
+        weight = prob * (1 - prob)
+
+        grad_a = np.bincount(cols, weights=residual * theta, minlength=num_items) - TWO_PL_RIDGE * (a - 1)
+        grad_c = np.bincount(cols, weights=residual, minlength=num_items) - TWO_PL_RIDGE * c
+        h_aa = np.bincount(cols, weights=weight * theta * theta, minlength=num_items) + TWO_PL_RIDGE
+        h_ac = np.bincount(cols, weights=weight * theta, minlength=num_items)
+        h_cc = np.bincount(cols, weights=weight, minlength=num_items) + TWO_PL_RIDGE
+
+        det = h_aa * h_cc - h_ac * h_ac
+        step_a = (h_cc * grad_a - h_ac * grad_c) / det
+        step_c = (h_aa * grad_c - h_ac * grad_a) / det
+        a = np.clip(a + step_a, -MAX_DISCRIMINATION, MAX_DISCRIMINATION)
+        c = c + step_c
+
+        if max(np.abs(step_a).max(initial=0.0), np.abs(step_c).max(initial=0.0)) < NEWTON_TOLERANCE:
+            break
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = np.where(np.abs(a) > 1e-6, -c / a, 0.0)
+    return a, b
+
+
+def persist_calibration(
+    db: Session,
+    stats: ItemStatistics,
+    indices: Iterable[int],
+    now: datetime,
+    chunk_size: int = PERSIST_CHUNK_SIZE
+) -> Dict[str, str]:
+    """Write difficulty_level and extra_data["irt_calibration"] for the given items in bulk."""
+    indices = list(indices)
+    difficulties = {}
+    calibrated_at = now.isoformat()
+
+    for start in range(0, len(indices), chunk_size):
+        chunk = indices[start:start + chunk_size]
+        existing = {
+            row.id: row for row in db.query(
+                Question.id, Question.difficulty_level, Question.extra_data
+            ).filter(Question.id.in_([stats.item_ids[i] for i in chunk]))
+        }
+
+        updates = []
+        for i in chunk:
+            row = existing.get(stats.item_ids[i])
+            if row is None:
+                continue
+            new_difficulty = DIFFICULTY_MAP[stats.difficulty_level[i]]
+            calibration = {
+                "p_value": float(stats.p_value[i]),
+                "discrimination": float(stats.discrimination[i]),
+                "point_biserial": float(stats.point_biserial[i]),
+                "response_count": int(stats.response_count[i]),
+                "confidence_interval": [float(stats.ci_lower[i]), float(stats.ci_upper[i])],
+                "calibrated_at": calibrated_at,
+                "previous_difficulty": row.difficulty_level
+            }
+            if stats.discrimination_2pl is not None:
+                calibration["two_pl"] = {
+                    "a": float(stats.discrimination_2pl[i]),
+                    "b": float(stats.difficulty_2pl[i])
+                }
+            updates.append({
+                "id": row.id,
+                "difficulty_level": new_difficulty,
+                "extra_data": {**(row.extra_data or {}), "irt_calibration": calibration}
+            })
+            difficulties[row.id] = new_difficulty
+
+        if updates:
+            db.bulk_update_mappings(Question, updates)
+            db.commit()
+
+    return difficulties
+
+
+def calibrate_item_bank(
+    db: Session,
+    question_ids: Optional[List[str]] = None,
+    fit_2pl: bool = False,
+    min_responses: int = IRTCalibrator.MIN_RESPONSES_FOR_CALIBRATION,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> BankCalibrationResult:
+    """
+    Calibrate the whole item bank (or just question_ids) from one pass over attempts.
+
+    Every attempt is read even when question_ids is given, because the
+    discrimination statistics rank responders by accuracy over all of
+    their attempts.
+
+    Args:
+        question_ids: Only persist these items (default: every item with enough responses)
+        fit_2pl: Also fit and store 2PL (a, b) parameters
+        min_responses: Items with fewer attempts are left uncalibrated
+    """
+    started = time.perf_counter()
+    matrix = stream_response_matrix(db, chunk_size)
+    stats = item_statistics(matrix)
+    if fit_2pl and matrix.num_responses:
+        stats.discrimination_2pl, stats.difficulty_2pl = fit_two_pl(matrix)
+
+    eligible = stats.response_count >= min_responses
+    if question_ids is not None:
+        wanted = set(question_ids)
+        eligible &= np.array([item_id in wanted for item_id in stats.item_ids], dtype=bool)
+
+    difficulties = persist_calibration(db, stats, np.flatnonzero(eligible), datetime.utcnow())
+    if difficulties:
+        # Sampling buckets are keyed by difficulty level
+        get_question_index().invalidate()
+
+    result = BankCalibrationResult(
+        responses_scanned=matrix.num_responses,
+        items_seen=len(matrix.item_ids),
+        items_calibrated=len(difficulties),
+        elapsed_seconds=time.perf_counter() - started,
+        fit_2pl=fit_2pl,
+        difficulties=difficulties
+    )
+    logger.info(
+        "Item bank calibration: %d/%d items calibrated from %d responses (%.0f items/sec)",
+        result.items_calibrated, result.items_seen, result.responses_scanned, result.items_per_second
+    )
+    return result
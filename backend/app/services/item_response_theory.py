@@ -464,28 +464,36 @@ class IRTCalibrator:
 
         return [c[0] for c in candidates]
 
-    def batch_calibrate(self, question_ids: Optional[List[str]] = None) -> Dict[str, str]:
+    def batch_calibrate(
+        self,
+        question_ids: Optional[List[str]] = None,
+        fit_2pl: bool = False
+    ) -> Dict[str, str]:
         """
         Calibrate multiple questions.
 
-        If question_ids is None, auto-selects candidates.
+        If question_ids is None, auto-selects candidates. All items are
+        calibrated together from one pass over question_attempts (see
+        irt_bank_calibration) rather than one calibrate_question() each.
 
         Returns dict of question_id -> new difficulty level
         """
+        from app.services.irt_bank_calibration import calibrate_item_bank
+
         if question_ids is None:
             question_ids = self.get_calibration_candidates()
+        if not question_ids:
+            return {}
+
+        result = calibrate_item_bank(
+            self.db,
+            question_ids=question_ids,
+            fit_2pl=fit_2pl,
+            min_responses=self.MIN_RESPONSES_FOR_CALIBRATION
+        )
 
-        results = {}
-        for qid in question_ids:
-            try:
-                new_difficulty = self.recalibrate_difficulty(qid)
-                if new_difficulty:
-                    results[qid] = new_difficulty
-            except Exception as e:
-                logger.warning("Failed to calibrate question %s: %s", qid, e)
-
-        logger.info("Batch calibration complete: %d questions calibrated", len(results))
-        return results
+        logger.info("Batch calibration complete: %d questions calibrated", result.items_calibrated)
+        return result.difficulties
 
 
 def get_empirical_difficulty(db: Session, question_id: str) -> Optional[float]:
@@ -15,6 +15,8 @@ import math
 import random
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, Integer, or_
 
@@ -23,6 +25,12 @@ from app.models.models import (
     UserSpecialtyDifficulty, UserRetentionMetrics,
     LearningSessionMix, ConceptRetention
 )
+from app.services.learning_snapshot import get_learning_snapshot
+from app.services.retention_decay import current_retention, decay_concept_retentions
+from app.services.review_queue import get_review_queue
+from app.services.spaced_repetition import (
+    ReviewEvent, apply_schedule, get_or_add_review, load_reviews
+)
 
 
 # =============================================================================
@@ -233,7 +241,46 @@ def update_retention_metrics(
     - where q is the quality of response (0-5, we map boolean to 0 or 5)
     """
     record = get_or_create_retention_metrics(db, user_id, specialty)
+    _record_retention_review(record, interval_days, is_correct)
+    db.commit()
+
+    return record
+
+
+def load_retention_metrics(
+    db: Session,
+    keys: List[Tuple[str, Optional[str]]]
+) -> Dict[Tuple[str, Optional[str]], UserRetentionMetrics]:
+    """
+    Retention metrics for many (user_id, specialty) pairs in one query.
+
+    Missing records are added to the session (not committed) and flushed
+    once so their column defaults are populated.
+    """
+    keys = {(user_id, specialty or None) for user_id, specialty in keys}
+    if not keys:
+        return {}
+
+    records = {
+        (r.user_id, r.specialty): r
+        for r in db.query(UserRetentionMetrics).filter(
+            UserRetentionMetrics.user_id.in_({user_id for user_id, _ in keys})
+        )
+        if (r.user_id, r.specialty) in keys
+    }
+
+    missing = [key for key in keys if key not in records]
+    for user_id, specialty in missing:
+        records[(user_id, specialty)] = UserRetentionMetrics(user_id=user_id, specialty=specialty)
+        db.add(records[(user_id, specialty)])
+    if missing:
+        db.flush()
 
+    return records
+
+
+def _record_retention_review(record: UserRetentionMetrics, interval_days: float, is_correct: bool):
+    """Apply one review outcome to a retention metrics record (no commit)."""
     # Map interval to bucket
     interval_bucket = None
     if interval_days <= 1:
@@ -288,9 +335,6 @@ def update_retention_metrics(
             record.optimal_first_interval_days = 1.0
 
     record.updated_at = datetime.utcnow()
-    db.commit()
-
-    return record
 
 
 def calculate_personalized_interval(
@@ -307,7 +351,15 @@ def calculate_personalized_interval(
         Next interval in days (float for sub-day precision)
     """
     metrics = get_or_create_retention_metrics(db, user_id, specialty)
+    return _personalized_interval(metrics, current_interval_days, is_correct)
+
 
+def _personalized_interval(
+    metrics: UserRetentionMetrics,
+    current_interval_days: float,
+    is_correct: bool
+) -> float:
+    """Next interval in days from a user's retention metrics."""
     if not is_correct:
         # Reset to first interval on incorrect
         return metrics.optimal_first_interval_days
@@ -324,6 +376,81 @@ def calculate_personalized_interval(
         return min(next_interval, 60.0)
 
 
+def _confidence_adjusted_interval(
+    next_interval: float,
+    is_correct: bool,
+    confidence_level: Optional[int]
+) -> float:
+    """Gap 5: Adjust interval based on confidence."""
+    if confidence_level is None:
+        return next_interval
+
+    # High confidence + correct = can wait longer
+    # Low confidence + correct = review sooner to reinforce
+    # High confidence + wrong = definitely review soon
+    if is_correct:
+        if confidence_level >= 4:
+            return next_interval * 1.2  # More confident, can wait
+        elif confidence_level <= 2:
+            return next_interval * 0.7  # Less confident, review sooner
+    elif confidence_level >= 4:
+        return next_interval * 0.5  # Overconfident error - needs attention
+    return next_interval
+
+
+def _format_interval(next_interval: float) -> str:
+    if next_interval < 1:
+        return f"{int(next_interval * 24)}h"
+    elif next_interval == int(next_interval):
+        return f"{int(next_interval)}d"
+    return f"{next_interval:.1f}d"
+
+
+def schedule_personalized_reviews(db: Session, events: List[ReviewEvent]) -> List[ScheduledReview]:
+    """
+    Schedule a batch of answers using personalized intervals, in one transaction.
+
+    Existing reviews and the retention metrics for every (user, specialty)
+    in the batch are loaded with one query each; events are applied in
+    order and committed once, then loaded review queues are updated.
+
+    Returns:
+        The ScheduledReview for each event, in order
+    """
+    now = datetime.utcnow()
+    reviews = load_reviews(db, events)
+    metrics = load_retention_metrics(db, [(e.user_id, e.specialty) for e in events])
+    scheduled = []
+
+    for event in events:
+        reviewed_at = event.reviewed_at or now
+        review, is_new = get_or_add_review(db, reviews, event)
+        record = metrics[(event.user_id, event.specialty or None)]
+
+        # Current interval is the time actually elapsed since the last review
+        current_interval_days = 0
+        if not is_new and review.last_reviewed:
+            current_interval_days = (reviewed_at - review.last_reviewed).days
+
+        # Personalized next interval, computed before this review updates the metrics
+        next_interval = _personalized_interval(record, current_interval_days, event.is_correct)
+        next_interval = _confidence_adjusted_interval(next_interval, event.is_correct, event.confidence_level)
+
+        if current_interval_days > 0:
+            _record_retention_review(record, current_interval_days, event.is_correct)
+
+        review.times_reviewed = (review.times_reviewed or 0) + 1
+        apply_schedule(
+            review, next_interval, record.optimal_interval_multiplier, reviewed_at,
+            interval_str=_format_interval(next_interval)
+        )
+        scheduled.append(review)
+
+    db.commit()
+    get_review_queue().record(scheduled)
+    return scheduled
+
+
 def schedule_personalized_review(
     db: Session,
     user_id: str,
@@ -341,80 +468,14 @@ def schedule_personalized_review(
     - Confidence-weighted intervals (Gap 5 integration)
     - Per-specialty retention tracking
     """
-    existing = db.query(ScheduledReview).filter_by(
+    return schedule_personalized_reviews(db, [ReviewEvent(
         user_id=user_id,
-        question_id=question_id
-    ).first()
-
-    # Calculate current interval
-    current_interval_days = 0
-    if existing and existing.last_reviewed:
-        days_since_review = (datetime.utcnow() - existing.last_reviewed).days
-        current_interval_days = days_since_review
-
-    # Get personalized next interval
-    next_interval = calculate_personalized_interval(
-        db, user_id, current_interval_days, is_correct, specialty
-    )
-
-    # Gap 5: Adjust interval based on confidence
-    if confidence_level is not None:
-        # High confidence + correct = can wait longer
-        # Low confidence + correct = review sooner to reinforce
-        # High confidence + wrong = definitely review soon
-        if is_correct:
-            if confidence_level >= 4:
-                next_interval *= 1.2  # More confident, can wait
-            elif confidence_level <= 2:
-                next_interval *= 0.7  # Less confident, review sooner
-        else:
-            if confidence_level >= 4:
-                next_interval *= 0.5  # Overconfident error - needs attention
-
-    # Update retention metrics
-    if current_interval_days > 0:
-        update_retention_metrics(db, user_id, current_interval_days, is_correct, specialty)
-
-    scheduled_for = datetime.utcnow() + timedelta(days=next_interval)
-
-    # Determine learning stage
-    if next_interval >= 30:
-        stage = "Mastered"
-    elif next_interval >= 7:
-        stage = "Review"
-    else:
-        stage = "Learning"
-
-    # Format interval string
-    if next_interval < 1:
-        interval_str = f"{int(next_interval * 24)}h"
-    elif next_interval == int(next_interval):
-        interval_str = f"{int(next_interval)}d"
-    else:
-        interval_str = f"{next_interval:.1f}d"
-
-    if not existing:
-        review = ScheduledReview(
-            user_id=user_id,
-            question_id=question_id,
-            scheduled_for=scheduled_for,
-            review_interval=interval_str,
-            times_reviewed=1,
-            learning_stage=stage,
-            source=source,
-            last_reviewed=datetime.utcnow()
-        )
-        db.add(review)
-    else:
-        existing.times_reviewed += 1
-        existing.last_reviewed = datetime.utcnow()
-        existing.scheduled_for = scheduled_for
-        existing.review_interval = interval_str
-        existing.learning_stage = stage
-        review = existing
-
-    db.commit()
-    return review
+        question_id=question_id,
+        is_correct=is_correct,
+        source=source,
+        specialty=specialty,
+        confidence_level=confidence_level
+    )])[0]
 
 
 # =============================================================================
@@ -468,12 +529,10 @@ def calculate_optimal_mix(db: Session, user_id: str) -> Dict:
 
     # Get review vs new balance
     # Check how many reviews are due
-    due_reviews = db.query(ScheduledReview).filter(
-        ScheduledReview.user_id == user_id,
-        ScheduledReview.scheduled_for <= datetime.utcnow()
-    ).count()
+    review_queue = get_review_queue()
+    due_reviews = review_queue.count_due(db, user_id)
 
-    total_reviews = db.query(ScheduledReview).filter_by(user_id=user_id).count()
+    total_reviews = review_queue.size(db, user_id)
 
     if due_reviews > 20:
         # Many reviews due - prioritize them
@@ -488,14 +547,10 @@ def calculate_optimal_mix(db: Session, user_id: str) -> Dict:
         review_ratio = 0.3
 
     # Calculate difficulty ratios based on overall performance
-    total_attempts = db.query(QuestionAttempt).filter_by(user_id=user_id).count()
-    correct_attempts = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.is_correct == True
-    ).count()
+    snapshot = get_learning_snapshot(db, user_id)
 
-    if total_attempts > 0:
-        accuracy = correct_attempts / total_attempts
+    if snapshot.total > 0:
+        accuracy = snapshot.accuracy
         if accuracy >= 0.75:
             # Doing well - more hard questions
             difficulty_ratios = {"easy": 0.1, "medium": 0.4, "hard": 0.5}
@@ -543,18 +598,13 @@ def select_interleaved_question(
     # Decide: new question or review?
     if random.random() < mix["review_ratio"]:
         # Try to get a review question
-        reviews = db.query(ScheduledReview).filter(
-            ScheduledReview.user_id == user_id,
-            ScheduledReview.scheduled_for <= datetime.utcnow(),
-            ScheduledReview.question_id.notin_(session_questions) if session_questions else True
-        ).order_by(
-            ScheduledReview.scheduled_for.asc()
-        ).limit(10).all()
-
-        if reviews:
+        excluded = set(session_questions)
+        due_ids = get_review_queue().due_confirmed(db, user_id, limit=10 + len(excluded))
+        review_ids = [qid for qid in due_ids if qid not in excluded][:10]
+
+        if review_ids:
             # Select from reviews, weighted by overdue-ness
-            selected_review = random.choice(reviews)
-            question = db.query(Question).get(selected_review.question_id)
+            question = db.query(Question).get(random.choice(review_ids))
             if question:
                 return question, "review"
 
@@ -737,56 +787,53 @@ def get_concepts_needing_review(
     """
     Get concepts whose predicted retention has dropped below threshold.
 
+    Retention is computed at read time from stored stability and
+    last_reviewed (vectorized over the user's concepts), so no decay
+    writes are needed beforehand; only the returned rows are loaded.
+
     Returns concepts sorted by urgency (lowest retention first).
     """
-    concepts = db.query(ConceptRetention).filter_by(user_id=user_id).all()
-
-    needing_review = []
-    now = datetime.utcnow()
-
-    for c in concepts:
-        if c.last_reviewed:
-            days_since = (now - c.last_reviewed).total_seconds() / 86400
-            current_retention = calculate_memory_strength(c.stability, days_since)
-
-            if current_retention < min_retention:
-                needing_review.append({
-                    "concept": c.concept,
-                    "specialty": c.specialty,
-                    "current_retention": current_retention,
-                    "stability": c.stability,
-                    "days_since_review": days_since,
-                    "total_exposures": c.total_exposures,
-                    "question_ids": c.question_ids
-                })
-
-    # Sort by retention (lowest first = most urgent)
-    needing_review.sort(key=lambda x: x["current_retention"])
+    rows = db.query(
+        ConceptRetention.id, ConceptRetention.stability, ConceptRetention.last_reviewed
+    ).filter(ConceptRetention.user_id == user_id).all()
+
+    ids, retention, days_since = current_retention(rows)
+    below = [i for i in np.argsort(retention, kind="stable") if retention[i] < min_retention][:limit]
+    if not below:
+        return []
+
+    concepts = {
+        c.id: c for c in db.query(ConceptRetention).filter(
+            ConceptRetention.id.in_([ids[i] for i in below])
+        )
+    }
 
-    return needing_review[:limit]
+    return [
+        {
+            "concept": c.concept,
+            "specialty": c.specialty,
+            "current_retention": float(retention[i]),
+            "stability": c.stability,
+            "days_since_review": float(days_since[i]),
+            "total_exposures": c.total_exposures,
+            "question_ids": c.question_ids
+        }
+        for i in below
+        for c in [concepts.get(ids[i])]
+        if c is not None
+    ]
 
 
 def update_all_concept_retentions(db: Session, user_id: str) -> int:
     """
     Batch update all concept retentions for a user (decay calculation).
-    Called periodically or on session start.
+
+    Readers compute retention on the fly, so this only refreshes the
+    stored predicted_retention / memory_strength columns.
 
     Returns number of concepts updated.
     """
-    concepts = db.query(ConceptRetention).filter_by(user_id=user_id).all()
-    now = datetime.utcnow()
-    updated = 0
-
-    for c in concepts:
-        if c.last_reviewed:
-            days_since = (now - c.last_reviewed).total_seconds() / 86400
-            c.predicted_retention = calculate_memory_strength(c.stability, days_since)
-            c.memory_strength = c.predicted_retention
-            c.updated_at = now
-            updated += 1
-
-    db.commit()
-    return updated
+    return decay_concept_retentions(db, user_id=user_id)["records_updated"]
 
 
 # =============================================================================
@@ -944,8 +991,7 @@ def select_next_question_advanced(
         "algorithms_used": []
     }
 
-    # Update concept retentions (decay calculation)
-    update_all_concept_retentions(db, user_id)
+    # Concept retention decays at read time (forgetting curve in get_concepts_needing_review)
     metadata["algorithms_used"].append("forgetting_curve_decay")
 
     # Check for urgent concept reviews (Gap 4)
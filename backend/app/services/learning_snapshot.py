@@ -0,0 +1,427 @@
+"""
+User Learning Snapshot
+
+One cached view of a user's answer history that
+all adaptive selectors read from, instead of each issuing its own
+aggregate scan over question_attempts:
+
+- adaptive.get_user_difficulty_target   (overall accuracy)
+- adaptive.get_weak_areas               (per-source accuracy)
+- adaptive.get_performance_by_source    (per-source accuracy)
+- adaptive.get_user_weakness_profile    (per-source accuracy, error types)
+- learning_engine.calculate_optimal_mix (overall accuracy)
+- massive_pool.get_instant_question_adaptive (per-specialty accuracy)
+
+Built with one grouped query over attempts (by source + specialty) and
+one over error analyses, then kept as a flat hash of counters in a
+SnapshotStore (Redis when REDIS_URL is reachable, otherwise in-process).
+submit_answer and error analysis apply their deltas to the stored hash
+atomically (one Lua script with HINCRBY, or under the store lock), so a
+user's snapshot survives answers and each /next is one key lookup.
+
+Each delta also bumps a per-user version. A rebuild reads the version
+before querying and only stores its result if the version is unchanged,
+so an answer committed while a rebuild was running cannot be lost by the
+rebuild overwriting it.
+
+Usage:
+    from app.services.learning_snapshot import get_learning_snapshot
+
+    snapshot = get_learning_snapshot(db, user_id)
+    snapshot.accuracy, snapshot.weak_sources(), snapshot.error_counts
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, Integer
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, ErrorAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Answers patch the stored snapshot; the TTL only bounds drift from writers
+# that neither patch nor invalidate
+SNAPSHOT_TTL_SECONDS = int(os.getenv("LEARNING_SNAPSHOT_TTL_SECONDS", "900"))
+
+CACHE_PREFIX = "learning_snapshot"
+
+
+@dataclass
+class UserLearningSnapshot:
+    """Aggregated answer history for one user."""
+
+    user_id: str
+    total: int = 0
+    correct: int = 0
+    by_source: Dict[str, List[int]] = field(default_factory=dict)      # source -> [total, correct]
+    by_specialty: Dict[str, List[int]] = field(default_factory=dict)   # specialty -> [total, correct]
+    error_counts: Dict[str, int] = field(default_factory=dict)         # error_type -> count
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total > 0 else 0.0
+
+    def performance_by_source(self) -> Dict[str, Dict]:
+        """Per-source breakdown in the get_performance_by_source format."""
+        return {
+            source: {
+                "total": total,
+                "correct": correct,
+                "accuracy": round(correct / total, 3) if total > 0 else 0.0,
+            }
+            for source, (total, correct) in self.by_source.items()
+        }
+
+    def weak_sources(self, threshold: float = 0.6) -> List[str]:
+        """Sources where accuracy is below threshold."""
+        return [
+            source for source, (total, correct) in self.by_source.items()
+            if total > 0 and correct / total < threshold
+        ]
+
+    def weak_specialties(self, threshold: float = 0.6, min_attempts: int = 3) -> List[str]:
+        """Normalized specialties where accuracy is below threshold, worst first."""
+        weak = [
+            (correct / total, specialty)
+            for specialty, (total, correct) in self.by_specialty.items()
+            if total >= min_attempts and correct / total < threshold
+        ]
+        weak.sort()
+        return [specialty for _, specialty in weak]
+
+    def to_fields(self) -> Dict[str, int]:
+        """Flatten into the counter fields the store keeps (see _attempt_deltas)."""
+        fields = {"total": self.total, "correct": self.correct}
+        for prefix, buckets in (("source", self.by_source), ("specialty", self.by_specialty)):
+            for key, (total, correct) in buckets.items():
+                fields[f"{prefix}:total:{key}"] = total
+                fields[f"{prefix}:correct:{key}"] = correct
+        for error_type, count in self.error_counts.items():
+            fields[f"error:{error_type}"] = count
+        return fields
+
+    @classmethod
+    def from_fields(cls, user_id: str, fields: Dict[str, int]) -> "UserLearningSnapshot":
+        snapshot = cls(user_id=user_id)
+        for name, value in fields.items():
+            value = int(value)
+            kind, _, rest = name.partition(":")
+            if kind == "total":
+                snapshot.total = value
+            elif kind == "correct":
+                snapshot.correct = value
+            elif kind == "error":
+                snapshot.error_counts[rest] = value
+            elif kind in ("source", "specialty"):
+                counter, _, key = rest.partition(":")
+                buckets = snapshot.by_source if kind == "source" else snapshot.by_specialty
+                buckets.setdefault(key, [0, 0])[0 if counter == "total" else 1] = value
+        return snapshot
+
+
+def _cache_key(user_id: str) -> str:
+    return f"{CACHE_PREFIX}:{user_id}"
+
+
+def _version_key(user_id: str) -> str:
+    return f"{CACHE_PREFIX}:version:{user_id}"
+
+
+def _attempt_deltas(source: Optional[str], specialty: Optional[str], is_correct: bool) -> Dict[str, int]:
+    correct = 1 if is_correct else 0
+    deltas = {"total": 1, "correct": correct}
+    if source is not None:
+        deltas[f"source:total:{source}"] = 1
+        deltas[f"source:correct:{source}"] = correct
+    if specialty is not None:
+        deltas[f"specialty:total:{specialty}"] = 1
+        deltas[f"specialty:correct:{specialty}"] = correct
+    return deltas
+
+
+# ============================================================================
+# STORES
+# ============================================================================
+
+class SnapshotStore(ABC):
+    """Per-user counter hashes with atomic increments and a write version."""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, user_id: str) -> Optional[Dict[str, int]]:
+        """Stored fields, or None if the user has no snapshot."""
+
+    @abstractmethod
+    def version(self, user_id: str) -> int:
+        """Current write version; bumped by every increment and invalidation."""
+
+    @abstractmethod
+    def store(self, user_id: str, fields: Dict[str, int], version: int, ttl: int) -> bool:
+        """Replace the snapshot if the version is still `version`; returns whether it was stored."""
+
+    @abstractmethod
+    def increment(self, user_id: str, deltas: Dict[str, int], ttl: int):
+        """Bump the version and add `deltas` to the snapshot, if one is stored."""
+
+    @abstractmethod
+    def invalidate(self, user_id: str, ttl: int):
+        """Bump the version and drop the snapshot."""
+
+
+class InMemorySnapshotStore(SnapshotStore):
+    """Process-local snapshots (development and tests)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._snapshots: Dict[str, Tuple[Dict[str, int], float]] = {}  # user_id -> (fields, expires_at)
+        self._versions: Dict[str, Tuple[int, float]] = {}              # user_id -> (version, expires_at)
+        self._lock = threading.Lock()
+
+    def _bump(self, user_id: str, ttl: int, now: float):
+        current = self._versions.get(user_id)
+        version = current[0] if current and current[1] > now else 0
+        self._versions[user_id] = (version + 1, now + ttl)
+
+    def get(self, user_id: str) -> Optional[Dict[str, int]]:
+        with self._lock:
+            entry = self._snapshots.get(user_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._snapshots[user_id]
+                return None
+            return dict(entry[0])
+
+    def version(self, user_id: str) -> int:
+        with self._lock:
+            current = self._versions.get(user_id)
+            return current[0] if current and current[1] > time.monotonic() else 0
+
+    def store(self, user_id: str, fields: Dict[str, int], version: int, ttl: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            current = self._versions.get(user_id)
+            if (current[0] if current and current[1] > now else 0) != version:
+                return False
+            self._snapshots[user_id] = (dict(fields), now + ttl)
+            return True
+
+    def increment(self, user_id: str, deltas: Dict[str, int], ttl: int):
+        now = time.monotonic()
+        with self._lock:
+            self._bump(user_id, ttl, now)
+            entry = self._snapshots.get(user_id)
+            if entry is None or entry[1] <= now:
+                return
+            fields = entry[0]
+            for name, delta in deltas.items():
+                fields[name] = fields.get(name, 0) + delta
+
+    def invalidate(self, user_id: str, ttl: int):
+        with self._lock:
+            self._bump(user_id, ttl, time.monotonic())
+            self._snapshots.pop(user_id, None)
+
+
+_STORE_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+_INCREMENT_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    for i = 2, #ARGV, 2 do
+        redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+"""
+
+
+class RedisSnapshotStore(SnapshotStore):
+    """Snapshots shared by all workers: one Redis hash per user plus a version key."""
+
+    name = "redis"
+
+    def __init__(self, client):
+        self._client = client
+        self._store = client.register_script(_STORE_SCRIPT)
+        self._increment = client.register_script(_INCREMENT_SCRIPT)
+
+    def get(self, user_id: str) -> Optional[Dict[str, int]]:
+        fields = self._client.hgetall(_cache_key(user_id))
+        return {name: int(value) for name, value in fields.items()} if fields else None
+
+    def version(self, user_id: str) -> int:
+        return int(self._client.get(_version_key(user_id)) or 0)
+
+    def store(self, user_id: str, fields: Dict[str, int], version: int, ttl: int) -> bool:
+        args = [version, ttl]
+        for name, value in fields.items():
+            args.extend((name, value))
+        return bool(self._store(keys=[_cache_key(user_id), _version_key(user_id)], args=args))
+
+    def increment(self, user_id: str, deltas: Dict[str, int], ttl: int):
+        args = [ttl]
+        for name, delta in deltas.items():
+            args.extend((name, delta))
+        self._increment(keys=[_cache_key(user_id), _version_key(user_id)], args=args)
+
+    def invalidate(self, user_id: str, ttl: int):
+        pipe = self._client.pipeline()
+        pipe.incr(_version_key(user_id))
+        pipe.expire(_version_key(user_id), ttl)
+        pipe.delete(_cache_key(user_id))
+        pipe.execute()
+
+
+def create_snapshot_store(redis_url: Optional[str] = None) -> SnapshotStore:
+    """Redis store when REDIS_URL is reachable, otherwise in-memory."""
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+            client = redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+            client.ping()
+            logger.info("Learning snapshots using Redis")
+            return RedisSnapshotStore(client)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for learning snapshots, using in-memory: {e}")
+    return InMemorySnapshotStore()
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_snapshot_store()
+    return _store
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def build_learning_snapshot(db: Session, user_id: str) -> UserLearningSnapshot:
+    """Compute a snapshot from the database (two grouped, user-indexed queries)."""
+    snapshot = UserLearningSnapshot(user_id=user_id)
+
+    rows = db.query(
+        Question.source,
+        Question.specialty,
+        func.count(QuestionAttempt.id),
+        func.sum(func.cast(QuestionAttempt.is_correct, Integer))
+    ).join(
+        Question, Question.id == QuestionAttempt.question_id
+    ).filter(
+        QuestionAttempt.user_id == user_id
+    ).group_by(
+        Question.source,
+        Question.specialty
+    ).all()
+
+    for source, specialty, total, correct in rows:
+        correct = correct or 0
+        snapshot.total += total
+        snapshot.correct += correct
+        if source is not None:
+            bucket = snapshot.by_source.setdefault(source, [0, 0])
+            bucket[0] += total
+            bucket[1] += correct
+        if specialty is not None:
+            bucket = snapshot.by_specialty.setdefault(specialty, [0, 0])
+            bucket[0] += total
+            bucket[1] += correct
+
+    snapshot.error_counts = _error_counts(db, user_id)
+
+    return snapshot
+
+
+def _error_counts(db: Session, user_id: str) -> Dict[str, int]:
+    rows = db.query(
+        ErrorAnalysis.error_type,
+        func.count(ErrorAnalysis.id)
+    ).filter(
+        ErrorAnalysis.user_id == user_id
+    ).group_by(
+        ErrorAnalysis.error_type
+    ).all()
+    return {error_type: count for error_type, count in rows}
+
+
+def get_learning_snapshot(db: Session, user_id: str) -> UserLearningSnapshot:
+    """Get the user's snapshot from the store, building it on a miss."""
+    store = get_snapshot_store()
+    fields = store.get(user_id)
+    if fields is not None:
+        return UserLearningSnapshot.from_fields(user_id, fields)
+
+    version = store.version(user_id)
+    snapshot = build_learning_snapshot(db, user_id)
+    if not store.store(user_id, snapshot.to_fields(), version, SNAPSHOT_TTL_SECONDS):
+        # An answer landed mid-build; the next read rebuilds with it included
+        logger.debug("Learning snapshot for %s changed during rebuild; not stored", user_id)
+    return snapshot
+
+
+def get_error_counts(db: Session, user_id: str) -> Dict[str, int]:
+    """
+    Error type counts for the user, for the submit path.
+
+    Read from the stored snapshot when there is one; on a miss this runs only
+    the error-analysis query rather than a full rebuild.
+    """
+    fields = get_snapshot_store().get(user_id)
+    if fields is not None:
+        return UserLearningSnapshot.from_fields(user_id, fields).error_counts
+    return _error_counts(db, user_id)
+
+
+def record_attempt_in_snapshot(
+    user_id: str,
+    source: Optional[str],
+    specialty: Optional[str],
+    is_correct: bool
+):
+    """Add a new (committed) attempt to the stored snapshot, atomically."""
+    get_snapshot_store().increment(
+        user_id, _attempt_deltas(source, specialty, is_correct), SNAPSHOT_TTL_SECONDS
+    )
+
+
+def record_error_in_snapshot(user_id: str, error_type: str):
+    """Add a new (committed) error analysis to the stored snapshot, atomically."""
+    get_snapshot_store().increment(user_id, {f"error:{error_type}": 1}, SNAPSHOT_TTL_SECONDS)
+
+
+def invalidate_learning_snapshot(user_id: str):
+    """Drop the stored snapshot; the next read rebuilds it."""
+    get_snapshot_store().invalidate(user_id, SNAPSHOT_TTL_SECONDS)
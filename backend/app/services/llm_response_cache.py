@@ -0,0 +1,292 @@
+"""
+Content-Addressed LLM Response Cache
+
+Caches OpenAI chat completions by a SHA-256 of the request content
+(model, messages and generation params), so identical prompts - the same
+specialty example set analyzed by the question agent, the same question
+re-sent to a validator - are answered once.
+
+Backends (LLM_CACHE_BACKEND):
+- memory: in-process LRU with per-entry TTL (default)
+- sqlite: file-backed table at LLM_CACHE_PATH, shared by local workers
+- redis:  REDIS_URL, shared across hosts
+- off:    disabled
+
+Policy: deterministic calls (temperature 0) are cached by default; other
+call sites opt in with cache=True (and an optional cache_ttl), and
+cache=False bypasses the cache entirely. Streaming and n > 1 requests are
+never cached. Backend errors degrade to a miss.
+
+Usage:
+    from app.services.openai_service import openai_service
+
+    response = openai_service.chat_completion(messages, model="gpt-4o",
+                                              temperature=0.3, cache=True,
+                                              cache_ttl=7 * 24 * 3600)
+    openai_service.get_status()["response_cache"]   # hits, misses, tokens_saved
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = int(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+DEFAULT_SQLITE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+
+# Request params that do not change the completion
+NON_SEMANTIC_PARAMS = frozenset({"timeout", "user", "extra_headers", "extra_query"})
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """File-backed cache table; safe to share between worker processes."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+
+
+class RedisBackend:
+    """Redis cache with native key expiry."""
+
+    name = "redis"
+    PREFIX = "shelfsense:llm"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        import redis
+
+        self._client = redis.from_url(
+            redis_url or os.getenv("REDIS_URL"),
+            decode_responses=True,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+        )
+        self._client.ping()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(f"{self.PREFIX}:{key}")
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._client.setex(f"{self.PREFIX}:{key}", ttl, value)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(f"{self.PREFIX}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(f"{self.PREFIX}:*"))
+
+
+def response_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+    """SHA-256 over the canonical JSON of everything that shapes the completion."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "params": {k: v for k, v in params.items() if k not in NON_SEMANTIC_PARAMS},
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Policy, serialization and counters around a cache backend."""
+
+    def __init__(self, backend: Optional[Any] = None, default_ttl: int = DEFAULT_TTL):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.bypassed = 0
+        self.errors = 0
+        self.tokens_saved = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        """Build from LLM_CACHE_BACKEND; falls back to memory if the backend fails."""
+        kind = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+        if kind in ("off", "none", "disabled", ""):
+            return cls(None)
+        try:
+            if kind == "sqlite":
+                return cls(SQLiteBackend())
+            if kind == "redis":
+                return cls(RedisBackend())
+        except Exception as e:
+            logger.warning(f"LLM cache backend '{kind}' unavailable ({e}); using memory")
+        return cls(MemoryBackend())
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def should_cache(self, params: Dict[str, Any], cache: Optional[bool]) -> bool:
+        """
+        Whether a call is cacheable.
+
+        cache=True opts in, cache=False bypasses; by default only
+        deterministic (temperature 0) requests are cached.
+        """
+        if not self.enabled or cache is False:
+            if cache is False:
+                self._count("bypassed")
+            return False
+        if params.get("stream") or (params.get("n") or 1) > 1:
+            return False
+        if cache:
+            return True
+        return params.get("temperature") == 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached response for key (a ChatCompletion), or None."""
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            self._count("errors")
+            raw = None
+
+        if raw is None:
+            self._count("misses")
+            return None
+
+        try:
+            from openai.types.chat import ChatCompletion
+
+            response = ChatCompletion.model_validate_json(raw)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable LLM cache entry: {e}")
+            self._count("errors")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.total_tokens:
+            self._count("tokens_saved", usage.total_tokens)
+        return response
+
+    def set(self, key: str, response: Any, ttl: Optional[int] = None) -> None:
+        """Store a ChatCompletion; responses that cannot be serialized are skipped."""
+        try:
+            raw = response.model_dump_json()
+            if not isinstance(raw, str):
+                return
+            self.backend.set(key, raw, ttl or self.default_ttl)
+            self._count("stores")
+        except Exception as e:
+            logger.debug(f"LLM response not cached: {e}")
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for the OpenAI service status endpoint."""
+        lookups = self.hits + self.misses
+        try:
+            entries = self.backend.size() if self.enabled else 0
+        except Exception:
+            entries = None
+        return {
+            "backend": self.backend.name if self.enabled else "off",
+            "entries": entries,
+            "default_ttl_seconds": self.default_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{(self.hits / lookups * 100):.1f}%" if lookups else "N/A",
+            "stores": self.stores,
+            "bypassed": self.bypassed,
+            "errors": self.errors,
+            "tokens_saved": self.tokens_saved,
+        }
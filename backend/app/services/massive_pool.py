@@ -18,7 +18,7 @@ Architecture:
 │    1. Get user's weakness profile (weak specialties)            │
 │    2. Get user's difficulty target (based on accuracy)          │
 │    3. Serve from matching pool bucket                           │
-│    4. Exclude already-answered questions                        │
+│    4. Exclude already-answered questions (in-memory index)      │
 │                                                                 │
 │  Background Replenishment:                                      │
 │    - Runs continuously (every 5 minutes)                        │
@@ -36,9 +36,10 @@ import random
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select, update
 from app.models.models import Question, QuestionAttempt, generate_uuid
 from app.database import SessionLocal
+from app.services.pool_index import get_pool_index, POOL_INDEX_ENABLED
 
 logger = logging.getLogger(__name__)
 
@@ -95,11 +96,38 @@ SPECIALTY_WEIGHTS = {
 POOL_SOURCE_PREFIX = "AI Pool"
 
 
+# Pool status values (Question.pool_status)
+POOL_STATUS_POOLED = "pooled"
+POOL_STATUS_CLAIMED = "claimed"
+
+
 def get_pool_source(specialty: str, difficulty: str) -> str:
     """Get the source string for pool questions."""
     return f"{POOL_SOURCE_PREFIX} - {specialty} - {difficulty}"
 
 
+def normalize_specialty(specialty: str) -> str:
+    """Convert a display specialty to the normalized Question.specialty value."""
+    return specialty.lower().replace(" ", "_")
+
+
+def _count_pool_buckets(db: Session) -> Dict[Tuple[str, str], int]:
+    """Count available pool questions per (normalized specialty, difficulty) in one query."""
+    rows = db.query(
+        Question.specialty,
+        Question.difficulty_level,
+        func.count(Question.id)
+    ).filter(
+        Question.pool_status == POOL_STATUS_POOLED,
+        Question.rejected == False
+    ).group_by(
+        Question.specialty,
+        Question.difficulty_level
+    ).all()
+
+    return {(specialty, difficulty): count for specialty, difficulty, count in rows}
+
+
 # =============================================================================
 # POOL STATISTICS
 # =============================================================================
@@ -126,15 +154,13 @@ def get_detailed_pool_stats(db: Session) -> Dict:
         "health": "healthy"
     }
 
+    bucket_counts = _count_pool_buckets(db)
+
     for specialty in SPECIALTIES:
         specialty_stats = {"total": 0}
 
         for difficulty in ["easy", "medium", "hard"]:
-            source_pattern = get_pool_source(specialty, difficulty)
-            count = db.query(Question).filter(
-                Question.source == source_pattern,
-                Question.rejected == False
-            ).count()
+            count = bucket_counts.get((normalize_specialty(specialty), difficulty), 0)
 
             specialty_stats[difficulty] = count
             specialty_stats["total"] += count
@@ -164,16 +190,13 @@ def get_pool_gaps(db: Session) -> List[Tuple[str, str, int]]:
     Returns list of (specialty, difficulty, needed_count) sorted by priority.
     """
     gaps = []
+    bucket_counts = _count_pool_buckets(db)
 
     for specialty in SPECIALTIES:
         weight = SPECIALTY_WEIGHTS.get(specialty, 0.1)
 
         for difficulty in ["easy", "medium", "hard"]:
-            source_pattern = get_pool_source(specialty, difficulty)
-            current = db.query(Question).filter(
-                Question.source == source_pattern,
-                Question.rejected == False
-            ).count()
+            current = bucket_counts.get((normalize_specialty(specialty), difficulty), 0)
 
             target = POOL_TARGETS[difficulty]
             needed = max(0, target - current)
@@ -215,13 +238,18 @@ def get_instant_question_adaptive(
     Returns:
         Question matched to user's needs, or None if pool empty
     """
-    from app.services.adaptive import get_user_difficulty_target, get_user_weakness_profile
-
-    # Get user's weakness profile
-    weakness_profile = get_user_weakness_profile(db, user_id)
-    weak_specialties = weakness_profile.get("weak_specialties", [])
-
-    # Get user's difficulty target
+    from app.services.adaptive import get_user_difficulty_target
+    from app.services.learning_snapshot import get_learning_snapshot
+
+    # Get user's weak specialties (from the cached learning snapshot)
+    snapshot = get_learning_snapshot(db, user_id)
+    pool_specialties = {normalize_specialty(s): s for s in SPECIALTIES}
+    weak_specialties = [
+        pool_specialties[s] for s in snapshot.weak_specialties()
+        if s in pool_specialties
+    ]
+
+    # Get user's difficulty target (same snapshot, no extra query)
     difficulty_info = get_user_difficulty_target(db, user_id)
     target_difficulty = difficulty_info.get("difficulty_level", "medium")
 
@@ -277,56 +305,201 @@ def _get_from_pool(
     difficulty: str
 ) -> Optional[Question]:
     """Get a specific question from pool bucket."""
-    source_pattern = get_pool_source(specialty, difficulty)
+    if POOL_INDEX_ENABLED:
+        question = get_pool_index().pick(db, user_id, specialty, difficulty)
+        if question:
+            logger.debug("Served %s/%s question to user %s", specialty, difficulty, user_id[:8])
+            _trigger_replenish_check(specialty, difficulty)
+        return question
 
-    # Get IDs of questions user has already answered
-    answered_ids = db.query(QuestionAttempt.question_id).filter(
-        QuestionAttempt.user_id == user_id
-    ).subquery()
+    return _get_from_pool_sql(db, user_id, specialty, difficulty)
 
-    # Query for available question
-    question = db.query(Question).filter(
-        Question.source == source_pattern,
-        Question.rejected == False,
-        ~Question.id.in_(answered_ids)
-    ).order_by(func.random()).first()
 
-    if question:
-        # Mark as served (update source to show it's been used)
-        question.source = f"AI Generated - {specialty} - {difficulty}"
-        db.commit()
+def _get_any_from_pool(db: Session, user_id: str) -> Optional[Question]:
+    """Get any available question from pool (last resort fallback)."""
+    if POOL_INDEX_ENABLED:
+        question = get_pool_index().pick_any(db, user_id)
+        if question:
+            logger.debug("Served fallback question to user %s", user_id[:8])
+        return question
+
+    return _get_any_from_pool_sql(db, user_id)
 
+
+def _get_from_pool_sql(
+    db: Session,
+    user_id: str,
+    specialty: str,
+    difficulty: str
+) -> Optional[Question]:
+    """Get a specific question from pool bucket by claiming it directly in the database."""
+    claimed = claim_pool_questions(db, user_id, specialty, difficulty, count=1)
+
+    if claimed:
         logger.debug("Served %s/%s question to user %s", specialty, difficulty, user_id[:8])
 
         # Trigger background replenishment check
         _trigger_replenish_check(specialty, difficulty)
 
-    return question
+    return claimed[0] if claimed else None
 
 
-def _get_any_from_pool(db: Session, user_id: str) -> Optional[Question]:
-    """Get any available question from pool (last resort fallback)."""
-    answered_ids = db.query(QuestionAttempt.question_id).filter(
-        QuestionAttempt.user_id == user_id
-    ).subquery()
+def _get_any_from_pool_sql(db: Session, user_id: str) -> Optional[Question]:
+    """Get any available question from pool by claiming it directly in the database."""
+    claimed = claim_pool_questions(db, user_id, count=1)
 
-    question = db.query(Question).filter(
-        Question.source.like(f"{POOL_SOURCE_PREFIX}%"),
-        Question.rejected == False,
-        ~Question.id.in_(answered_ids)
-    ).order_by(func.random()).first()
+    if claimed:
+        logger.debug("Served fallback question to user %s", user_id[:8])
 
-    if question:
-        # Parse specialty and difficulty from source
-        parts = question.source.split(" - ")
-        if len(parts) >= 3:
-            specialty = parts[1]
-            difficulty = parts[2]
-            question.source = f"AI Generated - {specialty} - {difficulty}"
-            db.commit()
-            logger.debug("Served fallback question to user %s", user_id[:8])
+    return claimed[0] if claimed else None
+
+
+# =============================================================================
+# POOL CLAIMS
+# =============================================================================
+
+# SQLite fallback: candidate re-reads when every candidate was claimed by
+# another session between the read and the compare-and-set
+SQLITE_CLAIM_RETRIES = 3
+
+
+def _claim_values(user_id: str) -> Dict:
+    """Column updates that move a question out of the pool."""
+    return {
+        Question.pool_status: POOL_STATUS_CLAIMED,
+        Question.pool_claimed_by: user_id,
+        Question.pool_claimed_at: datetime.utcnow(),
+        Question.source: func.replace(Question.source, POOL_SOURCE_PREFIX, "AI Generated"),
+    }
+
+
+def claim_pool_questions(
+    db: Session,
+    user_id: Optional[str],
+    specialty: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    count: int = 1
+) -> List[Question]:
+    """
+    Atomically claim up to `count` unanswered pool questions for a user.
+
+    Each question is served at most once, even with concurrent callers:
+    - PostgreSQL: one UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP
+      LOCKED) RETURNING round trip, so concurrent claimers skip each
+      other's rows instead of blocking or double-serving.
+    - SQLite: read candidates, then compare-and-set each row on
+      pool_status (SQLite serializes writers, so the CAS is sufficient).
+
+    Use count > 1 to prefetch several questions for a session.
+
+    Args:
+        db: Database session
+        user_id: User the questions are served to (None skips the answered filter)
+        specialty: Optional display specialty (e.g. "Internal Medicine")
+        difficulty: Optional difficulty ("easy", "medium", "hard")
+        count: Maximum number of questions to claim
+
+    Returns:
+        Claimed questions (may be fewer than count, or empty)
+    """
+    candidates = select(Question.id).where(
+        Question.pool_status == POOL_STATUS_POOLED,
+        Question.rejected == False
+    )
+    if user_id:
+        candidates = candidates.where(~Question.id.in_(
+            select(QuestionAttempt.question_id).where(QuestionAttempt.user_id == user_id)
+        ))
+    if specialty:
+        candidates = candidates.where(Question.specialty == normalize_specialty(specialty))
+    if difficulty:
+        candidates = candidates.where(Question.difficulty_level == difficulty)
+
+    if db.get_bind().dialect.name == "postgresql":
+        claimed_ids = _claim_skip_locked(db, user_id, candidates, count)
+    else:
+        claimed_ids = _claim_compare_and_set(db, user_id, candidates, count)
+
+    if not claimed_ids:
+        return []
+
+    return db.query(Question).filter(
+        Question.id.in_(claimed_ids)
+    ).populate_existing().all()
+
+
+def claim_pool_question(db: Session, question_id: str, user_id: str) -> Optional[Question]:
+    """
+    Claim a specific pool question by id (compare-and-set on pool_status).
+
+    Returns:
+        The claimed Question, or None if it was no longer in the pool
+    """
+    result = db.execute(
+        update(Question)
+        .where(Question.id == question_id, Question.pool_status == POOL_STATUS_POOLED)
+        .values(_claim_values(user_id))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if result.rowcount != 1:
+        return None
+
+    return db.query(Question).filter(
+        Question.id == question_id
+    ).populate_existing().first()
+
+
+def _claim_skip_locked(db: Session, user_id: str, candidates, count: int) -> List[str]:
+    """PostgreSQL claim: lock-free for concurrent claimers via SKIP LOCKED."""
+    locked = candidates.limit(count).with_for_update(skip_locked=True).scalar_subquery()
+
+    result = db.execute(
+        update(Question)
+        .where(Question.id.in_(locked))
+        .values(_claim_values(user_id))
+        .returning(Question.id)
+        .execution_options(synchronize_session=False)
+    )
+    claimed_ids = [row[0] for row in result]
+    db.commit()
+
+    return claimed_ids
+
+
+def _claim_compare_and_set(db: Session, user_id: str, candidates, count: int) -> List[str]:
+    """SQLite claim: conditional UPDATE per candidate, retried if all were taken."""
+    claimed_ids: List[str] = []
+
+    for _ in range(SQLITE_CLAIM_RETRIES):
+        needed = count - len(claimed_ids)
+        if needed <= 0:
+            break
+
+        # Over-fetch so losing a few races doesn't need another read
+        query = candidates
+        if claimed_ids:
+            query = query.where(~Question.id.in_(claimed_ids))
+        candidate_ids = db.execute(query.limit(needed * 2)).scalars().all()
+        if not candidate_ids:
+            break
+
+        for question_id in candidate_ids:
+            result = db.execute(
+                update(Question)
+                .where(Question.id == question_id, Question.pool_status == POOL_STATUS_POOLED)
+                .values(_claim_values(user_id))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                claimed_ids.append(question_id)
+                if len(claimed_ids) >= count:
+                    break
+
+        db.commit()
 
-    return question
+    return claimed_ids
 
 
 # =============================================================================
@@ -394,8 +567,9 @@ def replenish_pool_batch(
                     choices=question_data["choices"],
                     explanation=question_data.get("explanation"),
                     source=get_pool_source(specialty, difficulty),
-                    specialty=specialty.lower().replace(" ", "_"),
+                    specialty=normalize_specialty(specialty),
                     difficulty_level=difficulty,
+                    pool_status=POOL_STATUS_POOLED,
                     source_type="ai_generated",
                     recency_weight=1.0,
                     recency_tier=1,
@@ -408,6 +582,7 @@ def replenish_pool_batch(
                 )
                 db.add(question)
                 db.commit()
+                get_pool_index().add_question(question.id, specialty, difficulty)
                 generated += 1
 
                 logger.debug("Generated %s/%s question %d/%d", specialty, difficulty, generated, count)
@@ -5,6 +5,10 @@ Cross-references generated content against curated medical guidelines to prevent
 clinical inaccuracies from reaching students.
 
 Issue: #8
+
+Text rules (time windows, thresholds, outdated guidelines) are compiled
+once into a RuleSet, so each question is scanned with a single trigger pass
+and only rules that can match run their pattern.
 """
 
 import re
@@ -13,6 +17,8 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from app.services.validation_rules import Rule, RuleSet
+
 logger = logging.getLogger(__name__)
 
 
@@ -250,6 +256,31 @@ class ClinicalFactChecker:
         (r"tPA\s+(?:within|at|after)\s+(\d+(?:\.\d+)?)\s*(hours?)", "tpa_timing"),
     ]
 
+    # Rules applied to the combined question text, compiled once.
+    # data = (check stage, handler method name)
+    TEXT_RULES = RuleSet([
+        # Time-sensitive interventions
+        Rule("tpa_window", r"(?:tPA|alteplase|tissue plasminogen).*?(\d+(?:\.\d+)?)\s*(hours?)",
+             ("tpa", "alteplase", "tissue plasminogen"), data=("time_window", "_on_tpa_window")),
+        Rule("sepsis_antibiotics", r"(?:sepsis|septic).*?antibiotic.*?(\d+)\s*(hours?|minutes?)",
+             ("sepsis", "septic"), data=("time_window", "_on_sepsis_antibiotics")),
+
+        # Clinical thresholds
+        Rule("hba1c_threshold", r"HbA1c\s*[><=]\s*(\d+(?:\.\d+)?)\s*%?",
+             ("hba1c",), data=("threshold", "_on_hba1c_threshold")),
+        Rule("bp_value", r"(?:BP|blood pressure)[:\s]*(\d+)/(\d+)",
+             ("bp", "blood pressure"), data=("threshold", "_on_bp_value")),
+
+        # Patterns suggesting outdated info (first match only)
+        Rule("jnc7", r"JNC\s*7", ("jnc",), data=(
+            "guideline", "JNC 7 is outdated; current standard is ACC/AHA 2017")),
+        Rule("atp3", r"ATP\s*III", ("atp",), data=(
+            "guideline", "ATP III is outdated; use 2018 ACC/AHA guidelines")),
+        Rule("htn_stage1_140", r"(?:BP|blood pressure)\s*[>]\s*140/90.*?hypertension.*?stage\s*1",
+             ("bp", "blood pressure"), data=(
+                 "guideline", "Stage 1 HTN is now >= 130/80 per ACC/AHA 2017")),
+    ])
+
     def __init__(self):
         """Initialize the fact checker"""
         self.compiled_patterns = [
@@ -279,17 +310,20 @@ class ClinicalFactChecker:
         # Combine all text for analysis
         all_text = self._combine_text(vignette, correct_answer, explanation)
 
+        # Time windows, thresholds and guideline currency in one rule pass
+        stages = self._run_text_rules(all_text)
+
         # Check time-sensitive interventions
-        findings.extend(self._check_time_windows(all_text))
+        findings.extend(stages["time_window"])
 
         # Check clinical thresholds
-        findings.extend(self._check_thresholds(all_text))
+        findings.extend(stages["threshold"])
 
         # Check drug-related claims
         findings.extend(self._check_drug_claims(all_text))
 
         # Check for potentially outdated guidelines
-        findings.extend(self._check_guideline_currency(all_text))
+        findings.extend(stages["guideline"])
 
         # Calculate summary
         error_count = sum(1 for f in findings if f.severity == FactCheckSeverity.ERROR)
@@ -331,102 +365,108 @@ class ClinicalFactChecker:
 
         return " ".join(parts)
 
-    def _check_time_windows(self, text: str) -> List[FactCheckResult]:
-        """Check time-sensitive intervention windows"""
-        findings = []
-
-        # Check tPA timing for stroke
-        tpa_pattern = re.compile(
-            r"(?:tPA|alteplase|tissue plasminogen).*?(\d+(?:\.\d+)?)\s*(hours?)",
-            re.IGNORECASE
-        )
-        for match in tpa_pattern.finditer(text):
-            hours = float(match.group(1))
-            guideline = self.CLINICAL_THRESHOLDS["tpa_window_ischemic_stroke"]
-
-            if hours > guideline["value"]:
-                findings.append(FactCheckResult(
-                    claim=f"tPA at {hours} hours",
-                    is_valid=False,
-                    severity=FactCheckSeverity.CRITICAL,
-                    message=f"tPA window is {guideline['value']} hours, not {hours} hours",
-                    guideline_source=guideline["source"],
-                    suggested_correction=f"tPA within {guideline['value']} hours"
-                ))
-            elif hours == guideline["value"]:
-                findings.append(FactCheckResult(
-                    claim=f"tPA at {hours} hours",
-                    is_valid=True,
-                    severity=FactCheckSeverity.INFO,
-                    message="Correct tPA window",
-                    guideline_source=guideline["source"]
-                ))
-
-        # Check sepsis antibiotic timing
-        sepsis_abx_pattern = re.compile(
-            r"(?:sepsis|septic).*?antibiotic.*?(\d+)\s*(hours?|minutes?)",
-            re.IGNORECASE
-        )
-        for match in sepsis_abx_pattern.finditer(text):
-            value = float(match.group(1))
-            unit = match.group(2).lower()
-            hours = value if "hour" in unit else value / 60
-
-            guideline = self.CLINICAL_THRESHOLDS["sepsis_antibiotic_window"]
-            if hours > guideline["value"]:
-                findings.append(FactCheckResult(
-                    claim=f"Sepsis antibiotics within {value} {unit}",
-                    is_valid=False,
-                    severity=FactCheckSeverity.ERROR,
-                    message=f"Sepsis antibiotics should be within {guideline['value']} hour",
-                    guideline_source=guideline["source"],
-                    suggested_correction=f"Antibiotics within 1 hour of recognition"
-                ))
-
-        return findings
-
-    def _check_thresholds(self, text: str) -> List[FactCheckResult]:
-        """Check clinical threshold values"""
-        findings = []
+    def _run_text_rules(self, text: str) -> Dict[str, List[FactCheckResult]]:
+        """Apply TEXT_RULES to text; findings grouped by check stage, in rule order."""
+        stages: Dict[str, List[FactCheckResult]] = {"time_window": [], "threshold": [], "guideline": []}
+        text_lower = text.lower()
 
-        # Check diabetes thresholds
-        hba1c_pattern = re.compile(r"HbA1c\s*[><=]\s*(\d+(?:\.\d+)?)\s*%?", re.IGNORECASE)
-        for match in hba1c_pattern.finditer(text):
-            value = float(match.group(1))
-            guideline = self.CLINICAL_THRESHOLDS["hba1c_diabetes_diagnosis"]
+        for rule in self.TEXT_RULES.candidates(text):
+            stage, target = rule.data
 
-            # If claiming diabetes diagnosis at wrong threshold
-            if "diagnos" in text.lower() and abs(value - guideline["value"]) > 0.1:
-                findings.append(FactCheckResult(
-                    claim=f"HbA1c {value}% for diabetes diagnosis",
-                    is_valid=False,
-                    severity=FactCheckSeverity.WARNING,
-                    message=f"Diabetes diagnosis threshold is HbA1c >= {guideline['value']}%",
-                    guideline_source=guideline["source"],
-                    suggested_correction=f"HbA1c >= {guideline['value']}%"
-                ))
-
-        # Check BP thresholds
-        bp_pattern = re.compile(
-            r"(?:BP|blood pressure)[:\s]*(\d+)/(\d+)",
-            re.IGNORECASE
-        )
-        for match in bp_pattern.finditer(text):
-            systolic = int(match.group(1))
-
-            # Check for hypotension claims
-            if "hypotens" in text.lower():
-                guideline = self.CLINICAL_THRESHOLDS["hypotension_systolic"]
-                if systolic >= guideline["value"]:
-                    findings.append(FactCheckResult(
-                        claim=f"BP {systolic} described as hypotensive",
+            if stage == "guideline":
+                if rule.compiled.search(text):
+                    stages[stage].append(FactCheckResult(
+                        claim="Potentially outdated guideline reference",
                         is_valid=False,
-                        severity=FactCheckSeverity.ERROR,
-                        message=f"Hypotension is typically SBP < {guideline['value']} mmHg",
-                        guideline_source=guideline["source"]
+                        severity=FactCheckSeverity.WARNING,
+                        message=target,
+                        guideline_source="Current guidelines"
                     ))
-
-        return findings
+                continue
+
+            handler = getattr(self, target)
+            for match in rule.compiled.finditer(text):
+                finding = handler(match, text_lower)
+                if finding:
+                    stages[stage].append(finding)
+
+        return stages
+
+    def _on_tpa_window(self, match: "re.Match", text_lower: str) -> Optional[FactCheckResult]:
+        """Check tPA timing for stroke"""
+        hours = float(match.group(1))
+        guideline = self.CLINICAL_THRESHOLDS["tpa_window_ischemic_stroke"]
+
+        if hours > guideline["value"]:
+            return FactCheckResult(
+                claim=f"tPA at {hours} hours",
+                is_valid=False,
+                severity=FactCheckSeverity.CRITICAL,
+                message=f"tPA window is {guideline['value']} hours, not {hours} hours",
+                guideline_source=guideline["source"],
+                suggested_correction=f"tPA within {guideline['value']} hours"
+            )
+        elif hours == guideline["value"]:
+            return FactCheckResult(
+                claim=f"tPA at {hours} hours",
+                is_valid=True,
+                severity=FactCheckSeverity.INFO,
+                message="Correct tPA window",
+                guideline_source=guideline["source"]
+            )
+        return None
+
+    def _on_sepsis_antibiotics(self, match: "re.Match", text_lower: str) -> Optional[FactCheckResult]:
+        """Check sepsis antibiotic timing"""
+        value = float(match.group(1))
+        unit = match.group(2).lower()
+        hours = value if "hour" in unit else value / 60
+
+        guideline = self.CLINICAL_THRESHOLDS["sepsis_antibiotic_window"]
+        if hours > guideline["value"]:
+            return FactCheckResult(
+                claim=f"Sepsis antibiotics within {value} {unit}",
+                is_valid=False,
+                severity=FactCheckSeverity.ERROR,
+                message=f"Sepsis antibiotics should be within {guideline['value']} hour",
+                guideline_source=guideline["source"],
+                suggested_correction=f"Antibiotics within 1 hour of recognition"
+            )
+        return None
+
+    def _on_hba1c_threshold(self, match: "re.Match", text_lower: str) -> Optional[FactCheckResult]:
+        """Check diabetes thresholds"""
+        value = float(match.group(1))
+        guideline = self.CLINICAL_THRESHOLDS["hba1c_diabetes_diagnosis"]
+
+        # If claiming diabetes diagnosis at wrong threshold
+        if "diagnos" in text_lower and abs(value - guideline["value"]) > 0.1:
+            return FactCheckResult(
+                claim=f"HbA1c {value}% for diabetes diagnosis",
+                is_valid=False,
+                severity=FactCheckSeverity.WARNING,
+                message=f"Diabetes diagnosis threshold is HbA1c >= {guideline['value']}%",
+                guideline_source=guideline["source"],
+                suggested_correction=f"HbA1c >= {guideline['value']}%"
+            )
+        return None
+
+    def _on_bp_value(self, match: "re.Match", text_lower: str) -> Optional[FactCheckResult]:
+        """Check BP values described as hypotensive"""
+        systolic = int(match.group(1))
+
+        # Check for hypotension claims
+        if "hypotens" in text_lower:
+            guideline = self.CLINICAL_THRESHOLDS["hypotension_systolic"]
+            if systolic >= guideline["value"]:
+                return FactCheckResult(
+                    claim=f"BP {systolic} described as hypotensive",
+                    is_valid=False,
+                    severity=FactCheckSeverity.ERROR,
+                    message=f"Hypotension is typically SBP < {guideline['value']} mmHg",
+                    guideline_source=guideline["source"]
+                )
+        return None
 
     def _check_drug_claims(self, text: str) -> List[FactCheckResult]:
         """Check drug-related claims for contraindications"""
@@ -455,30 +495,6 @@ class ClinicalFactChecker:
 
         return findings
 
-    def _check_guideline_currency(self, text: str) -> List[FactCheckResult]:
-        """Check for potentially outdated guideline references"""
-        findings = []
-
-        # Patterns suggesting outdated info
-        outdated_patterns = [
-            (r"JNC\s*7", "JNC 7 is outdated; current standard is ACC/AHA 2017"),
-            (r"ATP\s*III", "ATP III is outdated; use 2018 ACC/AHA guidelines"),
-            (r"(?:BP|blood pressure)\s*[>]\s*140/90.*?hypertension.*?stage\s*1",
-             "Stage 1 HTN is now >= 130/80 per ACC/AHA 2017"),
-        ]
-
-        for pattern, message in outdated_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                findings.append(FactCheckResult(
-                    claim="Potentially outdated guideline reference",
-                    is_valid=False,
-                    severity=FactCheckSeverity.WARNING,
-                    message=message,
-                    guideline_source="Current guidelines"
-                ))
-
-        return findings
-
     def validate_treatment(self, drug: str, indication: str, patient_context: str = "") -> FactCheckResult:
         """
         Validate a specific treatment against contraindications.
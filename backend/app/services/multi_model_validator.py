@@ -13,16 +13,26 @@ Usage:
     validator = MultiModelValidator()
     result = await validator.validate_question(question_dict)
     # result.status = "ACCEPT" | "REVISE" | "REJECT"
+
+    results = await validator.validate_batch(questions)  # concurrent, input order
+    pairs = await validator.validate_batch_indexed(questions)  # [(input index, result), ...]
+
+Concurrency: each validator model has its own semaphore (MODEL_CONCURRENCY,
+overridable per instance), so a batch fans out up to that many in-flight
+calls per provider and a fallback burst cannot starve the preferred model.
 """
 
+import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
+from app.utils.fanout import gather_until
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +47,13 @@ class ValidatorModel(Enum):
     GPT_35_TURBO = "gpt-3.5-turbo"
 
 
+# Max in-flight validation calls per model
+MODEL_CONCURRENCY = {
+    ValidatorModel.CLAUDE_HAIKU: int(os.getenv("VALIDATOR_HAIKU_CONCURRENCY", "8")),
+    ValidatorModel.GPT_35_TURBO: int(os.getenv("VALIDATOR_GPT35_CONCURRENCY", "8")),
+}
+
+
 @dataclass
 class ValidationResult:
     """Result of question validation."""
@@ -111,7 +128,8 @@ class MultiModelValidator:
         preferred_model: ValidatorModel = ValidatorModel.CLAUDE_HAIKU,
         fallback_model: ValidatorModel = ValidatorModel.GPT_35_TURBO,
         min_accept_score: float = 70.0,
-        min_revise_score: float = 50.0
+        min_revise_score: float = 50.0,
+        model_concurrency: Optional[Dict[ValidatorModel, int]] = None
     ):
         """
         Initialize the validator.
@@ -121,11 +139,16 @@ class MultiModelValidator:
             fallback_model: Backup if preferred unavailable
             min_accept_score: Minimum score to ACCEPT (default 70)
             min_revise_score: Minimum score to REVISE vs REJECT (default 50)
+            model_concurrency: Per-model in-flight call limits (default MODEL_CONCURRENCY)
         """
         self.preferred_model = preferred_model
         self.fallback_model = fallback_model
         self.min_accept_score = min_accept_score
         self.min_revise_score = min_revise_score
+        self.model_concurrency = {**MODEL_CONCURRENCY, **(model_concurrency or {})}
+
+        # model -> (event loop, semaphore); semaphores are bound to the loop they run on
+        self._model_slots: Dict[ValidatorModel, Any] = {}
 
         self._validation_count = 0
         self._accept_count = 0
@@ -188,39 +211,78 @@ class MultiModelValidator:
     async def validate_batch(
         self,
         questions: List[Dict[str, Any]],
-        stop_on_reject_streak: int = 5
+        stop_on_reject_streak: int = 5,
+        concurrency: Optional[int] = None
     ) -> List[ValidationResult]:
         """
-        Validate a batch of questions.
+        Validate a batch of questions concurrently.
+
+        The reject streak is counted over results in the order they complete;
+        once it trips, in-flight validations are cancelled and the rest of
+        the batch is skipped.
 
         Args:
             questions: List of question dicts
             stop_on_reject_streak: Stop if this many consecutive REJECTs (quality issue)
+            concurrency: Questions in flight (default: the preferred model's limit)
 
         Returns:
-            List of ValidationResults
+            ValidationResults for the questions that completed, in input order
+            (use validate_batch_indexed to map them back to `questions`)
         """
-        results = []
-        reject_streak = 0
+        pairs = await self.validate_batch_indexed(questions, stop_on_reject_streak, concurrency)
+        return [result for _, result in pairs]
+
+    async def validate_batch_indexed(
+        self,
+        questions: List[Dict[str, Any]],
+        stop_on_reject_streak: int = 5,
+        concurrency: Optional[int] = None
+    ) -> List[Tuple[int, ValidationResult]]:
+        """
+        Same as validate_batch, but pairs each result with its index in `questions`.
 
-        for i, question in enumerate(questions):
-            logger.info(f"Validating question {i+1}/{len(questions)}")
+        Questions whose validation raised or was skipped after the streak
+        tripped have no pair.
+        """
+        reject_streak = 0
+        completed = 0
 
-            result = await self.validate_question(question)
-            results.append(result)
+        def on_result(index: int, result: ValidationResult) -> bool:
+            nonlocal reject_streak, completed
+            completed += 1
+            if completed % 25 == 0:
+                logger.info(f"Validated {completed}/{len(questions)} questions")
 
-            if result.status == ValidationStatus.REJECT:
-                reject_streak += 1
-                if reject_streak >= stop_on_reject_streak:
-                    logger.warning(
-                        f"Stopping validation: {reject_streak} consecutive REJECTs. "
-                        "Check generation quality."
-                    )
-                    break
-            else:
+            if result.status != ValidationStatus.REJECT:
                 reject_streak = 0
+                return False
 
-        return results
+            reject_streak += 1
+            if reject_streak >= stop_on_reject_streak:
+                logger.warning(
+                    f"Stopping validation: {reject_streak} consecutive REJECTs. "
+                    "Check generation quality."
+                )
+                return True
+            return False
+
+        results = await gather_until(
+            questions,
+            self.validate_question,
+            concurrency or self.model_concurrency[self.preferred_model],
+            on_result=on_result
+        )
+        return [(i, result) for i, result in enumerate(results) if result is not None]
+
+    def _model_slot(self, model: ValidatorModel) -> asyncio.Semaphore:
+        """Semaphore limiting in-flight calls to one model on the running loop."""
+        loop = asyncio.get_running_loop()
+        slot = self._model_slots.get(model)
+        if slot is None or slot[0] is not loop:
+            slot = (loop, asyncio.Semaphore(max(1, self.model_concurrency.get(model, 1))))
+            self._model_slots[model] = slot
+        return slot[1]
 
     async def _call_validator(
         self,
@@ -244,10 +306,11 @@ class MultiModelValidator:
         prompt = VALIDATION_PROMPT.format(question_json=question_json)
 
         try:
-            if model == ValidatorModel.CLAUDE_HAIKU:
-                return await self._call_claude_haiku(prompt)
-            else:
-                return await self._call_gpt35(prompt)
+            async with self._model_slot(model):
+                if model == ValidatorModel.CLAUDE_HAIKU:
+                    return await self._call_claude_haiku(prompt)
+                else:
+                    return await self._call_gpt35(prompt)
 
         except Exception as e:
             logger.error(f"Validator {model.value} failed: {e}")
@@ -255,8 +318,6 @@ class MultiModelValidator:
 
     async def _call_claude_haiku(self, prompt: str) -> Optional[str]:
         """Call Claude Haiku for validation (async-safe)."""
-        import asyncio
-
         try:
             from app.utils.anthropic_client import get_anthropic_client, is_anthropic_available
 
@@ -283,15 +344,16 @@ class MultiModelValidator:
             return None
 
     async def _call_gpt35(self, prompt: str) -> Optional[str]:
-        """Call GPT-3.5-turbo for validation."""
+        """Call GPT-3.5-turbo for validation (async-safe)."""
         try:
             from app.services.openai_service import openai_service, CircuitBreakerOpenError
 
-            response = openai_service.chat_completion(
+            response = await openai_service.achat_completion(
                 messages=[{"role": "user", "content": prompt}],
                 model="gpt-3.5-turbo",
                 temperature=0.1,
-                max_tokens=1000
+                max_tokens=1000,
+                cache=True  # Same question text gets the same verdict
             )
 
             return response.choices[0].message.content
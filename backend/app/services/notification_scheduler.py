@@ -5,105 +5,46 @@ Runs hourly to send push notifications for daily reminders and streak alerts.
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import os
+from datetime import datetime
 from typing import List, Tuple
 
-from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
-from app.models.models import (
-    User, UserSettings, UserEngagementScore, PushSubscription, ScheduledReview
-)
+from app.models.models import PushSubscription
 from app.services.push_notification_service import get_push_notification_service
+from app.services.reminder_targeting import (
+    ReminderTarget, get_active_subscriptions, get_reminder_targets
+)
+from app.utils.fanout import gather_bounded
 
 logger = logging.getLogger(__name__)
 
+# Push deliveries in flight at once (each goes to the browser vendor's push service)
+PUSH_SEND_CONCURRENCY = int(os.getenv("PUSH_SEND_CONCURRENCY", "20"))
+
 
-def get_users_for_push_reminder(db: Session, current_hour: int) -> List[Tuple[User, int, int, bool]]:
+def get_users_for_push_reminder(db: Session, current_hour: int) -> List[ReminderTarget]:
     """
     Get users who should receive a push reminder at this hour.
 
     Returns:
-        List of (user, review_count, current_streak, streak_at_risk) tuples
+        Targets with review_count, current_streak and streak_at_risk for
+        users with daily reminders on, a reminder in this hour and at least
+        one active push subscription
     """
-    now = datetime.utcnow()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    # Find users with:
-    # - daily_reminder = True
-    # - reminder_time hour matches current UTC hour
-    # - have at least one active push subscription
-    users_with_settings = db.query(User, UserSettings).join(
-        UserSettings, User.id == UserSettings.user_id
-    ).filter(
-        and_(
-            UserSettings.daily_reminder == True,
-            UserSettings.reminder_time.isnot(None)
-        )
-    ).all()
-
-    matching_users = []
-
-    for user, settings in users_with_settings:
-        # Parse reminder_time "HH:MM" and check hour
-        try:
-            reminder_hour = int(settings.reminder_time.split(":")[0])
-            if reminder_hour != current_hour:
-                continue
-        except (ValueError, AttributeError):
-            continue
-
-        # Check if user has active push subscriptions
-        has_push = db.query(PushSubscription).filter(
-            and_(
-                PushSubscription.user_id == user.id,
-                PushSubscription.is_active == True
-            )
-        ).first() is not None
-
-        if not has_push:
-            continue
-
-        # Count reviews due today
-        review_count = db.query(ScheduledReview).filter(
-            and_(
-                ScheduledReview.user_id == user.id,
-                ScheduledReview.scheduled_for <= now
-            )
-        ).count()
-
-        # Get streak info
-        engagement = db.query(UserEngagementScore).filter(
-            UserEngagementScore.user_id == user.id
-        ).first()
-
-        current_streak = 0
-        streak_at_risk = False
-
-        if engagement:
-            current_streak = engagement.streak_current or 0
-
-            # Check if streak is at risk
-            if engagement.last_activity_at:
-                last_activity_date = engagement.last_activity_at.replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                )
-                days_since = (today_start - last_activity_date).days
-
-                # Streak at risk if last activity was yesterday
-                if days_since == 1 and current_streak > 0:
-                    streak_at_risk = True
-
-        matching_users.append((user, review_count, current_streak, streak_at_risk))
-
-    return matching_users
+    return get_reminder_targets(db, current_hour, channel="push")
 
 
 async def send_push_reminders_for_hour(current_hour: int) -> int:
     """
     Send push notification reminders for all users scheduled at this hour.
 
+    Deliveries fan out with at most PUSH_SEND_CONCURRENCY in flight;
+    subscription health (last_used / failed_attempts) is committed once
+    at the end.
+
     Args:
         current_hour: UTC hour to process
 
@@ -120,49 +61,45 @@ async def send_push_reminders_for_hour(current_hour: int) -> int:
     sent_count = 0
 
     try:
-        users = get_users_for_push_reminder(db, current_hour)
-        logger.info(f"Found {len(users)} users due for push reminders at hour {current_hour}")
-
-        for user, review_count, current_streak, streak_at_risk in users:
-            # Get all active subscriptions for user
-            subs = db.query(PushSubscription).filter(
-                and_(
-                    PushSubscription.user_id == user.id,
-                    PushSubscription.is_active == True
-                )
-            ).all()
-
-            for sub in subs:
-                try:
-                    subscription_info = {
-                        "endpoint": sub.endpoint,
-                        "keys": {
-                            "p256dh": sub.p256dh_key,
-                            "auth": sub.auth_key
-                        }
+        targets = get_users_for_push_reminder(db, current_hour)
+        logger.info(f"Found {len(targets)} users due for push reminders at hour {current_hour}")
+
+        subscriptions = get_active_subscriptions(db, [t.user_id for t in targets])
+        deliveries: List[Tuple[ReminderTarget, PushSubscription]] = [
+            (target, sub)
+            for target in targets
+            for sub in subscriptions.get(target.user_id, [])
+        ]
+
+        async def deliver(delivery: Tuple[ReminderTarget, PushSubscription]) -> bool:
+            target, sub = delivery
+            return await push_service.send_study_reminder(
+                subscription_info={
+                    "endpoint": sub.endpoint,
+                    "keys": {
+                        "p256dh": sub.p256dh_key,
+                        "auth": sub.auth_key
                     }
+                },
+                user_name=target.first_name or "there",
+                reviews_due=target.review_count,
+                streak_at_risk=target.streak_at_risk,
+                current_streak=target.current_streak
+            )
 
-                    success = await push_service.send_study_reminder(
-                        subscription_info=subscription_info,
-                        user_name=user.first_name or "there",
-                        reviews_due=review_count,
-                        streak_at_risk=streak_at_risk,
-                        current_streak=current_streak
-                    )
-
-                    if success:
-                        sent_count += 1
-                        sub.last_used = datetime.utcnow()
-                        sub.failed_attempts = 0
-                    else:
-                        sub.failed_attempts += 1
-                        if sub.failed_attempts >= 3:
-                            sub.is_active = False
-                            logger.info(f"Deactivated subscription {sub.id} after 3 failures")
-
-                except Exception as e:
-                    logger.error(f"Failed to send push to {user.email}: {e}")
-                    sub.failed_attempts += 1
+        results = await gather_bounded(deliveries, deliver, PUSH_SEND_CONCURRENCY)
+
+        now = datetime.utcnow()
+        for (_, sub), success in zip(deliveries, results):
+            if success:
+                sent_count += 1
+                sub.last_used = now
+                sub.failed_attempts = 0
+            else:
+                sub.failed_attempts = (sub.failed_attempts or 0) + 1
+                if sub.failed_attempts >= 3:
+                    sub.is_active = False
+                    logger.info(f"Deactivated subscription {sub.id} after 3 failures")
 
         db.commit()
         logger.info(f"Sent {sent_count} push reminders for hour {current_hour}")
@@ -31,6 +31,8 @@ from datetime import datetime
 
 import httpx
 
+from app.utils.http_clients import get_async_http_client, get_pool_status
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,6 +88,10 @@ class OllamaService:
 
         logger.info(f"Ollama Service initialized (model: {default_model})")
 
+    def _client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for the Ollama server (one per event loop)."""
+        return get_async_http_client("ollama", base_url=self.base_url)
+
     async def generate(
         self,
         prompt: str,
@@ -126,50 +132,51 @@ class OllamaService:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=timeout_config) as client:
-                payload = {
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": True,  # Use streaming to avoid timeout on slow hardware
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
+            client = self._client()
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": True,  # Use streaming to avoid timeout on slow hardware
+                "options": {
+                    "temperature": temperature,
+                    "num_predict": max_tokens
                 }
+            }
+
+            if system:
+                payload["system"] = system
+
+            # Use streaming to collect response incrementally
+            full_response = []
+            async with client.stream(
+                "POST",
+                "/api/generate",
+                json=payload,
+                timeout=timeout_config
+            ) as response:
+                if response.status_code == 404:
+                    raise OllamaNotAvailableError(
+                        f"Model '{model}' not found. "
+                        f"Run: ollama pull {model}"
+                    )
+
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if line:
+                        try:
+                            chunk = json.loads(line)
+                            if chunk.get("response"):
+                                full_response.append(chunk["response"])
+                            if chunk.get("done"):
+                                break
+                        except json.JSONDecodeError:
+                            continue
+
+            latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+            self._record_call(model, success=True, latency_ms=latency_ms)
 
-                if system:
-                    payload["system"] = system
-
-                # Use streaming to collect response incrementally
-                full_response = []
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/api/generate",
-                    json=payload
-                ) as response:
-                    if response.status_code == 404:
-                        raise OllamaNotAvailableError(
-                            f"Model '{model}' not found. "
-                            f"Run: ollama pull {model}"
-                        )
-
-                    response.raise_for_status()
-
-                    async for line in response.aiter_lines():
-                        if line:
-                            try:
-                                chunk = json.loads(line)
-                                if chunk.get("response"):
-                                    full_response.append(chunk["response"])
-                                if chunk.get("done"):
-                                    break
-                            except json.JSONDecodeError:
-                                continue
-
-                latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-                self._record_call(model, success=True, latency_ms=latency_ms)
-
-                return "".join(full_response)
+            return "".join(full_response)
 
         except httpx.ConnectError:
             self._record_call(model, success=False, error="Connection failed")
@@ -378,9 +385,8 @@ Return ONLY valid JSON:
             bool: True if Ollama is ready to use
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                return response.status_code == 200
+            response = await self._client().get("/api/tags", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -392,11 +398,10 @@ Return ONLY valid JSON:
             List of model names
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                response.raise_for_status()
-                data = response.json()
-                return [m["name"] for m in data.get("models", [])]
+            response = await self._client().get("/api/tags", timeout=5.0)
+            response.raise_for_status()
+            data = response.json()
+            return [m["name"] for m in data.get("models", [])]
         except Exception as e:
             logger.warning(f"Failed to list models: {e}")
             return []
@@ -432,7 +437,8 @@ Return ONLY valid JSON:
             "avg_latency_ms": round(
                 sum(c.get("latency_ms", 0) for c in recent_calls if c.get("success"))
                 / max(successful, 1), 1
-            )
+            ),
+            "http_pool": get_pool_status()
         }
 
 
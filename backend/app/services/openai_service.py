@@ -6,6 +6,8 @@ This service wraps all OpenAI API calls with:
 - Exponential backoff with jitter
 - Sentry error tracking
 - Metrics collection
+- Optional content-addressed response cache (see llm_response_cache)
+- Native async calls (achat_completion) on a shared keep-alive pool
 
 Usage:
     from app.services.openai_service import openai_service, CircuitBreakerOpenError
@@ -18,6 +20,9 @@ Usage:
     except CircuitBreakerOpenError:
         # Handle gracefully - serve cached content or fallback
         pass
+
+    # From async code, without tying up a thread:
+    response = await openai_service.achat_completion(messages=[...], model="gpt-4o")
 """
 
 import logging
@@ -36,7 +41,9 @@ from app.utils.api_retry import (
     CircuitState,
     RetryConfig
 )
-from app.utils.openai_client import get_openai_client
+from app.utils.http_clients import get_pool_status
+from app.utils.openai_client import get_async_openai_client, get_openai_client
+from app.services.llm_response_cache import LLMResponseCache, response_key
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +96,7 @@ class OpenAIService:
 
         self.retry_handler = OpenAIRetryHandler(self.config)
         self._call_history: List[Dict[str, Any]] = []
+        self.response_cache = LLMResponseCache.from_env()
         self._initialized = True
 
         logger.info("OpenAI Service initialized with circuit breaker protection")
@@ -102,6 +110,8 @@ class OpenAIService:
         self,
         messages: List[Dict[str, str]],
         model: str = "gpt-4o",
+        cache: Optional[bool] = None,
+        cache_ttl: Optional[int] = None,
         **kwargs
     ) -> Any:
         """
@@ -110,6 +120,9 @@ class OpenAIService:
         Args:
             messages: List of message dicts with 'role' and 'content'
             model: OpenAI model to use (default: gpt-4o)
+            cache: True to cache this call, False to bypass the cache,
+                None to cache only deterministic (temperature 0) calls
+            cache_ttl: Seconds to keep a cached response (default LLM_CACHE_TTL)
             **kwargs: Additional arguments passed to OpenAI API
 
         Returns:
@@ -119,29 +132,17 @@ class OpenAIService:
             CircuitBreakerOpenError: If circuit breaker is open
             Exception: If all retries exhausted
         """
-        # Check circuit breaker first
-        if not self.circuit_breaker.can_execute():
-            self._record_call(model, success=False, circuit_open=True)
-
-            if sentry_sdk:
-                sentry_sdk.capture_message(
-                    "Circuit breaker open - OpenAI requests blocked",
-                    level="warning",
-                    extras={
-                        "circuit_state": self.circuit_breaker.state.value,
-                        "failure_count": self.circuit_breaker.failure_count,
-                        "model": model
-                    }
-                )
+        # Cached responses are served even while the circuit is open
+        cache_key = None
+        if self.response_cache.should_cache(kwargs, cache):
+            cache_key = response_key(model, messages, kwargs)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"OpenAI response cache hit ({model})")
+                return cached
 
-            logger.warning(
-                f"Circuit breaker OPEN - rejecting OpenAI request. "
-                f"Failures: {self.circuit_breaker.failure_count}"
-            )
-            raise CircuitBreakerOpenError(
-                "OpenAI service temporarily unavailable due to repeated failures. "
-                "Please try again later."
-            )
+        # Check circuit breaker first
+        self._check_circuit(model)
 
         # Create decorated function for this specific call
         @self.retry_handler.get_decorator()
@@ -160,23 +161,78 @@ class OpenAIService:
             self._record_call(model, success=True, latency_ms=latency_ms)
             logger.debug(f"OpenAI call succeeded in {latency_ms:.0f}ms")
 
+            if cache_key is not None:
+                self.response_cache.set(cache_key, result, ttl=cache_ttl)
+
             return result
 
         except Exception as e:
-            self._record_call(model, success=False, error=str(e))
+            self._record_failure(model, messages, e)
+            raise
 
-            if sentry_sdk:
-                sentry_sdk.capture_exception(e, extras={
-                    "model": model,
-                    "message_count": len(messages),
-                    "circuit_state": self.circuit_breaker.state.value,
-                    "failure_count": self.circuit_breaker.failure_count
-                })
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4o",
+        cache: Optional[bool] = None,
+        cache_ttl: Optional[int] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Async chat completion on the shared keep-alive connection pool.
 
-            logger.error(
-                f"OpenAI call failed after retries: {str(e)}. "
-                f"Circuit state: {self.circuit_breaker.state.value}"
+        Same retry, circuit breaker and response cache semantics as
+        chat_completion, without occupying a worker thread while the
+        request is in flight.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            model: OpenAI model to use (default: gpt-4o)
+            cache: True to cache this call, False to bypass the cache,
+                None to cache only deterministic (temperature 0) calls
+            cache_ttl: Seconds to keep a cached response (default LLM_CACHE_TTL)
+            **kwargs: Additional arguments passed to OpenAI API
+
+        Returns:
+            OpenAI ChatCompletion response
+
+        Raises:
+            CircuitBreakerOpenError: If circuit breaker is open
+            Exception: If all retries exhausted
+        """
+        cache_key = None
+        if self.response_cache.should_cache(kwargs, cache):
+            cache_key = response_key(model, messages, kwargs)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"OpenAI response cache hit ({model})")
+                return cached
+
+        self._check_circuit(model)
+
+        @self.retry_handler.get_decorator()
+        async def _make_call():
+            return await get_async_openai_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs
             )
+
+        try:
+            start_time = datetime.utcnow()
+            result = await _make_call()
+            latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+
+            self._record_call(model, success=True, latency_ms=latency_ms)
+            logger.debug(f"OpenAI async call succeeded in {latency_ms:.0f}ms")
+
+            if cache_key is not None:
+                self.response_cache.set(cache_key, result, ttl=cache_ttl)
+
+            return result
+
+        except Exception as e:
+            self._record_failure(model, messages, e)
             raise
 
     async def chat_completion_stream(
@@ -228,7 +284,7 @@ class OpenAIService:
             start_time = datetime.utcnow()
 
             # Create streaming request (no retry decorator for streaming)
-            stream = get_openai_client().chat.completions.create(
+            stream = await get_async_openai_client().chat.completions.create(
                 model=model,
                 messages=messages,
                 stream=True,
@@ -236,7 +292,7 @@ class OpenAIService:
             )
 
             # Yield chunks as they arrive
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
@@ -265,6 +321,50 @@ class OpenAIService:
             )
             raise
 
+    def _check_circuit(self, model: str) -> None:
+        """Raise CircuitBreakerOpenError (and report it) if the circuit is open."""
+        if self.circuit_breaker.can_execute():
+            return
+
+        self._record_call(model, success=False, circuit_open=True)
+
+        if sentry_sdk:
+            sentry_sdk.capture_message(
+                "Circuit breaker open - OpenAI requests blocked",
+                level="warning",
+                extras={
+                    "circuit_state": self.circuit_breaker.state.value,
+                    "failure_count": self.circuit_breaker.failure_count,
+                    "model": model
+                }
+            )
+
+        logger.warning(
+            f"Circuit breaker OPEN - rejecting OpenAI request. "
+            f"Failures: {self.circuit_breaker.failure_count}"
+        )
+        raise CircuitBreakerOpenError(
+            "OpenAI service temporarily unavailable due to repeated failures. "
+            "Please try again later."
+        )
+
+    def _record_failure(self, model: str, messages: List[Dict[str, str]], error: Exception) -> None:
+        """Record and report a call that failed after retries."""
+        self._record_call(model, success=False, error=str(error))
+
+        if sentry_sdk:
+            sentry_sdk.capture_exception(error, extras={
+                "model": model,
+                "message_count": len(messages),
+                "circuit_state": self.circuit_breaker.state.value,
+                "failure_count": self.circuit_breaker.failure_count
+            })
+
+        logger.error(
+            f"OpenAI call failed after retries: {str(error)}. "
+            f"Circuit state: {self.circuit_breaker.state.value}"
+        )
+
     def _record_call(
         self,
         model: str,
@@ -334,7 +434,9 @@ class OpenAIService:
                 "max_retries": self.config.max_retries,
                 "initial_delay_seconds": self.config.initial_delay,
                 "max_delay_seconds": self.config.max_delay
-            }
+            },
+            "response_cache": self.response_cache.get_stats(),
+            "http_pool": get_pool_status()
         }
 
     def reset_circuit_breaker(self):
@@ -7,6 +7,15 @@ Uses multiple detection methods:
 2. N-gram overlap detection
 3. Semantic similarity via embeddings (optional, uses API)
 
+Methods 1 and 2 run against a ShingleIndex (hashed-phrase inverted index +
+MinHash LSH), so a check only touches questions that share phrases or LSH
+buckets with the candidate instead of scanning the whole corpus.
+
+The index is normally opened from a memory-mapped on-disk snapshot
+(originality_snapshot) built by scripts/build_originality_snapshot.py, so
+loading the corpus does not scan the questions table. Questions accepted
+through add_to_corpus() are appended to the snapshot's delta log.
+
 Usage:
     from app.services.originality_checker import OriginalityChecker
 
@@ -22,13 +31,21 @@ Usage:
 
 import re
 import logging
-from typing import Dict, Any, Optional, List, Set, Tuple
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from collections import Counter
 
 from sqlalchemy.orm import Session
 
+from app.services.originality_snapshot import (
+    CorpusSnapshot,
+    ORIGINALITY_SNAPSHOT_DIR,
+    ORIGINALITY_SNAPSHOT_ENABLED,
+    open_snapshot,
+    write_snapshot,
+)
+from app.services.shingle_index import ShingleIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,7 +78,8 @@ class OriginalityChecker:
         db: Session,
         similarity_threshold: float = 0.7,
         ngram_size: int = 4,
-        min_phrase_length: int = 8
+        min_phrase_length: int = 8,
+        snapshot_dir: Optional[str] = None
     ):
         """
         Initialize the checker.
@@ -71,26 +89,33 @@ class OriginalityChecker:
             similarity_threshold: 0-1, questions above this are flagged
             ngram_size: Size of n-grams for overlap detection
             min_phrase_length: Minimum words for phrase matching
+            snapshot_dir: Corpus snapshot root (defaults to ORIGINALITY_SNAPSHOT_DIR)
         """
         self.db = db
         self.similarity_threshold = similarity_threshold
         self.ngram_size = ngram_size
         self.min_phrase_length = min_phrase_length
+        self.snapshot_dir = snapshot_dir or ORIGINALITY_SNAPSHOT_DIR
 
         # Corpus data (loaded lazily)
         self._corpus_loaded = False
-        self._question_texts: Dict[str, str] = {}  # id -> normalized text
-        self._question_ngrams: Dict[str, Set[str]] = {}  # id -> set of ngrams
-        self._all_ngrams: Set[str] = set()  # All ngrams across corpus
+        self._index = self._new_index()
+        self._snapshot: Optional[CorpusSnapshot] = None
 
         # Stats
         self._checks_performed = 0
         self._duplicates_found = 0
 
+    def _new_index(self) -> ShingleIndex:
+        return ShingleIndex(ngram_size=self.ngram_size, phrase_size=self.min_phrase_length)
+
     async def load_corpus(self, force_reload: bool = False) -> int:
         """
         Load existing questions into memory for comparison.
 
+        Opens the current corpus snapshot when one exists, otherwise scans
+        the questions table.
+
         Args:
             force_reload: If True, reload even if already loaded
 
@@ -98,36 +123,97 @@ class OriginalityChecker:
             Number of questions loaded
         """
         if self._corpus_loaded and not force_reload:
-            return len(self._question_texts)
+            return len(self._index)
 
-        from app.models.models import Question
+        if ORIGINALITY_SNAPSHOT_ENABLED and self._load_snapshot():
+            return len(self._index)
 
         logger.info("Loading question corpus for originality checking...")
 
         try:
-            questions = self.db.query(Question).filter(
-                Question.vignette.isnot(None)
-            ).all()
-
-            for q in questions:
-                q_id = str(q.id)
-                text = self._normalize_text(q.vignette or "")
-
-                if len(text) > 50:  # Skip very short questions
-                    self._question_texts[q_id] = text
-                    ngrams = self._extract_ngrams(text)
-                    self._question_ngrams[q_id] = ngrams
-                    self._all_ngrams.update(ngrams)
-
+            self._index, _ = self._build_from_database()
+            self._snapshot = None
             self._corpus_loaded = True
-            logger.info(f"Loaded {len(self._question_texts)} questions into corpus")
+            logger.info(f"Loaded {len(self._index)} questions into corpus")
 
-            return len(self._question_texts)
+            return len(self._index)
 
         except Exception as e:
             logger.error(f"Failed to load corpus: {e}")
             return 0
 
+    def _build_from_database(self) -> Tuple[ShingleIndex, Optional[datetime]]:
+        """Normalize and index every question; returns (index, newest created_at)."""
+        from app.models.models import Question
+
+        rows = self.db.query(Question.id, Question.vignette, Question.created_at).filter(
+            Question.vignette.isnot(None)
+        ).yield_per(1000)
+
+        documents = []
+        watermark = None
+        for q_id, vignette, created_at in rows:
+            if created_at and (watermark is None or created_at > watermark):
+                watermark = created_at
+
+            text = self._normalize_text(vignette or "")
+            if len(text) > 50:  # Skip very short questions
+                documents.append((str(q_id), text))
+
+        index = self._new_index()
+        index.add_many(documents)
+        return index, watermark
+
+    def _load_snapshot(self) -> bool:
+        """Open the corpus snapshot, replay its delta log and catch up from the database."""
+        snapshot = open_snapshot(self._new_index().get_params(), root=self.snapshot_dir)
+        if snapshot is None:
+            return False
+
+        index = snapshot.index
+        replayed = 0
+        for q_id, text in snapshot.read_delta():
+            index.add(q_id, text)
+            replayed += 1
+
+        caught_up = 0
+        try:
+            from app.models.models import Question
+
+            query = self.db.query(Question.id, Question.vignette).filter(
+                Question.vignette.isnot(None)
+            )
+            if snapshot.watermark is not None:
+                query = query.filter(Question.created_at > snapshot.watermark)
+
+            for q_id, vignette in query.yield_per(1000):
+                text = self._normalize_text(vignette or "")
+                if len(text) > 50 and str(q_id) not in index:
+                    index.add(str(q_id), text)
+                    caught_up += 1
+        except Exception as e:
+            logger.warning(f"Originality snapshot catch-up query failed: {e}")
+
+        self._index = index
+        self._snapshot = snapshot
+        self._corpus_loaded = True
+        logger.info(
+            f"Opened originality snapshot {snapshot.version}: {len(index)} questions "
+            f"({replayed} from delta log, {caught_up} newer than snapshot)"
+        )
+        return True
+
+    def build_snapshot(self) -> str:
+        """
+        Rebuild the corpus from the database and write it as a new snapshot version.
+
+        Returns:
+            Path of the snapshot version directory
+        """
+        index, watermark = self._build_from_database()
+        path = write_snapshot(index, watermark=watermark, root=self.snapshot_dir)
+        return str(path)
+
     async def check_originality(
         self,
         question: Dict[str, Any],
@@ -293,17 +379,6 @@ class OriginalityChecker:
 
         return text
 
-    def _extract_ngrams(self, text: str) -> Set[str]:
-        """Extract n-grams from text."""
-        words = text.split()
-        ngrams = set()
-
-        for i in range(len(words) - self.ngram_size + 1):
-            ngram = " ".join(words[i:i + self.ngram_size])
-            ngrams.add(ngram)
-
-        return ngrams
-
     def _check_exact_phrases(self, text: str) -> Tuple[float, Optional[str], Optional[str], List[str]]:
         """
         Check for exact phrase matches using indexed lookups.
@@ -315,37 +390,21 @@ class OriginalityChecker:
         if len(words) < self.min_phrase_length:
             return (0.0, None, None, [])
 
-        # Extract candidate phrases from input
-        phrases = []
-        for i in range(len(words) - self.min_phrase_length + 1):
-            phrase = " ".join(words[i:i + self.min_phrase_length])
-            phrases.append(phrase)
-
-        if not phrases:
+        match_counts, positions_by_q, total_phrases = self._index.phrase_matches(words)
+        if total_phrases == 0:
             return (0.0, None, None, [])
 
-        # Count matches per question using indexed lookup
-        match_counts: Dict[str, int] = {}
-        matched_phrases_by_q: Dict[str, List[str]] = {}
-
-        for phrase in phrases:
-            # O(n) search - consider building an inverted index if performance is critical
-            for q_id, corpus_text in self._question_texts.items():
-                if phrase in corpus_text:
-                    match_counts[q_id] = match_counts.get(q_id, 0) + 1
-                    if q_id not in matched_phrases_by_q:
-                        matched_phrases_by_q[q_id] = []
-                    if len(matched_phrases_by_q[q_id]) < 5:  # Limit stored phrases
-                        matched_phrases_by_q[q_id].append(phrase)
-
         if not match_counts:
             return (0.0, None, None, [])
 
         # Find best match
         best_match_id = max(match_counts.items(), key=lambda x: x[1])[0]
-        best_match_score = match_counts[best_match_id] / len(phrases)
-        best_match_preview = self._question_texts.get(best_match_id, "")[:200] + "..."
-        matched_phrases = matched_phrases_by_q.get(best_match_id, [])
+        best_match_score = match_counts[best_match_id] / total_phrases
+        best_match_preview = (self._index.get_text(best_match_id) or "")[:200] + "..."
+        matched_phrases = [
+            " ".join(words[i:i + self.min_phrase_length])
+            for i in positions_by_q[best_match_id][:5]  # Limit stored phrases
+        ]
 
         return (best_match_score, best_match_id, best_match_preview, matched_phrases)
 
@@ -353,34 +412,23 @@ class OriginalityChecker:
         """
         Check for n-gram overlap with corpus.
 
+        Exact Jaccard similarity is computed only for MinHash LSH candidates
+        and the questions sharing the most phrases, so scores below the LSH
+        band threshold may be under-reported.
+
         Returns:
             Tuple of (similarity_score, matched_id, matched_preview)
         """
-        text_ngrams = self._extract_ngrams(text)
-
-        if not text_ngrams:
+        words = text.split()
+        if len(words) < self.ngram_size:
             return (0.0, None, None)
 
-        best_match_id = None
-        best_match_score = 0.0
-        best_match_preview = None
-
-        for q_id, corpus_ngrams in self._question_ngrams.items():
-            if not corpus_ngrams:
-                continue
-
-            # Jaccard similarity
-            intersection = len(text_ngrams & corpus_ngrams)
-            union = len(text_ngrams | corpus_ngrams)
-
-            if union > 0:
-                similarity = intersection / union
-
-                if similarity > best_match_score:
-                    best_match_score = similarity
-                    best_match_id = q_id
-                    best_match_preview = self._question_texts.get(q_id, "")[:200] + "..."
+        phrase_counts = self._index.phrase_matches(words)[0]
+        best_match_id, best_match_score = self._index.most_similar(words, phrase_counts)
+        if best_match_id is None:
+            return (0.0, None, None)
 
+        best_match_preview = (self._index.get_text(best_match_id) or "")[:200] + "..."
         return (best_match_score, best_match_id, best_match_preview)
 
     async def _check_semantic_similarity(
@@ -412,17 +460,21 @@ class OriginalityChecker:
         text = self._normalize_text(vignette)
 
         if len(text) > 50:
-            self._question_texts[question_id] = text
-            ngrams = self._extract_ngrams(text)
-            self._question_ngrams[question_id] = ngrams
-            self._all_ngrams.update(ngrams)
+            self._index.add(question_id, text)
+
+            if self._snapshot is not None:
+                try:
+                    self._snapshot.append(question_id, text)
+                except OSError as e:
+                    logger.warning(f"Failed to append {question_id} to originality snapshot: {e}")
 
             logger.debug(f"Added question {question_id} to originality corpus")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get checker statistics."""
         return {
-            "corpus_size": len(self._question_texts),
+            "corpus_size": len(self._index),
+            "snapshot_version": self._snapshot.version if self._snapshot else None,
             "corpus_loaded": self._corpus_loaded,
             "checks_performed": self._checks_performed,
             "duplicates_found": self._duplicates_found,
@@ -434,7 +486,8 @@ class OriginalityChecker:
                 "similarity_threshold": self.similarity_threshold,
                 "ngram_size": self.ngram_size,
                 "min_phrase_length": self.min_phrase_length
-            }
+            },
+            "index": self._index.get_stats()
         }
 
 
@@ -0,0 +1,205 @@
+"""
+Originality Corpus Snapshot
+
+Persists the originality checker's ShingleIndex to disk so worker processes
+open it with memory maps instead of re-reading, re-normalizing and
+re-shingling every vignette on startup.
+
+Layout (under ORIGINALITY_SNAPSHOT_DIR):
+    CURRENT                 name of the active version directory
+    v20261016T120000000000-1234/
+        manifest.json       format, index params, document count, watermark
+        <array>.npy         one file per ShingleIndex.ARRAY_NAMES entry
+        delta.jsonl         {"id", "text"} lines appended after the build
+
+A build writes a complete version directory under a temporary name,
+renames it into place and then swaps CURRENT, so readers only ever see
+finished snapshots. Arrays are opened with mmap_mode="r": the OS page
+cache is shared between workers and opening costs the same regardless of
+corpus size. Questions accepted after the build are appended to the
+version's delta.jsonl (one O_APPEND write per question) and replayed into
+the index on open.
+
+Usage:
+    from app.services.originality_snapshot import write_snapshot, open_snapshot
+
+    write_snapshot(index, watermark=max_created_at)
+
+    snapshot = open_snapshot(expected_params=index.get_params())
+    if snapshot:
+        index = snapshot.index
+        snapshot.append(question_id, normalized_text)
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.services.shingle_index import ARRAY_NAMES, ShingleIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 2  # 2: MinHash computed without 64-bit overflow (LSH keys changed)
+
+ORIGINALITY_SNAPSHOT_DIR = os.getenv(
+    "ORIGINALITY_SNAPSHOT_DIR",
+    str(Path(__file__).resolve().parents[2] / "data" / "originality_snapshot")
+)
+
+ORIGINALITY_SNAPSHOT_ENABLED = os.getenv("ORIGINALITY_SNAPSHOT_ENABLED", "true").lower() == "true"
+
+# Older version directories kept after a build (workers may still map them)
+KEEP_VERSIONS = int(os.getenv("ORIGINALITY_SNAPSHOT_KEEP_VERSIONS", "2"))
+
+_CURRENT = "CURRENT"
+_MANIFEST = "manifest.json"
+_DELTA = "delta.jsonl"
+
+
+class CorpusSnapshot:
+    """An opened snapshot version: memory-mapped index plus its delta log."""
+
+    def __init__(self, path: Path, manifest: Dict[str, Any], index: ShingleIndex):
+        self.path = path
+        self.manifest = manifest
+        self.index = index
+
+    @property
+    def version(self) -> str:
+        return self.path.name
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """created_at of the newest question included in the build."""
+        value = self.manifest.get("watermark")
+        return datetime.fromisoformat(value) if value else None
+
+    def append(self, question_id: str, text: str):
+        """Record a newly accepted question in this version's delta log."""
+        line = json.dumps({"id": question_id, "text": text}) + "\n"
+        fd = os.open(self.path / _DELTA, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def read_delta(self) -> Iterator[Tuple[str, str]]:
+        """Yield (question_id, text) from the delta log, skipping torn lines."""
+        path = self.path / _DELTA
+        if not path.exists():
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    yield entry["id"], entry["text"]
+                except (ValueError, KeyError):
+                    continue
+
+
+def write_snapshot(
+    index: ShingleIndex,
+    watermark: Optional[datetime] = None,
+    root: str = ORIGINALITY_SNAPSHOT_DIR
+) -> Path:
+    """
+    Write the index as a new snapshot version and make it current.
+
+    Args:
+        index: Index to persist (live documents from both segments)
+        watermark: created_at of the newest question in the index
+        root: Snapshot root directory
+
+    Returns:
+        Path of the new version directory
+    """
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+
+    name = f"v{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}"
+    tmp_path = root_path / f".tmp-{name}"
+    final_path = root_path / name
+
+    arrays = index.to_arrays()
+    tmp_path.mkdir()
+    for array_name in ARRAY_NAMES:
+        np.save(tmp_path / f"{array_name}.npy", arrays[array_name], allow_pickle=False)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "params": index.get_params(),
+        "documents": int(len(arrays["ids"])),
+        "watermark": watermark.isoformat() if watermark else None,
+        "built_at": datetime.utcnow().isoformat(),
+    }
+    with open(tmp_path / _MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.rename(tmp_path, final_path)
+
+    current_tmp = root_path / f".{_CURRENT}.{os.getpid()}"
+    current_tmp.write_text(name)
+    os.replace(current_tmp, root_path / _CURRENT)
+
+    _prune(root_path, keep=name)
+    logger.info(f"Wrote originality snapshot {name} ({manifest['documents']} questions)")
+    return final_path
+
+
+def _prune(root_path: Path, keep: str):
+    """Delete all but the newest KEEP_VERSIONS version directories."""
+    versions = sorted(p for p in root_path.iterdir() if p.is_dir() and p.name.startswith("v"))
+    for path in versions[:-max(KEEP_VERSIONS, 1)]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _load_array(path: Path) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+    except ValueError:
+        # Zero-length arrays cannot be memory-mapped
+        return np.load(path, allow_pickle=False)
+
+
+def open_snapshot(
+    expected_params: Dict[str, int],
+    root: str = ORIGINALITY_SNAPSHOT_DIR,
+    **index_options
+) -> Optional[CorpusSnapshot]:
+    """
+    Memory-map the current snapshot version.
+
+    Returns None when there is no snapshot, it was built with a different
+    format or index parameters, or it cannot be read.
+    """
+    root_path = Path(root)
+    try:
+        name = (root_path / _CURRENT).read_text().strip()
+        path = root_path / name
+        with open(path / _MANIFEST) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("format") != SNAPSHOT_FORMAT or manifest.get("params") != expected_params:
+        logger.warning(f"Ignoring originality snapshot {name}: built with different parameters")
+        return None
+
+    try:
+        arrays = {
+            array_name: _load_array(path / f"{array_name}.npy")
+            for array_name in ARRAY_NAMES
+        }
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to open originality snapshot {name}: {e}")
+        return None
+
+    index = ShingleIndex.from_arrays(arrays, **expected_params, **index_options)
+    return CorpusSnapshot(path, manifest, index)
@@ -0,0 +1,354 @@
+"""
+Peer Distribution Store
+
+Process-local histograms of peer metrics, so peer comparisons and
+percentile ranks never group the question_attempts table on the request
+path.
+
+Each (metric, scope) pair is a FenwickHistogram over fixed bucket edges:
+- accuracy        per user with 10+ answers, scope "overall" or a specialty
+                  (0-100 in 0.1-point buckets)
+- questions_answered  per user with 10+ answers (exact counts up to 1000,
+                  then ~2% geometric buckets)
+- assessment_score    per completed self-assessment (0-100 in 0.1-point buckets)
+
+Percentile, mean, median and bucket-count queries are O(log n) in the
+number of buckets. The store remembers each user's current totals, so
+record_answer() moves the user between buckets in O(log n) as answers come
+in. A full rebuild (one grouped attempts query plus one assessment query)
+runs when the store is older than PEER_DISTRIBUTION_REFRESH_SECONDS; after
+the first build it runs on a background thread while the old data keeps
+serving.
+
+Usage:
+    from app.services.peer_distribution import get_peer_distribution
+
+    store = get_peer_distribution(db)
+    store.percentile("accuracy", 72.5)                  # -> 64
+    store.percentile("accuracy", 80.0, scope="Surgery")
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, Integer
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.models import QuestionAttempt, Question, SelfAssessment
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = int(os.getenv("PEER_DISTRIBUTION_REFRESH_SECONDS", "900"))
+
+# Peers need this many answers to count (matches the original comparison)
+MIN_PEER_QUESTIONS = 10
+
+OVERALL = "overall"
+
+# Specialties compared on the peer comparison page (matched against Question.source)
+PEER_SPECIALTIES = [
+    "Internal Medicine", "Surgery", "Pediatrics", "Psychiatry",
+    "Obstetrics and Gynecology", "Emergency Medicine"
+]
+
+_PERCENT_EDGES = [i / 10 for i in range(1001)]
+
+
+def _count_edges() -> List[float]:
+    edges = [float(i) for i in range(1000)]
+    value = 1000.0
+    while value < 1e7:
+        edges.append(value)
+        value = math.ceil(value * 1.02)
+    return edges
+
+
+_COUNT_EDGES = _count_edges()
+
+METRIC_EDGES = {
+    "accuracy": _PERCENT_EDGES,
+    "questions_answered": _COUNT_EDGES,
+    "assessment_score": _PERCENT_EDGES,
+}
+
+
+def specialties_for_source(source: Optional[str]) -> List[str]:
+    """Peer specialties a question source counts toward (same match as source ILIKE %specialty%)."""
+    if not source:
+        return []
+    lowered = source.lower()
+    return [s for s in PEER_SPECIALTIES if s.lower() in lowered]
+
+
+class FenwickHistogram:
+    """Counts per fixed bucket with O(log n) prefix sums and quantiles."""
+
+    __slots__ = ("edges", "_tree", "count", "total")
+
+    def __init__(self, edges: Sequence[float]):
+        self.edges = edges
+        self._tree = [0] * (len(edges) + 1)
+        self.count = 0
+        self.total = 0.0  # Sum of values, for the mean
+
+    def bucket(self, value: float) -> int:
+        """Bucket index of a value (values below the first edge go in bucket 0)."""
+        return max(0, bisect_right(self.edges, value) - 1)
+
+    def add(self, value: float, delta: int = 1):
+        i = self.bucket(value) + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+        self.count += delta
+        self.total += value * delta
+
+    def count_below_bucket(self, bucket: int) -> int:
+        """Number of values in buckets strictly below `bucket`."""
+        i, result = bucket, 0
+        while i > 0:
+            result += self._tree[i]
+            i -= i & -i
+        return result
+
+    def count_below(self, value: float) -> int:
+        return self.count_below_bucket(self.bucket(value))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Lower edge of the bucket holding the q-th value."""
+        if self.count == 0:
+            return None
+        target = min(self.count - 1, int(q * self.count))  # 0-based rank
+        position, step = 0, 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] <= target:
+                position = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return self.edges[min(position, len(self.edges) - 1)]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class PeerDistributionStore:
+    """Peer histograms plus the per-user totals needed to update them incrementally."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hists: Dict[Tuple[str, str], FenwickHistogram] = {}
+        self._values: Dict[Tuple[str, str], Dict[str, float]] = {}  # current value per member
+        self._user_totals: Dict[str, Dict[str, List[int]]] = {}  # scope -> user -> [total, correct]
+        self._platform: Dict[str, List[int]] = {}  # scope -> [total, correct] over all attempts
+        self.built_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _hist(self, metric: str, scope: str) -> FenwickHistogram:
+        key = (metric, scope)
+        hist = self._hists.get(key)
+        if hist is None:
+            hist = self._hists[key] = FenwickHistogram(METRIC_EDGES[metric])
+            self._values[key] = {}
+        return hist
+
+    def _set_value(self, metric: str, scope: str, member: str, value: Optional[float]):
+        hist = self._hist(metric, scope)
+        values = self._values[(metric, scope)]
+        previous = values.pop(member, None)
+        if previous is not None:
+            hist.add(previous, -1)
+        if value is not None:
+            hist.add(value)
+            values[member] = value
+
+    def _apply_totals(self, scope: str, user_id: str, total: int, correct: int):
+        self._user_totals.setdefault(scope, {})[user_id] = [total, correct]
+        eligible = total >= MIN_PEER_QUESTIONS
+        self._set_value("accuracy", scope, user_id, correct / total * 100 if eligible else None)
+        if scope == OVERALL:
+            self._set_value("questions_answered", scope, user_id, float(total) if eligible else None)
+
+    def record_answer(self, user_id: str, is_correct: bool, source: Optional[str] = None):
+        """Apply one answer to the user's overall and specialty distributions."""
+        with self._lock:
+            if self.built_at is None:
+                return  # The first build reads it from the database
+            for scope in [OVERALL] + specialties_for_source(source):
+                total, correct = self._user_totals.get(scope, {}).get(user_id, [0, 0])
+                self._apply_totals(scope, user_id, total + 1, correct + int(is_correct))
+                platform = self._platform.setdefault(scope, [0, 0])
+                platform[0] += 1
+                platform[1] += int(is_correct)
+
+    def record_assessment(self, assessment_id: str, percentage: float):
+        """Add (or replace) a completed self-assessment score."""
+        with self._lock:
+            if self.built_at is None:
+                return
+            self._set_value("assessment_score", OVERALL, assessment_id, percentage)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def peer_count(self, metric: str, scope: str = OVERALL) -> int:
+        hist = self._hists.get((metric, scope))
+        return hist.count if hist else 0
+
+    def percentile(self, metric: str, value: float, scope: str = OVERALL) -> Optional[int]:
+        """Percentage of peers strictly below `value` (None without peers)."""
+        with self._lock:
+            hist = self._hists.get((metric, scope))
+            if not hist or hist.count == 0:
+                return None
+            return round(hist.count_below(value) / hist.count * 100)
+
+    def summary(self, metric: str, scope: str = OVERALL) -> Dict[str, Optional[float]]:
+        with self._lock:
+            hist = self._hists.get((metric, scope))
+            if not hist or hist.count == 0:
+                return {"count": 0, "mean": None, "median": None}
+            return {"count": hist.count, "mean": hist.mean, "median": hist.quantile(0.5)}
+
+    def bucket_counts(self, metric: str, boundaries: Sequence[float], scope: str = OVERALL) -> List[int]:
+        """Peers per [boundaries[i], boundaries[i+1]) range; the last range is open-ended."""
+        with self._lock:
+            hist = self._hists.get((metric, scope))
+            if not hist:
+                return [0] * len(boundaries)
+            below = [hist.count_below(b) for b in boundaries] + [hist.count]
+            return [below[i + 1] - below[i] for i in range(len(boundaries))]
+
+    def platform_totals(self, scope: str = OVERALL) -> Tuple[int, int]:
+        """(answers, correct answers) across all users."""
+        with self._lock:
+            total, correct = self._platform.get(scope, [0, 0])
+            return total, correct
+
+    # ------------------------------------------------------------------
+    # Rebuild
+    # ------------------------------------------------------------------
+
+    def rebuild(self, db: Session):
+        """Recompute every distribution from the database and swap it in."""
+        start = time.perf_counter()
+
+        attempt_rows = db.query(
+            QuestionAttempt.user_id,
+            Question.source,
+            func.count(QuestionAttempt.id),
+            func.sum(func.cast(QuestionAttempt.is_correct, Integer))
+        ).join(
+            Question, QuestionAttempt.question_id == Question.id
+        ).group_by(
+            QuestionAttempt.user_id, Question.source
+        ).yield_per(5000)
+
+        assessment_rows = db.query(SelfAssessment.id, SelfAssessment.percentage_score).filter(
+            SelfAssessment.status == "completed",
+            SelfAssessment.percentage_score.isnot(None)
+        )
+
+        users = self.load(attempt_rows, assessment_rows)
+        logger.info(
+            "Peer distributions rebuilt in %.0fms (%d users)",
+            (time.perf_counter() - start) * 1000, users
+        )
+
+    def load(
+        self,
+        attempt_rows: Iterable[Tuple[str, Optional[str], int, Optional[int]]],
+        assessment_rows: Iterable[Tuple[str, float]] = ()
+    ) -> int:
+        """
+        Replace the distributions from aggregate rows.
+
+        attempt_rows are (user_id, question source, answers, correct answers)
+        and assessment_rows are (assessment_id, percentage_score). Returns the
+        number of users seen.
+        """
+        fresh = PeerDistributionStore()
+
+        totals: Dict[str, Dict[str, List[int]]] = {}
+        for user_id, source, total, correct in attempt_rows:
+            correct = correct or 0
+            for scope in [OVERALL] + specialties_for_source(source):
+                entry = totals.setdefault(scope, {}).setdefault(user_id, [0, 0])
+                entry[0] += total
+                entry[1] += correct
+
+        for scope, users in totals.items():
+            platform = fresh._platform.setdefault(scope, [0, 0])
+            for user_id, (total, correct) in users.items():
+                fresh._apply_totals(scope, user_id, total, correct)
+                platform[0] += total
+                platform[1] += correct
+
+        for assessment_id, percentage in assessment_rows:
+            fresh._set_value("assessment_score", OVERALL, assessment_id, percentage)
+
+        with self._lock:
+            self._hists = fresh._hists
+            self._values = fresh._values
+            self._user_totals = fresh._user_totals
+            self._platform = fresh._platform
+            self.built_at = time.monotonic()
+
+        return len(totals.get(OVERALL, {}))
+
+    def is_stale(self) -> bool:
+        return self.built_at is None or time.monotonic() - self.built_at > REFRESH_SECONDS
+
+
+# Singleton
+_store = PeerDistributionStore()
+_refresh_lock = threading.Lock()
+_refreshing = False
+
+
+def _refresh_in_background():
+    global _refreshing
+    db = SessionLocal()
+    try:
+        _store.rebuild(db)
+    except Exception as e:
+        logger.error("Peer distribution refresh failed: %s", e)
+    finally:
+        db.close()
+        _refreshing = False
+
+
+def get_peer_distribution(db: Session) -> PeerDistributionStore:
+    """
+    Get the shared store, building it on first use.
+
+    Later refreshes run on a background thread; callers keep reading the
+    previous distributions until the new ones are swapped in.
+    """
+    global _refreshing
+    if _store.built_at is None:
+        with _refresh_lock:
+            if _store.built_at is None:
+                _store.rebuild(db)
+    elif _store.is_stale() and not _refreshing:
+        with _refresh_lock:
+            if not _refreshing:
+                _refreshing = True
+                threading.Thread(target=_refresh_in_background, name="peer-distribution", daemon=True).start()
+    return _store
+
+
+def get_peer_distribution_store() -> PeerDistributionStore:
+    """The shared store without triggering a build (for incremental updates)."""
+    return _store
@@ -0,0 +1,314 @@
+"""
+In-Memory Pool Serving Index
+
+Process-local index that lets the massive pool serve questions without
+re-running the `NOT IN (answered)` subquery + `ORDER BY random()` scan on
+every `/questions/next` call.
+
+Structure:
+- Registry: pool question UUIDs are mapped to dense ints on load
+- Buckets: (specialty, difficulty) -> pre-shuffled list of int ids
+- Answered sets: per-user bitset (bytearray) over the dense int ids,
+  loaded lazily on first request and updated from submit_answer
+
+Serving pops candidates from the end of a bucket, skipping ids the user
+has already answered, then claims the row with a single compare-and-set
+UPDATE on pool_status (massive_pool.claim_pool_question). The UPDATE only
+succeeds while the row is still pooled, so stale entries (claimed by
+another worker process) are simply dropped.
+
+Usage:
+    from app.services.pool_index import get_pool_index
+
+    question = get_pool_index().pick(db, user_id, "Surgery", "medium")
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Optional, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt
+
+logger = logging.getLogger(__name__)
+
+# Rebuild buckets from the database at most this often (picks up questions
+# added by other worker processes)
+INDEX_REFRESH_SECONDS = int(os.getenv("POOL_INDEX_REFRESH_SECONDS", "300"))
+
+# Drop cached answered sets for users idle longer than this
+USER_SET_TTL_SECONDS = int(os.getenv("POOL_INDEX_USER_TTL_SECONDS", "3600"))
+
+POOL_INDEX_ENABLED = os.getenv("POOL_INDEX_ENABLED", "true").lower() == "true"
+
+
+class AnsweredSet:
+    """Compact bitset of dense question ids a user has answered."""
+
+    __slots__ = ("bits", "last_used")
+
+    def __init__(self, size: int = 0):
+        self.bits = bytearray((size >> 3) + 1)
+        self.last_used = time.monotonic()
+
+    def add(self, idx: int):
+        byte = idx >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte - len(self.bits) + 1))
+        self.bits[byte] |= 1 << (idx & 7)
+
+    def __contains__(self, idx: int) -> bool:
+        byte = idx >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (idx & 7)))
+
+
+class PoolServingIndex:
+    """
+    Answered-set + shuffled-bucket index for instant pool serving.
+
+    All state is process-local; the database remains the source of truth
+    and the conditional claim UPDATE keeps multiple workers consistent.
+    """
+
+    def __init__(self, refresh_seconds: int = INDEX_REFRESH_SECONDS):
+        self._lock = threading.Lock()
+        self._refresh_seconds = refresh_seconds
+        self._loaded_at: Optional[float] = None
+
+        # Dense id registry
+        self._ids: List[str] = []
+        self._id_to_int: Dict[str, int] = {}
+
+        # (specialty, difficulty) -> shuffled dense ids still in the pool
+        self._buckets: Dict[Tuple[str, str], List[int]] = {}
+
+        # user_id -> answered bitset
+        self._answered: Dict[str, AnsweredSet] = {}
+
+        self._stats = {"hits": 0, "misses": 0, "stale_claims": 0, "rebuilds": 0}
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def _needs_rebuild(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self._refresh_seconds
+        )
+
+    def rebuild(self, db: Session):
+        """Reload all pooled question ids from the database into fresh buckets."""
+        from app.services.massive_pool import POOL_STATUS_POOLED
+
+        rows = db.query(Question.id, Question.source).filter(
+            Question.pool_status == POOL_STATUS_POOLED,
+            Question.rejected == False
+        ).all()
+
+        with self._lock:
+            buckets: Dict[Tuple[str, str], List[int]] = {}
+            for question_id, source in rows:
+                bucket = _parse_pool_source(source)
+                if bucket is None:
+                    continue
+                idx = self._register(question_id)
+                buckets.setdefault(bucket, []).append(idx)
+
+            for ids in buckets.values():
+                random.shuffle(ids)
+
+            self._buckets = buckets
+            self._loaded_at = time.monotonic()
+            self._stats["rebuilds"] += 1
+            self._evict_idle_users()
+
+        logger.debug("Pool index rebuilt: %d questions in %d buckets", len(rows), len(buckets))
+
+    def _register(self, question_id: str) -> int:
+        """Map a question id to a dense int (caller holds the lock)."""
+        idx = self._id_to_int.get(question_id)
+        if idx is None:
+            idx = len(self._ids)
+            self._ids.append(question_id)
+            self._id_to_int[question_id] = idx
+        return idx
+
+    def _evict_idle_users(self):
+        cutoff = time.monotonic() - USER_SET_TTL_SECONDS
+        idle = [uid for uid, s in self._answered.items() if s.last_used < cutoff]
+        for uid in idle:
+            del self._answered[uid]
+
+    def _get_answered(self, db: Session, user_id: str) -> AnsweredSet:
+        """Return the user's answered bitset, loading it on first use."""
+        answered = self._answered.get(user_id)
+        if answered is not None:
+            answered.last_used = time.monotonic()
+            return answered
+
+        rows = db.query(QuestionAttempt.question_id).filter(
+            QuestionAttempt.user_id == user_id
+        ).all()
+
+        with self._lock:
+            answered = AnsweredSet(len(self._ids))
+            for (question_id,) in rows:
+                idx = self._id_to_int.get(question_id)
+                if idx is not None:
+                    answered.add(idx)
+            self._answered[user_id] = answered
+
+        return answered
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def add_question(self, question_id: str, specialty: str, difficulty: str):
+        """Register a newly pooled question (called after replenishment commits)."""
+        if self._loaded_at is None:
+            return  # Picked up on first rebuild
+
+        bucket = (specialty, difficulty)
+        with self._lock:
+            idx = self._register(question_id)
+            ids = self._buckets.setdefault(bucket, [])
+            # Insert at a random position to keep the bucket shuffled
+            ids.insert(random.randint(0, len(ids)), idx)
+
+    def record_answer(self, user_id: str, question_id: str):
+        """Mark a question as answered for a user (called from submit_answer)."""
+        answered = self._answered.get(user_id)
+        if answered is None:
+            return  # Loaded from the database on next request
+
+        idx = self._id_to_int.get(question_id)
+        if idx is not None:
+            with self._lock:
+                answered.add(idx)
+
+    def invalidate(self):
+        """Drop all cached state; next request rebuilds from the database."""
+        with self._lock:
+            self._ids = []
+            self._id_to_int = {}
+            self._buckets = {}
+            self._answered = {}
+            self._loaded_at = None
+
+    # -------------------------------------------------------------------------
+    # Serving
+    # -------------------------------------------------------------------------
+
+    def _take_candidate(
+        self,
+        bucket: Tuple[str, str],
+        answered: AnsweredSet
+    ) -> Optional[int]:
+        """Remove and return the next unanswered id from a bucket."""
+        with self._lock:
+            ids = self._buckets.get(bucket)
+            if not ids:
+                return None
+
+            # Walk back from the end; answered ids stay in the bucket for
+            # other users, so swap the chosen one to the end before popping.
+            for pos in range(len(ids) - 1, -1, -1):
+                idx = ids[pos]
+                if idx not in answered:
+                    ids[pos] = ids[-1]
+                    ids.pop()
+                    return idx
+
+        return None
+
+    def pick(
+        self,
+        db: Session,
+        user_id: str,
+        specialty: str,
+        difficulty: str
+    ) -> Optional[Question]:
+        """
+        Claim an unanswered question from a (specialty, difficulty) bucket.
+
+        Returns:
+            Claimed Question, or None if the bucket has nothing for this user
+        """
+        from app.services.massive_pool import claim_pool_question
+
+        if self._needs_rebuild():
+            self.rebuild(db)
+
+        answered = self._get_answered(db, user_id)
+        bucket = (specialty, difficulty)
+
+        while True:
+            idx = self._take_candidate(bucket, answered)
+            if idx is None:
+                self._stats["misses"] += 1
+                return None
+
+            question = claim_pool_question(db, self._ids[idx], user_id)
+            if question is not None:
+                self._stats["hits"] += 1
+                return question
+
+            # Claimed by another worker since the last rebuild
+            self._stats["stale_claims"] += 1
+
+    def pick_any(self, db: Session, user_id: str) -> Optional[Question]:
+        """Claim an unanswered question from any bucket (largest first)."""
+        if self._needs_rebuild():
+            self.rebuild(db)
+
+        with self._lock:
+            buckets = sorted(self._buckets, key=lambda b: len(self._buckets[b]), reverse=True)
+
+        for specialty, difficulty in buckets:
+            question = self.pick(db, user_id, specialty, difficulty)
+            if question is not None:
+                return question
+
+        return None
+
+    # -------------------------------------------------------------------------
+    # Monitoring
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict:
+        """Get index size and hit/miss counters."""
+        with self._lock:
+            return {
+                "enabled": POOL_INDEX_ENABLED,
+                "questions_registered": len(self._ids),
+                "questions_available": sum(len(ids) for ids in self._buckets.values()),
+                "buckets": len(self._buckets),
+                "users_cached": len(self._answered),
+                **self._stats,
+            }
+
+
+def _parse_pool_source(source: str) -> Optional[Tuple[str, str]]:
+    """Parse "AI Pool - Specialty - difficulty" into (specialty, difficulty)."""
+    parts = source.split(" - ")
+    if len(parts) < 3:
+        return None
+    return parts[1], parts[2]
+
+
+# Singleton instance
+_pool_index: Optional[PoolServingIndex] = None
+
+
+def get_pool_index() -> PoolServingIndex:
+    """Get the singleton PoolServingIndex instance."""
+    global _pool_index
+    if _pool_index is None:
+        _pool_index = PoolServingIndex()
+    return _pool_index
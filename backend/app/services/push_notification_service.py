@@ -5,6 +5,7 @@ Sends push notifications for daily study reminders and streak alerts.
 
 import os
 import json
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -102,7 +103,9 @@ class PushNotificationService:
         }
 
         try:
-            wp["webpush"](
+            # pywebpush is blocking; run it off the event loop so fan-outs overlap
+            await asyncio.to_thread(
+                wp["webpush"],
                 subscription_info=subscription_info,
                 data=json.dumps(payload),
                 vapid_private_key=self.vapid_private_key,
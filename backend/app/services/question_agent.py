@@ -15,10 +15,12 @@ import random
 import time
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 logger = logging.getLogger(__name__)
 from typing import Optional, Dict, List, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import SessionLocal
 from app.models.models import Question
 from app.services.step2ck_content_outline import (
     get_weighted_specialty,
@@ -45,6 +47,11 @@ from app.services.ai_question_analytics import (
 )
 from app.services.openai_service import openai_service, CircuitBreakerOpenError
 from app.services.medical_fact_checker import clinical_fact_checker, validate_question_facts
+from app.services.generation_executor import (
+    QUESTION_TIMEOUT_SECONDS,
+    GenerationExecutor,
+    get_generation_executor
+)
 from app.services.question_validators import (
     QuestionQualityValidator,
     validate_question as validate_question_quality,
@@ -53,6 +60,9 @@ from app.services.question_validators import (
     check_distractor_quality
 )
 
+# Example-set analyses are reused across generations for the same specialty
+EXAMPLE_ANALYSIS_CACHE_TTL = 7 * 24 * 3600
+
 # Fine-tuned model ID for fast generation
 FINE_TUNED_MODEL = "ft:gpt-3.5-turbo-0125:personal:shelfsense-usmle-v1:CgNY0xCx"
 
@@ -151,8 +161,12 @@ class QuestionGenerationAgent:
         self.conversation_history = []
 
     def _call_llm(self, system_prompt: str, user_prompt: str, temperature: float = 0.7,
-                  response_format: Optional[Dict] = None) -> str:
-        """Helper method to call OpenAI API with circuit breaker protection"""
+                  response_format: Optional[Dict] = None, cache: Optional[bool] = None,
+                  cache_ttl: Optional[int] = None) -> str:
+        """Helper method to call OpenAI API with circuit breaker protection.
+
+        cache/cache_ttl are passed through to the OpenAI service response cache.
+        """
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
@@ -168,6 +182,8 @@ class QuestionGenerationAgent:
         response = openai_service.chat_completion(
             messages=messages,
             model=self.model,
+            cache=cache,
+            cache_ttl=cache_ttl,
             **kwargs
         )
         return response.choices[0].message.content
@@ -209,8 +225,10 @@ Format:
   "difficulty_markers": "What makes questions appropriately challenging"
 }}"""
 
+        # The same example set yields the same analysis; reuse it across generations
         response = self._call_llm(system_prompt, user_prompt, temperature=0.3,
-                                  response_format={"type": "json_object"})
+                                  response_format={"type": "json_object"},
+                                  cache=True, cache_ttl=EXAMPLE_ANALYSIS_CACHE_TTL)
         return json.loads(response)
 
     def step2_create_clinical_scenario(self, specialty: str, topic: str,
@@ -724,7 +742,7 @@ Return JSON:
 
         try:
             response = self._call_llm(system_prompt, user_prompt, temperature=0.2,
-                                      response_format={"type": "json_object"})
+                                      response_format={"type": "json_object"}, cache=True)
             llm_validation = json.loads(response)
         except json.JSONDecodeError as e:
             logger.error("LLM returned invalid JSON: %s", e)
@@ -892,145 +910,55 @@ Return JSON:
     def generate_question_parallel(self, specialty: Optional[str] = None,
                                    topic: Optional[str] = None,
                                    difficulty: str = "medium",
-                                   max_retries: int = 2) -> Dict:
+                                   max_retries: int = 2,
+                                   timeout: Optional[float] = QUESTION_TIMEOUT_SECONDS) -> Dict:
         """
-        Generate a question using parallelized pipeline where possible.
-
-        This version runs independent steps concurrently to reduce total time.
-        Step dependencies:
-        - Step 1 (analyze) can run in parallel with loading specialty config
-        - Steps 2-4 are sequential (each depends on previous)
-        - Step 5 (explanation) can start as step 4 finishes
-
-        For true parallelization, we use ThreadPoolExecutor since OpenAI calls are I/O bound.
+        Generate a question with the six steps run as a stage DAG.
+
+        Delegates to the pipelined GenerationExecutor: the vignette (step 4)
+        is written while the answer choices (step 3) are generated, the
+        step 1 analysis is shared per specialty, and the scenario, choices
+        and vignette scores abort the attempt early.
+
+        Example questions are not read through self.db: executor stage
+        threads each open their own session on the same bind, so writes
+        still uncommitted in self.db are not visible to them. The shared
+        executor is used when this agent's class, model and bind match it;
+        otherwise a temporary one bound to self.db's engine.
+
+        Raises:
+            concurrent.futures.TimeoutError: no result within `timeout`
+                seconds (the shared pools may be busy with other batches).
+                The question is cancelled: no further stages are started
+                for it, and a temporary executor drops its queued stages
+                without waiting for the running ones.
         """
-        start_time = time.time()
-
-        # Select specialty and topic
-        if not specialty:
-            specialty = get_weighted_specialty()
-        if not topic:
-            topic = get_high_yield_topic(specialty)
-
-        question_type = get_question_type()
-        specialty_demographics = get_specialty_demographics(specialty)
-        clinical_setting = specialty_demographics.get('setting', random.choice(CLINICAL_SETTINGS))
-
-        # Get example questions (can run in parallel with analysis setup)
-        examples = self._get_example_questions(specialty, limit=5)
-
-        retry_count = 0
-        quality_scores = {}
-
-        while retry_count <= max_retries:
+        bind = self.db.get_bind()
+        executor = get_generation_executor()
+        if (type(self) is QuestionGenerationAgent and self.model == executor.model
+                and bind is SessionLocal.kw.get("bind")):
+            future = executor.submit(specialty, topic, difficulty, max_retries)
             try:
-                step_times = {}
-
-                # Step 1: Analyze examples
-                t1 = time.time()
-                logger.debug("Step 1/6: Analyzing examples...")
-                analysis = self.step1_analyze_examples(specialty, examples)
-                step_times["step1_analyze"] = time.time() - t1
-
-                # Step 2: Create scenario (depends on step 1)
-                t2 = time.time()
-                logger.debug("Step 2/6: Creating scenario (difficulty: %s)...", difficulty)
-                scenario = self.step2_create_clinical_scenario(
-                    specialty, topic, question_type, clinical_setting, analysis, difficulty
-                )
-                step_times["step2_scenario"] = time.time() - t2
-
-                # Quick score check
-                scenario_score, scenario_issues = self.score_clinical_scenario(scenario, specialty)
-                quality_scores["scenario"] = scenario_score
-                if scenario_score < 0.6:
-                    logger.debug("Early abort: scenario score %.2f", scenario_score)
-                    retry_count += 1
-                    continue
-
-                # Step 3: Generate choices (depends on step 2)
-                t3 = time.time()
-                logger.debug("Step 3/6: Generating choices...")
-                choices_data = self.step3_generate_answer_choices(scenario, specialty, difficulty)
-                step_times["step3_choices"] = time.time() - t3
-
-                # Quick score check
-                choices_score, choices_issues = self.score_answer_choices(choices_data)
-                quality_scores["choices"] = choices_score
-                if choices_score < 0.6:
-                    logger.debug("Early abort: choices score %.2f", choices_score)
-                    retry_count += 1
-                    continue
-
-                # Steps 4 and 5 can potentially run in parallel
-                # But step 5 technically needs choices_data, so we'll keep sequential
-                # The real win is in batch generation
-
-                # Step 4: Write vignette
-                t4 = time.time()
-                logger.debug("Step 4/6: Writing vignette...")
-                vignette = self.step4_write_vignette(scenario, analysis)
-                step_times["step4_vignette"] = time.time() - t4
-
-                # Quick score check
-                vignette_score, vignette_issues = self.score_vignette(vignette, scenario)
-                quality_scores["vignette"] = vignette_score
-                if vignette_score < 0.6:
-                    logger.debug("Early abort: vignette score %.2f", vignette_score)
-                    retry_count += 1
-                    continue
-
-                # Step 5: Create explanation
-                t5 = time.time()
-                logger.debug("Step 5/6: Creating explanation...")
-                explanation = self.step5_create_explanation(scenario, choices_data)
-                step_times["step5_explanation"] = time.time() - t5
-
-                # Step 6: Quality validation
-                t6 = time.time()
-                logger.debug("Step 6/6: Validating...")
-                passes_quality, issues = self.step6_quality_validation(
-                    vignette, choices_data, explanation, scenario, specialty
-                )
-                step_times["step6_validation"] = time.time() - t6
-
-                total_time = time.time() - start_time
-
-                if passes_quality:
-                    avg_score = sum(quality_scores.values()) / len(quality_scores)
-                    logger.debug("Done in %.1fs (avg score: %.2f)", total_time, avg_score)
-                    logger.debug("Step times: %s", ', '.join(f'{k}: {v:.1f}s' for k, v in step_times.items()))
-
-                    return {
-                        "vignette": vignette.strip(),
-                        "choices": choices_data['choices'],
-                        "answer_key": choices_data['correct_answer_letter'],
-                        "explanation": explanation,
-                        "source": f"AI Agent Generated - {specialty}",
-                        "specialty": specialty,
-                        "recency_weight": 1.0,
-                        "metadata": {
-                            "topic": topic,
-                            "question_type": question_type,
-                            "clinical_setting": clinical_setting,
-                            "difficulty": difficulty,
-                            "generation_method": "multi_step_agent_parallel",
-                            "quality_scores": quality_scores,
-                            "generation_time_seconds": total_time,
-                            "step_times": step_times
-                        }
-                    }
-                else:
-                    retry_count += 1
-                    logger.debug("Validation failed: %s", ', '.join(issues))
-
-            except Exception as e:
-                retry_count += 1
-                logger.warning("Error: %s", e)
-                if retry_count > max_retries:
-                    raise
+                return future.result(timeout=timeout)
+            except FuturesTimeoutError:
+                future.cancel()
+                raise
 
-        raise ValueError(f"Failed after {max_retries + 1} attempts")
+        # One question needs one worker per stage
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+        executor = GenerationExecutor(concurrency=1, model=self.model, agent_factory=type(self),
+                                      session_factory=session_factory)
+        timed_out = False
+        try:
+            future = executor.submit(specialty, topic, difficulty, max_retries)
+            try:
+                return future.result(timeout=timeout)
+            except FuturesTimeoutError:
+                timed_out = True
+                future.cancel()
+                raise
+        finally:
+            executor.shutdown(wait=not timed_out, cancel_pending=timed_out)
 
     def generate_targeted_question(self, specialty: str, topic: str,
                                    weakness_profile: Dict,
@@ -1461,12 +1389,12 @@ def generate_questions_batch(db: Session, count: int = 5,
                             specialty: Optional[str] = None,
                             difficulty: str = "medium") -> List[Dict]:
     """
-    Generate multiple questions in parallel for batch processing.
+    Generate multiple questions through the pipelined generation executor.
 
     Useful for warming the pool or generating study sets.
 
     Args:
-        db: Database session
+        db: Database session (kept for compatibility; stage workers open their own)
         count: Number of questions to generate (max 10)
         specialty: Optional specialty filter
         difficulty: Difficulty level
@@ -1476,21 +1404,9 @@ def generate_questions_batch(db: Session, count: int = 5,
     """
     count = min(count, 10)  # Limit to prevent resource exhaustion
 
-    def generate_one(i):
-        try:
-            agent = QuestionGenerationAgent(db)
-            topic = get_high_yield_topic(specialty) if specialty else None
-            return agent.generate_question(specialty, topic, difficulty, max_retries=1)
-        except Exception as e:
-            logger.warning("Batch question %d failed: %s", i+1, e)
-            return None
-
-    # Use ThreadPoolExecutor for parallel generation
-    with ThreadPoolExecutor(max_workers=min(count, 5)) as executor:
-        results = list(executor.map(generate_one, range(count)))
-
-    # Filter out None results
-    return [q for q in results if q is not None]
+    # Questions are pipelined stage by stage; each stage worker uses its own
+    # session, so `db` is never shared across threads
+    return get_generation_executor().generate_batch(count, specialty, difficulty, max_retries=1)
 
 
 def generate_weakness_targeted_question(db: Session, user_id: str) -> Dict:
@@ -23,6 +23,7 @@ from app.services.step2ck_content_outline import (
 from app.services.nbme_gold_book_principles import get_generation_principles
 from app.services.openai_service import openai_service, CircuitBreakerOpenError
 from app.services.cache_service import question_cache
+from app.services.question_search import match_terms
 from sqlalchemy import func
 
 SPECIALTIES = [
@@ -45,7 +46,7 @@ def get_training_statistics(db: Session, specialty: Optional[str] = None) -> Dic
     )
 
     if specialty:
-        query = query.filter(Question.source.like(f"%{specialty}%"))
+        query = query.filter(match_terms(db, [specialty], col="source"))
 
     all_questions = query.all()
 
@@ -69,7 +70,7 @@ def get_example_questions(db: Session, specialty: Optional[str] = None, limit: i
     )
 
     if specialty:
-        query = query.filter(Question.source.like(f"%{specialty}%"))
+        query = query.filter(match_terms(db, [specialty], col="source"))
 
     # Get total count for this specialty
     total = query.count()
@@ -126,7 +127,7 @@ def get_fallback_question(db: Session, specialty: Optional[str] = None) -> Optio
     )
 
     if specialty:
-        query = query.filter(Question.source.like(f"%{specialty}%"))
+        query = query.filter(match_terms(db, [specialty], col="source"))
 
     # Get random question
     question = query.order_by(func.random()).first()
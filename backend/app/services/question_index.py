@@ -0,0 +1,469 @@
+"""
+Question Sampling Index
+
+Process-local index of active question ids used to build self-assessments
+and timed / challenge / weak-focus study session pools without loading the
+whole bank or running ORDER BY random() over the questions table.
+
+Structure:
+- Registry: active question UUIDs are mapped to dense ints on load
+- Buckets: difficulty ("easy", "medium", "hard", "other") -> normalized
+  specialty -> compact array('I') of dense ids
+- Removed: bitset of dense ids found inactive since the last rebuild
+- Attempt history: per user, dense id -> latest attempt time, loaded with
+  one grouped query on the user's first selection after a rebuild and
+  kept current by record_answer (called from the answer paths); answers
+  taken in other worker processes show up after the next rebuild
+
+Selection samples without replacement with a sparse Fisher-Yates shuffle
+over the chosen bucket arrays (only the swapped positions are stored), so
+drawing k ids costs O(k) regardless of bank size. Ids the user attempted
+(ever, or within a recent window) are skipped during the draw; assessments
+fall back to them only if unseen questions run out. The chosen ids are
+re-checked against the database in one IN query; any that were archived
+or rejected since the last rebuild are dropped from the index and
+replaced. Selection latency is tracked per kind and reported by
+get_stats().
+
+Usage:
+    from app.services.question_index import get_question_index
+
+    index = get_question_index()
+    assessment_ids = index.select_assessment(db, 160, user_id=user.id)
+    pool = index.sample(db, 40, user_id=user.id, difficulties=["hard", "medium"],
+                        specialties=["surgery"], exclude_since=week_ago)
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from itertools import accumulate
+from typing import Container, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt
+from app.services.pool_index import AnsweredSet
+
+logger = logging.getLogger(__name__)
+
+# Rebuild buckets from the database at most this often (picks up new and
+# re-leveled questions; removals are caught when a chosen id is validated)
+INDEX_REFRESH_SECONDS = int(os.getenv("ASSESSMENT_INDEX_REFRESH_SECONDS", "300"))
+
+# NBME-like difficulty mix; the remainder is filled from any difficulty
+ASSESSMENT_DIFFICULTY_MIX = (("easy", 0.2), ("medium", 0.5), ("hard", 0.3))
+DIFFICULTY_GROUPS = ("easy", "medium", "hard", "other")
+
+# Replace-and-recheck passes when chosen ids turn out to be inactive
+MAX_VALIDATION_ROUNDS = 3
+
+
+class AttemptHistory:
+    """Latest attempt time per dense question id for one user."""
+
+    __slots__ = ("last_attempt",)
+
+    def __init__(self, last_attempt: Dict[int, datetime]):
+        self.last_attempt = last_attempt
+
+    def seen(self, since: Optional[datetime] = None) -> Container[int]:
+        """Dense ids attempted at or after `since` (ever, if None)."""
+        if since is None:
+            return self.last_attempt.keys()
+        return {idx for idx, attempted_at in self.last_attempt.items() if attempted_at >= since}
+
+
+class BucketSampler:
+    """
+    Draw without replacement from a set of arrays treated as one sequence.
+
+    Sparse Fisher-Yates: position i is swapped with a random position
+    j >= i, and only displaced positions are remembered, so each draw is
+    O(log buckets) time and memory grows with the number of draws.
+    """
+
+    def __init__(self, arrays: Sequence[array], rng: random.Random):
+        self._arrays = [a for a in arrays if len(a)]
+        self._ends = list(accumulate(len(a) for a in self._arrays))
+        self._swaps: Dict[int, int] = {}
+        self._drawn = 0
+        self._rng = rng
+        self.size = self._ends[-1] if self._ends else 0
+
+    @property
+    def remaining(self) -> int:
+        return self.size - self._drawn
+
+    def draw(self) -> Optional[int]:
+        """Next dense id in random order, or None when exhausted."""
+        if self._drawn >= self.size:
+            return None
+
+        i = self._drawn
+        j = self._rng.randrange(i, self.size)
+        position = self._swaps.get(j, j)
+        self._swaps[j] = self._swaps.pop(i, i)
+        self._drawn += 1
+        return self._at(position)
+
+    def _at(self, position: int) -> int:
+        k = bisect_right(self._ends, position)
+        start = self._ends[k - 1] if k else 0
+        return self._arrays[k][position - start]
+
+
+class QuestionSamplingIndex:
+    """
+    Difficulty/specialty-bucketed index of active questions for sampling.
+
+    All state is process-local; the database remains the source of truth.
+    Bucket arrays are replaced, never mutated, on rebuild, so selections
+    read them without holding the lock.
+    """
+
+    def __init__(self, refresh_seconds: int = INDEX_REFRESH_SECONDS):
+        self._lock = threading.Lock()
+        self._refresh_seconds = refresh_seconds
+        self._loaded_at: Optional[float] = None
+
+        # Dense id registry
+        self._ids: List[str] = []
+        self._id_to_int: Dict[str, int] = {}
+
+        # difficulty group -> specialty -> dense ids
+        self._buckets: Dict[str, Dict[str, array]] = {}
+        self._removed = AnsweredSet()
+        self._size = 0
+
+        # user_id -> attempt history over the current dense ids
+        self._history: Dict[str, AttemptHistory] = {}
+
+        self._stats = {"stale_removed": 0, "rebuilds": 0, "history_loads": 0}
+
+        # selection kind -> count / total_ms / max_ms
+        self._latency: Dict[str, Dict[str, float]] = {}
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def _needs_rebuild(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self._refresh_seconds
+        )
+
+    def rebuild(self, db: Session):
+        """Reload active question ids from the database into fresh buckets."""
+        rows = db.query(Question.id, Question.difficulty_level, Question.specialty).filter(
+            Question.rejected == False,
+            Question.content_status == "active"
+        ).all()
+
+        with self._lock:
+            ids: List[str] = []
+            id_to_int: Dict[str, int] = {}
+            buckets: Dict[str, Dict[str, array]] = {}
+            for question_id, difficulty, specialty in rows:
+                id_to_int[question_id] = len(ids)
+                group = difficulty if difficulty in DIFFICULTY_GROUPS else "other"
+                buckets.setdefault(group, {}).setdefault(specialty or "", array("I")).append(len(ids))
+                ids.append(question_id)
+
+            self._ids = ids
+            self._id_to_int = id_to_int
+            self._buckets = buckets
+            self._removed = AnsweredSet()
+            self._history = {}  # Keyed by the old dense ids
+            self._size = len(ids)
+            self._loaded_at = time.monotonic()
+            self._stats["rebuilds"] += 1
+
+        logger.debug("Question index rebuilt: %d questions", len(rows))
+
+    def remove(self, question_ids: Sequence[str]):
+        """Drop questions that are no longer active (until the next rebuild)."""
+        with self._lock:
+            for question_id in question_ids:
+                idx = self._id_to_int.get(question_id)
+                if idx is not None and idx not in self._removed:
+                    self._removed.add(idx)
+                    self._size -= 1
+                    self._stats["stale_removed"] += 1
+
+    def invalidate(self):
+        """Drop all cached state; next selection rebuilds from the database."""
+        with self._lock:
+            self._ids = []
+            self._id_to_int = {}
+            self._buckets = {}
+            self._removed = AnsweredSet()
+            self._history = {}
+            self._size = 0
+            self._loaded_at = None
+
+    def record_answer(self, user_id: str, question_id: str, attempted_at: datetime):
+        """Add a committed attempt to the user's history (if it is loaded)."""
+        with self._lock:
+            history = self._history.get(user_id)
+            idx = self._id_to_int.get(question_id)
+            if history is not None and idx is not None:
+                previous = history.last_attempt.get(idx)
+                if previous is None or attempted_at > previous:
+                    history.last_attempt[idx] = attempted_at
+
+    def invalidate_user(self, user_id: str):
+        """Drop a user's attempt history (after bulk writes); reloaded on next selection."""
+        with self._lock:
+            self._history.pop(user_id, None)
+
+    def _seen(
+        self,
+        db: Session,
+        user_id: Optional[str],
+        id_to_int: Dict[str, int],
+        since: Optional[datetime] = None
+    ) -> Container[int]:
+        """Dense ids the user has attempted (since `since`, if given)."""
+        if user_id is None:
+            return set()
+        history = self._history.get(user_id)
+        if history is None:
+            rows = db.query(
+                QuestionAttempt.question_id,
+                func.max(QuestionAttempt.attempted_at)
+            ).filter(
+                QuestionAttempt.user_id == user_id
+            ).group_by(
+                QuestionAttempt.question_id
+            ).all()
+            history = AttemptHistory({
+                id_to_int[qid]: attempted_at for qid, attempted_at in rows if qid in id_to_int
+            })
+            with self._lock:
+                # Only cache it if no rebuild replaced the dense ids meanwhile
+                if self._id_to_int is id_to_int:
+                    history = self._history.setdefault(user_id, history)
+                self._stats["history_loads"] += 1
+        return history.seen(since)
+
+    def _inactive(self, db: Session, question_ids: List[str]) -> Set[str]:
+        """Chosen ids that are no longer active, from one IN query."""
+        active = {
+            qid for (qid,) in db.query(Question.id).filter(
+                Question.id.in_(question_ids),
+                Question.rejected == False,
+                Question.content_status == "active"
+            )
+        }
+        return set(question_ids) - active
+
+    # -------------------------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------------------------
+
+    def select_assessment(
+        self,
+        db: Session,
+        count: int,
+        user_id: Optional[str] = None,
+        specialties: Optional[Sequence[str]] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[str]:
+        """
+        Choose `count` active question ids in the NBME-like difficulty mix.
+
+        Args:
+            user_id: Prefer questions this user has not attempted
+            specialties: Only draw from these specialty buckets
+
+        Returns every active id if the bank has fewer than `count`.
+        """
+        if self._needs_rebuild():
+            self.rebuild(db)
+        if self._size < count:
+            removed = self._removed
+            return [qid for idx, qid in enumerate(self._ids) if idx not in removed]
+
+        targets = [((group,), int(count * share)) for group, share in ASSESSMENT_DIFFICULTY_MIX]
+        targets[-1] = (targets[-1][0], count - sum(n for _, n in targets[:-1]))
+        return self._select(
+            "assessment", db, count, targets, DIFFICULTY_GROUPS,
+            user_id=user_id, seen_since=None, allow_seen=True, specialties=specialties, rng=rng
+        )
+
+    def sample(
+        self,
+        db: Session,
+        count: int,
+        user_id: Optional[str] = None,
+        difficulties: Optional[Sequence[str]] = None,
+        specialties: Optional[Sequence[str]] = None,
+        exclude_since: Optional[datetime] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[str]:
+        """
+        Uniformly sample up to `count` active question ids.
+
+        Args:
+            user_id: Never return questions this user attempted since exclude_since
+            difficulties: Only draw from these difficulty groups (default: all)
+            specialties: Only draw from these specialty buckets (default: all)
+            exclude_since: Start of the exclusion window (default: all attempts)
+
+        Returns fewer than `count` ids when the buckets run out.
+        """
+        groups = tuple(difficulties) if difficulties else DIFFICULTY_GROUPS
+        return self._select(
+            "session", db, count, [(groups, count)], groups,
+            user_id=user_id, seen_since=exclude_since, allow_seen=False, specialties=specialties, rng=rng
+        )
+
+    def _select(
+        self,
+        kind: str,
+        db: Session,
+        count: int,
+        targets: List[Tuple[Sequence[str], int]],
+        fill_groups: Sequence[str],
+        user_id: Optional[str],
+        seen_since: Optional[datetime],
+        allow_seen: bool,
+        specialties: Optional[Sequence[str]],
+        rng: Optional[random.Random]
+    ) -> List[str]:
+        """Run a selection, rebuilding once if the index turns out stale, and time it."""
+        started = time.perf_counter()
+        if self._needs_rebuild():
+            self.rebuild(db)
+
+        rng = rng or random.Random()
+        args = (db, count, targets, fill_groups, user_id, seen_since, allow_seen, specialties, rng)
+        selected, validated = self._choose(*args)
+        if not validated:
+            # Too much of the index went stale: reload it and choose again
+            self.rebuild(db)
+            selected, _ = self._choose(*args)
+
+        self._record_latency(kind, (time.perf_counter() - started) * 1000)
+        return selected
+
+    def _choose(
+        self,
+        db: Session,
+        count: int,
+        targets: List[Tuple[Sequence[str], int]],
+        fill_groups: Sequence[str],
+        user_id: Optional[str],
+        seen_since: Optional[datetime],
+        allow_seen: bool,
+        specialties: Optional[Sequence[str]],
+        rng: random.Random
+    ) -> Tuple[List[str], bool]:
+        """One selection pass; returns (ids, whether every id was confirmed active)."""
+        ids, id_to_int = self._ids, self._id_to_int
+        buckets, removed = self._buckets, self._removed
+
+        seen = self._seen(db, user_id, id_to_int, seen_since)
+        samplers = {
+            group: BucketSampler([
+                ids_in_bucket for specialty, ids_in_bucket in buckets.get(group, {}).items()
+                if specialties is None or specialty in specialties
+            ], rng)
+            for group in DIFFICULTY_GROUPS
+        }
+        previously_seen: List[int] = []
+
+        def draw(groups: Sequence[str], n: int) -> List[int]:
+            # Uniform over whatever is left in the given groups
+            taken = []
+            while len(taken) < n:
+                live = [samplers[g] for g in groups if samplers[g].remaining]
+                if not live:
+                    break
+                sampler = live[0] if len(live) == 1 else rng.choices(
+                    live, weights=[s.remaining for s in live]
+                )[0]
+                idx = sampler.draw()
+                if idx in removed:
+                    continue
+                if idx in seen:
+                    previously_seen.append(idx)
+                    continue
+                taken.append(idx)
+            return taken
+
+        def fill(n: int) -> List[int]:
+            taken = draw(fill_groups, n)
+            while allow_seen and len(taken) < n and previously_seen:
+                taken.append(previously_seen.pop())
+            return taken
+
+        selected: List[int] = []
+        for groups, n in targets:
+            selected.extend(draw(groups, n))
+        selected.extend(fill(count - len(selected)))
+
+        validated = False
+        for _ in range(MAX_VALIDATION_ROUNDS):
+            stale = self._inactive(db, [ids[idx] for idx in selected])
+            if not stale:
+                validated = True
+                break
+            self.remove(list(stale))
+            selected = [idx for idx in selected if ids[idx] not in stale]
+            selected.extend(fill(count - len(selected)))
+
+        rng.shuffle(selected)
+        return [ids[idx] for idx in selected], validated
+
+    def _record_latency(self, kind: str, elapsed_ms: float):
+        with self._lock:
+            latency = self._latency.setdefault(kind, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            latency["count"] += 1
+            latency["total_ms"] += elapsed_ms
+            latency["max_ms"] = max(latency["max_ms"], elapsed_ms)
+        logger.debug("Question index %s selection took %.2fms", kind, elapsed_ms)
+
+    # -------------------------------------------------------------------------
+    # Monitoring
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> Dict:
+        """Get index size, selection latency and counters."""
+        with self._lock:
+            return {
+                "questions_available": self._size,
+                "buckets": {
+                    group: sum(len(a) for a in specialties.values())
+                    for group, specialties in self._buckets.items()
+                },
+                "selection_latency_ms": {
+                    kind: {
+                        "count": int(latency["count"]),
+                        "avg": round(latency["total_ms"] / latency["count"], 2),
+                        "max": round(latency["max_ms"], 2)
+                    }
+                    for kind, latency in self._latency.items()
+                },
+                **self._stats,
+            }
+
+
+# Singleton instance
+_question_index: Optional[QuestionSamplingIndex] = None
+
+
+def get_question_index() -> QuestionSamplingIndex:
+    """Get the singleton QuestionSamplingIndex instance."""
+    global _question_index
+    if _question_index is None:
+        _question_index = QuestionSamplingIndex()
+    return _question_index
@@ -35,6 +35,7 @@ from app.services.step2ck_content_outline import (
     get_high_yield_topic,
 )
 from app.services.adaptive import get_user_difficulty_target
+from app.services.massive_pool import POOL_STATUS_POOLED, claim_pool_questions, normalize_specialty
 
 # Pool configuration
 MIN_POOL_SIZE = 20  # Minimum questions per specialty
@@ -62,22 +63,17 @@ class QuestionPoolManager:
         self._is_replenishing = False
 
     def get_pool_stats(self, db: Session) -> Dict[str, int]:
-        """Get count of available questions per specialty in pool."""
-        stats = {}
-
-        for specialty in SPECIALTIES:
-            count = db.query(Question).filter(
-                Question.source.like(f"AI Pool - {specialty}%"),
-                Question.rejected == False
-            ).count()
-            stats[specialty] = count
-
-        # Also count general pool
-        general_count = db.query(Question).filter(
-            Question.source.like("AI Pool%"),
+        """Get count of available questions per specialty in pool (indexed pool_status)."""
+        counts = dict(db.query(
+            Question.specialty,
+            func.count(Question.id)
+        ).filter(
+            Question.pool_status == POOL_STATUS_POOLED,
             Question.rejected == False
-        ).count()
-        stats["total"] = general_count
+        ).group_by(Question.specialty).all())
+
+        stats = {specialty: counts.get(normalize_specialty(specialty), 0) for specialty in SPECIALTIES}
+        stats["total"] = sum(counts.values())
 
         return stats
 
@@ -98,32 +94,12 @@ class QuestionPoolManager:
         Returns:
             Question from pool, or None if pool is empty
         """
-        # Build query for pool questions
-        query = db.query(Question).filter(
-            Question.source.like("AI Pool%"),
-            Question.rejected == False
-        )
-
-        # Filter by specialty if specified
-        if specialty:
-            query = query.filter(Question.source.like(f"AI Pool - {specialty}%"))
-
-        # Exclude questions user has already answered
-        if user_id:
-            from app.models.models import QuestionAttempt
-            attempted_ids = db.query(QuestionAttempt.question_id).filter(
-                QuestionAttempt.user_id == user_id
-            ).subquery()
-            query = query.filter(~Question.id.in_(attempted_ids))
-
-        # Get random question from pool (weighted by recency)
-        question = query.order_by(func.random()).first()
+        # Claim atomically (SKIP LOCKED / compare-and-set on pool_status) so
+        # concurrent requests never serve the same pool question
+        claimed = claim_pool_questions(db, user_id, specialty=specialty)
+        question = claimed[0] if claimed else None
 
         if question:
-            # Mark as served by updating source (move out of pool)
-            question.source = question.source.replace("AI Pool", "AI Generated")
-            db.commit()
-
             # Trigger background replenishment if pool is low
             self._check_and_replenish(specialty)
 
@@ -153,6 +129,8 @@ class QuestionPoolManager:
             choices=question_data["choices"],
             explanation=question_data.get("explanation"),
             source=f"AI Pool - {specialty}",
+            specialty=normalize_specialty(specialty),
+            pool_status=POOL_STATUS_POOLED,
             recency_weight=1.0,
             recency_tier=1,
             extra_data={
@@ -0,0 +1,286 @@
+"""
+Full-Text Search over Question Vignettes and Sources
+
+Replaces `ILIKE '%term%'` scans on questions.vignette / questions.source
+with an inverted index:
+
+- SQLite: an FTS5 table (questions_fts) over the vignette and source
+  columns, kept in sync by INSERT/UPDATE/DELETE triggers on questions.
+  FTS rows are keyed by questions_fts_docs.docid, an explicit INTEGER
+  PRIMARY KEY mapped to questions.id: questions has a TEXT primary key,
+  so its implicit rowid may be renumbered by VACUUM and cannot be used
+- PostgreSQL: generated tsvector columns (vignette_tsv, source_tsv) with
+  GIN indexes, maintained by the database on every write
+
+Both use an unstemmed, case-insensitive word index. A term matches as a
+phrase whose last word is a prefix ("chest pai" matches "chest pain"),
+which mirrors how the ILIKE filters were used; unlike ILIKE, a term no
+longer matches in the middle of a word.
+
+When the index has not been created (see ensure_search_index and
+migrations/add_question_search_index.py) every helper falls back to
+the equivalent escaped ILIKE filter, so callers never need to check.
+
+Usage:
+    from app.services.question_search import match_terms, count_matching, search_questions
+
+    query = db.query(Question).filter(match_terms(db, ["heart failure"]))
+    n = count_matching(db, ["atrial", "fibrillation"], Question.rejected == False)
+    ranked = search_questions(db, "pulmonary embolism", limit=20)  # [(id, score), ...]
+"""
+
+import logging
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, column, false, func, inspect, literal_column, or_, select, table, text, true
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.models import Question
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "questions_fts"
+DOCS_TABLE = "questions_fts_docs"
+SEARCH_COLUMNS = ("vignette", "source")
+TS_CONFIG = "simple"  # no stemming or stop words, like ILIKE
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# A missing index is looked up again after this long, so one created later
+# (e.g. by the migration in another process) is picked up
+RECHECK_MISSING_SECONDS = 300
+
+# engine url -> dialect name if the search index exists, else None
+_available: Dict[str, Optional[str]] = {}
+_checked_at: Dict[str, float] = {}
+
+_SQLITE_TRIGGERS = {
+    "ai": (
+        "AFTER INSERT ON questions BEGIN "
+        f"INSERT INTO {DOCS_TABLE}(question_id) VALUES (new.id); "
+        f"INSERT INTO {FTS_TABLE}(rowid, vignette, source) VALUES ("
+        f"(SELECT docid FROM {DOCS_TABLE} WHERE question_id = new.id), new.vignette, new.source); END"
+    ),
+    "ad": (
+        "AFTER DELETE ON questions BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = "
+        f"(SELECT docid FROM {DOCS_TABLE} WHERE question_id = old.id); "
+        f"DELETE FROM {DOCS_TABLE} WHERE question_id = old.id; END"
+    ),
+    "au": (
+        "AFTER UPDATE OF id, vignette, source ON questions BEGIN "
+        f"UPDATE {DOCS_TABLE} SET question_id = new.id WHERE question_id = old.id; "
+        f"DELETE FROM {FTS_TABLE} WHERE rowid = "
+        f"(SELECT docid FROM {DOCS_TABLE} WHERE question_id = new.id); "
+        f"INSERT INTO {FTS_TABLE}(rowid, vignette, source) VALUES ("
+        f"(SELECT docid FROM {DOCS_TABLE} WHERE question_id = new.id), new.vignette, new.source); END"
+    ),
+}
+
+
+def _sqlite_table_exists(conn, name: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}
+    ).first() is not None
+
+
+def _create_sqlite_index(conn, rebuild: bool):
+    fts_exists = _sqlite_table_exists(conn, FTS_TABLE)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DOCS_TABLE} ("
+        f"docid INTEGER PRIMARY KEY, question_id TEXT NOT NULL UNIQUE)"
+    ))
+    if not fts_exists:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(vignette, source, tokenize='unicode61')"
+        ))
+    for name, body in _SQLITE_TRIGGERS.items():
+        conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{name} {body}"))
+
+    if rebuild or not fts_exists:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        conn.execute(text(f"DELETE FROM {DOCS_TABLE}"))
+        conn.execute(text(f"INSERT INTO {DOCS_TABLE}(question_id) SELECT id FROM questions"))
+        conn.execute(text(
+            f"INSERT INTO {FTS_TABLE}(rowid, vignette, source) "
+            f"SELECT d.docid, q.vignette, q.source FROM {DOCS_TABLE} d "
+            f"JOIN questions q ON q.id = d.question_id"
+        ))
+
+
+def ensure_search_index(bind: Engine, rebuild: bool = False) -> bool:
+    """
+    Create the full-text index for the bound database if it is missing.
+
+    Safe to run repeatedly. A newly created SQLite index is populated from
+    the existing rows; PostgreSQL computes its generated columns when they
+    are added.
+
+    Returns:
+        True if the dialect supports the index (and it now exists)
+    """
+    key = str(bind.url)
+    _available.pop(key, None)
+    _checked_at.pop(key, None)
+
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        with bind.begin() as conn:
+            _create_sqlite_index(conn, rebuild)
+
+    elif dialect == "postgresql":
+        with bind.begin() as conn:
+            for name in SEARCH_COLUMNS:
+                conn.execute(text(
+                    f"ALTER TABLE questions ADD COLUMN IF NOT EXISTS {name}_tsv tsvector "
+                    f"GENERATED ALWAYS AS (to_tsvector('{TS_CONFIG}', coalesce({name}, ''))) STORED"
+                ))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_questions_{name}_tsv "
+                    f"ON questions USING GIN ({name}_tsv)"
+                ))
+    else:
+        return False
+
+    _available[key] = dialect
+    return True
+
+
+def search_backend(db: Session) -> Optional[str]:
+    """Dialect name if the full-text index exists for this session's database."""
+    engine = db.get_bind().engine
+    key = str(engine.url)
+    now = time.monotonic()
+    stale = _available.get(key, "") is None and now - _checked_at.get(key, now) > RECHECK_MISSING_SECONDS
+    if key not in _available or stale:
+        dialect = engine.dialect.name
+        found = False
+        try:
+            if dialect == "sqlite":
+                found = _sqlite_table_exists(db, DOCS_TABLE) and _sqlite_table_exists(db, FTS_TABLE)
+            elif dialect == "postgresql":
+                found = "vignette_tsv" in {c["name"] for c in inspect(engine).get_columns("questions")}
+        except Exception as e:
+            logger.warning(f"Search index check failed, using ILIKE: {e}")
+        _available[key] = dialect if found else None
+        _checked_at[key] = now
+    return _available[key]
+
+
+def _tokens(term: str) -> List[str]:
+    return _TOKEN.findall(term.lower())
+
+
+def _fts5_query(terms: Sequence[str], mode: str, col: str) -> Optional[str]:
+    phrases = [f'"{" ".join(tokens)}"*' for tokens in map(_tokens, terms) if tokens]
+    if not phrases:
+        return None
+    joined = f" {'AND' if mode == 'all' else 'OR'} ".join(phrases)
+    return f"{col} : ({joined})"
+
+
+def _tsquery(terms: Sequence[str], mode: str) -> Optional[str]:
+    phrases = []
+    for tokens in map(_tokens, terms):
+        if tokens:
+            phrases.append(" <-> ".join(tokens[:-1] + [f"{tokens[-1]}:*"]))
+    if not phrases:
+        return None
+    return f" {'&' if mode == 'all' else '|'} ".join(f"({p})" for p in phrases)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def match_terms(db: Session, terms: Iterable[str], col: str = "vignette", mode: str = "all"):
+    """
+    Filter criterion: questions whose `col` contains the terms.
+
+    Args:
+        db: Database session (selects the index backend)
+        terms: Words or phrases; each is matched as a phrase with a prefix last word
+        col: "vignette" or "source"
+        mode: "all" (every term) or "any" (at least one term)
+
+    Returns:
+        A SQLAlchemy criterion for Query.filter()
+    """
+    if col not in SEARCH_COLUMNS:
+        raise ValueError(f"Unsupported search column: {col}")
+    terms = [t for t in terms if t and t.strip()]
+    combine = and_ if mode == "all" else or_
+    backend = search_backend(db)
+
+    if backend == "sqlite":
+        expr = _fts5_query(terms, mode, col)
+        if expr is not None:
+            fts = table(FTS_TABLE, column("rowid"))
+            docs = table(DOCS_TABLE, column("docid"), column("question_id"))
+            matched = select(docs.c.question_id).join(fts, fts.c.rowid == docs.c.docid).where(
+                literal_column(FTS_TABLE).op("MATCH")(expr)
+            )
+            return Question.id.in_(matched)
+    elif backend == "postgresql":
+        expr = _tsquery(terms, mode)
+        if expr is not None:
+            return literal_column(f"questions.{col}_tsv").op("@@")(func.to_tsquery(TS_CONFIG, expr))
+
+    if not terms:
+        return false() if mode == "any" else true()
+    target = getattr(Question, col)
+    return combine(*[target.ilike(f"%{_escape_like(t)}%", escape="\\") for t in terms])
+
+
+def count_matching(db: Session, terms: Iterable[str], *criteria, col: str = "vignette",
+                   mode: str = "all") -> int:
+    """Count questions matching the terms and any extra filter criteria."""
+    return db.query(func.count(Question.id)).filter(
+        *criteria, match_terms(db, terms, col=col, mode=mode)
+    ).scalar() or 0
+
+
+def search_questions(db: Session, query: str, limit: int = 50,
+                     filters: Sequence = (), col: str = "vignette") -> List[Tuple[str, float]]:
+    """
+    Ranked search: (question_id, score) pairs, best match first.
+
+    Every word of `query` must appear (as a word prefix); score is BM25 on
+    SQLite and ts_rank on PostgreSQL (higher is better). Without the index,
+    ILIKE matches are returned newest first with score 0.
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+    backend = search_backend(db)
+
+    if backend == "sqlite":
+        expr = _fts5_query(tokens, "all", col)
+        rank = literal_column(f"bm25({FTS_TABLE})")
+        fts = table(FTS_TABLE, column("rowid"))
+        docs = table(DOCS_TABLE, column("docid"), column("question_id"))
+        rows = db.query(Question.id, rank).join(
+            docs, docs.c.question_id == Question.id
+        ).join(
+            fts, fts.c.rowid == docs.c.docid
+        ).filter(
+            literal_column(FTS_TABLE).op("MATCH")(expr), *filters
+        ).order_by(rank).limit(limit).all()
+        return [(qid, -float(score)) for qid, score in rows]
+
+    if backend == "postgresql":
+        ts_query = func.to_tsquery(TS_CONFIG, _tsquery(tokens, "all"))
+        vector = literal_column(f"questions.{col}_tsv")
+        rank = func.ts_rank(vector, ts_query)
+        rows = db.query(Question.id, rank).filter(
+            vector.op("@@")(ts_query), *filters
+        ).order_by(rank.desc()).limit(limit).all()
+        return [(qid, float(score)) for qid, score in rows]
+
+    rows = db.query(Question.id).filter(
+        match_terms(db, tokens, col=col, mode="all"), *filters
+    ).order_by(Question.created_at.desc()).limit(limit).all()
+    return [(qid, 0.0) for (qid,) in rows]
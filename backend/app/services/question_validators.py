@@ -8,17 +8,53 @@ Implements pre-generation and post-generation validation for:
 
 These validators integrate into the question generation pipeline
 to ensure high-quality output.
+
+All regex rules are compiled once per class into RuleSets
+(app.services.validation_rules), so validating a question runs one trigger
+pass per text and only the patterns that can match. validate_many() runs
+the deterministic checks for a large batch across a process pool.
 """
 
+import os
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 from difflib import SequenceMatcher
 
+from app.services.elite_quality_validator import EliteQualityResult, elite_validator
+from app.services.medical_fact_checker import FactCheckReport, clinical_fact_checker
+from app.services.validation_rules import Rule, RuleSet
+
 logger = logging.getLogger(__name__)
 
+# "A. text" / "A) text" choice prefix
+CHOICE_PREFIX_PATTERN = re.compile(r"^([A-E])[\.\)]\s*(.+)$")
+
+
+def _similarity(a: str, b: str, threshold: float) -> float:
+    """
+    SequenceMatcher ratio of a and b for `> threshold` checks.
+
+    Returns a cheap upper bound instead when it already rules the pair out,
+    so dissimilar choices never pay for the full ratio().
+    """
+    matcher = SequenceMatcher(None, a, b)
+    bound = matcher.real_quick_ratio()
+    if bound <= threshold:
+        return bound
+    bound = matcher.quick_ratio()
+    if bound <= threshold:
+        return bound
+    return matcher.ratio()
+
+
+# Question lead-in at the end of a vignette, and the last-sentence fallback
+LEAD_IN_PATTERN = re.compile(r"([^.?!]*\?)\s*$")
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+
 
 class ValidationSeverity(Enum):
     """Severity of validation findings"""
@@ -47,6 +83,19 @@ class ValidationReport:
     warning_count: int
 
 
+@dataclass
+class QuestionValidationOutcome:
+    """All deterministic (zero-cost) checks for one question"""
+    question_id: Optional[str]
+    quality: ValidationReport       # Vague terms, testwiseness, distractors
+    facts: FactCheckReport          # Clinical fact-check
+    elite: EliteQualityResult       # Explanation quality
+
+    @property
+    def passed(self) -> bool:
+        return self.quality.passed and self.facts.passed
+
+
 # =============================================================================
 # VAGUE CLINICAL TERMS VALIDATOR (#10)
 # =============================================================================
@@ -151,15 +200,24 @@ class VagueTermValidator:
     }
 
     # Additional phrases that suggest missing values
+    # Format: (pattern, suggestion, trigger literal)
     VAGUE_PHRASES = [
-        (r"vital signs (?:are |were )?(?:un)?stable", "Provide specific vital sign values"),
-        (r"labs (?:are |were )?(?:ab)?normal", "Provide specific lab values"),
-        (r"mildly abnormal", "Quantify the abnormality"),
-        (r"significantly elevated", "Provide the specific value"),
-        (r"slightly decreased", "Provide the specific value"),
-        (r"within normal limits", "Acceptable but specific values preferred for key labs"),
+        (r"vital signs (?:are |were )?(?:un)?stable", "Provide specific vital sign values", "vital signs"),
+        (r"labs (?:are |were )?(?:ab)?normal", "Provide specific lab values", "labs"),
+        (r"mildly abnormal", "Quantify the abnormality", "mildly abnormal"),
+        (r"significantly elevated", "Provide the specific value", "significantly elevated"),
+        (r"slightly decreased", "Provide the specific value", "slightly decreased"),
+        (r"within normal limits", "Acceptable but specific values preferred for key labs", "within normal limits"),
     ]
 
+    # Terms report every match, phrases their first; each term is its own trigger
+    RULES = RuleSet(
+        [Rule(term, config["pattern"], (term,), data=("term", config))
+         for term, config in VAGUE_TERM_PATTERNS.items()]
+        + [Rule(pattern, pattern, (trigger,), data=("phrase", suggestion))
+           for pattern, suggestion, trigger in VAGUE_PHRASES]
+    )
+
     def validate(self, vignette: str) -> List[ValidationFinding]:
         """
         Check vignette for vague clinical terms.
@@ -172,32 +230,31 @@ class VagueTermValidator:
         """
         findings = []
 
-        # Check each vague term pattern
-        for term, config in self.VAGUE_TERM_PATTERNS.items():
-            pattern = re.compile(config["pattern"], re.IGNORECASE)
-            matches = pattern.finditer(vignette)
+        for rule in self.RULES.candidates(vignette):
+            kind, payload = rule.data
 
-            for match in matches:
-                findings.append(ValidationFinding(
-                    validator="VagueTermValidator",
-                    issue=f"Vague term '{term}' without explicit {config['requires']}",
-                    severity=ValidationSeverity.ERROR,
-                    location="vignette",
-                    suggestion=f"Use explicit value, e.g., '{config['example']}'"
-                ))
+            # Check vague term pattern
+            if kind == "term":
+                for _ in rule.compiled.finditer(vignette):
+                    findings.append(ValidationFinding(
+                        validator="VagueTermValidator",
+                        issue=f"Vague term '{rule.name}' without explicit {payload['requires']}",
+                        severity=ValidationSeverity.ERROR,
+                        location="vignette",
+                        suggestion=f"Use explicit value, e.g., '{payload['example']}'"
+                    ))
 
-        # Check vague phrases
-        for pattern, suggestion in self.VAGUE_PHRASES:
-            if re.search(pattern, vignette, re.IGNORECASE):
+            # Check vague phrase
+            elif rule.compiled.search(vignette):
                 # "within normal limits" is less severe
-                severity = ValidationSeverity.WARNING if "normal limits" in pattern else ValidationSeverity.ERROR
+                severity = ValidationSeverity.WARNING if "normal limits" in rule.pattern else ValidationSeverity.ERROR
 
                 findings.append(ValidationFinding(
                     validator="VagueTermValidator",
-                    issue=f"Vague phrase detected: '{pattern}'",
+                    issue=f"Vague phrase detected: '{rule.pattern}'",
                     severity=severity,
                     location="vignette",
-                    suggestion=suggestion
+                    suggestion=payload
                 ))
 
         return findings
@@ -219,24 +276,40 @@ class TestwisenessValidator:
     - Convergence (two choices say the same thing)
     """
 
-    # Absolute terms that are usually wrong
+    # Absolute terms that are usually wrong: (pattern, trigger literals)
     ABSOLUTE_TERMS = [
-        r"\balways\b",
-        r"\bnever\b",
-        r"\ball\s+patients?\b",
-        r"\bno\s+patients?\b",
-        r"\bonly\s+(?:treatment|option|choice)\b",
-        r"\bguarantee[sd]?\b",
-        r"\bimpossible\b",
+        (r"\balways\b", ("always",)),
+        (r"\bnever\b", ("never",)),
+        (r"\ball\s+patients?\b", ("patient",)),
+        (r"\bno\s+patients?\b", ("patient",)),
+        (r"\bonly\s+(?:treatment|option|choice)\b", ("only",)),
+        (r"\bguarantee[sd]?\b", ("guarantee",)),
+        (r"\bimpossible\b", ("impossible",)),
     ]
 
     # Trick patterns
     TRICK_PATTERNS = [
-        r"\ball\s+of\s+the\s+above\b",
-        r"\bnone\s+of\s+the\s+above\b",
-        r"\bboth\s+[A-E]\s+and\s+[A-E]\b",
+        (r"\ball\s+of\s+the\s+above\b", ("above",)),
+        (r"\bnone\s+of\s+the\s+above\b", ("above",)),
+        (r"\bboth\s+[A-E]\s+and\s+[A-E]\b", ("both",)),
+    ]
+
+    # Indicators of specificity
+    SPECIFICITY_PATTERNS = [
+        (r"\d+\s*(?:mg|g|mcg|mL|units?|hours?|days?|weeks?)", ()),  # Dosages/times
+        (r"\d+(?:\.\d+)?%", ("%",)),  # Percentages
+        (r"(?:first|second|third)-line", ("-line",)),  # Treatment order
+        (r"(?:immediately|urgently|stat)", ("immediately", "urgently", "stat")),  # Timing modifiers
+        (r"(?:IV|PO|IM|SC|topical)", ("iv", "po", "im", "sc", "topical")),  # Routes
     ]
 
+    ABSOLUTE_RULES = RuleSet([Rule(p, p, t) for p, t in ABSOLUTE_TERMS])
+    TRICK_RULES = RuleSet([Rule(p, p, t) for p, t in TRICK_PATTERNS])
+    SPECIFICITY_RULES = RuleSet([Rule(p, p, t) for p, t in SPECIFICITY_PATTERNS])
+
+    SINGULAR_LEAD_IN = re.compile(r"\bis\s+(?:the\s+)?most\b|\bwhich\s+(?:one|single)\b", re.IGNORECASE)
+    PLURAL_LEAD_IN = re.compile(r"\bare\s+(?:the\s+)?most\b|\bwhich\s+(?:ones|multiple)\b", re.IGNORECASE)
+
     def validate(
         self,
         lead_in: str,
@@ -288,7 +361,7 @@ class TestwisenessValidator:
         result = {}
         for choice in choices:
             # Handle formats: "A. text", "A) text", "A text"
-            match = re.match(r"^([A-E])[\.\)]\s*(.+)$", choice.strip())
+            match = CHOICE_PREFIX_PATTERN.match(choice.strip())
             if match:
                 result[match.group(1)] = match.group(2)
             elif len(choices) <= 5:
@@ -348,20 +421,7 @@ class TestwisenessValidator:
         """Check if correct answer has more specific/precise language"""
         findings = []
 
-        # Indicators of specificity
-        specificity_patterns = [
-            r"\d+\s*(?:mg|g|mcg|mL|units?|hours?|days?|weeks?)",  # Dosages/times
-            r"\d+(?:\.\d+)?%",  # Percentages
-            r"(?:first|second|third)-line",  # Treatment order
-            r"(?:immediately|urgently|stat)",  # Timing modifiers
-            r"(?:IV|PO|IM|SC|topical)",  # Routes
-        ]
-
-        def count_specificity(text: str) -> int:
-            return sum(
-                len(re.findall(p, text, re.IGNORECASE))
-                for p in specificity_patterns
-            )
+        count_specificity = self.SPECIFICITY_RULES.count
 
         correct_specificity = count_specificity(choices[correct_key])
         incorrect_specificities = [
@@ -394,26 +454,25 @@ class TestwisenessValidator:
         findings = []
 
         for letter, text in choices.items():
-            for pattern in self.ABSOLUTE_TERMS:
-                if re.search(pattern, text, re.IGNORECASE):
-                    # Absolute terms in correct answer is unusual
-                    if letter == correct_key:
-                        findings.append(ValidationFinding(
-                            validator="TestwisenessValidator",
-                            issue=f"Correct answer contains absolute term",
-                            severity=ValidationSeverity.WARNING,
-                            location=f"Choice {letter}",
-                            suggestion="Absolute terms are usually wrong; review if appropriate"
-                        ))
-                    else:
-                        # Expected in distractors but note it
-                        findings.append(ValidationFinding(
-                            validator="TestwisenessValidator",
-                            issue=f"Distractor contains absolute term (may be too obvious)",
-                            severity=ValidationSeverity.INFO,
-                            location=f"Choice {letter}",
-                            suggestion="Consider if distractor is too obviously wrong"
-                        ))
+            for _ in self.ABSOLUTE_RULES.search(text):
+                # Absolute terms in correct answer is unusual
+                if letter == correct_key:
+                    findings.append(ValidationFinding(
+                        validator="TestwisenessValidator",
+                        issue=f"Correct answer contains absolute term",
+                        severity=ValidationSeverity.WARNING,
+                        location=f"Choice {letter}",
+                        suggestion="Absolute terms are usually wrong; review if appropriate"
+                    ))
+                else:
+                    # Expected in distractors but note it
+                    findings.append(ValidationFinding(
+                        validator="TestwisenessValidator",
+                        issue=f"Distractor contains absolute term (may be too obvious)",
+                        severity=ValidationSeverity.INFO,
+                        location=f"Choice {letter}",
+                        suggestion="Consider if distractor is too obviously wrong"
+                    ))
 
         return findings
 
@@ -422,15 +481,14 @@ class TestwisenessValidator:
         findings = []
 
         combined = " ".join(choices)
-        for pattern in self.TRICK_PATTERNS:
-            if re.search(pattern, combined, re.IGNORECASE):
-                findings.append(ValidationFinding(
-                    validator="TestwisenessValidator",
-                    issue=f"Contains test-taking trick pattern",
-                    severity=ValidationSeverity.ERROR,
-                    location="choices",
-                    suggestion="Remove 'all/none of the above' patterns"
-                ))
+        for _ in self.TRICK_RULES.search(combined):
+            findings.append(ValidationFinding(
+                validator="TestwisenessValidator",
+                issue=f"Contains test-taking trick pattern",
+                severity=ValidationSeverity.ERROR,
+                location="choices",
+                suggestion="Remove 'all/none of the above' patterns"
+            ))
 
         return findings
 
@@ -451,7 +509,7 @@ class TestwisenessValidator:
                 text1, text2 = incorrect_choices[letter1], incorrect_choices[letter2]
 
                 # Calculate similarity
-                similarity = SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+                similarity = _similarity(text1.lower(), text2.lower(), 0.7)
 
                 if similarity > 0.7:
                     findings.append(ValidationFinding(
@@ -485,11 +543,8 @@ class TestwisenessValidator:
                     ))
 
         # Check for singular/plural agreement
-        singular_patterns = [r"\bis\s+(?:the\s+)?most\b", r"\bwhich\s+(?:one|single)\b"]
-        plural_patterns = [r"\bare\s+(?:the\s+)?most\b", r"\bwhich\s+(?:ones|multiple)\b"]
-
-        is_singular = any(re.search(p, lead_in, re.IGNORECASE) for p in singular_patterns)
-        is_plural = any(re.search(p, lead_in, re.IGNORECASE) for p in plural_patterns)
+        is_singular = self.SINGULAR_LEAD_IN.search(lead_in) is not None
+        is_plural = self.PLURAL_LEAD_IN.search(lead_in) is not None
 
         if is_singular:
             for letter, text in choices.items():
@@ -521,39 +576,68 @@ class DistractorQualityValidator:
     - Are homogeneous (same type as correct answer)
     """
 
-    # Common clinical categories for homogeneity checking
+    # Common clinical categories for homogeneity checking: (pattern, trigger literals)
     CLINICAL_CATEGORIES = {
         "diagnoses": [
-            r"(?:acute|chronic)?\s*\w+itis\b",  # inflammatory conditions
-            r"\b\w+oma\b",  # tumors
-            r"\b\w+osis\b",  # degenerative conditions
-            r"\bsyndrome\b",
-            r"\bdisease\b",
-            r"\bdisorder\b",
+            (r"(?:acute|chronic)?\s*\w+itis\b", ("itis",)),  # inflammatory conditions
+            (r"\b\w+oma\b", ("oma",)),  # tumors
+            (r"\b\w+osis\b", ("osis",)),  # degenerative conditions
+            (r"\bsyndrome\b", ("syndrome",)),
+            (r"\bdisease\b", ("disease",)),
+            (r"\bdisorder\b", ("disorder",)),
         ],
         "treatments": [
-            r"\b(?:start|begin|initiate|administer|give)\b",
-            r"\b\w+(?:mab|nib|pril|olol|statin|sartan)\b",  # drug suffixes
-            r"\btherapy\b",
-            r"\btreatment\b",
-            r"\bsurgery\b",
-            r"\bprocedure\b",
+            (r"\b(?:start|begin|initiate|administer|give)\b",
+             ("start", "begin", "initiate", "administer", "give")),
+            (r"\b\w+(?:mab|nib|pril|olol|statin|sartan)\b",
+             ("mab", "nib", "pril", "olol", "statin", "sartan")),  # drug suffixes
+            (r"\btherapy\b", ("therapy",)),
+            (r"\btreatment\b", ("treatment",)),
+            (r"\bsurgery\b", ("surgery",)),
+            (r"\bprocedure\b", ("procedure",)),
         ],
         "tests": [
-            r"\b(?:CT|MRI|X-ray|ultrasound|ECG|EKG)\b",
-            r"\b(?:order|obtain|check|measure)\b.*\b(?:level|test|study)\b",
-            r"\blab(?:oratory)?\b",
-            r"\bimaging\b",
-            r"\bbiopsy\b",
+            (r"\b(?:CT|MRI|X-ray|ultrasound|ECG|EKG)\b", ("ct", "mri", "x-ray", "ultrasound", "ecg", "ekg")),
+            (r"\b(?:order|obtain|check|measure)\b.*\b(?:level|test|study)\b",
+             ("order", "obtain", "check", "measure")),
+            (r"\blab(?:oratory)?\b", ("lab",)),
+            (r"\bimaging\b", ("imaging",)),
+            (r"\bbiopsy\b", ("biopsy",)),
         ],
         "mechanisms": [
-            r"\b(?:inhibit|block|activate|stimulate|suppress)\b",
-            r"\b(?:increase|decrease|enhance|reduce)\b.*\b(?:production|release|synthesis)\b",
-            r"\bpathway\b",
-            r"\breceptor\b",
+            (r"\b(?:inhibit|block|activate|stimulate|suppress)\b",
+             ("inhibit", "block", "activate", "stimulate", "suppress")),
+            (r"\b(?:increase|decrease|enhance|reduce)\b.*\b(?:production|release|synthesis)\b",
+             ("increase", "decrease", "enhance", "reduce")),
+            (r"\bpathway\b", ("pathway",)),
+            (r"\breceptor\b", ("receptor",)),
         ],
     }
 
+    # Patterns that suggest obviously wrong choices: (pattern, description)
+    OBVIOUS_WRONG_PATTERNS = [
+        (r"do nothing", "Non-actionable distractor"),
+        (r"reassure and discharge", "May be too obviously wrong in acute setting"),
+        (r"watchful waiting", "May be too obviously wrong in acute setting"),
+        (r"no further workup", "May be too obviously wrong"),
+    ]
+
+    # Categories in declaration order, so the first matching rule names the category
+    CATEGORY_RULES = RuleSet([
+        Rule(pattern, pattern, triggers, data=category)
+        for category, patterns in CLINICAL_CATEGORIES.items()
+        for pattern, triggers in patterns
+    ])
+    OBVIOUS_WRONG_RULES = RuleSet([
+        Rule(pattern, pattern, (pattern,), data=description)
+        for pattern, description in OBVIOUS_WRONG_PATTERNS
+    ])
+
+    ACUTE_INDICATORS = [
+        "emergency", "acute", "severe", "unstable",
+        "deteriorating", "critical", "immediate"
+    ]
+
     def validate(
         self,
         choices: List[str],
@@ -596,7 +680,7 @@ class DistractorQualityValidator:
         """Parse choices into letter -> text dict"""
         result = {}
         for i, choice in enumerate(choices):
-            match = re.match(r"^([A-E])[\.\)]\s*(.+)$", choice.strip())
+            match = CHOICE_PREFIX_PATTERN.match(choice.strip())
             if match:
                 result[match.group(1)] = match.group(2)
             elif i < 5:
@@ -610,12 +694,8 @@ class DistractorQualityValidator:
         # Determine category for each choice
         choice_categories = {}
         for letter, text in choices.items():
-            for category, patterns in self.CLINICAL_CATEGORIES.items():
-                if any(re.search(p, text, re.IGNORECASE) for p in patterns):
-                    choice_categories[letter] = category
-                    break
-            else:
-                choice_categories[letter] = "unknown"
+            rule = self.CATEGORY_RULES.first(text)
+            choice_categories[letter] = rule.data if rule else "unknown"
 
         # Check if all categorized choices are same category
         categories = [c for c in choice_categories.values() if c != "unknown"]
@@ -651,7 +731,7 @@ class DistractorQualityValidator:
                         suggestion="Remove duplicate choice"
                     ))
                 # Check near-duplicates
-                elif SequenceMatcher(None, text1, text2).ratio() > 0.85:
+                elif _similarity(text1, text2, 0.85) > 0.85:
                     findings.append(ValidationFinding(
                         validator="DistractorQualityValidator",
                         issue=f"Choices {letter1} and {letter2} are nearly identical",
@@ -677,7 +757,7 @@ class DistractorQualityValidator:
                 continue
 
             text_lower = text.lower()
-            similarity = SequenceMatcher(None, correct_text, text_lower).ratio()
+            similarity = _similarity(correct_text, text_lower, 0.8)
 
             # Too similar to correct answer
             if similarity > 0.8:
@@ -700,36 +780,25 @@ class DistractorQualityValidator:
         """Check for obviously wrong choices that don't test reasoning"""
         findings = []
 
-        # Patterns that suggest obviously wrong choices
-        obvious_patterns = [
-            (r"do nothing", "Non-actionable distractor"),
-            (r"reassure and discharge", "May be too obviously wrong in acute setting"),
-            (r"watchful waiting", "May be too obviously wrong in acute setting"),
-            (r"no further workup", "May be too obviously wrong"),
-        ]
+        # Only flag if vignette suggests acute/emergent setting
+        if not vignette:
+            return findings
+        vignette_lower = vignette.lower()
+        if not any(ind in vignette_lower for ind in self.ACUTE_INDICATORS):
+            return findings
 
         for letter, text in choices.items():
             if letter == correct_key:
                 continue
 
-            for pattern, description in obvious_patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    # Only flag if vignette suggests acute/emergent setting
-                    if vignette:
-                        acute_indicators = [
-                            "emergency", "acute", "severe", "unstable",
-                            "deteriorating", "critical", "immediate"
-                        ]
-                        is_acute = any(ind in vignette.lower() for ind in acute_indicators)
-
-                        if is_acute:
-                            findings.append(ValidationFinding(
-                                validator="DistractorQualityValidator",
-                                issue=f"Choice {letter} may be too obviously wrong: {description}",
-                                severity=ValidationSeverity.WARNING,
-                                location=f"Choice {letter}",
-                                suggestion="Replace with more plausible distractor"
-                            ))
+            for rule, _ in self.OBVIOUS_WRONG_RULES.search(text):
+                findings.append(ValidationFinding(
+                    validator="DistractorQualityValidator",
+                    issue=f"Choice {letter} may be too obviously wrong: {rule.data}",
+                    severity=ValidationSeverity.WARNING,
+                    location=f"Choice {letter}",
+                    suggestion="Replace with more plausible distractor"
+                ))
 
         return findings
 
@@ -804,13 +873,12 @@ class QuestionQualityValidator:
     def _extract_lead_in(self, vignette: str) -> str:
         """Extract the question lead-in from vignette"""
         # Look for question pattern at end
-        question_pattern = r"([^.?!]*\?)\s*$"
-        match = re.search(question_pattern, vignette)
+        match = LEAD_IN_PATTERN.search(vignette)
         if match:
             return match.group(1)
 
         # Fallback: last sentence
-        sentences = re.split(r'[.!?]+', vignette)
+        sentences = SENTENCE_SPLIT_PATTERN.split(vignette)
         return sentences[-1].strip() if sentences else ""
 
 
@@ -874,3 +942,81 @@ def check_distractor_quality(choices: List[str], correct_key: str, vignette: str
     messages = [f"{f.issue} - {f.suggestion}" for f in findings if f.suggestion]
 
     return len(errors) == 0, messages
+
+
+# =============================================================================
+# BATCH VALIDATION
+# =============================================================================
+
+# Below this many questions a process pool costs more to start than it saves
+VALIDATE_MANY_MIN_PARALLEL = 200
+
+_batch_validator = QuestionQualityValidator()
+
+
+def _question_fields(question: Dict[str, Any]) -> Tuple[str, List[str], str]:
+    """
+    (vignette, choices, correct_key) from a generated or extracted question.
+
+    Accepts string or structured vignettes ({"presentation": ...}),
+    "A. text" strings or {"id", "text"} choices, and answer_key or
+    correct_answer.
+    """
+    vignette = question.get("vignette", "")
+    if isinstance(vignette, dict):
+        vignette = " ".join(v for v in vignette.values() if isinstance(v, str) and v != "TBD")
+    stem = question.get("question_stem")
+    if stem and stem not in vignette:
+        vignette = f"{vignette} {stem}"
+
+    choices = []
+    for choice in question.get("choices", []):
+        if isinstance(choice, dict):
+            choices.append(f"{choice.get('id', '')}. {choice.get('text', '')}")
+        else:
+            choices.append(str(choice))
+
+    correct_key = question.get("answer_key") or question.get("correct_answer") or ""
+    return vignette, choices, correct_key
+
+
+def _validate_one(question: Dict[str, Any]) -> QuestionValidationOutcome:
+    """Run the deterministic validators on one question (process pool worker)."""
+    vignette, choices, correct_key = _question_fields(question)
+
+    correct_text = _batch_validator.testwiseness_validator._parse_choices(choices).get(correct_key, "")
+    explanation = question.get("explanation") or {}
+
+    return QuestionValidationOutcome(
+        question_id=question.get("id"),
+        quality=_batch_validator.validate_question(vignette, choices, correct_key),
+        facts=clinical_fact_checker.validate_question(vignette, correct_text, explanation),
+        elite=elite_validator.validate({**question, "vignette": vignette, "explanation": explanation})
+    )
+
+
+def validate_many(
+    questions: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunksize: int = 64
+) -> List[QuestionValidationOutcome]:
+    """
+    Run all deterministic validators over a batch of questions.
+
+    Rule sets are compiled once per process, so large imports are spread
+    across a process pool; small batches run inline.
+
+    Args:
+        questions: Question dicts (generated or extracted format)
+        workers: Worker processes (default: CPU count; 1 = run inline)
+        chunksize: Questions sent to a worker at a time
+
+    Returns:
+        QuestionValidationOutcome per question, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(questions) < VALIDATE_MANY_MIN_PARALLEL:
+        return [_validate_one(q) for q in questions]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_validate_one, questions, chunksize=chunksize))
@@ -0,0 +1,139 @@
+"""
+Reminder Targeting
+
+Computes an hour's reminder recipients for the email and push schedulers
+in one query, instead of loading every user with reminders enabled,
+parsing reminder_time in Python and issuing per-user queries for due
+reviews, push subscriptions and engagement.
+
+The query filters on the indexed UserSettings.reminder_hour (kept in sync
+with reminder_time by the model) and joins:
+- due review counts, grouped in one subquery restricted to the hour's users
+- UserEngagementScore for the current streak / streak-at-risk flag
+- an EXISTS on active push subscriptions (push channel only)
+
+Usage:
+    from app.services.reminder_targeting import get_reminder_targets
+
+    targets = get_reminder_targets(db, hour=9, channel="email")
+    subscriptions = get_active_subscriptions(db, [t.user_id for t in targets])
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, exists, and_
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    User, UserSettings, UserEngagementScore, PushSubscription, ScheduledReview
+)
+from app.utils.fanout import chunked
+
+CHANNELS = ("email", "push")
+
+# Keep IN lists well under database parameter limits
+_IN_CHUNK = 500
+
+
+@dataclass
+class ReminderTarget:
+    """One recipient of an hourly reminder."""
+
+    user_id: str
+    email: Optional[str]
+    first_name: Optional[str]
+    review_count: int
+    current_streak: int = 0
+    streak_at_risk: bool = False
+
+
+def get_reminder_targets(
+    db: Session,
+    hour: int,
+    channel: str = "email",
+    now: Optional[datetime] = None
+) -> List[ReminderTarget]:
+    """
+    Users whose daily reminder falls in this UTC hour.
+
+    Args:
+        hour: UTC hour (0-23)
+        channel: "email" (email notifications on, an address, at least one
+            due review) or "push" (at least one active subscription)
+        now: Reference time for due reviews and streaks (default: utcnow)
+    """
+    if channel not in CHANNELS:
+        raise ValueError(f"Unknown reminder channel: {channel}")
+
+    now = now or datetime.utcnow()
+    yesterday = (now - timedelta(days=1)).date()
+
+    hour_filter = and_(
+        UserSettings.reminder_hour == hour,
+        UserSettings.daily_reminder == True
+    )
+
+    due = db.query(
+        ScheduledReview.user_id.label("user_id"),
+        func.count(ScheduledReview.id).label("review_count")
+    ).join(
+        UserSettings, UserSettings.user_id == ScheduledReview.user_id
+    ).filter(
+        hour_filter,
+        ScheduledReview.scheduled_for <= now
+    ).group_by(ScheduledReview.user_id).subquery()
+
+    query = db.query(
+        User.id,
+        User.email,
+        User.first_name,
+        func.coalesce(due.c.review_count, 0),
+        UserEngagementScore.streak_current,
+        UserEngagementScore.last_activity_at
+    ).join(
+        UserSettings, UserSettings.user_id == User.id
+    ).outerjoin(
+        UserEngagementScore, UserEngagementScore.user_id == User.id
+    ).filter(hour_filter)
+
+    if channel == "email":
+        # Email reminders are only about due reviews
+        query = query.join(due, due.c.user_id == User.id).filter(
+            UserSettings.email_notifications == True,
+            User.email.isnot(None)
+        )
+    else:
+        query = query.outerjoin(due, due.c.user_id == User.id).filter(
+            exists().where(and_(
+                PushSubscription.user_id == User.id,
+                PushSubscription.is_active == True
+            ))
+        )
+
+    targets = []
+    for user_id, email, first_name, review_count, streak, last_activity_at in query:
+        streak = streak or 0
+        targets.append(ReminderTarget(
+            user_id=user_id,
+            email=email,
+            first_name=first_name,
+            review_count=review_count,
+            current_streak=streak,
+            # Streak at risk if the last activity was yesterday
+            streak_at_risk=bool(streak > 0 and last_activity_at and last_activity_at.date() == yesterday)
+        ))
+    return targets
+
+
+def get_active_subscriptions(db: Session, user_ids: List[str]) -> Dict[str, List[PushSubscription]]:
+    """Active push subscriptions for many users, in a few IN queries."""
+    subscriptions: Dict[str, List[PushSubscription]] = {}
+    for chunk in chunked(user_ids, _IN_CHUNK):
+        for sub in db.query(PushSubscription).filter(
+            PushSubscription.user_id.in_(chunk),
+            PushSubscription.is_active == True
+        ):
+            subscriptions.setdefault(sub.user_id, []).append(sub)
+    return subscriptions
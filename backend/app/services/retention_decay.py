@@ -0,0 +1,151 @@
+"""
+Concept Retention Decay
+
+Vectorized Ebbinghaus forgetting curve (R = e^(-t/S)) over ConceptRetention
+columns, replacing per-row math.exp over ORM objects:
+
+- Read time: predicted retention is a pure function of the stored
+  stability and last_reviewed, so readers (get_concepts_needing_review,
+  the question selector, the dashboard) compute it on the fly from a
+  light (id, stability, last_reviewed) column query and need no writes.
+- Batch job: decay_concept_retentions() refreshes the stored
+  predicted_retention / memory_strength columns for one user or the whole
+  table. Rows are streamed in id order in chunks, retention is computed
+  with NumPy per chunk, and only rows whose value moved by more than
+  min_change are written back with one bulk UPDATE per chunk.
+
+Usage:
+    from app.services.retention_decay import decay_concept_retentions, predict_retention
+
+    result = decay_concept_retentions(db)            # nightly, all users
+    retention = predict_retention(stability, days)   # arrays in, array out
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.models import ConceptRetention
+
+logger = logging.getLogger(__name__)
+
+DECAY_BATCH_SIZE = 50_000
+
+# Stored values closer than this to the fresh prediction are left alone
+MIN_RETENTION_CHANGE = 0.001
+
+_SECONDS_PER_DAY = 86400.0
+
+
+def predict_retention(stability: np.ndarray, days_since: np.ndarray) -> np.ndarray:
+    """
+    R = e^(-t/S) elementwise; 1.0 where no time has passed.
+
+    Args:
+        stability: Memory stability per concept (days)
+        days_since: Days since each concept's last review
+    """
+    stability = np.maximum(np.asarray(stability, dtype=np.float64), 1e-9)
+    days_since = np.asarray(days_since, dtype=np.float64)
+    return np.where(days_since <= 0, 1.0, np.exp(-np.maximum(days_since, 0.0) / stability))
+
+
+def days_since_review(last_reviewed: Sequence[datetime], now: datetime) -> np.ndarray:
+    """Fractional days between each last_reviewed and now."""
+    reviewed = np.array(last_reviewed, dtype="datetime64[us]")
+    return (np.datetime64(now, "us") - reviewed) / np.timedelta64(1, "s") / _SECONDS_PER_DAY
+
+
+def current_retention(
+    rows: Sequence[Tuple[Any, Optional[float], Optional[datetime]]],
+    now: Optional[datetime] = None
+) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+    """
+    Predicted retention for (key, stability, last_reviewed) rows.
+
+    Rows never reviewed are skipped. Returns (keys, retention, days_since)
+    for the remaining rows, in input order.
+    """
+    now = now or datetime.utcnow()
+    reviewed = [row for row in rows if row[2] is not None]
+    if not reviewed:
+        empty = np.empty(0, dtype=np.float64)
+        return [], empty, empty
+
+    keys = [row[0] for row in reviewed]
+    stability = np.array([row[1] if row[1] is not None else 1.0 for row in reviewed], dtype=np.float64)
+    days = days_since_review([row[2] for row in reviewed], now)
+    return keys, predict_retention(stability, days), days
+
+
+def decay_concept_retentions(
+    db: Session,
+    user_id: Optional[str] = None,
+    now: Optional[datetime] = None,
+    batch_size: int = DECAY_BATCH_SIZE,
+    min_change: float = MIN_RETENTION_CHANGE
+) -> Dict[str, Any]:
+    """
+    Refresh stored predicted_retention / memory_strength from the forgetting curve.
+
+    Args:
+        user_id: Limit to one user (default: every user)
+        batch_size: Rows per chunk (one SELECT and at most one bulk UPDATE each)
+        min_change: Skip rows whose stored retention is already this close
+
+    Returns:
+        {"status", "records_scanned", "records_updated"}
+    """
+    now = now or datetime.utcnow()
+    scanned = updated = 0
+    last_id = None
+
+    while True:
+        query = db.query(
+            ConceptRetention.id,
+            ConceptRetention.stability,
+            ConceptRetention.last_reviewed,
+            ConceptRetention.predicted_retention
+        ).filter(ConceptRetention.last_reviewed.isnot(None))
+        if user_id is not None:
+            query = query.filter(ConceptRetention.user_id == user_id)
+        if last_id is not None:
+            query = query.filter(ConceptRetention.id > last_id)
+        rows = query.order_by(ConceptRetention.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        last_id = rows[-1][0]
+        scanned += len(rows)
+
+        ids, retention, _ = current_retention([row[:3] for row in rows], now)
+        stored = np.array(
+            [row[3] if row[3] is not None else np.nan for row in rows], dtype=np.float64
+        )
+        changed = np.flatnonzero(~(np.abs(retention - stored) <= min_change))
+
+        if len(changed):
+            db.bulk_update_mappings(ConceptRetention, [
+                {
+                    "id": ids[i],
+                    "predicted_retention": float(retention[i]),
+                    "memory_strength": float(retention[i]),
+                    "updated_at": now
+                }
+                for i in changed
+            ])
+            db.commit()
+            updated += len(changed)
+
+        if len(rows) < batch_size:
+            break
+
+    logger.info(f"Concept retention decay: {updated}/{scanned} rows updated")
+    return {
+        "status": "success",
+        "records_scanned": scanned,
+        "records_updated": updated
+    }
@@ -0,0 +1,434 @@
+"""
+Review Queue
+
+Serves "what is due" for spaced repetition from a per-user priority
+structure instead of querying scheduled_reviews on every request:
+
+- ReviewHeap: a min-heap of (due timestamp, question_id) with lazy
+  deletion. Rescheduling pushes a new entry and leaves the old one to be
+  skipped; the heap is compacted once stale entries dominate. Due items
+  are read in due order by walking the heap, without popping.
+- Backends hold one queue per user:
+  - InMemoryReviewQueueBackend: ReviewHeaps in a bounded LRU; used when
+    REDIS_URL is not set and in tests
+  - RedisReviewQueueBackend: one sorted set per user scored by due
+    timestamp, shared by all worker processes
+
+A user's queue is loaded from scheduled_reviews (one indexed query) on
+first use and expires after REVIEW_QUEUE_TTL_SECONDS. The schedulers in
+spaced_repetition / learning_engine write through after they commit, so
+a loaded queue stays current; writes for users without a loaded queue
+are dropped (the next read loads fresh state).
+
+Readers that return ScheduledReview rows re-check scheduled_for on the
+rows they fetch, and id-only readers use due_confirmed(), so an entry
+that is stale in a cache (for example in another process with the
+in-memory backend) is never served as due.
+
+Configuration (env):
+    REVIEW_QUEUE_TTL_SECONDS   lifetime of a loaded queue (default 600)
+    REVIEW_QUEUE_MAX_USERS     users kept by the in-memory backend (default 10000)
+
+Usage:
+    from app.services.review_queue import get_review_queue
+
+    queue = get_review_queue()
+    question_ids = queue.due_confirmed(db, user_id, before=datetime.utcnow(), limit=50)
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.models import ScheduledReview
+from app.utils.fanout import chunked
+
+logger = logging.getLogger(__name__)
+
+QUEUE_TTL_SECONDS = int(os.getenv("REVIEW_QUEUE_TTL_SECONDS", "600"))
+MAX_CACHED_USERS = int(os.getenv("REVIEW_QUEUE_MAX_USERS", "10000"))
+
+_IN_CHUNK = 500  # Ids per IN (...) when re-checking due entries
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_timestamp(moment: datetime) -> float:
+    """Naive UTC datetime -> seconds since the epoch (queue scores)."""
+    return (moment - _EPOCH).total_seconds()
+
+
+class ReviewHeap:
+    """One user's reviews ordered by due time."""
+
+    def __init__(self, entries: Iterable[Tuple[str, float]] = ()):
+        self._due: Dict[str, float] = dict(entries)
+        self._heap: List[Tuple[float, str]] = [(ts, qid) for qid, ts in self._due.items()]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, question_id: str, due_ts: float):
+        """Add a review or move it to a new due time."""
+        if self._due.get(question_id) == due_ts:
+            return
+        self._due[question_id] = due_ts
+        heapq.heappush(self._heap, (due_ts, question_id))
+        self._maybe_compact()
+
+    def remove(self, question_id: str):
+        if self._due.pop(question_id, None) is not None:
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(ts, qid) for qid, ts in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def due(self, before_ts: float, limit: Optional[int] = None) -> List[str]:
+        """
+        Question ids due at or before `before_ts`, earliest first.
+
+        Walks the heap as a tree (children of index i are 2i+1 and 2i+2)
+        with a small frontier heap, so reading k due items costs
+        O(k log k) regardless of how many reviews are scheduled later.
+        """
+        heap = self._heap
+        result: List[str] = []
+        if not heap:
+            return result
+
+        # A review moved away and back leaves two identical live entries
+        seen = set()
+        frontier = [(heap[0], 0)]
+        while frontier and (limit is None or len(result) < limit):
+            (due_ts, question_id), index = heapq.heappop(frontier)
+            if due_ts > before_ts:
+                break
+            if self._due.get(question_id) == due_ts and question_id not in seen:
+                seen.add(question_id)
+                result.append(question_id)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
+
+    def next_due(self) -> Optional[Tuple[str, float]]:
+        """The earliest scheduled review as (question_id, due timestamp)."""
+        while self._heap:
+            due_ts, question_id = self._heap[0]
+            if self._due.get(question_id) == due_ts:
+                return question_id, due_ts
+            heapq.heappop(self._heap)
+        return None
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class ReviewQueueBackend(ABC):
+    """Per-user due queues. Reads return None when the user's queue isn't loaded."""
+
+    name = "base"
+
+    @abstractmethod
+    def load(self, user_id: str, entries: Sequence[Tuple[str, float]], ttl: int):
+        """Replace the user's queue with (question_id, due timestamp) entries."""
+
+    @abstractmethod
+    def due(self, user_id: str, before_ts: float, limit: Optional[int]) -> Optional[List[str]]:
+        """Question ids due before `before_ts`, soonest first."""
+
+    @abstractmethod
+    def count_due(self, user_id: str, before_ts: float) -> Optional[int]:
+        """Number of entries due before `before_ts`."""
+
+    @abstractmethod
+    def size(self, user_id: str) -> Optional[int]:
+        """Number of entries in the user's queue."""
+
+    @abstractmethod
+    def schedule(self, user_id: str, entries: Sequence[Tuple[str, float]]):
+        """Write through to a loaded queue; no-op otherwise."""
+
+    @abstractmethod
+    def invalidate(self, user_id: str):
+        """Drop the user's queue so the next read reloads it."""
+
+
+class InMemoryReviewQueueBackend(ReviewQueueBackend):
+    """ReviewHeaps in a bounded, expiring LRU (single process)."""
+
+    name = "memory"
+
+    def __init__(self, max_users: int = MAX_CACHED_USERS):
+        self.max_users = max(1, max_users)
+        self._queues: "OrderedDict[str, Tuple[ReviewHeap, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, user_id: str) -> Optional[ReviewHeap]:
+        entry = self._queues.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._queues[user_id]
+            return None
+        self._queues.move_to_end(user_id)
+        return entry[0]
+
+    def load(self, user_id: str, entries: Sequence[Tuple[str, float]], ttl: int):
+        with self._lock:
+            self._queues[user_id] = (ReviewHeap(entries), time.monotonic() + ttl)
+            self._queues.move_to_end(user_id)
+            while len(self._queues) > self.max_users:
+                self._queues.popitem(last=False)
+
+    def due(self, user_id: str, before_ts: float, limit: Optional[int]) -> Optional[List[str]]:
+        with self._lock:
+            heap = self._get(user_id)
+            return heap.due(before_ts, limit) if heap is not None else None
+
+    def count_due(self, user_id: str, before_ts: float) -> Optional[int]:
+        due = self.due(user_id, before_ts, None)
+        return len(due) if due is not None else None
+
+    def size(self, user_id: str) -> Optional[int]:
+        with self._lock:
+            heap = self._get(user_id)
+            return len(heap) if heap is not None else None
+
+    def schedule(self, user_id: str, entries: Sequence[Tuple[str, float]]):
+        with self._lock:
+            heap = self._get(user_id)
+            if heap is not None:
+                for question_id, due_ts in entries:
+                    heap.schedule(question_id, due_ts)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._queues.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._queues.clear()
+
+
+# Marks a loaded queue, so a user with no reviews still has a (non-empty) key
+_LOADED_MEMBER = "__loaded__"
+
+_SCHEDULE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('ZADD', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+
+def _queue_key(user_id: str) -> str:
+    return f"review_queue:{user_id}"
+
+
+class RedisReviewQueueBackend(ReviewQueueBackend):
+    """One sorted set per user (member = question id, score = due timestamp)."""
+
+    name = "redis"
+
+    def __init__(self, client):
+        self._client = client
+        self._schedule = client.register_script(_SCHEDULE_SCRIPT)
+
+    def load(self, user_id: str, entries: Sequence[Tuple[str, float]], ttl: int):
+        key = _queue_key(user_id)
+        mapping = {question_id: due_ts for question_id, due_ts in entries}
+        mapping[_LOADED_MEMBER] = float("inf")
+        pipe = self._client.pipeline()
+        pipe.delete(key)
+        pipe.zadd(key, mapping)
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+    def due(self, user_id: str, before_ts: float, limit: Optional[int]) -> Optional[List[str]]:
+        key = _queue_key(user_id)
+        pipe = self._client.pipeline()
+        pipe.exists(key)
+        if limit is None:
+            pipe.zrangebyscore(key, "-inf", before_ts)
+        else:
+            pipe.zrangebyscore(key, "-inf", before_ts, start=0, num=limit)
+        loaded, members = pipe.execute()
+        return list(members) if loaded else None
+
+    def count_due(self, user_id: str, before_ts: float) -> Optional[int]:
+        key = _queue_key(user_id)
+        pipe = self._client.pipeline()
+        pipe.exists(key)
+        pipe.zcount(key, "-inf", before_ts)
+        loaded, count = pipe.execute()
+        return int(count) if loaded else None
+
+    def size(self, user_id: str) -> Optional[int]:
+        count = self._client.zcard(_queue_key(user_id))
+        return int(count) - 1 if count else None
+
+    def schedule(self, user_id: str, entries: Sequence[Tuple[str, float]]):
+        args = []
+        for question_id, due_ts in entries:
+            args.extend([due_ts, question_id])
+        if args:
+            self._schedule(keys=[_queue_key(user_id)], args=args)
+
+    def invalidate(self, user_id: str):
+        self._client.delete(_queue_key(user_id))
+
+
+def create_review_queue_backend(redis_url: Optional[str] = None) -> ReviewQueueBackend:
+    """Redis backend when REDIS_URL is reachable, otherwise in-memory."""
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+            client = redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+            client.ping()
+            logger.info("Review queues using Redis")
+            return RedisReviewQueueBackend(client)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for review queues, using in-memory: {e}")
+    return InMemoryReviewQueueBackend()
+
+
+# ============================================================================
+# QUEUE
+# ============================================================================
+
+class ReviewQueue:
+    """Due-review reads served from per-user queues, loaded from the database on a miss."""
+
+    def __init__(self, backend: Optional[ReviewQueueBackend] = None, ttl: int = QUEUE_TTL_SECONDS):
+        self.backend = backend or create_review_queue_backend()
+        self._fallback = InMemoryReviewQueueBackend()
+        self.ttl = ttl
+        self._stats = {"hits": 0, "loads": 0, "stale": 0, "backend_errors": 0}
+
+    def _call(self, operation: Callable[[ReviewQueueBackend], object]):
+        try:
+            return operation(self.backend)
+        except Exception as e:
+            self._stats["backend_errors"] += 1
+            logger.warning(f"Review queue backend error, using local queues: {e}")
+            return operation(self._fallback)
+
+    def _load(self, db: Session, user_id: str):
+        self._stats["loads"] += 1
+        entries = [
+            (question_id, to_timestamp(scheduled_for))
+            for question_id, scheduled_for in db.query(
+                ScheduledReview.question_id, ScheduledReview.scheduled_for
+            ).filter(ScheduledReview.user_id == user_id)
+        ]
+        self._call(lambda backend: backend.load(user_id, entries, self.ttl))
+
+    def _read(self, db: Session, user_id: str, read: Callable[[ReviewQueueBackend], object]):
+        result = self._call(read)
+        if result is None:
+            self._load(db, user_id)
+            result = self._call(read)
+        else:
+            self._stats["hits"] += 1
+        return result
+
+    def due(
+        self,
+        db: Session,
+        user_id: str,
+        before: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """Question ids due at or before `before` (default now), earliest first."""
+        before_ts = to_timestamp(before or datetime.utcnow())
+        return self._read(db, user_id, lambda backend: backend.due(user_id, before_ts, limit)) or []
+
+    def due_confirmed(
+        self,
+        db: Session,
+        user_id: str,
+        before: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        due(), with the ids re-checked against scheduled_reviews.
+
+        Ids whose row was rescheduled past `before` or removed since the
+        queue was loaded are dropped, and the user's queue is invalidated
+        so the next read reloads it.
+        """
+        before = before or datetime.utcnow()
+        question_ids = self.due(db, user_id, before=before, limit=limit)
+        if not question_ids:
+            return []
+
+        still_due = set()
+        for chunk in chunked(question_ids, _IN_CHUNK):
+            still_due.update(question_id for (question_id,) in db.query(ScheduledReview.question_id).filter(
+                ScheduledReview.user_id == user_id,
+                ScheduledReview.question_id.in_(chunk),
+                ScheduledReview.scheduled_for <= before
+            ))
+        if len(still_due) < len(question_ids):
+            self._stats["stale"] += 1
+            self.invalidate(user_id)
+        return [question_id for question_id in question_ids if question_id in still_due]
+
+    def count_due(self, db: Session, user_id: str, before: Optional[datetime] = None) -> int:
+        before_ts = to_timestamp(before or datetime.utcnow())
+        return self._read(db, user_id, lambda backend: backend.count_due(user_id, before_ts)) or 0
+
+    def size(self, db: Session, user_id: str) -> int:
+        """Total scheduled reviews for the user."""
+        return self._read(db, user_id, lambda backend: backend.size(user_id)) or 0
+
+    def record(self, reviews: Iterable[ScheduledReview]):
+        """Write committed schedules through to loaded queues."""
+        by_user: Dict[str, List[Tuple[str, float]]] = {}
+        for review in reviews:
+            by_user.setdefault(review.user_id, []).append(
+                (review.question_id, to_timestamp(review.scheduled_for))
+            )
+        for user_id, entries in by_user.items():
+            self._call(lambda backend: backend.schedule(user_id, entries))
+
+    def invalidate(self, user_id: str):
+        """Drop a user's queue (call after writing scheduled_reviews outside the schedulers)."""
+        self._call(lambda backend: backend.invalidate(user_id))
+
+    def get_stats(self) -> Dict[str, object]:
+        return {**self._stats, "backend": self.backend.name}
+
+
+# Singleton
+_review_queue: Optional[ReviewQueue] = None
+
+
+def get_review_queue() -> ReviewQueue:
+    """Get or create the singleton review queue."""
+    global _review_queue
+    if _review_queue is None:
+        _review_queue = ReviewQueue()
+    return _review_queue
@@ -0,0 +1,509 @@
+"""
+Shingle Index for Originality Checking
+
+Replaces the originality checker's linear corpus scans with two indexed
+candidate stages over integer-hashed word shingles:
+
+1. Phrase index: an inverted index from hashed 8-word phrases to the
+   questions containing them (sorted uint64 keys + int32 postings, looked
+   up with binary search). Counting postings per question gives the
+   exact-phrase score without touching non-matching questions.
+2. MinHash LSH: each question's 4-gram set is summarized by a MinHash
+   signature split into bands; questions sharing any band bucket (plus
+   the top phrase-index hits) are the only ones whose exact Jaccard
+   similarity is computed.
+
+Each question is stored as a sorted uint64 array of its 4-gram hashes
+rather than a set of strings. Shingle hashes are built from crc32 word
+hashes, so they are stable across processes.
+
+Storage is split in two segments:
+- Base: flat arrays (ids, texts, 4-grams with offsets, phrase postings,
+  LSH keys). Built by add_many() on an empty index, or handed over by
+  from_arrays() - typically read-only memory maps of an on-disk snapshot
+  (see originality_snapshot), so opening an index does no per-question work.
+- Appended: questions added later via add(). Their phrases go into a small
+  sorted delta that is merged into the main phrase arrays once it grows
+  past `merge_threshold`, so add() stays cheap.
+
+Usage:
+    index = ShingleIndex()
+    index.add_many([(question_id, normalized_text), ...])
+
+    counts, positions, total = index.phrase_matches(words)
+    best_id, jaccard = index.most_similar(words)
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Combines word hashes into shingle hashes (64-bit FNV prime, wrapping)
+_SHINGLE_PRIME = np.uint64(1099511628211)
+
+# MinHash permutations: (a * x + b) mod p, truncated to 32 bits
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_LOW_29 = np.uint64((1 << 29) - 1)
+_U32 = np.uint64(32)
+_U29 = np.uint64(29)
+_MINHASH_SEED = 1
+
+_EMPTY_HASHES = np.empty(0, dtype=np.uint64)
+_EMPTY_DOCS = np.empty(0, dtype=np.int32)
+_EMPTY_OFFSETS = np.zeros(1, dtype=np.int64)
+
+# Arrays exchanged with from_arrays() / to_arrays()
+ARRAY_NAMES = (
+    "ids", "id_order", "texts", "text_offsets", "ngrams", "ngram_offsets",
+    "phrase_keys", "phrase_docs", "lsh_keys", "lsh_docs",
+)
+
+
+def hash_words(words: Sequence[str]) -> np.ndarray:
+    """Stable 32-bit hash per word (as uint64 for shingle arithmetic)."""
+    return np.fromiter(
+        (zlib.crc32(word.encode("utf-8")) for word in words),
+        dtype=np.uint64,
+        count=len(words)
+    )
+
+
+def shingle_hashes(word_hashes: np.ndarray, size: int) -> np.ndarray:
+    """Hash of every `size`-word window, in text order (duplicates kept)."""
+    count = len(word_hashes) - size + 1
+    if count <= 0:
+        return _EMPTY_HASHES
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_PRIME + word_hashes[offset:offset + count]
+    return hashes
+
+
+def _offsets(lengths: List[int]) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+class ShingleIndex:
+    """Phrase inverted index + MinHash LSH over hashed word shingles."""
+
+    def __init__(
+        self,
+        ngram_size: int = 4,
+        phrase_size: int = 8,
+        num_perm: int = 64,
+        bands: int = 16,
+        merge_threshold: int = 50000,
+        max_phrase_candidates: int = 50
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.ngram_size = ngram_size
+        self.phrase_size = phrase_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.merge_threshold = merge_threshold
+        self.max_phrase_candidates = max_phrase_candidates
+
+        rng = np.random.RandomState(_MINHASH_SEED)
+        perm_a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        perm_b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        # a < p split into 29 high / 32 low bits so a * x never exceeds 64 bits
+        perm_a %= _MERSENNE_PRIME
+        perm_a[perm_a == 0] = 1
+        self._perm_a_hi = (perm_a >> _U32)[:, None]
+        self._perm_a_lo = (perm_a & _MAX_HASH)[:, None]
+        self._perm_b = (perm_b % _MERSENNE_PRIME)[:, None]
+        self._band_ids = np.arange(bands, dtype=np.uint64)
+
+        # Base segment (doc index < _base_count)
+        self._base_count = 0
+        self._base_ids = np.empty(0, dtype="<U1")
+        self._base_id_order = _EMPTY_DOCS  # argsort of _base_ids, for binary search
+        self._base_texts = np.empty(0, dtype=np.uint8)  # utf-8, concatenated
+        self._base_text_offsets = _EMPTY_OFFSETS
+        self._base_ngrams = _EMPTY_HASHES  # sorted unique 4-gram hashes, concatenated
+        self._base_ngram_offsets = _EMPTY_OFFSETS
+        self._lsh_keys = _EMPTY_HASHES  # sorted (band, band hash) keys
+        self._lsh_docs = _EMPTY_DOCS
+
+        # Appended segment (doc index = _base_count + list position)
+        self._extra_ids: List[str] = []
+        self._extra_texts: List[str] = []
+        self._extra_ngrams: List[np.ndarray] = []
+        self._positions: Dict[str, int] = {}  # appended id -> doc index
+        self._buckets: Dict[int, List[int]] = {}  # LSH key -> appended doc indexes
+
+        self._alive = bytearray()  # 0 once a doc is replaced by a re-add
+        self._live = 0
+
+        # Phrase inverted index: main sorted arrays + small sorted delta
+        self._phrase_keys = _EMPTY_HASHES
+        self._phrase_docs = _EMPTY_DOCS
+        self._delta_keys = _EMPTY_HASHES
+        self._delta_docs = _EMPTY_DOCS
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, question_id: str) -> bool:
+        return self._doc_for(question_id) is not None
+
+    def get_params(self) -> Dict[str, int]:
+        """Parameters that must match for hashed arrays to be reusable."""
+        return {
+            "ngram_size": self.ngram_size,
+            "phrase_size": self.phrase_size,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+        }
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def _id(self, doc: int) -> str:
+        if doc < self._base_count:
+            return str(self._base_ids[doc])
+        return self._extra_ids[doc - self._base_count]
+
+    def _doc_for(self, question_id: str) -> Optional[int]:
+        doc = self._positions.get(question_id)
+        if doc is None and self._base_count:
+            slot = int(np.searchsorted(self._base_ids, question_id, sorter=self._base_id_order))
+            if slot < self._base_count:
+                candidate = int(self._base_id_order[slot])
+                if self._base_ids[candidate] == question_id:
+                    doc = candidate
+        if doc is None or not self._alive[doc]:
+            return None
+        return doc
+
+    def _doc_ngrams(self, doc: int) -> np.ndarray:
+        if doc < self._base_count:
+            return self._base_ngrams[self._base_ngram_offsets[doc]:self._base_ngram_offsets[doc + 1]]
+        return self._extra_ngrams[doc - self._base_count]
+
+    def _doc_text(self, doc: int) -> str:
+        if doc < self._base_count:
+            start, end = self._base_text_offsets[doc], self._base_text_offsets[doc + 1]
+            return self._base_texts[start:end].tobytes().decode("utf-8")
+        return self._extra_texts[doc - self._base_count]
+
+    def get_text(self, question_id: str) -> Optional[str]:
+        """Normalized text stored for a question, if indexed."""
+        doc = self._doc_for(question_id)
+        return self._doc_text(doc) if doc is not None else None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _minhash(self, hashes: np.ndarray) -> np.ndarray:
+        """MinHash signature of a set of shingle hashes."""
+        if len(hashes) == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        x = hashes & _MAX_HASH
+        # a * x = hi * x * 2^32 + lo * x; hi * x < 2^61 and, with 2^61 = 1
+        # (mod p), hi * x * 2^32 = (top 32 bits) + (low 29 bits) << 32
+        high = self._perm_a_hi * x
+        high = (high >> _U29) + ((high & _LOW_29) << _U32)
+        low = (self._perm_a_lo * x) % _MERSENNE_PRIME
+        values = (high + low + self._perm_b) % _MERSENNE_PRIME  # Sum < 2^63, no wrap
+        return (values & _MAX_HASH).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> np.ndarray:
+        """One key per LSH band (rows combined like shingles, then the band number)."""
+        bands = signature.reshape(self.bands, self.rows)
+        keys = np.zeros(self.bands, dtype=np.uint64)
+        for row in range(self.rows):
+            keys = keys * _SHINGLE_PRIME + bands[:, row]
+        return keys * _SHINGLE_PRIME + self._band_ids
+
+    def _shingle(self, text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(unique 4-gram hashes, unique phrase hashes, LSH band keys) of a text."""
+        word_hashes = hash_words(text.split())
+        ngrams = np.unique(shingle_hashes(word_hashes, self.ngram_size))
+        phrases = np.unique(shingle_hashes(word_hashes, self.phrase_size))
+        return ngrams, phrases, self._band_keys(self._minhash(ngrams))
+
+    def _retire(self, question_id: str):
+        previous = self._doc_for(question_id)
+        if previous is not None:
+            self._alive[previous] = 0
+            self._live -= 1
+
+    def _append(self, question_id: str, text: str) -> Tuple[int, np.ndarray]:
+        """Store a doc in the appended segment; returns (doc index, phrase hashes)."""
+        self._retire(question_id)
+        ngrams, phrases, lsh_keys = self._shingle(text)
+
+        doc = len(self._alive)
+        self._extra_ids.append(question_id)
+        self._extra_texts.append(text)
+        self._extra_ngrams.append(ngrams)
+        self._positions[question_id] = doc
+        self._alive.append(1)
+        self._live += 1
+
+        for key in lsh_keys.tolist():
+            self._buckets.setdefault(key, []).append(doc)
+
+        return doc, phrases
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """
+        Bulk-add (question_id, normalized_text) pairs with a single phrase merge.
+
+        On an empty index the documents become the flat base segment.
+        """
+        if len(self._alive):
+            key_parts = [self._phrase_keys, self._delta_keys]
+            doc_parts = [self._phrase_docs, self._delta_docs]
+            added = 0
+            for question_id, text in documents:
+                doc, phrases = self._append(question_id, text)
+                key_parts.append(phrases)
+                doc_parts.append(np.full(len(phrases), doc, dtype=np.int32))
+                added += 1
+            if added:
+                self._phrase_keys, self._phrase_docs = self._sorted(
+                    np.concatenate(key_parts), np.concatenate(doc_parts)
+                )
+                self._delta_keys, self._delta_docs = _EMPTY_HASHES, _EMPTY_DOCS
+            return added
+
+        ids, texts, ngram_parts, phrase_parts, lsh_parts = [], [], [], [], []
+        for question_id, text in documents:
+            ngrams, phrases, lsh_keys = self._shingle(text)
+            ids.append(question_id)
+            texts.append(text.encode("utf-8"))
+            ngram_parts.append(ngrams)
+            phrase_parts.append(phrases)
+            lsh_parts.append(lsh_keys)
+
+        if not ids:
+            return 0
+
+        docs = np.arange(len(ids), dtype=np.int32)
+        phrase_keys, phrase_docs = self._sorted(
+            np.concatenate(phrase_parts),
+            np.repeat(docs, [len(p) for p in phrase_parts])
+        )
+        lsh_keys, lsh_docs = self._sorted(np.concatenate(lsh_parts), np.repeat(docs, self.bands))
+        id_array = np.array(ids)
+
+        self._set_base({
+            "ids": id_array,
+            "id_order": np.argsort(id_array, kind="stable").astype(np.int32),
+            "texts": np.frombuffer(b"".join(texts), dtype=np.uint8),
+            "text_offsets": _offsets([len(t) for t in texts]),
+            "ngrams": np.concatenate(ngram_parts),
+            "ngram_offsets": _offsets([len(n) for n in ngram_parts]),
+            "phrase_keys": phrase_keys,
+            "phrase_docs": phrase_docs,
+            "lsh_keys": lsh_keys,
+            "lsh_docs": lsh_docs,
+        })
+        return len(ids)
+
+    def _set_base(self, arrays: Dict[str, np.ndarray]):
+        self._base_count = len(arrays["ids"])
+        self._base_ids = arrays["ids"]
+        self._base_id_order = arrays["id_order"]
+        self._base_texts = arrays["texts"]
+        self._base_text_offsets = arrays["text_offsets"]
+        self._base_ngrams = arrays["ngrams"]
+        self._base_ngram_offsets = arrays["ngram_offsets"]
+        self._phrase_keys = arrays["phrase_keys"]
+        self._phrase_docs = arrays["phrase_docs"]
+        self._lsh_keys = arrays["lsh_keys"]
+        self._lsh_docs = arrays["lsh_docs"]
+        self._alive = bytearray(b"\x01") * self._base_count
+        self._live = self._base_count
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], **params) -> "ShingleIndex":
+        """
+        Open an index over prebuilt base arrays (see ARRAY_NAMES).
+
+        The arrays are used as-is, never written to, so read-only memory maps
+        are shared between processes.
+        """
+        index = cls(**params)
+        index._set_base(arrays)
+        return index
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Flatten live documents (both segments) into base arrays for persisting."""
+        count = len(self._alive)
+        alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+        live_docs = np.flatnonzero(alive)
+
+        ids = [self._id(doc) for doc in live_docs.tolist()]
+        texts = [self._doc_text(doc).encode("utf-8") for doc in live_docs.tolist()]
+        ngram_parts = [np.asarray(self._doc_ngrams(doc)) for doc in live_docs.tolist()]
+
+        phrase_keys = np.concatenate([self._phrase_keys, self._delta_keys])
+        phrase_docs = np.concatenate([self._phrase_docs, self._delta_docs])
+        keep = alive[phrase_docs] if len(phrase_docs) else np.zeros(0, dtype=bool)
+        phrase_keys, phrase_docs = self._sorted(phrase_keys[keep], remap[phrase_docs[keep]].astype(np.int32))
+
+        lsh_keys = [np.asarray(self._lsh_keys)]
+        lsh_docs = [np.asarray(self._lsh_docs)]
+        for key, docs in self._buckets.items():
+            lsh_keys.append(np.full(len(docs), key, dtype=np.uint64))
+            lsh_docs.append(np.asarray(docs, dtype=np.int32))
+        lsh_keys, lsh_docs = np.concatenate(lsh_keys), np.concatenate(lsh_docs)
+        keep = alive[lsh_docs] if count else np.zeros(0, dtype=bool)
+        lsh_keys, lsh_docs = self._sorted(lsh_keys[keep], remap[lsh_docs[keep]].astype(np.int32))
+
+        id_array = np.array(ids) if ids else np.empty(0, dtype="<U1")
+        return {
+            "ids": id_array,
+            "id_order": np.argsort(id_array, kind="stable").astype(np.int32),
+            "texts": np.frombuffer(b"".join(texts), dtype=np.uint8),
+            "text_offsets": _offsets([len(t) for t in texts]),
+            "ngrams": np.concatenate(ngram_parts) if ngram_parts else _EMPTY_HASHES,
+            "ngram_offsets": _offsets([len(n) for n in ngram_parts]),
+            "phrase_keys": phrase_keys,
+            "phrase_docs": phrase_docs,
+            "lsh_keys": lsh_keys,
+            "lsh_docs": lsh_docs,
+        }
+
+    def add(self, question_id: str, text: str):
+        """Incrementally add one normalized text."""
+        doc, phrases = self._append(question_id, text)
+
+        self._delta_keys, self._delta_docs = self._sorted(
+            np.concatenate([self._delta_keys, phrases]),
+            np.concatenate([self._delta_docs, np.full(len(phrases), doc, dtype=np.int32)])
+        )
+        if len(self._delta_keys) >= self.merge_threshold:
+            self._phrase_keys, self._phrase_docs = self._sorted(
+                np.concatenate([self._phrase_keys, self._delta_keys]),
+                np.concatenate([self._phrase_docs, self._delta_docs])
+            )
+            self._delta_keys, self._delta_docs = _EMPTY_HASHES, _EMPTY_DOCS
+
+    @staticmethod
+    def _sorted(keys: np.ndarray, docs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(keys, kind="stable")
+        return keys[order], docs[order]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _postings(keys: np.ndarray, docs: np.ndarray, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """All (query position, doc) pairs whose hashes match."""
+        left = np.searchsorted(keys, query, side="left")
+        right = np.searchsorted(keys, query, side="right")
+        lengths = right - left
+        total = int(lengths.sum())
+        if total == 0:
+            return _EMPTY_DOCS, _EMPTY_DOCS
+
+        group_starts = np.cumsum(lengths) - lengths
+        index = np.repeat(left, lengths) + (np.arange(total) - np.repeat(group_starts, lengths))
+        positions = np.repeat(np.arange(len(query)), lengths)
+        return positions, docs[index]
+
+    def phrase_matches(self, words: Sequence[str]) -> Tuple[Dict[str, int], Dict[str, List[int]], int]:
+        """
+        Count, per question, how many of the text's phrases it contains.
+
+        Returns:
+            (question_id -> matched phrase count,
+             question_id -> matched phrase start positions,
+             number of phrases in the text)
+        """
+        query = shingle_hashes(hash_words(words), self.phrase_size)
+        if len(query) == 0:
+            return {}, {}, 0
+
+        positions, docs = self._postings(self._phrase_keys, self._phrase_docs, query)
+        if len(self._delta_keys):
+            delta_positions, delta_docs = self._postings(self._delta_keys, self._delta_docs, query)
+            positions = np.concatenate([positions, delta_positions])
+            docs = np.concatenate([docs, delta_docs])
+
+        counts: Dict[str, int] = {}
+        matched: Dict[str, List[int]] = {}
+        if len(docs) == 0:
+            return counts, matched, len(query)
+
+        unique_docs, doc_counts = np.unique(docs, return_counts=True)
+        for doc, count in zip(unique_docs.tolist(), doc_counts.tolist()):
+            if self._alive[doc]:
+                counts[self._id(doc)] = count
+        for position, doc in zip(positions.tolist(), docs.tolist()):
+            if self._alive[doc]:
+                matched.setdefault(self._id(doc), []).append(position)
+
+        return counts, matched, len(query)
+
+    def candidates(self, ngrams: np.ndarray, phrase_counts: Optional[Dict[str, int]] = None) -> List[int]:
+        """Doc indexes sharing an LSH bucket, plus the top phrase-index hits."""
+        band_keys = self._band_keys(self._minhash(ngrams))
+        found = set(self._postings(self._lsh_keys, self._lsh_docs, band_keys)[1].tolist())
+        for key in band_keys.tolist():
+            found.update(self._buckets.get(key, ()))
+
+        if phrase_counts:
+            top = sorted(phrase_counts.items(), key=lambda item: item[1], reverse=True)
+            for question_id, _ in top[:self.max_phrase_candidates]:
+                doc = self._doc_for(question_id)
+                if doc is not None:
+                    found.add(doc)
+
+        return [doc for doc in found if self._alive[doc]]
+
+    def most_similar(
+        self,
+        words: Sequence[str],
+        phrase_counts: Optional[Dict[str, int]] = None
+    ) -> Tuple[Optional[str], float]:
+        """Best exact 4-gram Jaccard similarity among LSH / phrase candidates."""
+        ngrams = np.unique(shingle_hashes(hash_words(words), self.ngram_size))
+        if len(ngrams) == 0:
+            return None, 0.0
+
+        best_id, best_score = None, 0.0
+        for doc in self.candidates(ngrams, phrase_counts):
+            corpus_ngrams = self._doc_ngrams(doc)
+            if len(corpus_ngrams) == 0:
+                continue
+            intersection = len(np.intersect1d(ngrams, corpus_ngrams, assume_unique=True))
+            union = len(ngrams) + len(corpus_ngrams) - intersection
+            similarity = intersection / union
+            if similarity > best_score:
+                best_id, best_score = self._id(doc), similarity
+
+        return best_id, best_score
+
+    def get_stats(self) -> Dict[str, int]:
+        ngram_bytes = self._base_ngrams.nbytes + sum(a.nbytes for a in self._extra_ngrams)
+        phrase_bytes = (
+            self._phrase_keys.nbytes + self._phrase_docs.nbytes
+            + self._delta_keys.nbytes + self._delta_docs.nbytes
+        )
+        return {
+            "documents": len(self),
+            "base_documents": self._base_count,
+            "appended_documents": len(self._extra_ids),
+            "phrase_postings": len(self._phrase_keys) + len(self._delta_keys),
+            "pending_delta": len(self._delta_keys),
+            "lsh_postings": len(self._lsh_keys) + sum(len(d) for d in self._buckets.values()),
+            "ngram_bytes": ngram_bytes,
+            "phrase_index_bytes": phrase_bytes,
+        }
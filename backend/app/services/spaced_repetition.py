@@ -10,19 +10,34 @@ SM-2 Algorithm:
 - Intervals grow exponentially: 1 → 6 → (interval * ease_factor)
 - Wrong answers reset to 1 day
 
+Review state (interval, ease factor and stability) is stored on each
+ScheduledReview. schedule_reviews() schedules a batch of answers in one
+transaction, and due reviews are read from the per-user review queues
+in app.services.review_queue.
+
 Reference: https://www.supermemo.com/en/archives1990-2015/english/ol/sm2
 """
 
+import math
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.models import ScheduledReview, Question, QuestionAttempt
+from app.services.review_queue import get_review_queue
+from app.utils.fanout import chunked
 
 
 # SM-2 Constants
 DEFAULT_EASE_FACTOR = 2.5
 MIN_EASE_FACTOR = 1.3
 
+# Reviews are due when predicted retention falls to this level
+RETENTION_TARGET = 0.9
+
+# Keep IN lists well under database parameter limits
+_IN_CHUNK = 500
+
 # Interval progression map (legacy support + SM-2 aligned)
 INTERVAL_MAP = {
     "1d": 6,    # First correct → 6 days (SM-2 standard)
@@ -148,6 +163,152 @@ def string_to_interval(interval_str: str) -> int:
     return mapping.get(interval_str, 1)
 
 
+def parse_interval(interval_str: Optional[str]) -> float:
+    """
+    Parse a stored review_interval ("3d", "2.5d", "12h") into days.
+
+    Only needed for rows written before interval_days was stored.
+    """
+    try:
+        if interval_str.endswith("h"):
+            return float(interval_str[:-1]) / 24
+        if interval_str.endswith("d"):
+            return float(interval_str[:-1])
+    except (AttributeError, ValueError):
+        pass
+    return 1.0
+
+
+def stability_for_interval(interval_days: float) -> float:
+    """
+    Memory stability implied by scheduling a review after interval_days.
+
+    Reviews are due when predicted retention R = e^(-t/S) falls to
+    RETENTION_TARGET, so S = t / -ln(RETENTION_TARGET).
+    """
+    return interval_days / -math.log(RETENTION_TARGET)
+
+
+def learning_stage_for(interval_days: float) -> str:
+    """Learning stage shown for a review scheduled interval_days out."""
+    if interval_days >= 30:
+        return "Mastered"
+    elif interval_days >= 7:
+        return "Review"
+    return "Learning"
+
+
+@dataclass
+class ReviewEvent:
+    """One answered question to (re)schedule."""
+
+    user_id: str
+    question_id: str
+    is_correct: bool
+    source: Optional[str] = None
+    specialty: Optional[str] = None
+    time_seconds: float = 0
+    confidence_level: Optional[int] = None
+    reviewed_at: Optional[datetime] = None
+
+
+def review_state(review: ScheduledReview) -> Tuple[float, float]:
+    """Stored (interval days, ease factor), falling back to the interval string for old rows."""
+    interval = review.interval_days
+    if interval is None:
+        interval = parse_interval(review.review_interval)
+    return interval, review.ease_factor or DEFAULT_EASE_FACTOR
+
+
+def load_reviews(db: Session, events: List[ReviewEvent]) -> Dict[Tuple[str, str], ScheduledReview]:
+    """Existing reviews for a batch of events, keyed by (user_id, question_id), in one query."""
+    pairs = {(e.user_id, e.question_id) for e in events}
+    if not pairs:
+        return {}
+
+    reviews = db.query(ScheduledReview).filter(
+        ScheduledReview.user_id.in_({user_id for user_id, _ in pairs}),
+        ScheduledReview.question_id.in_({question_id for _, question_id in pairs})
+    ).all()
+    return {
+        (r.user_id, r.question_id): r
+        for r in reviews
+        if (r.user_id, r.question_id) in pairs
+    }
+
+
+def apply_schedule(
+    review: ScheduledReview,
+    interval_days: float,
+    ease_factor: float,
+    reviewed_at: datetime,
+    interval_str: Optional[str] = None
+):
+    """Store a review's next interval, ease and stability and set its due time."""
+    review.interval_days = interval_days
+    review.ease_factor = ease_factor
+    review.stability = stability_for_interval(interval_days)
+    review.review_interval = interval_str or interval_to_string(interval_days)
+    review.scheduled_for = reviewed_at + timedelta(days=interval_days)
+    review.learning_stage = learning_stage_for(interval_days)
+    review.last_reviewed = reviewed_at
+
+
+def get_or_add_review(
+    db: Session,
+    reviews: Dict[Tuple[str, str], ScheduledReview],
+    event: ReviewEvent
+) -> Tuple[ScheduledReview, bool]:
+    """The event's review from a load_reviews map, adding a new one if missing. Returns (review, is_new)."""
+    key = (event.user_id, event.question_id)
+    review = reviews.get(key)
+    if review is not None:
+        return review, False
+
+    review = ScheduledReview(
+        user_id=event.user_id,
+        question_id=event.question_id,
+        times_reviewed=0,
+        source=event.source
+    )
+    db.add(review)
+    reviews[key] = review
+    return review, True
+
+
+def schedule_reviews(db: Session, events: List[ReviewEvent]) -> List[ScheduledReview]:
+    """
+    Schedule a batch of answers with SM-2 in one transaction.
+
+    Existing reviews are loaded with one query, the stored interval and
+    ease factor are advanced per event (several events for the same
+    question apply in order), and everything is committed once. Loaded
+    review queues are updated after the commit.
+
+    Returns:
+        The ScheduledReview for each event, in order
+    """
+    now = datetime.utcnow()
+    reviews = load_reviews(db, events)
+    scheduled = []
+
+    for event in events:
+        quality = calculate_sm2_quality(event.is_correct, event.time_seconds)
+        review, is_new = get_or_add_review(db, reviews, event)
+        current_interval, ease_factor = (0, DEFAULT_EASE_FACTOR) if is_new else review_state(review)
+
+        review.times_reviewed = (review.times_reviewed or 0) + 1
+        next_days, new_ease = calculate_sm2_interval(
+            current_interval, ease_factor, quality, review.times_reviewed
+        )
+        apply_schedule(review, next_days, new_ease, event.reviewed_at or now)
+        scheduled.append(review)
+
+    db.commit()
+    get_review_queue().record(scheduled)
+    return scheduled
+
+
 def schedule_review(
     db: Session,
     user_id: str,
@@ -170,85 +331,42 @@ def schedule_review(
     Returns:
         ScheduledReview object
     """
-    # Calculate SM-2 quality rating
-    quality = calculate_sm2_quality(is_correct, time_seconds)
-
-    # Check if review already exists
-    existing = db.query(ScheduledReview).filter_by(
+    return schedule_reviews(db, [ReviewEvent(
         user_id=user_id,
-        question_id=question_id
-    ).first()
-
-    if not existing:
-        # First time seeing this question
-        repetition_number = 1
-        current_interval = 0
-        ease_factor = DEFAULT_EASE_FACTOR
-
-        # Calculate next interval using SM-2
-        next_days, _ = calculate_sm2_interval(
-            current_interval, ease_factor, quality, repetition_number
-        )
-
-        # Determine learning stage
-        if next_days >= 30:
-            stage = "Mastered"
-        elif next_days >= 7:
-            stage = "Review"
-        else:
-            stage = "Learning"
-
-        scheduled_for = datetime.utcnow() + timedelta(days=next_days)
-        interval = interval_to_string(next_days)
-
-        review = ScheduledReview(
-            user_id=user_id,
-            question_id=question_id,
-            scheduled_for=scheduled_for,
-            review_interval=interval,
-            times_reviewed=1,
-            learning_stage=stage,
-            source=source,
-            last_reviewed=datetime.utcnow()
-        )
-
-        db.add(review)
-        db.commit()
-        return review
-
-    else:
-        # Subsequent reviews - use SM-2 algorithm
-        existing.times_reviewed += 1
-        existing.last_reviewed = datetime.utcnow()
-
-        # Get current interval in days
-        current_interval = string_to_interval(existing.review_interval)
-
-        # Calculate next interval using SM-2
-        # We simulate ease factor since we don't store it (default 2.5)
-        # In a full implementation, ease_factor would be stored per review
-        ease_factor = DEFAULT_EASE_FACTOR
-        next_days, _ = calculate_sm2_interval(
-            current_interval,
-            ease_factor,
-            quality,
-            existing.times_reviewed
-        )
+        question_id=question_id,
+        is_correct=is_correct,
+        source=source,
+        time_seconds=time_seconds
+    )])[0]
 
-        # Determine learning stage
-        if next_days >= 30:
-            stage = "Mastered"
-        elif next_days >= 7:
-            stage = "Review"
-        else:
-            stage = "Learning"
 
-        existing.review_interval = interval_to_string(next_days)
-        existing.scheduled_for = datetime.utcnow() + timedelta(days=next_days)
-        existing.learning_stage = stage
+def get_due_reviews(
+    db: Session,
+    user_id: str,
+    before: Optional[datetime] = None,
+    limit: Optional[int] = None
+) -> List[ScheduledReview]:
+    """
+    Reviews due at or before `before` (default now), earliest first.
 
-        db.commit()
-        return existing
+    Due question ids come from the user's review queue, so a user with
+    nothing due costs no query; the rows themselves are fetched by
+    (user_id, question_id) and re-checked against scheduled_for.
+    """
+    before = before or datetime.utcnow()
+    question_ids = get_review_queue().due(db, user_id, before=before, limit=limit)
+    if not question_ids:
+        return []
+
+    reviews = []
+    for chunk in chunked(question_ids, _IN_CHUNK):
+        reviews.extend(db.query(ScheduledReview).filter(
+            ScheduledReview.user_id == user_id,
+            ScheduledReview.question_id.in_(chunk),
+            ScheduledReview.scheduled_for <= before
+        ))
+    reviews.sort(key=lambda r: r.scheduled_for)
+    return reviews
 
 
 def get_todays_reviews(db: Session, user_id: str) -> List[ScheduledReview]:
@@ -263,16 +381,10 @@ def get_todays_reviews(db: Session, user_id: str) -> List[ScheduledReview]:
         List of ScheduledReview objects
     """
     today = datetime.utcnow().date()
-    tomorrow = today + timedelta(days=1)
+    tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time())
 
-    reviews = db.query(ScheduledReview).filter(
-        ScheduledReview.user_id == user_id,
-        ScheduledReview.scheduled_for < tomorrow
-    ).order_by(
-        ScheduledReview.scheduled_for.asc()
-    ).all()
-
-    return reviews
+    # Due before midnight, i.e. strictly earlier than tomorrow
+    return get_due_reviews(db, user_id, before=tomorrow - timedelta(microseconds=1))
 
 
 def get_upcoming_reviews(db: Session, user_id: str, days: int = 7) -> dict:
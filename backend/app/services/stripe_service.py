@@ -18,6 +18,7 @@ from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.models import Subscription, User
+from app.services.usage_counters import get_usage_counters
 
 # Initialize Stripe
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
@@ -211,6 +212,7 @@ def sync_subscription_from_stripe(
 
     db.commit()
     db.refresh(subscription)
+    get_usage_counters().invalidate_tier(user_id)
 
     return subscription
 
@@ -316,6 +318,7 @@ def handle_subscription_deleted(
         subscription.cancelled_at = datetime.utcnow()
         db.commit()
         db.refresh(subscription)
+        get_usage_counters().invalidate_tier(user_id)
 
     return subscription
 
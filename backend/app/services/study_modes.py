@@ -13,13 +13,19 @@ Provides different study experiences:
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc
+from sqlalchemy import and_, desc
 
 from app.models.models import (
-    StudySession, Question, QuestionAttempt, User,
-    ScheduledReview, generate_uuid
+    StudySession, Question, QuestionAttempt, User, generate_uuid
 )
 from app.services.adaptive import select_next_question, get_weak_areas
+from app.services.learning_snapshot import record_attempt_in_snapshot
+from app.services.peer_distribution import get_peer_distribution_store
+from app.services.daily_activity import record_daily_activity
+from app.services.review_queue import get_review_queue
+from app.services.question_index import get_question_index
+from app.services.massive_pool import normalize_specialty
+from app.services.badge_service import get_badge_service
 
 
 # ============================================================================
@@ -29,6 +35,16 @@ from app.services.adaptive import select_next_question, get_weak_areas
 VALID_MODES = ["practice", "timed", "tutor", "challenge", "review", "weak_focus"]
 VALID_DIFFICULTIES = ["easy", "medium", "hard", "adaptive"]
 
+# Difficulty groups each session difficulty draws from (None = any)
+SESSION_DIFFICULTY_GROUPS = {
+    "hard": ["hard", "medium"],
+    "easy": ["easy"],
+}
+
+# Recently answered questions are kept out of new pools for this long
+RECENT_ATTEMPT_WINDOW = timedelta(days=7)
+WEAK_AREA_RECENT_WINDOW = timedelta(days=3)
+
 # Default configurations per mode
 MODE_DEFAULTS = {
     "practice": {
@@ -255,6 +271,10 @@ def submit_answer(
         attempted_at=datetime.utcnow()
     )
     db.add(attempt)
+    record_daily_activity(
+        db, session.user_id, question.specialty, is_correct,
+        time_spent_seconds, confidence_level, attempt.attempted_at
+    )
 
     # Update session progress
     session.questions_answered += 1
@@ -265,6 +285,10 @@ def submit_answer(
     session.updated_at = datetime.utcnow()
 
     db.commit()
+    record_attempt_in_snapshot(session.user_id, question.source, question.specialty, is_correct)
+    get_question_index().record_answer(session.user_id, question_id, attempt.attempted_at)
+    get_peer_distribution_store().record_answer(session.user_id, is_correct, question.source)
+    get_badge_service().record_answer(db, session.user_id, is_correct, attempt.attempted_at)
 
     # Build feedback based on mode
     mode_config = MODE_DEFAULTS.get(session.mode, {})
@@ -372,6 +396,11 @@ def end_session(
     session.updated_at = datetime.utcnow()
     db.commit()
 
+    if session.status == "completed":
+        get_badge_service().check_and_award_badges(
+            db, session.user_id, trigger_context={"session_completed": True}
+        )
+
     # Build session summary
     return get_session_summary(db, session_id)
 
@@ -437,30 +466,19 @@ def _build_question_pool(
     specialty: Optional[str] = None,
     difficulty: Optional[str] = None
 ) -> List[str]:
-    """Build a pool of question IDs for a session."""
-    query = db.query(Question.id)
-
-    if specialty:
-        query = query.filter(Question.source.ilike(f"%{specialty}%"))
-
-    if difficulty == "hard":
-        # Use questions with lower user accuracy or higher difficulty
-        query = query.filter(Question.difficulty_level.in_(["hard", "medium"]))
-    elif difficulty == "easy":
-        query = query.filter(Question.difficulty_level == "easy")
-
-    # Exclude recently answered questions
-    recent_attempts = db.query(QuestionAttempt.question_id).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.attempted_at >= datetime.utcnow() - timedelta(days=7)
-    ).subquery()
-
-    query = query.filter(~Question.id.in_(recent_attempts))
-
-    # Randomize and limit
-    questions = query.order_by(func.random()).limit(count).all()
+    """
+    Build a pool of question IDs for a session.
 
-    return [q.id for q in questions]
+    Sampled from the cached question index by normalized specialty and
+    difficulty level, excluding questions answered in the last 7 days.
+    """
+    return get_question_index().sample(
+        db, count,
+        user_id=user_id,
+        difficulties=SESSION_DIFFICULTY_GROUPS.get(difficulty),
+        specialties=[normalize_specialty(specialty)] if specialty else None,
+        exclude_since=datetime.utcnow() - RECENT_ATTEMPT_WINDOW
+    )
 
 
 def _build_weak_area_pool(
@@ -469,41 +487,30 @@ def _build_weak_area_pool(
     count: int
 ) -> List[str]:
     """Build a pool targeting user's weak areas."""
-    # Get weak areas
-    weak_areas = get_weak_areas(db, user_id)
-
-    if not weak_areas:
+    # Weak areas are sources; sample from the specialties they cover
+    weak_sources = get_weak_areas(db, user_id)[:3]
+    weak_specialties = [
+        specialty for (specialty,) in db.query(Question.specialty).filter(
+            Question.source.in_(weak_sources),
+            Question.specialty.isnot(None)
+        ).distinct()
+    ] if weak_sources else []
+
+    if not weak_specialties:
         # Fall back to random questions
         return _build_question_pool(db, user_id, count)
 
-    # Get questions from weak areas
-    weak_specs = [area["specialty"] for area in weak_areas[:3]]
-
-    query = db.query(Question.id).filter(
-        Question.source.in_(weak_specs)
+    return get_question_index().sample(
+        db, count,
+        user_id=user_id,
+        specialties=weak_specialties,
+        exclude_since=datetime.utcnow() - WEAK_AREA_RECENT_WINDOW
     )
 
-    # Exclude recently answered
-    recent_attempts = db.query(QuestionAttempt.question_id).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.attempted_at >= datetime.utcnow() - timedelta(days=3)
-    ).subquery()
-
-    query = query.filter(~Question.id.in_(recent_attempts))
-
-    questions = query.order_by(func.random()).limit(count).all()
-
-    return [q.id for q in questions]
-
 
 def _get_due_reviews(db: Session, user_id: str, limit: int = 50) -> List[str]:
-    """Get questions due for spaced repetition review."""
-    reviews = db.query(ScheduledReview.question_id).filter(
-        ScheduledReview.user_id == user_id,
-        ScheduledReview.scheduled_for <= datetime.utcnow()
-    ).limit(limit).all()
-
-    return [r.question_id for r in reviews]
+    """Get questions due for spaced repetition review (earliest due first)."""
+    return get_review_queue().due_confirmed(db, user_id, limit=limit)
 
 
 def _select_question_for_mode(
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.models.models import Subscription, DailyUsage, User
+from app.services.usage_counters import get_usage_counters
 
 
 # =============================================================================
@@ -180,6 +181,7 @@ def upgrade_subscription(
 
     db.commit()
     db.refresh(subscription)
+    get_usage_counters().invalidate_tier(user_id)
 
     return subscription
 
@@ -197,6 +199,7 @@ def cancel_subscription(
 
     db.commit()
     db.refresh(subscription)
+    get_usage_counters().invalidate_tier(user_id)
 
     return subscription
 
@@ -216,6 +219,7 @@ def start_trial(db: Session, user_id: str, trial_days: int = 7) -> Subscription:
 
     db.commit()
     db.refresh(subscription)
+    get_usage_counters().invalidate_tier(user_id)
 
     return subscription
 
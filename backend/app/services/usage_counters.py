@@ -0,0 +1,639 @@
+"""
+Usage Counters for Rate Limiting
+
+Keeps rate-limit bookkeeping off the database. Daily usage counts and
+per-minute burst windows live in a pluggable CounterBackend:
+
+- RedisCounterBackend: check-and-increment runs as one Lua script (GET,
+  compare with the limit, INCRBY, EXPIRE), so every worker process shares
+  the same counters and concurrent requests cannot overshoot a limit
+- InMemoryCounterBackend: the same operations on a dict; used when
+  REDIS_URL is not set (single-process development) and in tests. It is
+  per process: with N workers each enforces its own limit, so a user can
+  use up to N times the quota. Set REDIS_URL for multi-worker deployments.
+
+Counters are seeded from today's DailyUsage row the first time a process
+sees a user each day, so a restart (or an evicted Redis key) does not reset
+the day's quota.
+
+UsageCounters adds the in-process fast paths around the backend:
+- Tier cache: subscription tiers are cached per process, so the allow
+  path does no SQL (one Subscription query per user per TTL)
+- Denial cache: once a user hits a daily limit the denial is remembered
+  locally for a short time, so repeated requests skip the backend
+- Unlimited usage is counted locally and pushed to the backend in batches
+- Write-behind: a background thread periodically copies the totals of
+  users whose counters changed into DailyUsage. It keeps the larger of the
+  stored and counted value, so a backend restart never lowers recorded usage.
+
+TokenBucket is the local per-user bucket used by OpenAIBurstLimiter before
+it consults the shared per-minute window.
+
+Configuration (env):
+    RATE_LIMIT_FLUSH_SECONDS        write-behind interval (default 60)
+    RATE_LIMIT_TIER_TTL_SECONDS     tier cache lifetime (default 60)
+    RATE_LIMIT_DENIAL_TTL_SECONDS   local denial cache lifetime (default 30)
+
+Usage:
+    from app.services.usage_counters import get_usage_counters
+
+    counters = get_usage_counters()
+    allowed, current = counters.consume(user_id, "ai_chat_messages", limit=50)
+"""
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.models import DailyUsage
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SECONDS = int(os.getenv("RATE_LIMIT_FLUSH_SECONDS", "60"))
+TIER_TTL_SECONDS = int(os.getenv("RATE_LIMIT_TIER_TTL_SECONDS", "60"))
+DENIAL_TTL_SECONDS = int(os.getenv("RATE_LIMIT_DENIAL_TTL_SECONDS", "30"))
+
+# DailyUsage columns tracked by the counters
+USAGE_TYPES = (
+    "questions_answered",
+    "ai_chat_messages",
+    "ai_questions_generated",
+    "assessments_created",
+    "study_plans_created",
+    "curriculum_uploads",
+)
+
+# Daily keys outlive the day so the last write-behind flush can still read them
+DAILY_KEY_TTL = 2 * 24 * 3600
+BURST_WINDOW_SECONDS = 60
+
+
+def _usage_key(day: str, user_id: str, usage_type: str) -> str:
+    return f"ratelimit:usage:{day}:{user_id}:{usage_type}"
+
+
+def _burst_key(user_id: str, window: int) -> str:
+    return f"ratelimit:burst:{user_id}:{window}"
+
+
+def next_reset_at() -> datetime:
+    """Midnight after today, when daily limits reset."""
+    return datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class CounterBackend(ABC):
+    """Atomic integer counters with expiry."""
+
+    name = "base"
+
+    @abstractmethod
+    def consume(self, key: str, amount: int, limit: Optional[int], ttl: int) -> Tuple[bool, int]:
+        """
+        Add `amount` unless that would take the counter past `limit`.
+
+        Returns:
+            (allowed, counter value after the call)
+        """
+
+    def add(self, key: str, amount: int, ttl: int) -> int:
+        """Unconditionally add `amount` (negative to refund); returns the new value."""
+        return self.consume(key, amount, None, ttl)[1]
+
+    @abstractmethod
+    def seed(self, key: str, value: int, ttl: int):
+        """Raise the counter to `value` if it is missing or lower."""
+
+    @abstractmethod
+    def get_many(self, keys: Sequence[str]) -> List[int]:
+        """Current values (0 for missing keys)."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove a counter."""
+
+
+class InMemoryCounterBackend(CounterBackend):
+    """Process-local counters (development and tests)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[int, float]] = {}  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def _current(self, key: str, now: float) -> int:
+        entry = self._values.get(key)
+        if entry is None:
+            return 0
+        if entry[1] <= now:
+            del self._values[key]
+            return 0
+        return entry[0]
+
+    def consume(self, key: str, amount: int, limit: Optional[int], ttl: int) -> Tuple[bool, int]:
+        now = time.monotonic()
+        with self._lock:
+            current = self._current(key, now)
+            if limit is not None and current + amount > limit:
+                return False, current
+            expires_at = self._values[key][1] if key in self._values else now + ttl
+            self._values[key] = (current + amount, expires_at)
+            return True, current + amount
+
+    def seed(self, key: str, value: int, ttl: int):
+        now = time.monotonic()
+        with self._lock:
+            current = self._current(key, now)
+            if current < value:
+                expires_at = self._values[key][1] if key in self._values else now + ttl
+                self._values[key] = (value, expires_at)
+
+    def get_many(self, keys: Sequence[str]) -> List[int]:
+        now = time.monotonic()
+        with self._lock:
+            return [self._current(key, now) for key in keys]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+
+_CONSUME_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local amount = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+if limit >= 0 and current + amount > limit then
+    return {0, current}
+end
+current = redis.call('INCRBY', KEYS[1], amount)
+if redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return {1, current}
+"""
+
+_SEED_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '-1')
+if current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+end
+"""
+
+
+class RedisCounterBackend(CounterBackend):
+    """Counters shared by all workers via Redis (one round trip per operation)."""
+
+    name = "redis"
+
+    def __init__(self, client):
+        self._client = client
+        self._consume = client.register_script(_CONSUME_SCRIPT)
+        self._seed = client.register_script(_SEED_SCRIPT)
+
+    def consume(self, key: str, amount: int, limit: Optional[int], ttl: int) -> Tuple[bool, int]:
+        allowed, current = self._consume(keys=[key], args=[amount, -1 if limit is None else limit, ttl])
+        return bool(int(allowed)), int(current)
+
+    def seed(self, key: str, value: int, ttl: int):
+        self._seed(keys=[key], args=[value, ttl])
+
+    def get_many(self, keys: Sequence[str]) -> List[int]:
+        if not keys:
+            return []
+        return [int(value) if value is not None else 0 for value in self._client.mget(list(keys))]
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+
+def create_counter_backend(redis_url: Optional[str] = None) -> CounterBackend:
+    """Redis backend when REDIS_URL is reachable, otherwise in-memory."""
+    redis_url = redis_url or os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+            client = redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+            client.ping()
+            logger.info("Rate limit counters using Redis")
+            return RedisCounterBackend(client)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for rate limit counters, using in-memory: {e}")
+    if os.getenv("ENVIRONMENT", "").lower() == "production":
+        logger.warning(
+            "Rate limit counters are in-memory and per process; with several "
+            "workers each enforces its own daily limit. Set REDIS_URL to share them."
+        )
+    return InMemoryCounterBackend()
+
+
+# ============================================================================
+# LOCAL TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """Refills `capacity` tokens evenly over `period` seconds."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: int, period: float = BURST_WINDOW_SECONDS):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def available(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def take(self, amount: int = 1) -> bool:
+        if self.available() < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def wait_time(self, amount: int = 1) -> int:
+        """Whole seconds until `amount` tokens are available."""
+        missing = amount - self.available()
+        if missing <= 0 or self.rate <= 0:
+            return 0
+        return int(missing / self.rate) + 1
+
+
+# ============================================================================
+# USAGE COUNTERS
+# ============================================================================
+
+class UsageCounters:
+    """
+    Daily usage counting with in-process fast paths and write-behind to DailyUsage.
+
+    The flush thread starts lazily on the first recorded usage.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CounterBackend] = None,
+        flush_interval: int = FLUSH_SECONDS,
+        tier_ttl: int = TIER_TTL_SECONDS,
+        denial_ttl: int = DENIAL_TTL_SECONDS,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.backend = backend or create_counter_backend()
+        self._fallback = InMemoryCounterBackend()
+        self.flush_interval = flush_interval
+        self.denial_ttl = denial_ttl
+        self._session_factory = session_factory or SessionLocal
+
+        self._tiers = TTLCache(maxsize=10000, default_ttl=tier_ttl)
+        self._denied: Dict[str, float] = {}  # usage key -> monotonic expiry
+        self._pending: Dict[str, int] = defaultdict(int)  # unlimited usage not yet in the backend
+        self._dirty: Set[Tuple[str, str]] = set()  # (day, user_id) awaiting write-behind
+        self._seeded: Set[Tuple[str, str]] = set()  # (day, user_id) loaded from DailyUsage
+        self._lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {
+            "allowed": 0,
+            "denied": 0,
+            "denied_local": 0,
+            "tier_lookups": 0,
+            "backend_errors": 0,
+            "flushes": 0,
+            "rows_flushed": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def get_tier(self, user_id: str, db: Optional[Session] = None) -> str:
+        """Subscription tier, from the process cache when possible."""
+        tier = self._tiers.get(user_id)
+        if tier is not None:
+            return tier
+
+        from app.middleware.rate_limiter import get_user_tier
+
+        self._count("tier_lookups")
+        if db is not None:
+            tier = get_user_tier(db, user_id)
+        else:
+            session = self._session_factory()
+            try:
+                tier = get_user_tier(session, user_id)
+            finally:
+                session.close()
+
+        self._tiers.set(user_id, tier)
+        return tier
+
+    def invalidate_tier(self, user_id: str):
+        """Forget a cached tier (call after subscription changes)."""
+        self._tiers.delete(user_id)
+        with self._lock:
+            prefix = _usage_key(date.today().isoformat(), user_id, "")
+            for key in [k for k in self._denied if k.startswith(prefix)]:
+                del self._denied[key]
+
+    # ------------------------------------------------------------------
+    # Daily usage
+    # ------------------------------------------------------------------
+
+    def _call(self, operation: Callable[[CounterBackend], object]):
+        try:
+            return operation(self.backend)
+        except Exception as e:
+            self._count("backend_errors")
+            logger.warning(f"Rate limit counter backend error, using local counters: {e}")
+            return operation(self._fallback)
+
+    def seed_today(self, user_id: str, db: Optional[Session] = None):
+        """
+        Load today's DailyUsage totals into the counters (once per user per
+        day per process). The backend keeps the larger value, so seeding
+        never lowers usage counted by another worker.
+        """
+        day = date.today().isoformat()
+        if (day, user_id) in self._seeded:
+            return
+
+        day_start = datetime.combine(date.fromisoformat(day), datetime.min.time())
+        own_session = db is None
+        db = db or self._session_factory()
+        try:
+            row = db.query(DailyUsage).filter(
+                DailyUsage.user_id == user_id,
+                DailyUsage.date >= day_start,
+                DailyUsage.date < day_start + timedelta(days=1)
+            ).first()
+        except Exception as e:
+            logger.warning(f"Could not seed usage counters for {user_id}: {e}")
+            return
+        finally:
+            if own_session:
+                db.close()
+
+        if row is not None:
+            for usage_type in USAGE_TYPES:
+                stored = getattr(row, usage_type) or 0
+                if stored:
+                    key = _usage_key(day, user_id, usage_type)
+                    self._call(lambda b: b.seed(key, stored, DAILY_KEY_TTL))
+
+        with self._lock:
+            if any(seeded_day != day for seeded_day, _ in self._seeded):
+                self._seeded = {entry for entry in self._seeded if entry[0] == day}
+            self._seeded.add((day, user_id))
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _mark_dirty(self, day: str, user_id: str):
+        with self._lock:
+            self._dirty.add((day, user_id))
+        self._ensure_started()
+
+    def consume(
+        self,
+        user_id: str,
+        usage_type: str,
+        limit: Optional[int],
+        amount: int = 1
+    ) -> Tuple[bool, Optional[int]]:
+        """
+        Record usage if it stays within `limit` (None = unlimited).
+
+        Returns:
+            (allowed, current count) - current is None for unlimited usage,
+            which is counted locally without reading the backend
+        """
+        day = date.today().isoformat()
+        key = _usage_key(day, user_id, usage_type)
+
+        if limit is not None:
+            self.seed_today(user_id)
+
+        if limit is None:
+            with self._lock:
+                self._pending[key] += amount
+                self._stats["allowed"] += 1
+            self._mark_dirty(day, user_id)
+            return True, None
+
+        with self._lock:
+            denied_until = self._denied.get(key)
+            if denied_until is not None:
+                if denied_until > time.monotonic():
+                    self._stats["denied_local"] += 1
+                    return False, limit
+                del self._denied[key]
+
+        allowed, current = self._call(lambda b: b.consume(key, amount, limit, DAILY_KEY_TTL))
+        if not allowed:
+            with self._lock:
+                self._denied[key] = time.monotonic() + self.denial_ttl
+                self._stats["denied"] += 1
+            return False, current
+
+        self._count("allowed")
+        self._mark_dirty(day, user_id)
+        return True, current
+
+    def add(self, user_id: str, usage_type: str, amount: int = 1):
+        """Record usage without a limit check (negative amounts refund)."""
+        day = date.today().isoformat()
+        key = _usage_key(day, user_id, usage_type)
+        self._call(lambda b: b.add(key, amount, DAILY_KEY_TTL))
+        if amount < 0:
+            with self._lock:
+                self._denied.pop(key, None)
+        self._mark_dirty(day, user_id)
+
+    def refund(self, user_id: str, usage_type: str, limited: bool = True, amount: int = 1):
+        """Give back usage consumed for a request that failed."""
+        if limited:
+            self.add(user_id, usage_type, -amount)
+            return
+        key = _usage_key(date.today().isoformat(), user_id, usage_type)
+        with self._lock:
+            self._pending[key] -= amount
+
+    def get_usage(self, user_id: str, usage_types: Sequence[str] = USAGE_TYPES) -> Dict[str, int]:
+        """Today's counts for a user (one backend read for all types)."""
+        self.seed_today(user_id)
+        day = date.today().isoformat()
+        keys = [_usage_key(day, user_id, usage_type) for usage_type in usage_types]
+        values = self._call(lambda b: b.get_many(keys))
+        with self._lock:
+            return {
+                usage_type: max(0, value + self._pending.get(key, 0))
+                for usage_type, key, value in zip(usage_types, keys, values)
+            }
+
+    # ------------------------------------------------------------------
+    # Burst windows
+    # ------------------------------------------------------------------
+
+    def get_burst_count(self, user_id: str) -> int:
+        window = int(time.time() // BURST_WINDOW_SECONDS)
+        return self._call(lambda b: b.get_many([_burst_key(user_id, window)]))[0]
+
+    def add_burst(self, user_id: str) -> int:
+        window = int(time.time() // BURST_WINDOW_SECONDS)
+        return self._call(lambda b: b.add(_burst_key(user_id, window), 1, 2 * BURST_WINDOW_SECONDS))
+
+    def clear_burst(self, user_id: str):
+        window = int(time.time() // BURST_WINDOW_SECONDS)
+        self._call(lambda b: b.delete(_burst_key(user_id, window)))
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    def _push_pending(self):
+        with self._lock:
+            pending = {key: amount for key, amount in self._pending.items() if amount}
+            self._pending.clear()
+        for key, amount in pending.items():
+            self._call(lambda b: b.add(key, amount, DAILY_KEY_TTL))
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """
+        Copy counter totals of changed users into DailyUsage.
+
+        Returns:
+            Number of DailyUsage rows written
+        """
+        self._push_pending()
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+        if not dirty:
+            return 0
+
+        by_day: Dict[str, List[str]] = defaultdict(list)
+        for day, user_id in dirty:
+            by_day[day].append(user_id)
+
+        own_session = db is None
+        db = db or self._session_factory()
+        written = 0
+        try:
+            for day, user_ids in by_day.items():
+                written += self._flush_day(db, day, user_ids)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Rate limit write-behind flush failed: {e}")
+            with self._lock:
+                self._dirty.update(dirty)
+            return 0
+        finally:
+            if own_session:
+                db.close()
+
+        with self._lock:
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += written
+        return written
+
+    def _flush_day(self, db: Session, day: str, user_ids: List[str]) -> int:
+        day_start = datetime.combine(date.fromisoformat(day), datetime.min.time())
+        keys = [_usage_key(day, user_id, usage_type) for user_id in user_ids for usage_type in USAGE_TYPES]
+        values = self._call(lambda b: b.get_many(keys))
+
+        rows = {
+            row.user_id: row
+            for row in db.query(DailyUsage).filter(
+                DailyUsage.user_id.in_(user_ids),
+                DailyUsage.date >= day_start,
+                DailyUsage.date < day_start + timedelta(days=1)
+            )
+        }
+
+        for i, user_id in enumerate(user_ids):
+            totals = values[i * len(USAGE_TYPES):(i + 1) * len(USAGE_TYPES)]
+            row = rows.get(user_id)
+            if row is None:
+                # Same deterministic id as get_or_create_daily_usage
+                row = DailyUsage(
+                    id=hashlib.sha256(f"{user_id}:{day_start.isoformat()}".encode()).hexdigest()[:32],
+                    user_id=user_id,
+                    date=day_start,
+                )
+                db.add(row)
+            for usage_type, total in zip(USAGE_TYPES, totals):
+                setattr(row, usage_type, max(getattr(row, usage_type) or 0, total))
+            row.updated_at = datetime.utcnow()
+
+        return len(user_ids)
+
+    def _ensure_started(self):
+        if self._thread is not None or self.flush_interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._flush_loop, name="usage-flush", daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop the flush thread and write remaining totals."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            stats = dict(self._stats)
+            dirty = len(self._dirty)
+            pending = len(self._pending)
+        return {
+            **stats,
+            "backend": self.backend.name,
+            "dirty_users": dirty,
+            "pending_unlimited_keys": pending,
+            "flush_running": self._thread is not None,
+        }
+
+
+# Singleton
+_usage_counters: Optional[UsageCounters] = None
+
+
+def get_usage_counters() -> UsageCounters:
+    """Get or create the singleton usage counters."""
+    global _usage_counters
+    if _usage_counters is None:
+        _usage_counters = UsageCounters()
+    return _usage_counters
@@ -0,0 +1,116 @@
+"""
+Compiled Validation Rule Engine
+
+Shared matcher for the deterministic question validators
+(question_validators, medical_fact_checker, elite_quality_validator).
+
+Each validator declares its regex rules once as a RuleSet. Every rule is
+compiled when the RuleSet is built, and all rule trigger literals are folded
+into one combined pattern:
+
+- Trigger pass: a single scan of the lowercased text with the combined
+  trigger pattern finds which rules can possibly match (a rule's pattern
+  cannot match unless one of its lowercase trigger literals occurs in the
+  text)
+- Rule pass: only those candidate rules run their precompiled pattern, and
+  matches are handed back in rule declaration order so validators keep their
+  original finding order
+
+Rules without triggers (e.g. pure numeric patterns) always run. Results are
+identical to running every pattern independently; the engine only skips
+patterns that provably cannot match.
+
+Usage:
+    from app.services.validation_rules import Rule, RuleSet
+
+    rules = RuleSet([
+        Rule("hypotensive", r"hypotensive(?!\\s*\\(BP)", triggers=("hypotensive",)),
+        Rule("jnc7", r"JNC\\s*7", triggers=("jnc",)),
+    ])
+    for rule, match in rules.finditer(text):
+        handlers[rule.name](match)
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Sequence, Set, Tuple
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single validator pattern."""
+    name: str                           # Rule id (handler dispatch key)
+    pattern: str                        # Regex source
+    triggers: Tuple[str, ...] = ()      # Literals, one of which every match contains
+    flags: int = re.IGNORECASE
+    data: Any = None                    # Validator payload (messages, severities...)
+    compiled: Optional[Pattern] = field(default=None, compare=False, repr=False)
+
+
+class RuleSet:
+    """A fixed set of rules compiled once, matched with a single trigger pass."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules: List[Rule] = [
+            Rule(r.name, r.pattern, tuple(t.lower() for t in r.triggers), r.flags, r.data,
+                 re.compile(r.pattern, r.flags))
+            for r in rules
+        ]
+
+        self._always: Set[int] = {i for i, r in enumerate(self.rules) if not r.triggers}
+
+        # trigger -> rule indexes, including rules keyed on any trigger that is a
+        # prefix of it (the combined pattern reports the longest trigger at a position)
+        by_trigger: Dict[str, Set[int]] = {}
+        for i, rule in enumerate(self.rules):
+            for trigger in rule.triggers:
+                by_trigger.setdefault(trigger, set()).add(i)
+        self._by_trigger: Dict[str, Set[int]] = {
+            trigger: set().union(*(
+                indexes for other, indexes in by_trigger.items() if trigger.startswith(other)
+            ))
+            for trigger in by_trigger
+        }
+
+        self._triggers: Optional[Pattern] = None
+        if by_trigger:
+            alternatives = "|".join(
+                re.escape(t) for t in sorted(by_trigger, key=len, reverse=True)
+            )
+            # Zero-width lookahead so overlapping triggers are all seen; matched
+            # against the lowercased text (much cheaper than re.IGNORECASE)
+            self._triggers = re.compile(f"(?=({alternatives}))")
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def candidates(self, text: str) -> List[Rule]:
+        """Rules whose pattern may match text, in declaration order (one trigger pass)."""
+        hits = set(self._always)
+        if self._triggers is not None and text:
+            for trigger in {m.group(1) for m in self._triggers.finditer(text.lower())}:
+                hits |= self._by_trigger[trigger]
+        return [self.rules[i] for i in sorted(hits)]
+
+    def finditer(self, text: str) -> Iterator[Tuple[Rule, "re.Match"]]:
+        """Every match of every rule, grouped by rule in declaration order."""
+        for rule in self.candidates(text):
+            for match in rule.compiled.finditer(text):
+                yield rule, match
+
+    def search(self, text: str) -> Iterator[Tuple[Rule, "re.Match"]]:
+        """First match of each rule that matches, in declaration order."""
+        for rule in self.candidates(text):
+            match = rule.compiled.search(text)
+            if match:
+                yield rule, match
+
+    def first(self, text: str) -> Optional[Rule]:
+        """The first rule (declaration order) that matches text, if any."""
+        for rule, _ in self.search(text):
+            return rule
+        return None
+
+    def count(self, text: str) -> int:
+        """Total non-overlapping matches across all rules (like summing re.findall)."""
+        return sum(len(rule.compiled.findall(text)) for rule in self.candidates(text))
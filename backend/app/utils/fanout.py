@@ -0,0 +1,108 @@
+"""
+Bounded Async Fan-Out
+
+Helpers for sending many notifications without one request at a time and
+without opening an unbounded number of provider connections:
+
+- chunked:        split a list into fixed-size batches (provider batch APIs)
+- gather_bounded: run a coroutine per item with at most N in flight,
+                  returning results in input order
+- gather_until:   like gather_bounded, but every result is handed to an
+                  observer as it completes; the observer can stop the
+                  fan-out, cancelling in-flight work and skipping the rest
+
+A worker that raises yields None for its item (the error is logged), so
+one failed recipient never cancels the rest of the fan-out.
+
+Usage:
+    from app.utils.fanout import chunked, gather_bounded, gather_until
+
+    results = await gather_bounded(chunked(messages, 100), send_batch, concurrency=2)
+    results = await gather_until(questions, validate, 16, on_result=check_gates)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    """Split items into consecutive batches of at most `size`."""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def gather_bounded(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[Any]],
+    concurrency: int
+) -> List[Any]:
+    """
+    Await worker(item) for every item with at most `concurrency` running at once.
+
+    Returns:
+        Worker results in the same order as items (None where the worker raised)
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item: T) -> Any:
+        async with semaphore:
+            try:
+                return await worker(item)
+            except Exception as e:
+                logger.error(f"Fan-out worker failed: {e}")
+                return None
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+async def gather_until(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[Any]],
+    concurrency: int,
+    on_result: Optional[Callable[[int, Any], bool]] = None
+) -> List[Any]:
+    """
+    Await worker(item) with at most `concurrency` running, stopping early on request.
+
+    on_result(index, result) is called in completion order for every
+    successful result; returning True stops the fan-out: in-flight workers
+    are cancelled and items not yet started are skipped.
+
+    Returns:
+        Worker results in the same order as items (None where the worker
+        raised, was cancelled or never started)
+    """
+    results: List[Any] = [None] * len(items)
+    pending = iter(range(len(items)))
+    stopped = asyncio.Event()
+    runners: List[asyncio.Task] = []
+
+    async def run():
+        for index in pending:
+            if stopped.is_set():
+                return
+            try:
+                result = await worker(items[index])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Fan-out worker failed: {e}")
+                continue
+
+            results[index] = result
+            if on_result is not None and on_result(index, result) and not stopped.is_set():
+                stopped.set()
+                current = asyncio.current_task()
+                for runner in runners:
+                    if runner is not current:
+                        runner.cancel()
+                return
+
+    runners.extend(asyncio.create_task(run()) for _ in range(max(1, min(concurrency, len(items)))))
+    await asyncio.gather(*runners, return_exceptions=True)
+    return results
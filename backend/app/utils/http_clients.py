@@ -0,0 +1,133 @@
+"""
+Shared async HTTP client pools.
+
+One long-lived httpx.AsyncClient per upstream (Ollama, OpenAI), so async
+routes and asyncio pipelines reuse keep-alive connections instead of
+paying TCP/TLS setup on every call. Clients are created lazily on first
+use and closed from the FastAPI lifespan shutdown.
+
+Pool limits are configurable:
+- HTTP_MAX_CONNECTIONS: max open connections per client (default 100)
+- HTTP_MAX_KEEPALIVE_CONNECTIONS: idle connections kept alive (default 20)
+- HTTP_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 30)
+- HTTP2_ENABLED: negotiate HTTP/2 when the h2 package is installed (default true)
+
+An httpx client is bound to the event loop it was first used on, so the
+registry hands out one client per (name, loop); a new loop (tests,
+asyncio.run in scripts) gets a fresh client.
+
+Usage:
+    from app.utils.http_clients import get_async_http_client
+
+    client = get_async_http_client("ollama", base_url="http://localhost:11434")
+    response = await client.get("/api/tags", timeout=5.0)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+# Timeout configuration: 60s total request, 10s connect
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_clients: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by every client."""
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def get_async_http_client(
+    name: str,
+    base_url: Optional[str] = None,
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """
+    Get the shared AsyncClient for an upstream on the running event loop.
+
+    Args:
+        name: Upstream name (one pool per name)
+        base_url: Base URL for relative request paths
+        timeout: Default timeout (requests may override it per call)
+
+    Returns:
+        httpx.AsyncClient with keep-alive pooling
+    """
+    loop = asyncio.get_running_loop()
+    key = (name, id(loop))
+
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        # Drop clients whose loop has gone away (their connections are unusable)
+        for stale in [k for k, (owner, _) in _clients.items() if owner.is_closed()]:
+            del _clients[stale]
+
+        client = httpx.AsyncClient(
+            base_url=base_url or "",
+            timeout=timeout,
+            limits=pool_limits(),
+            http2=_http2_available(),
+        )
+        _clients[key] = (loop, client)
+        logger.debug(f"Created pooled HTTP client '{name}' (http2={_http2_available()})")
+        return client
+
+
+async def close_async_http_clients() -> None:
+    """Close every pooled client on the running loop (lifespan shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        owned = [(k, c) for k, (owner, c) in _clients.items() if owner is loop]
+        for key, _ in owned:
+            del _clients[key]
+
+    for (name, _), client in owned:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP client '{name}': {e}")
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Pool configuration and open clients for status endpoints."""
+    with _lock:
+        names = sorted({name for (name, _), (loop, client) in _clients.items()
+                        if not loop.is_closed() and not client.is_closed})
+    return {
+        "clients": names,
+        "max_connections": MAX_CONNECTIONS,
+        "max_keepalive_connections": MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry_seconds": KEEPALIVE_EXPIRY,
+        "http2": _http2_available(),
+    }
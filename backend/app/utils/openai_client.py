@@ -1,19 +1,36 @@
 """
 Lazy-initialized OpenAI client to prevent import-time errors
 when OPENAI_API_KEY is not set.
+
+The async client rides on the shared keep-alive pool from
+app.utils.http_clients.
 """
 
 import os
 from typing import Optional
 import httpx
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from app.utils.http_clients import get_async_http_client
 
 _client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
 
 # Timeout configuration: 60s total request, 10s connect
 DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
 
 
+def _require_api_key() -> str:
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError(
+            "OPENAI_API_KEY environment variable is not set. "
+            "Please set it before using AI features."
+        )
+    return api_key
+
+
 def get_openai_client() -> OpenAI:
     """
     Get a lazily-initialized OpenAI client with timeout configuration.
@@ -32,20 +49,43 @@ def get_openai_client() -> OpenAI:
     global _client
 
     if _client is None:
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY environment variable is not set. "
-                "Please set it before using AI features."
-            )
-        _client = OpenAI(api_key=api_key, timeout=DEFAULT_TIMEOUT)
+        _client = OpenAI(api_key=_require_api_key(), timeout=DEFAULT_TIMEOUT)
 
     return _client
 
 
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get an AsyncOpenAI client backed by the shared pooled HTTP client.
+
+    Must be called from a running event loop. The client is rebuilt when the
+    pooled HTTP client changes (new loop, or pools closed at shutdown).
+
+    Returns:
+        AsyncOpenAI: The async OpenAI client instance
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    global _async_client, _async_http_client
+
+    http_client = get_async_http_client("openai", timeout=DEFAULT_TIMEOUT)
+    if _async_client is None or http_client is not _async_http_client:
+        _async_client = AsyncOpenAI(
+            api_key=_require_api_key(),
+            timeout=DEFAULT_TIMEOUT,
+            http_client=http_client
+        )
+        _async_http_client = http_client
+
+    return _async_client
+
+
 def reset_client() -> None:
     """
     Reset the client (useful for testing or when API key changes).
     """
-    global _client
+    global _client, _async_client, _async_http_client
     _client = None
+    _async_client = None
+    _async_http_client = None
@@ -0,0 +1,116 @@
+"""
+Migration: Add Badge Counters Table and Backfill
+
+Creates:
+- user_badge_counters table: running per-user answer counters used by
+  incremental badge evaluation (total/correct answered, current and best
+  correct run, first night-owl / early-bird answer, counted_through
+  watermark of the last rebuild)
+
+Then rebuilds every user's counters from question_attempts in one
+streaming pass. Users without a counters row are also rebuilt lazily on
+their next answer, so running the backfill is an optimisation, not a
+requirement.
+
+Safe to run multiple times - the table is created only if missing and the
+backfill replaces all counters.
+
+Usage:
+    python migrations/add_badge_counters_table.py
+    python migrations/add_badge_counters_table.py --skip-backfill
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect, text
+from app.database import engine, SessionLocal
+from app.models.models import UserBadgeCounters
+from app.services.badge_service import get_badge_service
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists in the database."""
+    inspector = inspect(engine)
+    return table_name in inspector.get_table_names()
+
+
+def create_badge_counters_table():
+    """Create the user_badge_counters table."""
+    if table_exists("user_badge_counters"):
+        print("  ✓ Table 'user_badge_counters' already exists, skipping")
+        return False
+
+    UserBadgeCounters.__table__.create(bind=engine)
+    print("  + Created table 'user_badge_counters'")
+    return True
+
+
+def add_counted_through_column():
+    """Add counted_through to a user_badge_counters table created before it existed."""
+    columns = {col["name"] for col in inspect(engine).get_columns("user_badge_counters")}
+    if "counted_through" in columns:
+        print("  ✓ Column 'counted_through' already exists, skipping")
+        return False
+
+    with engine.connect() as conn:
+        conn.execute(text("ALTER TABLE user_badge_counters ADD COLUMN counted_through TIMESTAMP"))
+        conn.commit()
+
+    print("  + Added column 'counted_through'")
+    return True
+
+
+def backfill_badge_counters(batch_size: int) -> int:
+    """Rebuild all counters from question_attempts."""
+    db = SessionLocal()
+    try:
+        return get_badge_service().backfill_counters(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def migrate(skip_backfill: bool = False, batch_size: int = 1000):
+    """Create the badge counters table and backfill it."""
+
+    print("=" * 80)
+    print("ShelfSense - Add Badge Counters Migration")
+    print("=" * 80)
+    print()
+
+    if not table_exists("question_attempts"):
+        print("ERROR: 'question_attempts' table does not exist!")
+        print("Please run the main migration first.")
+        return False
+
+    print("Creating tables...")
+    if not create_badge_counters_table():
+        add_counted_through_column()
+
+    if not skip_backfill:
+        print()
+        print("Backfilling counters from question_attempts...")
+        start = time.perf_counter()
+        users = backfill_badge_counters(batch_size)
+        print(f"✓ Backfilled counters for {users} user(s) in {time.perf_counter() - start:.1f}s")
+
+    print()
+    print("=" * 80)
+    print("Migration complete!")
+    print("=" * 80)
+
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and backfill user_badge_counters")
+    parser.add_argument("--skip-backfill", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Users per insert batch")
+    args = parser.parse_args()
+
+    migrate(skip_backfill=args.skip_backfill, batch_size=args.batch_size)
@@ -0,0 +1,98 @@
+"""
+Migration: Add Daily Activity Rollup Table and Backfill
+
+Creates:
+- user_daily_activity table: per-user, per-UTC-day, per-specialty answer
+  counts, answer time and confidence sums, read by performance trends,
+  the activity heatmap, streaks and the weekly digest
+
+Then rebuilds the rollup from question_attempts with one grouped query.
+Attempts recorded before the table exists are only visible to those
+endpoints after the backfill, so run it once after deploying.
+
+Safe to run multiple times - the table is created only if missing and the
+backfill replaces all rollup rows.
+
+Usage:
+    python migrations/add_daily_activity_table.py
+    python migrations/add_daily_activity_table.py --skip-backfill
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect
+from app.database import engine, SessionLocal
+from app.models.models import UserDailyActivity
+from app.services.daily_activity import backfill_daily_activity
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists in the database."""
+    inspector = inspect(engine)
+    return table_name in inspector.get_table_names()
+
+
+def create_daily_activity_table():
+    """Create the user_daily_activity table."""
+    if table_exists("user_daily_activity"):
+        print("  ✓ Table 'user_daily_activity' already exists, skipping")
+        return False
+
+    UserDailyActivity.__table__.create(bind=engine)
+    print("  + Created table 'user_daily_activity'")
+    return True
+
+
+def backfill_rollup(batch_size: int) -> int:
+    """Rebuild all rollup rows from question_attempts."""
+    db = SessionLocal()
+    try:
+        return backfill_daily_activity(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def migrate(skip_backfill: bool = False, batch_size: int = 1000):
+    """Create the daily activity table and backfill it."""
+
+    print("=" * 80)
+    print("ShelfSense - Add Daily Activity Rollup Migration")
+    print("=" * 80)
+    print()
+
+    if not table_exists("question_attempts"):
+        print("ERROR: 'question_attempts' table does not exist!")
+        print("Please run the main migration first.")
+        return False
+
+    print("Creating tables...")
+    create_daily_activity_table()
+
+    if not skip_backfill:
+        print()
+        print("Backfilling rollup from question_attempts...")
+        start = time.perf_counter()
+        rows = backfill_rollup(batch_size)
+        print(f"✓ Backfilled {rows} daily activity row(s) in {time.perf_counter() - start:.1f}s")
+
+    print()
+    print("=" * 80)
+    print("Migration complete!")
+    print("=" * 80)
+
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and backfill user_daily_activity")
+    parser.add_argument("--skip-backfill", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert batch")
+    args = parser.parse_args()
+
+    migrate(skip_backfill=args.skip_backfill, batch_size=args.batch_size)
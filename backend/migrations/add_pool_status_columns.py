@@ -0,0 +1,144 @@
+"""
+Migration: Add Pool Claim Columns to Questions Table
+
+Adds the following columns to the questions table:
+- pool_status: "pooled" (ready to serve) / "claimed" (served); NULL for non-pool questions
+- pool_claimed_by: User the pool question was served to
+- pool_claimed_at: When the pool question was claimed
+
+Creates ix_questions_pool_bucket (pool_status, specialty, difficulty_level),
+which also serves pool_status-only lookups, and backfills existing
+"AI Pool - <specialty> - <difficulty>" and instant-pool "AI Pool - <specialty>"
+rows so they stay servable.
+
+Safe to run multiple times - checks if columns/indexes exist first.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text, inspect
+from app.database import engine
+
+
+def get_existing_columns(table_name: str) -> set:
+    """Get set of existing column names for a table."""
+    inspector = inspect(engine)
+    columns = inspector.get_columns(table_name)
+    return {col['name'] for col in columns}
+
+
+def get_existing_indexes(table_name: str) -> set:
+    """Get set of existing index names for a table."""
+    inspector = inspect(engine)
+    return {idx['name'] for idx in inspector.get_indexes(table_name)}
+
+
+def add_column_if_not_exists(table: str, column: str, column_def: str):
+    """Add a column if it doesn't already exist."""
+    existing_columns = get_existing_columns(table)
+
+    if column in existing_columns:
+        print(f"  ✓ Column '{column}' already exists, skipping")
+        return False
+
+    with engine.connect() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_def}"))
+        conn.commit()
+
+    print(f"  + Added column '{column}'")
+    return True
+
+
+def create_index_if_not_exists(table: str, index: str, columns: str):
+    """Create an index if it doesn't already exist."""
+    if index in get_existing_indexes(table):
+        print(f"  ✓ Index '{index}' already exists, skipping")
+        return False
+
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE INDEX {index} ON {table} ({columns})"))
+        conn.commit()
+
+    print(f"  + Created index '{index}'")
+    return True
+
+
+def backfill_pool_rows() -> int:
+    """Mark unclaimed pool rows as pooled and fill their bucket columns."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, source FROM questions "
+            "WHERE source LIKE 'AI Pool - %' AND pool_status IS NULL"
+        )).fetchall()
+
+        for question_id, source in rows:
+            # Instant-pool rows have no difficulty part
+            _, specialty, difficulty = (source.split(" - ", 2) + [None])[:3]
+            conn.execute(
+                text(
+                    "UPDATE questions SET pool_status = 'pooled', "
+                    "specialty = COALESCE(specialty, :specialty), "
+                    "difficulty_level = COALESCE(difficulty_level, :difficulty) "
+                    "WHERE id = :id"
+                ),
+                {
+                    "id": question_id,
+                    "specialty": specialty.lower().replace(" ", "_"),
+                    "difficulty": difficulty,
+                }
+            )
+        conn.commit()
+
+    return len(rows)
+
+
+def migrate():
+    """Add pool claim columns and indexes to questions table."""
+
+    print("=" * 80)
+    print("ShelfSense - Add Pool Claim Columns Migration")
+    print("=" * 80)
+    print()
+
+    inspector = inspect(engine)
+    if 'questions' not in inspector.get_table_names():
+        print("ERROR: 'questions' table does not exist!")
+        print("Please run the main migration first.")
+        return False
+
+    print("Adding pool claim columns to 'questions' table...")
+    print()
+
+    columns_to_add = [
+        ("pool_status", "VARCHAR"),
+        ("pool_claimed_by", "VARCHAR"),
+        ("pool_claimed_at", "TIMESTAMP"),
+    ]
+
+    for column_name, column_def in columns_to_add:
+        add_column_if_not_exists("questions", column_name, column_def)
+
+    print()
+    print("Creating indexes...")
+    create_index_if_not_exists(
+        "questions", "ix_questions_pool_bucket", "pool_status, specialty, difficulty_level"
+    )
+
+    print()
+    backfilled = backfill_pool_rows()
+    print(f"✓ Backfilled {backfilled} pooled question(s)")
+
+    print()
+    print("=" * 80)
+    print("Migration complete!")
+    print("=" * 80)
+
+    return True
+
+
+if __name__ == "__main__":
+    migrate()
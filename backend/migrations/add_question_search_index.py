@@ -0,0 +1,70 @@
+"""
+Migration: Add Full-Text Search Index for Question Vignettes
+
+Creates (see app/services/question_search.py):
+- SQLite: questions_fts FTS5 table over vignette/source, the
+  questions_fts_docs table mapping its integer keys to question ids, and
+  the insert/update/delete triggers that keep both in sync, populated
+  from the existing rows
+- PostgreSQL: generated vignette_tsv/source_tsv tsvector columns with
+  GIN indexes (ix_questions_vignette_tsv, ix_questions_source_tsv)
+
+Until this runs, search call sites fall back to ILIKE scans. On
+PostgreSQL adding the generated columns rewrites the questions table, so
+run it during a quiet period.
+
+Safe to run multiple times - objects are created only if missing.
+
+Usage:
+    python migrations/add_question_search_index.py
+    python migrations/add_question_search_index.py --rebuild
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect
+from app.database import engine
+from app.services.question_search import ensure_search_index
+
+
+def migrate(rebuild: bool = False):
+    """Create the question full-text search index."""
+
+    print("=" * 80)
+    print("ShelfSense - Add Question Search Index Migration")
+    print("=" * 80)
+    print()
+
+    inspector = inspect(engine)
+    if 'questions' not in inspector.get_table_names():
+        print("ERROR: 'questions' table does not exist!")
+        print("Please run the main migration first.")
+        return False
+
+    print(f"Creating full-text index ({engine.dialect.name})...")
+    start = time.perf_counter()
+    if not ensure_search_index(engine, rebuild=rebuild):
+        print(f"  ✗ {engine.dialect.name} is not supported; searches keep using ILIKE")
+        return False
+    print(f"✓ Search index ready in {time.perf_counter() - start:.1f}s")
+
+    print()
+    print("=" * 80)
+    print("Migration complete!")
+    print("=" * 80)
+
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the question full-text search index")
+    parser.add_argument("--rebuild", action="store_true", help="Repopulate the SQLite FTS tables")
+    args = parser.parse_args()
+
+    migrate(rebuild=args.rebuild)
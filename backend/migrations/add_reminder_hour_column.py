@@ -0,0 +1,122 @@
+"""
+Migration: Add Reminder Hour Column to User Settings
+
+Adds the following column to the user_settings table:
+- reminder_hour: UTC hour (0-23) parsed from reminder_time ("HH:MM"),
+  NULL when unset or unparseable
+
+Creates ix_user_settings_reminder_hour so the hourly email and push
+schedulers select an hour's recipients with an index lookup, and
+backfills the column from existing reminder_time values. New writes are
+kept in sync by the UserSettings model.
+
+Safe to run multiple times - checks if the column/index exist first.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text, inspect
+from app.database import engine
+from app.models.models import parse_reminder_hour
+
+
+def get_existing_columns(table_name: str) -> set:
+    """Get set of existing column names for a table."""
+    inspector = inspect(engine)
+    columns = inspector.get_columns(table_name)
+    return {col['name'] for col in columns}
+
+
+def get_existing_indexes(table_name: str) -> set:
+    """Get set of existing index names for a table."""
+    inspector = inspect(engine)
+    return {idx['name'] for idx in inspector.get_indexes(table_name)}
+
+
+def add_column_if_not_exists(table: str, column: str, column_def: str):
+    """Add a column if it doesn't already exist."""
+    existing_columns = get_existing_columns(table)
+
+    if column in existing_columns:
+        print(f"  ✓ Column '{column}' already exists, skipping")
+        return False
+
+    with engine.connect() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_def}"))
+        conn.commit()
+
+    print(f"  + Added column '{column}'")
+    return True
+
+
+def create_index_if_not_exists(table: str, index: str, columns: str):
+    """Create an index if it doesn't already exist."""
+    if index in get_existing_indexes(table):
+        print(f"  ✓ Index '{index}' already exists, skipping")
+        return False
+
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE INDEX {index} ON {table} ({columns})"))
+        conn.commit()
+
+    print(f"  + Created index '{index}'")
+    return True
+
+
+def backfill_reminder_hours() -> int:
+    """Parse reminder_time into reminder_hour for every row that has one."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, reminder_time FROM user_settings WHERE reminder_time IS NOT NULL"
+        )).fetchall()
+
+        updates = [
+            {"id": settings_id, "hour": parse_reminder_hour(reminder_time)}
+            for settings_id, reminder_time in rows
+        ]
+        if updates:
+            conn.execute(text("UPDATE user_settings SET reminder_hour = :hour WHERE id = :id"), updates)
+        conn.commit()
+
+    return len(updates)
+
+
+def migrate():
+    """Add reminder_hour column and index to user_settings."""
+
+    print("=" * 80)
+    print("ShelfSense - Add Reminder Hour Column Migration")
+    print("=" * 80)
+    print()
+
+    inspector = inspect(engine)
+    if 'user_settings' not in inspector.get_table_names():
+        print("ERROR: 'user_settings' table does not exist!")
+        print("Please run the main migration first.")
+        return False
+
+    print("Adding reminder_hour to 'user_settings' table...")
+    add_column_if_not_exists("user_settings", "reminder_hour", "INTEGER")
+
+    print()
+    print("Creating indexes...")
+    create_index_if_not_exists("user_settings", "ix_user_settings_reminder_hour", "reminder_hour")
+
+    print()
+    backfilled = backfill_reminder_hours()
+    print(f"✓ Backfilled {backfilled} reminder hour(s)")
+
+    print()
+    print("=" * 80)
+    print("Migration complete!")
+    print("=" * 80)
+
+    return True
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,106 @@
+"""
+Migration: Add Stored SM-2 State to Scheduled Reviews
+
+Adds the following columns to the scheduled_reviews table:
+- interval_days: numeric interval behind review_interval ("3d", "12h", ...)
+- ease_factor: SM-2 ease factor (NULL means the default 2.5)
+- stability: memory stability in days for R = e^(-t/S)
+
+Backfills interval_days and stability from existing review_interval
+strings, so the schedulers no longer parse them on every review. New
+writes store all three.
+
+Safe to run multiple times - checks if the columns exist first.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text, inspect
+from app.database import engine
+from app.services.spaced_repetition import parse_interval, stability_for_interval
+
+BATCH_SIZE = 5000
+
+
+def get_existing_columns(table_name: str) -> set:
+    """Get set of existing column names for a table."""
+    inspector = inspect(engine)
+    columns = inspector.get_columns(table_name)
+    return {col['name'] for col in columns}
+
+
+def add_column_if_not_exists(table: str, column: str, column_def: str):
+    """Add a column if it doesn't already exist."""
+    existing_columns = get_existing_columns(table)
+
+    if column in existing_columns:
+        print(f"  ✓ Column '{column}' already exists, skipping")
+        return False
+
+    with engine.connect() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_def}"))
+        conn.commit()
+
+    print(f"  + Added column '{column}'")
+    return True
+
+
+def backfill_intervals() -> int:
+    """Parse review_interval into interval_days/stability for rows that lack them."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, review_interval FROM scheduled_reviews WHERE interval_days IS NULL"
+        )).fetchall()
+
+        updates = []
+        for review_id, review_interval in rows:
+            days = parse_interval(review_interval)
+            updates.append({"id": review_id, "days": days, "stability": stability_for_interval(days)})
+
+        for start in range(0, len(updates), BATCH_SIZE):
+            conn.execute(
+                text("UPDATE scheduled_reviews SET interval_days = :days, stability = :stability WHERE id = :id"),
+                updates[start:start + BATCH_SIZE]
+            )
+        conn.commit()
+
+    return len(updates)
+
+
+def migrate():
+    """Add stored SM-2 state columns to scheduled_reviews."""
+
+    print("=" * 80)
+    print("ShelfSense - Add Review State Columns Migration")
+    print("=" * 80)
+    print()
+
+    inspector = inspect(engine)
+    if 'scheduled_reviews' not in inspector.get_table_names():
+        print("ERROR: 'scheduled_reviews' table does not exist!")
+        print("Please run the main migration first.")
+        return False
+
+    print("Adding review state to 'scheduled_reviews' table...")
+    add_column_if_not_exists("scheduled_reviews", "interval_days", "FLOAT")
+    add_column_if_not_exists("scheduled_reviews", "ease_factor", "FLOAT")
+    add_column_if_not_exists("scheduled_reviews", "stability", "FLOAT")
+
+    print()
+    backfilled = backfill_intervals()
+    print(f"✓ Backfilled {backfilled} review interval(s)")
+
+    print()
+    print("=" * 80)
+    print("Migration complete!")
+    print("=" * 80)
+
+    return True
+
+
+if __name__ == "__main__":
+    migrate()
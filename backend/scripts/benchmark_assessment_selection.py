@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Assessment Question Selection
+
+Compares choosing the 160 questions of a 4 x 40 self-assessment:
+- legacy: load id/difficulty/source for every active question, split into
+  difficulty lists and shuffle them all (the previous
+  select_assessment_questions)
+- QuestionSamplingIndex.select_assessment: sparse Fisher-Yates draws from cached
+  difficulty/specialty buckets plus one validation query (the one-off
+  index rebuild is reported separately)
+
+at several bank sizes, to show which cost grows with the bank.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_assessment_selection
+
+    # Or with options:
+    python -m scripts.benchmark_assessment_selection --sizes 10000 100000 500000 --runs 20
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from app.database import SessionLocal, engine, Base
+from app.models.models import Question
+from app.services.question_index import QuestionSamplingIndex
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+SPECIALTIES = ["internal_medicine", "surgery", "pediatrics", "psychiatry", "obgyn", "neurology"]
+
+
+def grow_bank(db, target: int, current: int, rng: random.Random) -> int:
+    """Bulk-insert active questions until the bank has `target` rows."""
+    for start in range(current, target, 10000):
+        db.bulk_insert_mappings(Question, [
+            {
+                "id": str(uuid.uuid4()), "vignette": "Benchmark", "answer_key": "A",
+                "choices": ["A", "B", "C", "D", "E"], "recency_weight": 1.0,
+                "difficulty_level": rng.choice(["easy", "medium", "medium", "hard", None]),
+                "specialty": rng.choice(SPECIALTIES), "content_status": "active", "rejected": False
+            }
+            for _ in range(min(10000, target - start))
+        ])
+    db.commit()
+    return target
+
+
+def legacy_select(db, count: int):
+    """The previous select_assessment_questions."""
+    all_questions = db.query(Question.id, Question.difficulty_level, Question.source).filter(
+        Question.rejected == False,
+        Question.content_status == "active"
+    ).all()
+    easy_count, medium_count = int(count * 0.2), int(count * 0.5)
+    hard_count = count - easy_count - medium_count
+    easy_qs = [q.id for q in all_questions if q.difficulty_level == "easy"]
+    medium_qs = [q.id for q in all_questions if q.difficulty_level == "medium"]
+    hard_qs = [q.id for q in all_questions if q.difficulty_level == "hard"]
+    other_qs = [q.id for q in all_questions if q.difficulty_level not in ["easy", "medium", "hard"]]
+    for qs in (easy_qs, medium_qs, hard_qs, other_qs):
+        random.shuffle(qs)
+    selected = easy_qs[:easy_count] + medium_qs[:medium_count] + hard_qs[:hard_count]
+    random.shuffle(selected)
+    return selected[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark assessment question selection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--count", type=int, default=160, help="Questions per assessment")
+    parser.add_argument("--runs", type=int, default=10, help="Selections timed per size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    current = 0
+    try:
+        print(f"{'bank size':>10} {'legacy':>12} {'index rebuild':>14} {'index select':>13}")
+        for size in args.sizes:
+            current = grow_bank(db, size, current, rng)
+
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                legacy_select(db, args.count)
+            legacy_ms = (time.perf_counter() - start) * 1000 / args.runs
+
+            index = QuestionSamplingIndex()
+            start = time.perf_counter()
+            index.rebuild(db)
+            rebuild_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                selected = index.select_assessment(db, args.count, rng=rng)
+            select_ms = (time.perf_counter() - start) * 1000 / args.runs
+            assert len(set(selected)) == args.count
+
+            print(f"{size:>10} {legacy_ms:>10.1f}ms {rebuild_ms:>12.1f}ms {select_ms:>11.2f}ms")
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Concurrent Batch Validation
+
+Runs BatchValidationPipeline.validate_batch against a local fake validator
+model (fixed latency plus jitter, canned JSON verdicts) so the numbers
+reflect the pipeline's fan-out rather than a provider:
+- sequential: concurrency=1, one Stage 2 call at a time (the previous loop)
+- concurrent: questions fanned out with per-model semaphore limits
+
+Also times a STOP_GENERATION run (every verdict is dangerous) to show
+in-flight validations being cancelled once the critical-issue gate trips.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_batch_validation
+
+    # Or with options:
+    python -m scripts.benchmark_batch_validation --questions 200 --latency-ms 200 --concurrency 32
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from app.services.batch_validation_pipeline import BatchValidationPipeline
+from app.services.multi_model_validator import ValidatorModel
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")
+
+QUESTION = {
+    "vignette": (
+        "A 65-year-old man with a history of hypertension presents with chest pain "
+        "(BP 180/110 mmHg, HR 88/min). ECG shows ST elevations in leads V1-V4. "
+        "What is the most appropriate next step?"
+    ),
+    "choices": [
+        "A. Aspirin 325 mg PO",
+        "B. Nitroglycerin sublingual",
+        "C. Emergent cardiac catheterization",
+        "D. Thrombolytic therapy",
+        "E. Beta-blocker IV"
+    ],
+    "answer_key": "C",
+    "explanation": {
+        "quick_answer": "STEMI requires emergent reperfusion with PCI within 90 minutes.",
+        "clinical_reasoning": (
+            "ST elevations in V1-V4 (anterior wall) with chest pain -> anterior STEMI -> "
+            "emergent cardiac catheterization (door-to-balloon <90 min)."
+        ),
+        "correct_answer_explanation": (
+            "Primary PCI is the preferred reperfusion strategy for STEMI when available "
+            "within 90 minutes of first medical contact."
+        ),
+        "distractor_explanations": {
+            "A": "Aspirin is given but does not achieve reperfusion.",
+            "B": "Nitroglycerin relieves symptoms but does not open the occluded artery.",
+            "D": "Thrombolytics are used only when PCI is unavailable within 120 minutes.",
+            "E": "IV beta-blockers can precipitate cardiogenic shock."
+        }
+    },
+    "specialty": "internal_medicine",
+    "subsystem": "cardiology"
+}
+
+
+def fake_validator(latency_ms: float, rng: random.Random, status: str, medical_accuracy: float):
+    """Stand-in for the validator model call: sleeps, then returns a verdict."""
+    async def call(prompt: str):
+        await asyncio.sleep(latency_ms * rng.uniform(0.5, 1.5) / 1000)
+        return json.dumps({
+            "status": status,
+            "overall_score": 90 if status == "ACCEPT" else 20,
+            "medical_accuracy": medical_accuracy,
+            "distractor_quality": 85,
+            "vignette_quality": 85,
+            "issues": [],
+            "suggestions": []
+        })
+    return call
+
+
+async def timed_batch(label: str, questions, concurrency: int, model_limit: int,
+                      latency_ms: float, rng: random.Random, status: str = "ACCEPT",
+                      medical_accuracy: float = 90) -> float:
+    pipeline = BatchValidationPipeline(db=None)
+    validator = pipeline.multi_model_validator
+    validator.model_concurrency[ValidatorModel.CLAUDE_HAIKU] = model_limit
+    validator._call_claude_haiku = fake_validator(latency_ms, rng, status, medical_accuracy)
+
+    start = time.perf_counter()
+    report = await pipeline.validate_batch(questions, enable_gates=True, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+
+    done = report.accepted + report.rejected + report.needs_review
+    print(f"  {label:<34} {elapsed * 1000:10.1f}ms  "
+          f"{done / elapsed:8.1f} q/s  ({done}/{len(questions)} validated, "
+          f"{len(report.quality_gate_failures)} gate failures)")
+    return elapsed
+
+
+async def run(args) -> int:
+    rng = random.Random(args.seed)
+    questions = [{**QUESTION, "id": f"q_{i}"} for i in range(args.questions)]
+
+    print(f"\n{args.questions} questions, fake validator latency ~{args.latency_ms:.0f}ms")
+    sequential = await timed_batch("sequential (concurrency=1)", questions, 1, 1,
+                                   args.latency_ms, rng)
+    concurrent = await timed_batch(f"concurrent ({args.concurrency}, model {args.model_limit})",
+                                   questions, args.concurrency, args.model_limit,
+                                   args.latency_ms, rng)
+    print(f"  {'speedup':<34} {sequential / concurrent:10.1f}x")
+
+    print("\nSTOP_GENERATION gate (every verdict dangerous)")
+    await timed_batch("concurrent, cancels on STOP", questions, args.concurrency,
+                      args.model_limit, args.latency_ms, rng, status="REJECT",
+                      medical_accuracy=10)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent batch validation")
+    parser.add_argument("--questions", type=int, default=200, help="Questions per batch")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Mean fake validator latency")
+    parser.add_argument("--concurrency", type=int, default=16, help="Questions in flight")
+    parser.add_argument("--model-limit", type=int, default=8, help="In-flight calls per model")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
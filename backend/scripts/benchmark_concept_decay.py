@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Concept Retention Decay
+
+Compares, over --rows ConceptRetention rows (default 1M):
+- compute only: math.exp per row (the previous loop) versus
+  retention_decay.predict_retention over column arrays
+- nightly refresh: the previous update_all_concept_retentions (ORM objects,
+  per-row UPDATEs on commit) timed on a sample of users and projected,
+  versus retention_decay.decay_concept_retentions over the whole table,
+  and a second run where most stored values are still current
+- read path: the previous get_concepts_needing_review (load every ORM
+  row, math.exp each) versus the vectorized read-time version
+
+Seeds a throwaway SQLite database.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_concept_decay
+
+    # Or with options:
+    python -m scripts.benchmark_concept_decay --rows 1000000 --users 20000 --legacy-users 200
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+import numpy as np
+
+from app.database import SessionLocal, engine, Base
+from app.models.models import ConceptRetention, User
+from app.services.learning_engine import calculate_memory_strength, get_concepts_needing_review
+from app.services.retention_decay import decay_concept_retentions, predict_retention
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+
+def seed(num_rows: int, num_users: int, now: datetime, rng: random.Random):
+    """Bulk-insert users and concept retention rows reviewed over the last 90 days."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user_ids = [str(uuid.uuid4()) for _ in range(num_users)]
+        db.bulk_insert_mappings(User, [
+            {"id": user_id, "full_name": f"User {i}", "email": f"user{i}@example.com", "created_at": now}
+            for i, user_id in enumerate(user_ids)
+        ])
+
+        rows = []
+        for i in range(num_rows):
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_ids[i % num_users],
+                "concept": f"concept_{i // num_users}",
+                "stability": rng.choice([0.5, 1.0, 2.0, 5.0, 12.0, 30.0, 90.0]),
+                "memory_strength": 1.0,
+                "predicted_retention": 1.0,
+                "last_reviewed": now - timedelta(seconds=rng.randrange(90 * 86400)),
+                "total_exposures": rng.randrange(1, 10)
+            })
+            if len(rows) == 20000:
+                db.bulk_insert_mappings(ConceptRetention, rows)
+                rows = []
+        if rows:
+            db.bulk_insert_mappings(ConceptRetention, rows)
+        db.commit()
+        print(f"  seeded {num_rows} concept rows for {num_users} users")
+        return user_ids
+    finally:
+        db.close()
+
+
+def legacy_update_all(db, user_id: str) -> int:
+    """The previous update_all_concept_retentions."""
+    concepts = db.query(ConceptRetention).filter_by(user_id=user_id).all()
+    now = datetime.utcnow()
+    updated = 0
+    for c in concepts:
+        if c.last_reviewed:
+            days_since = (now - c.last_reviewed).total_seconds() / 86400
+            c.predicted_retention = calculate_memory_strength(c.stability, days_since)
+            c.memory_strength = c.predicted_retention
+            c.updated_at = now
+            updated += 1
+    db.commit()
+    return updated
+
+
+def legacy_needing_review(db, user_id: str, min_retention: float = 0.7, limit: int = 20):
+    """The previous get_concepts_needing_review."""
+    now = datetime.utcnow()
+    needing = []
+    for c in db.query(ConceptRetention).filter_by(user_id=user_id).all():
+        if c.last_reviewed:
+            days_since = (now - c.last_reviewed).total_seconds() / 86400
+            retention = calculate_memory_strength(c.stability, days_since)
+            if retention < min_retention:
+                needing.append((retention, c.concept))
+    needing.sort()
+    return needing[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concept retention decay")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Seeded concept rows")
+    parser.add_argument("--users", type=int, default=20_000, help="Users the rows are spread over")
+    parser.add_argument("--legacy-users", type=int, default=200, help="Users to time with the ORM loop before projecting")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print(f"Compute only ({args.rows} rows)")
+    stability = np.array([rng.choice([0.5, 1.0, 5.0, 30.0]) for _ in range(args.rows)])
+    days = np.array([rng.random() * 90 for _ in range(args.rows)])
+    stability_list, days_list = stability.tolist(), days.tolist()
+    start = time.perf_counter()
+    loop = [calculate_memory_strength(s, d) for s, d in zip(stability_list, days_list)]
+    loop_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    vectorized = predict_retention(stability, days)
+    vector_ms = (time.perf_counter() - start) * 1000
+    assert np.allclose(loop, vectorized)
+    print(f"  {'math.exp loop':<34} {loop_ms:10.1f}ms")
+    print(f"  {'predict_retention':<34} {vector_ms:10.1f}ms  ({loop_ms / max(vector_ms, 1e-9):.0f}x)")
+
+    now = datetime.utcnow()
+    print(f"\nSeeding {args.rows} rows...")
+    user_ids = seed(args.rows, args.users, now, rng)
+    sample = user_ids[:args.legacy_users]
+
+    db = SessionLocal()
+    try:
+        print("\nNightly refresh (all users)")
+        start = time.perf_counter()
+        legacy_rows = sum(legacy_update_all(db, user_id) for user_id in sample)
+        per_row = (time.perf_counter() - start) / max(1, legacy_rows)
+        print(f"  {'ORM loop (projected)':<34} {per_row * args.rows * 1000:10.1f}ms  "
+              f"({legacy_rows} rows timed)")
+
+        # Age the clock a little so the refresh has real changes to write
+        later = now + timedelta(hours=6)
+        start = time.perf_counter()
+        result = decay_concept_retentions(db, now=later)
+        elapsed = time.perf_counter() - start
+        print(f"  {'decay_concept_retentions':<34} {elapsed * 1000:10.1f}ms  "
+              f"({result['records_updated']}/{result['records_scanned']} rows written, "
+              f"{result['records_scanned'] / elapsed:,.0f} rows/sec)")
+
+        start = time.perf_counter()
+        result = decay_concept_retentions(db, now=later + timedelta(minutes=5))
+        print(f"  {'rerun 5 minutes later':<34} {(time.perf_counter() - start) * 1000:10.1f}ms  "
+              f"({result['records_updated']} rows written)")
+
+        print(f"\nRead path ({len(sample)} users, {args.rows // args.users} concepts each)")
+        start = time.perf_counter()
+        legacy = [legacy_needing_review(db, user_id) for user_id in sample]
+        print(f"  {'ORM loop':<34} {(time.perf_counter() - start) * 1000 / len(sample):10.2f}ms/user")
+        start = time.perf_counter()
+        current = [get_concepts_needing_review(db, user_id) for user_id in sample]
+        print(f"  {'get_concepts_needing_review':<34} {(time.perf_counter() - start) * 1000 / len(sample):10.2f}ms/user")
+        assert [len(a) for a in legacy] == [len(b) for b in current]
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
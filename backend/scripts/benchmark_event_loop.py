@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Event Loop Responsiveness Under Slow Queries
+
+Serves a slow endpoint (a query that sleeps inside SQLite via a sleep()
+SQL function) next to a /ping endpoint, fires N concurrent slow requests
+and pings the app throughout. Three ways to write the slow route:
+- async inline: `async def` running the query directly (the previous
+  pattern in admin/auth/chat routes)
+- async + run_db: `async def` awaiting the query on the DB offload threads
+- sync def: plain `def`, run by FastAPI's threadpool
+
+Reports slow-request wall time, ping latency while they run, and the
+event loop lag monitor's view of the same window.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_event_loop
+
+    # Or with options:
+    python -m scripts.benchmark_event_loop --slow-requests 20 --query-ms 200
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import engine, get_db, run_db
+from app.middleware.performance_monitor import EventLoopLagMonitor
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+
+@event.listens_for(engine, "connect")
+def _register_sleep(dbapi_connection, connection_record):
+    dbapi_connection.create_function("sleep", 1, lambda s: time.sleep(s) or s)
+
+
+def build_app(query_seconds: float) -> FastAPI:
+    app = FastAPI()
+
+    def slow_query(db: Session) -> float:
+        return db.execute(text("SELECT sleep(:s)"), {"s": query_seconds}).scalar()
+
+    @app.get("/slow/async-inline")
+    async def slow_inline(db: Session = Depends(get_db)):
+        return {"value": slow_query(db)}
+
+    @app.get("/slow/run-db")
+    async def slow_run_db(db: Session = Depends(get_db)):
+        return {"value": await run_db(slow_query, db)}
+
+    @app.get("/slow/sync-def")
+    def slow_sync(db: Session = Depends(get_db)):
+        return {"value": slow_query(db)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)] if ordered else 0.0
+
+
+async def scenario(client: httpx.AsyncClient, path: str, slow_requests: int) -> dict:
+    monitor = EventLoopLagMonitor(interval=0.005, stall_threshold=0.05)
+    monitor.start()
+    ping_latencies = []
+
+    async def pinger(stop: asyncio.Event):
+        while not stop.is_set():
+            start = time.perf_counter()
+            await client.get("/ping")
+            ping_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    stop = asyncio.Event()
+    pinging = asyncio.create_task(pinger(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[client.get(path) for _ in range(slow_requests)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await pinging
+    await monitor.stop()
+
+    lag = monitor.get_stats()
+    return {
+        "elapsed_ms": elapsed * 1000,
+        "pings": len(ping_latencies),
+        "ping_p50_ms": percentile(ping_latencies, 0.5) * 1000,
+        "ping_max_ms": max(ping_latencies, default=0) * 1000,
+        "lag_max_ms": lag["max_ms"],
+        "stalls": lag["stalls"],
+    }
+
+
+async def run(args) -> int:
+    app = build_app(args.query_ms / 1000)
+    transport = httpx.ASGITransport(app=app)
+
+    print(f"\n{args.slow_requests} concurrent slow requests, {args.query_ms:.0f}ms query each")
+    print(f"  {'route':<20} {'wall':>10} {'pings':>7} {'ping p50':>10} {'ping max':>10} {'loop lag max':>13} {'stalls':>7}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for label, path in [("async inline", "/slow/async-inline"),
+                            ("async + run_db", "/slow/run-db"),
+                            ("sync def", "/slow/sync-def")]:
+            r = await scenario(client, path, args.slow_requests)
+            print(f"  {label:<20} {r['elapsed_ms']:8.0f}ms {r['pings']:7d} {r['ping_p50_ms']:8.1f}ms "
+                  f"{r['ping_max_ms']:8.1f}ms {r['lag_max_ms']:11.1f}ms {r['stalls']:7d}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event loop responsiveness under slow queries")
+    parser.add_argument("--slow-requests", type=int, default=10, help="Concurrent slow requests")
+    parser.add_argument("--query-ms", type=float, default=200.0, help="Simulated query time")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
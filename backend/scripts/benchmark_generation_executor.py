@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Pipelined Question Generation
+
+Generates a batch of questions against a local fake LLM (each step sleeps
+for a jittered latency instead of calling OpenAI) and compares:
+- sequential: one question at a time, steps 1-6 back to back (the
+  previous generate_question_parallel)
+- thread batch: whole questions on 5 threads (the previous
+  generate_questions_batch)
+- pipelined: GenerationExecutor at increasing stage concurrency, with and
+  without an LLM rate limit
+
+Reports questions/minute, LLM calls/minute and per-stage p50/p95 latency.
+Throughput should grow with concurrency until the rate limit is reached.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_generation_executor
+
+    # Or with options:
+    python -m scripts.benchmark_generation_executor --questions 60 --llm-ms 150 --rpm 1200
+"""
+
+import os
+import sys
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from app.services.generation_executor import STAGES, GenerationExecutor
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+SPECIALTIES = ["Internal Medicine", "Surgery", "Pediatrics", "Psychiatry", "Obstetrics and Gynecology"]
+CHOICES = {"choices": ["A", "B", "C", "D", "E"], "correct_answer_letter": "A"}
+
+
+class FakeLLMAgent:
+    """QuestionGenerationAgent stand-in: every LLM step sleeps, scores are random."""
+
+    llm_seconds = 0.1
+    abort_rate = 0.1
+    calls = 0
+    _lock = threading.Lock()
+
+    def __init__(self, db=None, model="gpt-4o"):
+        self.db = db
+        self.model = model
+
+    def _llm(self, value):
+        with FakeLLMAgent._lock:
+            FakeLLMAgent.calls += 1
+        time.sleep(self.llm_seconds * random.uniform(0.5, 1.5))
+        return value
+
+    def _score(self):
+        return (0.3 if random.random() < self.abort_rate else 0.85), []
+
+    def _get_example_questions(self, specialty, limit=5):
+        time.sleep(0.005)  # Indexed DB query
+        return []
+
+    def step1_analyze_examples(self, specialty, examples):
+        return self._llm({"specialty": specialty})
+
+    def step2_create_clinical_scenario(self, specialty, topic, question_type, setting, analysis, difficulty):
+        return self._llm({"topic": topic})
+
+    def step3_generate_answer_choices(self, scenario, specialty, difficulty):
+        return self._llm(CHOICES)
+
+    def step4_write_vignette(self, scenario, analysis):
+        return self._llm(f"A patient with {scenario['topic']}.")
+
+    def step5_create_explanation(self, scenario, choices_data):
+        return self._llm({"principle": "..."})
+
+    def step6_quality_validation(self, vignette, choices_data, explanation, scenario, specialty):
+        return self._llm((True, []))
+
+    def score_clinical_scenario(self, scenario, specialty):
+        return self._score()
+
+    def score_answer_choices(self, choices_data):
+        return self._score()
+
+    def score_vignette(self, vignette, scenario):
+        return self._score()
+
+    def generate_question(self, specialty, difficulty="medium", max_retries=1):
+        """Steps 1-6 back to back, with the same early aborts."""
+        analysis = self.step1_analyze_examples(specialty, self._get_example_questions(specialty))
+        for _ in range(max_retries + 1):
+            scenario = self.step2_create_clinical_scenario(specialty, "topic", "dx", "ED", analysis, difficulty)
+            if self.score_clinical_scenario(scenario, specialty)[0] < 0.6:
+                continue
+            choices = self.step3_generate_answer_choices(scenario, specialty, difficulty)
+            if self.score_answer_choices(choices)[0] < 0.6:
+                continue
+            vignette = self.step4_write_vignette(scenario, analysis)
+            if self.score_vignette(vignette, scenario)[0] < 0.6:
+                continue
+            explanation = self.step5_create_explanation(scenario, choices)
+            self.step6_quality_validation(vignette, choices, explanation, scenario, specialty)
+            return vignette
+        return None
+
+
+def specialty_for(i: int) -> str:
+    return SPECIALTIES[i % len(SPECIALTIES)]
+
+
+def run_sequential(count: int) -> int:
+    agent = FakeLLMAgent()
+    return sum(agent.generate_question(specialty_for(i)) is not None for i in range(count))
+
+
+def run_thread_batch(count: int) -> int:
+    agent = FakeLLMAgent()
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda i: agent.generate_question(specialty_for(i)), range(count)))
+    return sum(r is not None for r in results)
+
+
+def run_pipelined(count: int, concurrency: int, rpm: int):
+    with GenerationExecutor(concurrency=concurrency, llm_rpm=rpm, agent_factory=FakeLLMAgent) as executor:
+        futures = [executor.submit(specialty_for(i), "topic", max_retries=1) for i in range(count)]
+        done = 0
+        for future in futures:
+            try:
+                future.result()
+                done += 1
+            except ValueError:
+                pass
+        return done, executor.get_stats()
+
+
+def timed(label: str, fn):
+    FakeLLMAgent.calls = 0
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    done, stats = result if isinstance(result, tuple) else (result, None)
+    print(f"  {label:<28} {elapsed:8.2f}s {done:6d} {done / elapsed * 60:10.0f} "
+          f"{FakeLLMAgent.calls / elapsed * 60:10.0f}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipelined question generation")
+    parser.add_argument("--questions", type=int, default=40, help="Questions per run")
+    parser.add_argument("--llm-ms", type=float, default=100.0, help="Mean fake LLM latency")
+    parser.add_argument("--abort-rate", type=float, default=0.1, help="Chance each checkpoint aborts")
+    parser.add_argument("--concurrency", type=str, default="1,2,4,8,16", help="Stage worker counts")
+    parser.add_argument("--rpm", type=int, default=3000, help="LLM rate limit for the capped runs")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    FakeLLMAgent.llm_seconds = args.llm_ms / 1000
+    FakeLLMAgent.abort_rate = args.abort_rate
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    print(f"\n{args.questions} questions, {args.llm_ms:.0f}ms fake LLM, "
+          f"{args.abort_rate:.0%} abort rate per checkpoint")
+    print(f"  {'mode':<28} {'wall':>9} {'done':>6} {'q/min':>10} {'llm/min':>10}")
+    timed("sequential", lambda: run_sequential(args.questions))
+    timed("thread batch (5 threads)", lambda: run_thread_batch(args.questions))
+
+    stats = None
+    for level in levels:
+        stats = timed(f"pipelined x{level}", lambda: run_pipelined(args.questions, level, 0))
+    for level in levels:
+        timed(f"pipelined x{level} @ {args.rpm} rpm", lambda: run_pipelined(args.questions, level, args.rpm))
+
+    print(f"\nStage latency (pipelined x{levels[-1]}, unlimited)")
+    print(f"  {'stage':<14} {'count':>7} {'mean':>10} {'p50':>9} {'p95':>9} {'max':>10}")
+    for stage in STAGES:
+        s = stats["stages"][stage]
+        print(f"  {stage:<14} {s['count']:7d} {s['mean_ms']:8.1f}ms {s['p50_ms']:7.0f}ms "
+              f"{s['p95_ms']:7.0f}ms {s['max_ms']:8.1f}ms")
+    print(f"  retries: {stats['retries']}, aborts: {stats['aborts']}, "
+          f"analyses computed/shared: {stats['analyses_computed']}/{stats['analyses_shared']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
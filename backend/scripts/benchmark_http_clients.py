@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Shared Async HTTP Client Pools
+
+Starts a local mock LLM server (Ollama /api/generate streaming and OpenAI
+/v1/chat/completions, fixed latency, HTTP/1.1 keep-alive) and measures
+requests/sec with N concurrent callers:
+- Ollama, per-request client: a fresh httpx.AsyncClient per call (the
+  previous OllamaService.generate)
+- Ollama, shared pool: OllamaService.generate on the pooled client
+- OpenAI, sync SDK in threads: chat_completion via asyncio.to_thread
+- OpenAI, native async: achat_completion on the pooled AsyncOpenAI client
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_http_clients
+
+    # Or with options:
+    python -m scripts.benchmark_http_clients --callers 100 --requests 1000 --latency-ms 20
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+os.environ["OPENAI_API_KEY"] = "sk-benchmark"
+os.environ["LLM_CACHE_BACKEND"] = "off"
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+import httpx
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")
+
+COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 1700000000,
+    "model": "gpt-4o",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": '{"status": "ACCEPT"}'}
+    }],
+    "usage": {"prompt_tokens": 50, "completion_tokens": 10, "total_tokens": 60}
+}
+GENERATE_LINES = [{"response": "Aortic"}, {"response": " stenosis"}, {"done": True}]
+
+
+class MockLLMServer:
+    """Minimal keep-alive HTTP/1.1 server on its own thread and event loop."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                path = request_line.split()[1].decode()
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+
+                await asyncio.sleep(self.latency)
+                if path.endswith("/chat/completions"):
+                    body, content_type = json.dumps(COMPLETION), "application/json"
+                else:
+                    body = "\n".join(json.dumps(line) for line in GENERATE_LINES)
+                    content_type = "application/x-ndjson"
+                payload = body.encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    + f"Content-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+                      f"Connection: keep-alive\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def start(self) -> "MockLLMServer":
+        def run():
+            self._loop = asyncio.new_event_loop()
+            server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024)
+            )
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+async def drive(label: str, call, requests: int, callers: int) -> float:
+    """Run `requests` calls with `callers` concurrent workers; print req/s."""
+    remaining = iter(range(requests))
+
+    async def caller():
+        for i in remaining:
+            await call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[caller() for _ in range(callers)])
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed * 1000:10.1f}ms  {requests / elapsed:8.0f} req/s")
+    return requests / elapsed
+
+
+async def run(args, server: MockLLMServer) -> int:
+    from app.services.ollama_service import OllamaService
+    from app.services.openai_service import openai_service
+    from app.utils.http_clients import close_async_http_clients
+
+    ollama = OllamaService()
+    ollama.base_url = server.url
+    payload = {"model": "llama3.2:3b", "prompt": "Name the murmur", "stream": True}
+
+    async def per_request_client(i):
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            async with client.stream("POST", f"{server.url}/api/generate", json=payload) as response:
+                async for _ in response.aiter_lines():
+                    pass
+
+    async def pooled_generate(i):
+        await ollama.generate("Name the murmur")
+
+    def messages(i):
+        return [{"role": "user", "content": f"Validate question {i}"}]
+
+    async def threaded_openai(i):
+        await asyncio.to_thread(openai_service.chat_completion, messages(i), model="gpt-4o")
+
+    async def native_openai(i):
+        await openai_service.achat_completion(messages(i), model="gpt-4o")
+
+    print(f"\n{args.requests} requests, {args.callers} concurrent callers, "
+          f"mock latency {args.latency_ms:.0f}ms")
+
+    print("\nOllama /api/generate")
+    fresh = await drive("per-request AsyncClient", per_request_client, args.requests, args.callers)
+    pooled = await drive("shared pool", pooled_generate, args.requests, args.callers)
+    print(f"  {'speedup':<34} {pooled / fresh:10.1f}x")
+
+    print("\nOpenAI /v1/chat/completions")
+    threaded = await drive("sync SDK via to_thread", threaded_openai, args.requests, args.callers)
+    native = await drive("achat_completion (pooled)", native_openai, args.requests, args.callers)
+    print(f"  {'speedup':<34} {native / threaded:10.1f}x")
+
+    await close_async_http_clients()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared async HTTP client pools")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--callers", type=int, default=100, help="Concurrent callers")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mock server latency")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.latency_ms).start()
+    os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+    return asyncio.run(run(args, server))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Item Bank IRT Calibration
+
+Compares calibrating every item in the bank:
+- per question: the previous IRTCalibrator.recalibrate_difficulty loop
+  (all attempts for the item, an accuracy aggregate over every responder,
+  one commit per item), timed on a sample of items and projected
+- calibrate_item_bank: one streamed pass over question_attempts, vectorized
+  statistics for all items, bulk UPDATEs; with and without the 2PL fit
+
+Seeds a throwaway SQLite database with simulated 2PL responses.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_irt_calibration
+
+    # Or with options:
+    python -m scripts.benchmark_irt_calibration --items 2000 --users 20000 --attempts 1000000
+"""
+
+import os
+import sys
+import math
+import random
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from sqlalchemy import text
+
+from app.database import SessionLocal, engine, Base
+from app.models.models import Question, QuestionAttempt, User
+from app.services.irt_bank_calibration import calibrate_item_bank
+from app.services.item_response_theory import IRTCalibrator
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+
+def seed(num_items: int, num_users: int, num_attempts: int, rng: random.Random):
+    """Bulk-insert items, users and attempts drawn from a 2PL model."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    now = datetime.utcnow()
+    try:
+        items = [(str(uuid.uuid4()), rng.uniform(0.3, 2.0), rng.gauss(0, 1)) for _ in range(num_items)]
+        users = [(str(uuid.uuid4()), rng.gauss(0, 1)) for _ in range(num_users)]
+
+        db.bulk_insert_mappings(Question, [
+            {"id": qid, "vignette": "Benchmark", "answer_key": "A", "choices": ["A", "B", "C", "D", "E"],
+             "difficulty_level": "medium", "recency_weight": 1.0}
+            for qid, _, _ in items
+        ])
+        db.bulk_insert_mappings(User, [
+            {"id": user_id, "full_name": f"User {i}", "first_name": "User", "email": f"user{i}@example.com",
+             "created_at": now}
+            for i, (user_id, _) in enumerate(users)
+        ])
+
+        rows = []
+        for _ in range(num_attempts):
+            qid, a, b = items[rng.randrange(num_items)]
+            user_id, theta = users[rng.randrange(num_users)]
+            correct = rng.random() < 1 / (1 + math.exp(-a * (theta - b)))
+            rows.append({
+                "id": str(uuid.uuid4()), "user_id": user_id, "question_id": qid,
+                "is_correct": correct, "user_answer": "A" if correct else "B", "attempted_at": now
+            })
+            if len(rows) == 20000:
+                db.bulk_insert_mappings(QuestionAttempt, rows)
+                rows = []
+        if rows:
+            db.bulk_insert_mappings(QuestionAttempt, rows)
+        db.commit()
+        print(f"  seeded {num_items} items, {num_users} users, {num_attempts} attempts")
+        return [qid for qid, _, _ in items]
+    finally:
+        db.close()
+
+
+def reset_calibration():
+    with engine.connect() as conn:
+        conn.execute(text("UPDATE questions SET extra_data = NULL, difficulty_level = 'medium'"))
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark item bank IRT calibration")
+    parser.add_argument("--items", type=int, default=2000, help="Seeded questions")
+    parser.add_argument("--users", type=int, default=20000, help="Seeded users")
+    parser.add_argument("--attempts", type=int, default=1_000_000, help="Seeded attempts")
+    parser.add_argument("--legacy-items", type=int, default=50, help="Items to time with the per-question loop")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print("Seeding...")
+    item_ids = seed(args.items, args.users, args.attempts, rng)
+
+    db = SessionLocal()
+    try:
+        print(f"\nCalibrating {args.items} items")
+        calibrator = IRTCalibrator(db)
+        sample = item_ids[:args.legacy_items]
+        start = time.perf_counter()
+        legacy = {qid: calibrator.recalibrate_difficulty(qid) for qid in sample}
+        per_item = (time.perf_counter() - start) / max(1, len(sample))
+        print(f"  {'per-question loop (projected)':<34} {per_item * args.items * 1000:10.1f}ms  "
+              f"({1 / per_item:,.1f} items/sec)")
+
+        reset_calibration()
+        db.expire_all()
+        result = calibrate_item_bank(db)
+        print(f"  {'calibrate_item_bank':<34} {result.elapsed_seconds * 1000:10.1f}ms  "
+              f"({result.items_per_second:,.1f} items/sec, {result.items_calibrated} calibrated)")
+
+        reset_calibration()
+        db.expire_all()
+        result = calibrate_item_bank(db, fit_2pl=True)
+        print(f"  {'calibrate_item_bank(fit_2pl)':<34} {result.elapsed_seconds * 1000:10.1f}ms  "
+              f"({result.items_per_second:,.1f} items/sec)")
+
+        matched = sum(1 for qid, level in legacy.items() if level == result.difficulties.get(qid))
+        print(f"  difficulty levels match the per-question loop for {matched}/{len(legacy)} sampled items")
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
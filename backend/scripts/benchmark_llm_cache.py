@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM Response Cache
+
+Replays a workload of repeated prompts through OpenAIService.chat_completion
+against a local fake OpenAI client (fixed latency, canned completions) and
+compares:
+- uncached: every call reaches the client (cache=False)
+- memory / sqlite: content-addressed cache, repeated prompts served locally
+
+The workload mirrors generation: each run re-analyzes one of a few specialty
+example sets (step 1) and re-validates one of a pool of questions.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_llm_cache
+
+    # Or with options:
+    python -m scripts.benchmark_llm_cache --calls 500 --distinct 50 --latency-ms 300
+"""
+
+import os
+import sys
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from openai.types.chat import ChatCompletion
+
+from app.services.llm_response_cache import LLMResponseCache, MemoryBackend, SQLiteBackend
+from app.services.openai_service import openai_service
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")
+
+
+def fake_client(latency_ms: float):
+    """Stand-in OpenAI client: sleeps, then returns a canned completion."""
+    def create(model, messages, **kwargs):
+        time.sleep(latency_ms / 1000)
+        return ChatCompletion.model_validate({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": '{"status": "ACCEPT", "overall_score": 90}'}
+            }],
+            "usage": {"prompt_tokens": 900, "completion_tokens": 300, "total_tokens": 1200}
+        })
+
+    client = MagicMock()
+    client.chat.completions.create.side_effect = create
+    return client
+
+
+def workload(calls: int, distinct: int, seed: int):
+    """Prompts drawn (with repeats) from a fixed pool of distinct requests."""
+    rng = random.Random(seed)
+    pool = [
+        [{"role": "system", "content": "You are an expert USMLE question analyst."},
+         {"role": "user", "content": f"Analyze example set {i}."}]
+        for i in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(calls)]
+
+
+def timed_run(label: str, cache: LLMResponseCache, prompts, use_cache: bool) -> float:
+    openai_service.response_cache = cache
+    start = time.perf_counter()
+    for messages in prompts:
+        openai_service.chat_completion(messages, model="gpt-4o", temperature=0.3, cache=use_cache)
+    elapsed = time.perf_counter() - start
+
+    stats = cache.get_stats()
+    print(f"  {label:<34} {elapsed * 1000:10.1f}ms  "
+          f"hits {stats['hits']:>5}  misses {stats['misses']:>5}  "
+          f"tokens saved {stats['tokens_saved']:>8}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LLM response cache")
+    parser.add_argument("--calls", type=int, default=300, help="chat_completion calls")
+    parser.add_argument("--distinct", type=int, default=30, help="Distinct prompts in the workload")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake OpenAI latency")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    prompts = workload(args.calls, args.distinct, args.seed)
+    print(f"\n{args.calls} calls over {args.distinct} distinct prompts, "
+          f"fake latency {args.latency_ms:.0f}ms")
+
+    with patch("app.services.openai_service.get_openai_client", return_value=fake_client(args.latency_ms)):
+        uncached = timed_run("uncached (cache=False)", LLMResponseCache(MemoryBackend()), prompts, False)
+        memory = timed_run("memory LRU", LLMResponseCache(MemoryBackend()), prompts, True)
+        sqlite = timed_run("sqlite file",
+                           LLMResponseCache(SQLiteBackend(os.path.join(_tmp_dir, "llm_cache.db"))),
+                           prompts, True)
+
+    print(f"  {'speedup (memory)':<34} {uncached / memory:10.1f}x")
+    print(f"  {'speedup (sqlite)':<34} {uncached / sqlite:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Originality Checking (Linear Scan vs Shingle Index)
+
+Compares the per-check latency of the original corpus scan (substring
+search of every 8-word phrase plus Jaccard against every question's
+4-gram string set) with the ShingleIndex used by OriginalityChecker
+(hashed-phrase inverted index + MinHash LSH candidates), and reports how
+long the index takes to build, persist as a snapshot and reopen from the
+memory-mapped snapshot. Indexed checks run against the reopened snapshot.
+
+Builds a synthetic corpus of templated vignettes in memory - no database
+is needed. Queries are a mix of lightly edited corpus vignettes (should be
+flagged) and freshly generated ones (should pass). The linear scan is
+slow at this scale, so it only runs on the first --legacy-checks queries.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_originality
+
+    # Or with options:
+    python -m scripts.benchmark_originality --corpus 50000 --checks 500 --legacy-checks 5
+"""
+
+import sys
+import random
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.originality_checker import OriginalityChecker
+from app.services.originality_snapshot import open_snapshot, write_snapshot
+
+AGES = list(range(18, 90))
+SEXES = ["man", "woman"]
+SETTINGS = ["emergency department", "clinic", "urgent care center", "inpatient ward", "office"]
+SYMPTOMS = [
+    "chest pain", "shortness of breath", "fever", "productive cough", "abdominal pain",
+    "headache", "fatigue", "weight loss", "joint swelling", "palpitations", "syncope",
+    "nausea", "vomiting", "diarrhea", "rash", "dysuria", "back pain", "confusion",
+]
+DURATIONS = ["2 hours", "6 hours", "1 day", "3 days", "1 week", "2 weeks", "3 months"]
+HISTORY = [
+    "hypertension", "type 2 diabetes mellitus", "asthma", "hyperlipidemia", "atrial fibrillation",
+    "chronic kidney disease", "hypothyroidism", "major depressive disorder", "COPD", "HIV",
+]
+MEDICATIONS = ["lisinopril", "metformin", "albuterol", "atorvastatin", "warfarin", "levothyroxine", "sertraline"]
+EXAM = [
+    "crackles at the right lung base", "a holosystolic murmur at the apex", "right lower quadrant tenderness",
+    "bilateral pedal edema", "jugular venous distension", "a palpable purpuric rash", "nuchal rigidity",
+    "decreased breath sounds on the left", "hepatomegaly", "conjunctival pallor",
+]
+LABS = ["hemoglobin", "leukocyte count", "platelet count", "sodium", "potassium", "creatinine", "glucose"]
+FILLER = [
+    "He", "She", "reports", "denies", "recent", "travel", "sick", "contacts", "smokes", "drinks",
+    "alcohol", "occasionally", "works", "as", "a", "teacher", "farmer", "nurse", "lives", "alone",
+]
+
+
+def make_vignette(rng: random.Random) -> str:
+    symptoms = rng.sample(SYMPTOMS, 2)
+    labs = rng.sample(LABS, 3)
+    parts = [
+        f"A {rng.choice(AGES)}-year-old {rng.choice(SEXES)} comes to the {rng.choice(SETTINGS)} "
+        f"because of {symptoms[0]} and {symptoms[1]} for {rng.choice(DURATIONS)}.",
+        f"He has a history of {rng.choice(HISTORY)} and {rng.choice(HISTORY)}.",
+        f"Current medications include {rng.choice(MEDICATIONS)} and {rng.choice(MEDICATIONS)}.",
+        " ".join(rng.choice(FILLER) for _ in range(rng.randint(10, 20))) + ".",
+        f"Temperature is {rng.uniform(36.0, 40.0):.1f}C, pulse is {rng.randint(50, 140)}/min, "
+        f"respirations are {rng.randint(10, 32)}/min, and blood pressure is "
+        f"{rng.randint(80, 190)}/{rng.randint(40, 110)} mm Hg.",
+        f"Physical examination shows {rng.choice(EXAM)}.",
+        "Laboratory studies show: " + ", ".join(
+            f"{lab} {rng.randint(1, 400)}" for lab in labs
+        ) + ".",
+        "Which of the following is the most likely diagnosis?",
+    ]
+    return " ".join(parts)
+
+
+def perturb(vignette: str, rng: random.Random, edits: int) -> str:
+    """Replace a few words so the query is a near-duplicate, not a copy."""
+    words = vignette.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(FILLER)
+    return " ".join(words)
+
+
+class LegacyScan:
+    """The original linear-scan implementation, kept here as the baseline."""
+
+    def __init__(self, texts, ngram_size: int = 4, phrase_length: int = 8):
+        self.texts = texts
+        self.ngram_size = ngram_size
+        self.phrase_length = phrase_length
+        self.ngrams = {q_id: self._ngrams(text) for q_id, text in texts.items()}
+
+    def _ngrams(self, text):
+        words = text.split()
+        return {" ".join(words[i:i + self.ngram_size]) for i in range(len(words) - self.ngram_size + 1)}
+
+    def check(self, text):
+        words = text.split()
+        phrases = [" ".join(words[i:i + self.phrase_length]) for i in range(len(words) - self.phrase_length + 1)]
+        counts = {}
+        for phrase in phrases:
+            for q_id, corpus_text in self.texts.items():
+                if phrase in corpus_text:
+                    counts[q_id] = counts.get(q_id, 0) + 1
+        phrase_score = max(counts.values()) / len(phrases) if counts else 0.0
+
+        query = self._ngrams(text)
+        ngram_score = 0.0
+        for corpus_ngrams in self.ngrams.values():
+            union = len(query | corpus_ngrams)
+            if union:
+                ngram_score = max(ngram_score, len(query & corpus_ngrams) / union)
+        return phrase_score, ngram_score
+
+
+def summarize(label: str, latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"  {label:<8} checks={len(latencies):<5} mean={statistics.mean(latencies):9.3f}ms "
+          f"p50={statistics.median(latencies):9.3f}ms p99={p99:9.3f}ms")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark originality checking paths")
+    parser.add_argument("--corpus", type=int, default=50000)
+    parser.add_argument("--checks", type=int, default=500)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.5,
+                        help="Fraction of queries that are edited corpus vignettes")
+    parser.add_argument("--edits", type=int, default=3, help="Words replaced per near-duplicate")
+    parser.add_argument("--legacy-checks", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Generating {args.corpus} synthetic vignettes...")
+    corpus = [(f"q{i}", make_vignette(rng)) for i in range(args.corpus)]
+
+    checker = OriginalityChecker(db=None)
+    tracemalloc.start()
+    start = time.perf_counter()
+    documents = []
+    for q_id, vignette in corpus:
+        text = checker._normalize_text(vignette)
+        documents.append((q_id, text))
+    checker._index.add_many(documents)
+    checker._corpus_loaded = True
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  index built in {time.perf_counter() - start:.1f}s (peak {peak / 1e6:.0f} MB incl. texts)")
+    print(f"  index stats: {checker._index.get_stats()}")
+
+    snapshot_dir = tempfile.mkdtemp(prefix="shelfsense_originality_")
+    start = time.perf_counter()
+    write_snapshot(checker._index, root=snapshot_dir)
+    print(f"  snapshot written in {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    snapshot = open_snapshot(checker._index.get_params(), root=snapshot_dir)
+    print(f"  snapshot opened (memory-mapped) in {(time.perf_counter() - start) * 1000:.1f}ms")
+    checker._index = snapshot.index  # Queries below run against the mapped arrays
+
+    queries = []
+    for _ in range(args.checks):
+        if rng.random() < args.duplicate_ratio:
+            queries.append((True, perturb(rng.choice(corpus)[1], rng, args.edits)))
+        else:
+            queries.append((False, make_vignette(rng)))
+
+    print(f"\nChecking {args.checks} queries ({args.duplicate_ratio:.0%} near-duplicates)")
+    indexed_latencies, flagged_correctly = [], 0
+    for is_duplicate, vignette in queries:
+        start = time.perf_counter()
+        result = asyncio.run(checker.check_originality({"vignette": vignette}))
+        indexed_latencies.append((time.perf_counter() - start) * 1000)
+        flagged_correctly += (not result.is_original) == is_duplicate
+    indexed_mean = summarize("indexed", indexed_latencies)
+    print(f"  classification agreement with ground truth: {flagged_correctly}/{len(queries)}")
+
+    additions = [make_vignette(rng) for _ in range(1000)]
+    start = time.perf_counter()
+    for i, vignette in enumerate(additions):
+        checker.add_to_corpus(f"new{i}", vignette)
+    per_add = (time.perf_counter() - start) * 1000 / len(additions)
+    print(f"  incremental add_to_corpus: {per_add:.3f}ms per question")
+
+    if args.legacy_checks > 0:
+        print(f"\nLegacy linear scan on the first {args.legacy_checks} queries")
+        texts = dict(documents)
+        start = time.perf_counter()
+        legacy = LegacyScan(texts)
+        print(f"  string n-gram sets built in {time.perf_counter() - start:.1f}s")
+
+        legacy_latencies, agreements = [], 0
+        for _, vignette in queries[:args.legacy_checks]:
+            text = checker._normalize_text(vignette)
+            start = time.perf_counter()
+            phrase_score, ngram_score = legacy.check(text)
+            legacy_latencies.append((time.perf_counter() - start) * 1000)
+
+            indexed_phrase = checker._check_exact_phrases(text)[0]
+            indexed_ngram = checker._check_ngram_overlap(text)[0]
+            legacy_flag = max(phrase_score, ngram_score) >= checker.similarity_threshold
+            indexed_flag = max(indexed_phrase, indexed_ngram) >= checker.similarity_threshold
+            agreements += legacy_flag == indexed_flag
+
+        legacy_mean = summarize("legacy", legacy_latencies)
+        print(f"  flag agreement with indexed path: {agreements}/{len(legacy_latencies)}")
+        print(f"  speedup (mean): {legacy_mean / indexed_mean:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Peer Comparison (Per-Request Scan vs Peer Distribution Store)
+
+Compares the work the peer comparison endpoint used to do per request
+(group every attempt by user, sort peer accuracies for each percentile,
+bucket every peer, scan attempts once per specialty) with the
+PeerDistributionStore, which is built once from aggregate rows and then
+answers percentiles from fixed-bucket Fenwick histograms.
+
+Generates synthetic attempts in memory - no database is needed. The
+legacy path is timed on the in-memory attempts list, so it understates the
+real cost (which also pays for the SQL GROUP BY and row transfer).
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_peer_distribution
+
+    # Or with options:
+    python -m scripts.benchmark_peer_distribution --attempts 1000000 --users 20000 --requests 200
+"""
+
+import sys
+import random
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.peer_distribution import PEER_SPECIALTIES, PeerDistributionStore
+
+SOURCES = PEER_SPECIALTIES + ["Neurology", "Family Medicine", None]
+
+
+def make_attempts(n_attempts: int, n_users: int, rng: random.Random):
+    """(user_id, source, is_correct) tuples with per-user skill and a long-tailed activity mix."""
+    skills = [rng.betavariate(6, 3) for _ in range(n_users)]
+    weights = [rng.paretovariate(1.2) for _ in range(n_users)]
+    users = rng.choices(range(n_users), weights=weights, k=n_attempts)
+    return [
+        (f"user-{u}", rng.choice(SOURCES), rng.random() < skills[u])
+        for u in users
+    ]
+
+
+def legacy_comparison(attempts, user_id: str):
+    """The original endpoint body, minus the database."""
+    per_user = defaultdict(lambda: [0, 0])
+    for uid, _, is_correct in attempts:
+        per_user[uid][0] += 1
+        per_user[uid][1] += is_correct
+    peers = [(t, c) for t, c in per_user.values() if t >= 10]
+    peer_accuracies = [c / t * 100 for t, c in peers]
+    peer_totals = [t for t, _ in peers]
+
+    def calculate_percentile(value, data_list):
+        sorted_data = sorted(data_list)
+        count_below = sum(1 for x in sorted_data if x < value)
+        return round((count_below / len(sorted_data)) * 100)
+
+    total, correct = per_user[user_id]
+    accuracy = round(correct / total * 100, 1) if total else 0
+    result = {
+        "accuracy": calculate_percentile(accuracy, peer_accuracies),
+        "questions_answered": calculate_percentile(total, peer_totals),
+        "median_accuracy": sorted(peer_accuracies)[len(peer_accuracies) // 2],
+    }
+    for specialty in PEER_SPECIALTIES:
+        lowered = specialty.lower()
+        sum(1 for _, source, _ in attempts if source and lowered in source.lower())
+    return result
+
+
+def store_comparison(store: PeerDistributionStore, user_totals, user_id: str):
+    total, correct = user_totals[user_id]
+    accuracy = round(correct / total * 100, 1) if total else 0
+    result = {
+        "accuracy": store.percentile("accuracy", accuracy),
+        "questions_answered": store.percentile("questions_answered", total),
+        "median_accuracy": store.summary("accuracy")["median"],
+    }
+    store.bucket_counts("accuracy", [0, 50, 60, 70, 80, 90])
+    for specialty in PEER_SPECIALTIES:
+        store.platform_totals(specialty)
+    return result
+
+
+def summarize(label: str, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(f"  {label:<8} requests={len(latencies):<5} mean={statistics.mean(latencies):10.3f}ms "
+          f"p95={p95:10.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peer comparison paths")
+    parser.add_argument("--attempts", type=int, default=1_000_000, help="Synthetic attempts")
+    parser.add_argument("--users", type=int, default=20_000, help="Synthetic users")
+    parser.add_argument("--requests", type=int, default=200, help="Store-backed comparisons to time")
+    parser.add_argument("--legacy-requests", type=int, default=3, help="Legacy comparisons to time")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Generating {args.attempts} attempts across {args.users} users...")
+    attempts = make_attempts(args.attempts, args.users, rng)
+
+    # What the store's rebuild query returns: one row per (user, source)
+    grouped = defaultdict(lambda: [0, 0])
+    user_totals = defaultdict(lambda: [0, 0])
+    for uid, source, is_correct in attempts:
+        grouped[(uid, source)][0] += 1
+        grouped[(uid, source)][1] += is_correct
+        user_totals[uid][0] += 1
+        user_totals[uid][1] += is_correct
+    rows = [(uid, source, t, c) for (uid, source), (t, c) in grouped.items()]
+    print(f"  {len(rows)} (user, source) aggregate rows")
+
+    store = PeerDistributionStore()
+    start = time.perf_counter()
+    users = store.load(rows)
+    print(f"  store built in {(time.perf_counter() - start) * 1000:.0f}ms "
+          f"({users} users, {store.peer_count('accuracy')} peers)")
+
+    sample_users = rng.sample(sorted(user_totals), min(args.requests, len(user_totals)))
+
+    print("\nStore-backed comparisons")
+    latencies = []
+    for uid in sample_users:
+        start = time.perf_counter()
+        store_comparison(store, user_totals, uid)
+        latencies.append((time.perf_counter() - start) * 1000)
+    summarize("store", latencies)
+    store_mean = statistics.mean(latencies)
+
+    start = time.perf_counter()
+    for uid, source, is_correct in attempts[:10_000]:
+        store.record_answer(uid, is_correct, source)
+    per_answer = (time.perf_counter() - start) * 1000 / 10_000
+    print(f"  incremental record_answer: {per_answer:.4f}ms per answer")
+
+    if args.legacy_requests:
+        print("\nLegacy per-request scan")
+        baseline = PeerDistributionStore()  # The timed store has taken incremental answers since
+        baseline.load(rows)
+        legacy_latencies, agreements = [], 0
+        for uid in sample_users[:args.legacy_requests]:
+            start = time.perf_counter()
+            legacy = legacy_comparison(attempts, uid)
+            legacy_latencies.append((time.perf_counter() - start) * 1000)
+            indexed = store_comparison(baseline, user_totals, uid)
+            if abs(legacy["accuracy"] - indexed["accuracy"]) <= 1 and \
+                    legacy["questions_answered"] == indexed["questions_answered"]:
+                agreements += 1
+        summarize("legacy", legacy_latencies)
+        print(f"  percentile agreement (within 1 point): {agreements}/{len(legacy_latencies)}")
+        print(f"  speedup (mean): {statistics.mean(legacy_latencies) / store_mean:.0f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Massive Pool Serving (SQL vs In-Memory Index)
+
+Compares the latency of claiming a pooled question through a direct SQL
+claim (`NOT IN (answered)` candidate query + pool_status update) against
+the in-memory PoolServingIndex (answered bitsets + pre-shuffled buckets).
+
+Seeds a throwaway SQLite database with pooled questions, users and
+attempt history, then serves the same request stream through both paths.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_pool_serving
+
+    # Or with options:
+    python -m scripts.benchmark_pool_serving --users 10000 --questions 5000 --requests 2000
+"""
+
+import os
+import sys
+import random
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from sqlalchemy import update
+from app.database import SessionLocal, engine, Base
+from app.models.models import User, Question, QuestionAttempt
+from app.services.massive_pool import (
+    SPECIALTIES,
+    POOL_STATUS_POOLED,
+    POOL_STATUS_CLAIMED,
+    get_pool_source,
+    normalize_specialty,
+    _get_from_pool_sql,
+    _get_any_from_pool_sql,
+)
+from app.services.pool_index import PoolServingIndex
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+logging.getLogger("sqlalchemy.query_timing").setLevel(logging.ERROR)
+warnings.filterwarnings("ignore")
+
+
+def seed(num_users: int, num_questions: int, attempts_per_user: int):
+    """Bulk-insert users, pooled questions and attempt history."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        question_ids = [str(uuid.uuid4()) for _ in range(num_questions)]
+        db.bulk_insert_mappings(Question, [
+            {
+                "id": qid,
+                "vignette": f"Benchmark vignette {i}",
+                "answer_key": "A",
+                "choices": ["A", "B", "C", "D", "E"],
+                "source": get_pool_source(SPECIALTIES[i % len(SPECIALTIES)], DIFFICULTIES[i % 3]),
+                "specialty": normalize_specialty(SPECIALTIES[i % len(SPECIALTIES)]),
+                "difficulty_level": DIFFICULTIES[i % 3],
+                "pool_status": POOL_STATUS_POOLED,
+                "rejected": False,
+                "recency_weight": 1.0,
+            }
+            for i, qid in enumerate(question_ids)
+        ])
+
+        user_ids = [str(uuid.uuid4()) for _ in range(num_users)]
+        db.bulk_insert_mappings(User, [
+            {"id": uid, "full_name": "Bench User", "first_name": "Bench", "email": f"{uid}@bench.local"}
+            for uid in user_ids
+        ])
+
+        now = datetime.utcnow()
+        attempts = []
+        for uid in user_ids:
+            for qid in random.sample(question_ids, attempts_per_user):
+                attempts.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": uid,
+                    "question_id": qid,
+                    "user_answer": "A",
+                    "is_correct": True,
+                    "attempted_at": now,
+                })
+            if len(attempts) >= 50000:
+                db.bulk_insert_mappings(QuestionAttempt, attempts)
+                attempts = []
+        if attempts:
+            db.bulk_insert_mappings(QuestionAttempt, attempts)
+
+        db.commit()
+        return user_ids
+    finally:
+        db.close()
+
+
+def reset_pool(drained_specialties=()):
+    """Move every served question back into the pool, optionally emptying some specialties."""
+    db = SessionLocal()
+    try:
+        for specialty in SPECIALTIES:
+            drained = specialty in drained_specialties
+            db.execute(
+                update(Question)
+                .where(Question.specialty == normalize_specialty(specialty))
+                .values(pool_status=POOL_STATUS_CLAIMED if drained else POOL_STATUS_POOLED)
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def fallback_chain(serve, serve_any):
+    """Wrap a bucket server in the same fallback order as get_instant_question_adaptive."""
+    def chained(db, user_id, specialty, difficulty):
+        question = serve(db, user_id, specialty, difficulty)
+        if question:
+            return question
+        for alt_difficulty in ["medium", "easy", "hard"]:
+            if alt_difficulty != difficulty:
+                question = serve(db, user_id, specialty, alt_difficulty)
+                if question:
+                    return question
+        for alt_specialty in SPECIALTIES:
+            if alt_specialty != specialty:
+                question = serve(db, user_id, alt_specialty, difficulty)
+                if question:
+                    return question
+        return serve_any(db, user_id)
+    return chained
+
+
+def fresh_index():
+    """Build a PoolServingIndex over the current pool contents."""
+    index = PoolServingIndex()
+    db = SessionLocal()
+    start = time.perf_counter()
+    index.rebuild(db)
+    db.close()
+    print(f"  (index rebuild: {(time.perf_counter() - start) * 1000:.1f}ms, one-off)")
+    return index
+
+
+def run(label: str, serve, requests):
+    """Serve every (user, specialty, difficulty) request and collect latencies."""
+    db = SessionLocal()
+    latencies = []
+    served = 0
+    try:
+        for user_id, specialty, difficulty in requests:
+            start = time.perf_counter()
+            question = serve(db, user_id, specialty, difficulty)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if question is not None:
+                served += 1
+    finally:
+        db.close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"  {label:<10} served={served:<6} mean={statistics.mean(latencies):8.3f}ms "
+          f"p50={p50:8.3f}ms  p99={p99:8.3f}ms")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark massive pool serving paths")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--attempts-per-user", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--active-users", type=int, default=200,
+                        help="Users issuing requests (sessions reuse cached answered sets)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"Seeding {args.users} users x {args.questions} pooled questions "
+          f"({args.attempts_per_user} attempts/user) in {_tmp_dir} ...")
+    start = time.perf_counter()
+    user_ids = seed(args.users, args.questions, args.attempts_per_user)
+    print(f"  seeded in {time.perf_counter() - start:.1f}s")
+
+    active = random.sample(user_ids, min(args.active_users, len(user_ids)))
+    requests = [
+        (random.choice(active), random.choice(SPECIALTIES), random.choice(DIFFICULTIES))
+        for _ in range(args.requests)
+    ]
+
+    print(f"\nScenario 1: {args.requests} direct bucket hits from {len(active)} active users")
+    sql_mean = run("sql", _get_from_pool_sql, requests)
+    reset_pool()
+    index = fresh_index()
+    indexed_mean = run("indexed", index.pick, requests)
+    print(f"  speedup (mean): {sql_mean / indexed_mean:.1f}x")
+
+    drained = SPECIALTIES[:len(SPECIALTIES) // 2]
+    print(f"\nScenario 2: fallback chain with {len(drained)} of {len(SPECIALTIES)} specialties drained")
+    reset_pool(drained)
+    sql_mean = run("sql", fallback_chain(_get_from_pool_sql, _get_any_from_pool_sql), requests)
+    reset_pool(drained)
+    index = fresh_index()
+    indexed_mean = run("indexed", fallback_chain(index.pick, index.pick_any), requests)
+    print(f"  speedup (mean): {sql_mean / indexed_mean:.1f}x")
+
+    print(f"\nIndex stats: {index.get_stats()}")
+
+if __name__ == "__main__":
+    main()
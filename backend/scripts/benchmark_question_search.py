@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Question Full-Text Search
+
+Seeds a throwaway SQLite database with synthetic vignettes (NBME
+vignettes from data/extracted_questions, cycled with varied ages and
+sources) and times the search call sites with and without the index:
+- ILIKE: match_terms with the index unavailable (the previous filters)
+- FTS5: match_terms / count_matching / search_questions on questions_fts
+
+Scenarios:
+- admin search: one phrase, count + first page
+- curriculum count: three keywords, all required
+- topic filter: ten keywords, any
+- specialty examples: phrase on source
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_question_search
+
+    # Or with options:
+    python -m scripts.benchmark_question_search --questions 100000 --repeat 5
+"""
+
+import os
+import sys
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from app.database import Base, SessionLocal, engine
+from app.models.models import Question
+from app.services import question_search
+from app.services.question_search import count_matching, ensure_search_index, match_terms, search_questions
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+DATA_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "extracted_questions" / "all_nbme_step2_questions.json"
+SOURCES = ["NBME {n} - Internal Medicine", "NBME {n} - Surgery", "NBME {n} - Pediatrics",
+           "NBME {n} - Psychiatry", "AI Generated - Internal Medicine"]
+FALLBACK_VIGNETTES = [
+    "A 62-year-old man has crushing chest pain radiating to the left arm and diaphoresis.",
+    "A 30-year-old woman has pleuritic chest pain and tachycardia after a long flight.",
+    "A 3-year-old boy has fever for 6 days, conjunctivitis and a strawberry tongue.",
+    "A 19-year-old man has periumbilical pain migrating to the right lower quadrant.",
+]
+
+
+def _vignette_text(question: dict) -> str:
+    vignette = question.get("vignette") or ""
+    if isinstance(vignette, dict):
+        vignette = " ".join(v for v in vignette.values() if isinstance(v, str) and v != "TBD")
+    return f"{vignette} {question.get('question_stem') or ''}".strip()
+
+
+def seed(count: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    try:
+        base = [_vignette_text(q) for q in json.loads(DATA_FILE.read_text())]
+        base = [v for v in base if v] or FALLBACK_VIGNETTES
+    except (OSError, ValueError):
+        base = FALLBACK_VIGNETTES
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    for start in range(0, count, 5000):
+        db.bulk_insert_mappings(Question, [
+            {"id": f"bench-{i}", "answer_key": "A", "choices": ["A", "B", "C", "D", "E"],
+             "vignette": f"A {rng.randint(18, 90)}-year-old patient. " + base[i % len(base)],
+             "source": rng.choice(SOURCES).format(n=rng.randint(6, 12)),
+             "content_status": "active", "rejected": False}
+            for i in range(start, min(start + 5000, count))
+        ])
+        db.commit()
+    db.close()
+
+
+def timed(label: str, repeat: int, fn) -> float:
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<34} {elapsed * 1000:10.1f}ms  -> {result}")
+    return elapsed
+
+
+def scenarios(db):
+    active = [Question.rejected == False, Question.content_status == "active"]
+    topic_keywords = ["myocardial", "infarction", "pneumonia", "sepsis", "appendicitis",
+                      "pancreatitis", "diabetes", "asthma", "stroke", "anemia"]
+    return [
+        ("admin search", lambda: (
+            db.query(Question).filter(match_terms(db, ["chest pain"])).count(),
+            len(db.query(Question.id).filter(match_terms(db, ["chest pain"]))
+                .order_by(Question.created_at.desc()).limit(50).all())
+        )),
+        ("curriculum count (3 terms)", lambda: count_matching(db, ["acute", "chest", "pain"], *active)),
+        ("topic filter (10 terms, any)", lambda: db.query(Question.id).filter(
+            match_terms(db, topic_keywords, mode="any"), *active).limit(20).count()),
+        ("specialty source phrase", lambda: db.query(Question).filter(
+            match_terms(db, ["Internal Medicine"], col="source")).count()),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark question full-text search")
+    parser.add_argument("--questions", type=int, default=100000, help="Vignettes to seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timing")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed(args.questions, args.seed)
+    print(f"Seeded {args.questions} questions in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    ensure_search_index(engine)
+    print(f"Built FTS5 index in {time.perf_counter() - start:.1f}s")
+
+    db = SessionLocal()
+    url = str(engine.url)
+    results = {}
+    for mode in ("ILIKE", "FTS5"):
+        question_search._available[url] = None if mode == "ILIKE" else "sqlite"
+        print(f"\n{mode}")
+        for label, fn in scenarios(db):
+            results[(mode, label)] = timed(label, args.repeat, fn)
+
+    print("\nRanked search (FTS5)")
+    timed("search_questions top 20", args.repeat,
+          lambda: len(search_questions(db, "pleuritic chest pain", limit=20)))
+
+    print("\nSpeedup")
+    for label, _ in scenarios(db):
+        print(f"  {label:<34} {results[('ILIKE', label)] / results[('FTS5', label)]:10.1f}x")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Hourly Reminder Targeting and Fan-Out
+
+Compares, for one hour's email and push reminders:
+- targeting: the previous scheduler logic (load every user with reminders
+  enabled, parse reminder_time in Python, then per-user queries for due
+  reviews, push subscriptions and engagement) versus
+  reminder_targeting.get_reminder_targets (one query on the indexed
+  reminder_hour with grouped due-review counts)
+- fan-out: sending one message at a time versus EmailService.send_bulk
+  (Resend batch API, bounded concurrency) and the bounded push fan-out
+
+Seeds a throwaway SQLite database. The Resend and webpush clients are
+replaced by local stubs that sleep for --latency-ms per call, so no
+network traffic is sent.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_reminders
+
+    # Or with options:
+    python -m scripts.benchmark_reminders --users 100000 --latency-ms 50 --legacy-sends 200
+"""
+
+import os
+import sys
+import random
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+os.environ["VAPID_PRIVATE_KEY"] = "benchmark"
+os.environ["VAPID_PUBLIC_KEY"] = "benchmark"
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from sqlalchemy import and_
+
+from app.database import SessionLocal, engine, Base
+from app.models.models import (
+    User, UserSettings, UserEngagementScore, PushSubscription, ScheduledReview, Question
+)
+from app.services.email import email_service as email_module
+from app.services import push_notification_service as push_module
+from app.services.email.email_service import EmailService, OutgoingEmail
+from app.services.reminder_targeting import get_active_subscriptions, get_reminder_targets
+from app.utils.fanout import gather_bounded
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+
+class StubResend:
+    """Resend client stand-in: every call sleeps for the configured latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        stub = self
+
+        class Emails:
+            @staticmethod
+            def send(payload):
+                stub.calls += 1
+                time.sleep(stub.latency)
+                return {"id": str(uuid.uuid4())}
+
+        class Batch:
+            @staticmethod
+            def send(payloads):
+                stub.calls += 1
+                time.sleep(stub.latency)
+                return {"data": [{"id": str(uuid.uuid4())} for _ in payloads]}
+
+        self.Emails = Emails
+        self.Batch = Batch
+
+
+def seed(num_users: int, hour: int, rng: random.Random):
+    """Bulk-insert users with settings, due reviews, engagement and push subscriptions."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    now = datetime.utcnow()
+    try:
+        question_id = str(uuid.uuid4())
+        db.bulk_insert_mappings(Question, [{
+            "id": question_id, "vignette": "Benchmark", "answer_key": "A",
+            "choices": ["A", "B", "C", "D", "E"], "recency_weight": 1.0
+        }])
+
+        users, settings, reviews, engagement, subs = [], [], [], [], []
+        for i in range(num_users):
+            user_id = str(uuid.uuid4())
+            reminder = f"{rng.randrange(24):02d}:{rng.choice(['00', '30'])}"
+            users.append({
+                "id": user_id, "full_name": f"User {i}", "first_name": f"User{i}",
+                "email": f"user{i}@example.com", "created_at": now
+            })
+            settings.append({
+                "id": str(uuid.uuid4()), "user_id": user_id, "email_notifications": True,
+                "daily_reminder": rng.random() < 0.7, "reminder_time": reminder,
+                "reminder_hour": int(reminder[:2])
+            })
+            for _ in range(rng.choice([0, 0, 1, 3, 8])):
+                reviews.append({
+                    "id": str(uuid.uuid4()), "user_id": user_id, "question_id": question_id,
+                    "scheduled_for": now - timedelta(hours=rng.randrange(1, 72)), "review_interval": "1d"
+                })
+            if rng.random() < 0.5:
+                engagement.append({
+                    "id": str(uuid.uuid4()), "user_id": user_id, "engagement_status": "active",
+                    "streak_current": rng.randrange(0, 30),
+                    "last_activity_at": now - timedelta(days=rng.randrange(0, 3))
+                })
+            if rng.random() < 0.3:
+                subs.append({
+                    "id": str(uuid.uuid4()), "user_id": user_id, "endpoint": f"https://push.example/{i}",
+                    "p256dh_key": "k", "auth_key": "a", "is_active": True, "failed_attempts": 0
+                })
+
+        for model, rows in ((User, users), (UserSettings, settings), (ScheduledReview, reviews),
+                            (UserEngagementScore, engagement), (PushSubscription, subs)):
+            for start in range(0, len(rows), 5000):
+                db.bulk_insert_mappings(model, rows[start:start + 5000])
+        db.commit()
+        print(f"  seeded {num_users} users, {len(reviews)} reviews, {len(subs)} push subscriptions")
+    finally:
+        db.close()
+
+
+def legacy_email_targets(db, current_hour: int):
+    """The previous get_users_for_reminder."""
+    rows = db.query(User, UserSettings).join(UserSettings, User.id == UserSettings.user_id).filter(and_(
+        UserSettings.email_notifications == True, UserSettings.daily_reminder == True,
+        UserSettings.reminder_time.isnot(None), User.email.isnot(None)
+    )).all()
+    now = datetime.utcnow()
+    matching = []
+    for user, settings in rows:
+        try:
+            if int(settings.reminder_time.split(":")[0]) != current_hour:
+                continue
+        except (ValueError, AttributeError):
+            continue
+        review_count = db.query(ScheduledReview).filter(and_(
+            ScheduledReview.user_id == user.id, ScheduledReview.scheduled_for <= now
+        )).count()
+        if review_count > 0:
+            matching.append((user, review_count))
+    return matching
+
+
+def legacy_push_targets(db, current_hour: int):
+    """The previous get_users_for_push_reminder (streak logic abbreviated)."""
+    rows = db.query(User, UserSettings).join(UserSettings, User.id == UserSettings.user_id).filter(and_(
+        UserSettings.daily_reminder == True, UserSettings.reminder_time.isnot(None)
+    )).all()
+    now = datetime.utcnow()
+    matching = []
+    for user, settings in rows:
+        try:
+            if int(settings.reminder_time.split(":")[0]) != current_hour:
+                continue
+        except (ValueError, AttributeError):
+            continue
+        if db.query(PushSubscription).filter(and_(
+            PushSubscription.user_id == user.id, PushSubscription.is_active == True
+        )).first() is None:
+            continue
+        review_count = db.query(ScheduledReview).filter(and_(
+            ScheduledReview.user_id == user.id, ScheduledReview.scheduled_for <= now
+        )).count()
+        engagement = db.query(UserEngagementScore).filter(UserEngagementScore.user_id == user.id).first()
+        matching.append((user, review_count, engagement.streak_current if engagement else 0))
+    return matching
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<34} {elapsed:10.1f}ms  ({len(result)} targets)")
+    return result, elapsed
+
+
+async def fan_out(args, targets, push_targets, db):
+    latency = args.latency_ms / 1000
+    service = EmailService()
+    messages = [
+        OutgoingEmail(t.user_id, t.email, f"You have {t.review_count} questions to review today", "<p>Review</p>")
+        for t in targets
+    ]
+
+    print(f"\nEmail fan-out ({len(messages)} messages, {args.latency_ms}ms per provider call)")
+    stub = StubResend(latency)
+    email_module._resend = stub
+    legacy = messages[:args.legacy_sends]
+    start = time.perf_counter()
+    for message in legacy:
+        await asyncio.to_thread(stub.Emails.send, {"to": [message.to_email]})
+    per_message = (time.perf_counter() - start) / max(1, len(legacy))
+    print(f"  {'sequential (projected)':<34} {per_message * len(messages) * 1000:10.1f}ms")
+
+    stub.calls = 0
+    start = time.perf_counter()
+    sent = await service.send_bulk(db, "reminder", messages)
+    print(f"  {'send_bulk':<34} {(time.perf_counter() - start) * 1000:10.1f}ms  "
+          f"({sum(sent)} sent in {stub.calls} provider calls)")
+
+    subscriptions = get_active_subscriptions(db, [t.user_id for t in push_targets])
+    deliveries = [sub for t in push_targets for sub in subscriptions.get(t.user_id, [])]
+    push_module._webpush = {"webpush": lambda **kwargs: time.sleep(latency), "WebPushException": Exception}
+    push_service = push_module.PushNotificationService()
+
+    async def deliver(sub):
+        return await push_service.send_notification(
+            {"endpoint": sub.endpoint, "keys": {"p256dh": sub.p256dh_key, "auth": sub.auth_key}},
+            title="Time to study!", body="Benchmark"
+        )
+
+    print(f"\nPush fan-out ({len(deliveries)} deliveries)")
+    print(f"  {'sequential (projected)':<34} {len(deliveries) * args.latency_ms:10.1f}ms")
+    start = time.perf_counter()
+    results = await gather_bounded(deliveries, deliver, args.push_concurrency)
+    print(f"  {'gather_bounded':<34} {(time.perf_counter() - start) * 1000:10.1f}ms  "
+          f"({sum(bool(r) for r in results)} sent, concurrency {args.push_concurrency})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reminder targeting and fan-out")
+    parser.add_argument("--users", type=int, default=100_000, help="Seeded users")
+    parser.add_argument("--hour", type=int, default=9, help="UTC hour to target")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Stub provider latency per call")
+    parser.add_argument("--legacy-sends", type=int, default=100, help="Sequential sends to time before projecting")
+    parser.add_argument("--push-concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Seeding {args.users} users...")
+    seed(args.users, args.hour, rng)
+
+    db = SessionLocal()
+    try:
+        print(f"\nTargeting hour {args.hour}")
+        legacy_email, _ = timed("legacy email (per-user queries)", lambda: legacy_email_targets(db, args.hour))
+        targets, _ = timed("get_reminder_targets(email)", lambda: get_reminder_targets(db, args.hour, "email"))
+        legacy_push, _ = timed("legacy push (per-user queries)", lambda: legacy_push_targets(db, args.hour))
+        push_targets, _ = timed("get_reminder_targets(push)", lambda: get_reminder_targets(db, args.hour, "push"))
+
+        assert {u.id for u, _ in legacy_email} == {t.user_id for t in targets}
+        assert {u.id for u, _, _ in legacy_push} == {t.user_id for t in push_targets}
+        print("  target sets match the legacy logic")
+
+        asyncio.run(fan_out(args, targets, push_targets, db))
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
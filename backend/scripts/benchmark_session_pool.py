@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Study Session Question Pools
+
+Compares building the 40-question pool of a timed / challenge session:
+- legacy: Question.source ILIKE '%specialty%', a NOT IN recent-attempts
+  subquery and ORDER BY random() LIMIT n (the previous _build_question_pool)
+- QuestionSamplingIndex.sample via _build_question_pool: normalized
+  specialty / difficulty buckets, sparse Fisher-Yates draws and one
+  validation query
+
+and times create_study_session end to end. The one-off index rebuild is
+reported separately; the index's own selection latency metric is printed
+at the end.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_session_pool
+
+    # Or with options:
+    python -m scripts.benchmark_session_pool --questions 100000 --sessions 50
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from sqlalchemy import func
+
+from app.database import SessionLocal, engine, Base
+from app.models.models import Question, QuestionAttempt, User
+from app.services.question_index import get_question_index
+from app.services.study_modes import _build_question_pool, create_study_session
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+SPECIALTIES = ["Internal Medicine", "Surgery", "Pediatrics", "Psychiatry", "Obstetrics and Gynecology", "Neurology"]
+
+
+def seed(num_questions: int, num_users: int, attempts_per_user: int, rng: random.Random):
+    """Bulk-insert questions across specialties/difficulties and recent attempts."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    now = datetime.utcnow()
+    try:
+        question_ids = []
+        for start in range(0, num_questions, 10000):
+            rows = []
+            for _ in range(min(10000, num_questions - start)):
+                specialty = rng.choice(SPECIALTIES)
+                difficulty = rng.choice(["easy", "medium", "hard"])
+                question_id = str(uuid.uuid4())
+                question_ids.append(question_id)
+                rows.append({
+                    "id": question_id, "vignette": "Benchmark", "answer_key": "A",
+                    "choices": ["A", "B", "C", "D", "E"], "recency_weight": 1.0,
+                    "source": f"AI Pool - {specialty} - {difficulty}",
+                    "specialty": specialty.lower().replace(" ", "_"), "difficulty_level": difficulty,
+                    "content_status": "active", "rejected": False
+                })
+            db.bulk_insert_mappings(Question, rows)
+
+        user_ids = [str(uuid.uuid4()) for _ in range(num_users)]
+        db.bulk_insert_mappings(User, [
+            {"id": user_id, "full_name": f"User {i}", "email": f"user{i}@example.com", "created_at": now}
+            for i, user_id in enumerate(user_ids)
+        ])
+        db.bulk_insert_mappings(QuestionAttempt, [
+            {"id": str(uuid.uuid4()), "user_id": user_id, "question_id": rng.choice(question_ids),
+             "is_correct": rng.random() < 0.6, "attempted_at": now - timedelta(days=rng.randrange(14))}
+            for user_id in user_ids for _ in range(attempts_per_user)
+        ])
+        db.commit()
+        print(f"  seeded {num_questions} questions, {num_users} users x {attempts_per_user} attempts")
+        return user_ids
+    finally:
+        db.close()
+
+
+def legacy_pool(db, user_id: str, count: int, specialty: str, difficulty: str):
+    """The previous _build_question_pool."""
+    query = db.query(Question.id).filter(Question.source.ilike(f"%{specialty}%"))
+    if difficulty == "hard":
+        query = query.filter(Question.difficulty_level.in_(["hard", "medium"]))
+    recent_attempts = db.query(QuestionAttempt.question_id).filter(
+        QuestionAttempt.user_id == user_id,
+        QuestionAttempt.attempted_at >= datetime.utcnow() - timedelta(days=7)
+    ).subquery()
+    query = query.filter(~Question.id.in_(recent_attempts))
+    return [q.id for q in query.order_by(func.random()).limit(count).all()]
+
+
+def timed_runs(label: str, runs: int, fn):
+    start = time.perf_counter()
+    for i in range(runs):
+        fn(i)
+    print(f"  {label:<34} {(time.perf_counter() - start) * 1000 / runs:10.2f}ms/session")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark study session pool building")
+    parser.add_argument("--questions", type=int, default=100_000, help="Seeded questions")
+    parser.add_argument("--users", type=int, default=200, help="Seeded users")
+    parser.add_argument("--attempts", type=int, default=300, help="Attempts per user")
+    parser.add_argument("--sessions", type=int, default=50, help="Sessions timed per variant")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print("Seeding...")
+    user_ids = seed(args.questions, args.users, args.attempts, rng)
+
+    db = SessionLocal()
+    try:
+        index = get_question_index()
+        start = time.perf_counter()
+        index.rebuild(db)
+        print(f"\nIndex rebuild (one-off, then every refresh interval): "
+              f"{(time.perf_counter() - start) * 1000:.1f}ms")
+
+        def pick(i):
+            return user_ids[i % len(user_ids)], SPECIALTIES[i % len(SPECIALTIES)]
+
+        print(f"\n40-question challenge pools over {args.questions} questions")
+        timed_runs("legacy ORDER BY random()", args.sessions,
+                   lambda i: legacy_pool(db, pick(i)[0], 40, pick(i)[1], "hard"))
+        timed_runs("_build_question_pool", args.sessions,
+                   lambda i: _build_question_pool(db, pick(i)[0], 40, pick(i)[1], "hard"))
+        timed_runs("create_study_session(challenge)", args.sessions,
+                   lambda i: create_study_session(db, pick(i)[0], "challenge", specialty=pick(i)[1]))
+
+        print(f"\nIndex metrics: {index.get_stats()['selection_latency_ms']}")
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/questions/submit Latency (Inline vs Post-Answer Pipeline)
+
+Measures request latency of answer submission with the side-effects
+(streak, prediction snapshot, badges, specialty difficulty, review
+scheduling, concept retention) run inline in the request - the previous
+behaviour - versus handed to the PostAnswerPipeline workers.
+
+Seeds a throwaway SQLite database with users, questions and some answer
+history, then submits the same answer stream through both modes via the
+FastAPI TestClient. Answers are all correct so no LLM error analysis runs.
+
+SQLite has a single writer, so with --interval-ms 0 the worker's batch
+transactions and the request's attempt INSERT queue behind each other and
+p99 gets worse; with realistic gaps between answers the worker drains
+between requests. PostgreSQL has row-level locks and no such contention.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_submit_answer
+
+    # Or with options:
+    python -m scripts.benchmark_submit_answer --users 50 --questions 2000 --requests 1000 --interval-ms 0
+"""
+
+import os
+import sys
+import random
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+os.environ["ENABLE_POOL_WARMING"] = "false"
+os.environ["ENABLE_CACHE_WARMING"] = "false"
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal, engine, Base
+from app.dependencies.auth import get_current_user
+from app.models.models import User, Question, QuestionAttempt
+from app.services.answer_pipeline import PostAnswerPipeline
+import app.services.answer_pipeline as answer_pipeline
+
+SPECIALTIES = ["internal_medicine", "surgery", "pediatrics", "psychiatry", "obgyn"]
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+
+def seed(num_users: int, num_questions: int, attempts_per_user: int):
+    """Bulk-insert users, questions (with concepts) and attempt history."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        question_ids = [str(uuid.uuid4()) for _ in range(num_questions)]
+        db.bulk_insert_mappings(Question, [
+            {
+                "id": qid,
+                "vignette": f"Benchmark vignette {i}",
+                "answer_key": "A",
+                "choices": ["A", "B", "C", "D", "E"],
+                "source": f"{SPECIALTIES[i % len(SPECIALTIES)].title()} - NBME",
+                "specialty": SPECIALTIES[i % len(SPECIALTIES)],
+                "rejected": False,
+                "recency_weight": 1.0,
+                "extra_data": {"concepts": [f"concept-{i % 40}", f"concept-{i % 17}"]},
+            }
+            for i, qid in enumerate(question_ids)
+        ])
+
+        user_ids = [str(uuid.uuid4()) for _ in range(num_users)]
+        db.bulk_insert_mappings(User, [
+            {"id": uid, "full_name": "Bench User", "first_name": "Bench", "email": f"{uid}@bench.local"}
+            for uid in user_ids
+        ])
+
+        now = datetime.utcnow()
+        db.bulk_insert_mappings(QuestionAttempt, [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": uid,
+                "question_id": qid,
+                "user_answer": "A",
+                "is_correct": random.random() < 0.7,
+                "attempted_at": now - timedelta(days=random.randint(0, 30)),
+            }
+            for uid in user_ids
+            for qid in random.sample(question_ids, attempts_per_user)
+        ])
+
+        db.commit()
+        return {uid: db.query(User).get(uid) for uid in user_ids}, question_ids
+    finally:
+        db.close()
+
+
+def run(label: str, client: TestClient, users, requests, interval_ms: float):
+    """Submit every (user, question) pair and collect request latencies."""
+    latencies = []
+    for user_id, question_id in requests:
+        time.sleep(interval_ms / 1000)
+        app.dependency_overrides[get_current_user] = lambda user=users[user_id]: user
+        start = time.perf_counter()
+        response = client.post("/api/questions/submit", json={
+            "user_id": user_id,
+            "question_id": question_id,
+            "user_answer": "A",
+            "time_spent_seconds": 60,
+            "confidence_level": 3,
+        })
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"  {label:<10} mean={statistics.mean(latencies):8.2f}ms "
+          f"p50={p50:8.2f}ms  p99={p99:8.2f}ms")
+    return p50, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /questions/submit latency")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--attempts-per-user", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--interval-ms", type=float, default=50,
+                        help="Gap between submissions (0 = saturate the single SQLite writer)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"Seeding {args.users} users x {args.questions} questions "
+          f"({args.attempts_per_user} attempts/user) in {_tmp_dir} ...")
+    users, question_ids = seed(args.users, args.questions, args.attempts_per_user)
+
+    user_ids = list(users)
+    requests = [(random.choice(user_ids), random.choice(question_ids)) for _ in range(args.requests * 2)]
+
+    with TestClient(app) as client:
+        print(f"\n{args.requests} submissions every {args.interval_ms:.0f}ms, side-effects inline (before)")
+        answer_pipeline._answer_pipeline = PostAnswerPipeline(enabled=False)
+        inline_p50, inline_p99 = run("inline", client, users, requests[:args.requests], args.interval_ms)
+
+        print(f"\n{args.requests} submissions every {args.interval_ms:.0f}ms, side-effects on the pipeline (after)")
+        pipeline = PostAnswerPipeline(enabled=True)
+        answer_pipeline._answer_pipeline = pipeline
+        deferred_p50, deferred_p99 = run("deferred", client, users, requests[args.requests:], args.interval_ms)
+
+        start = time.perf_counter()
+        pipeline.drain(timeout=300)
+        print(f"  (pipeline drained remaining work in {(time.perf_counter() - start) * 1000:.0f}ms)")
+
+        print(f"\n  speedup p50: {inline_p50 / deferred_p50:.1f}x   p99: {inline_p99 / deferred_p99:.1f}x")
+        print(f"\nPipeline stats: {pipeline.get_stats()}")
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Deterministic Question Validators
+
+Validates the extracted NBME questions in data/extracted_questions and compares:
+- legacy: per-call pattern loops (VagueTermValidator recompiling every
+  VAGUE_TERM_PATTERNS entry, fact-checker rules built per invocation)
+- compiled: RuleSet matchers compiled once, one trigger pass per text
+
+then times the full deterministic stack (quality validators, fact checker,
+elite validator) through validate_many inline and across a process pool.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_validators
+
+    # Or with options:
+    python -m scripts.benchmark_validators --workers 8 --repeat 3
+"""
+
+import os
+import sys
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from app.services.medical_fact_checker import ClinicalFactChecker
+from app.services.question_validators import VagueTermValidator, _question_fields, validate_many
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+DATA_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "extracted_questions" / "all_nbme_step2_questions.json"
+
+LEGACY_FACT_PATTERNS = [
+    r"(?:tPA|alteplase|tissue plasminogen).*?(\d+(?:\.\d+)?)\s*(hours?)",
+    r"(?:sepsis|septic).*?antibiotic.*?(\d+)\s*(hours?|minutes?)",
+    r"HbA1c\s*[><=]\s*(\d+(?:\.\d+)?)\s*%?",
+    r"(?:BP|blood pressure)[:\s]*(\d+)/(\d+)",
+]
+LEGACY_GUIDELINE_PATTERNS = [
+    r"JNC\s*7",
+    r"ATP\s*III",
+    r"(?:BP|blood pressure)\s*[>]\s*140/90.*?hypertension.*?stage\s*1",
+]
+
+
+def legacy_vague(vignette: str) -> int:
+    """The previous VagueTermValidator.validate loop (match count only)."""
+    found = 0
+    for config in VagueTermValidator.VAGUE_TERM_PATTERNS.values():
+        pattern = re.compile(config["pattern"], re.IGNORECASE)
+        found += sum(1 for _ in pattern.finditer(vignette))
+    for pattern, _, _ in VagueTermValidator.VAGUE_PHRASES:
+        if re.search(pattern, vignette, re.IGNORECASE):
+            found += 1
+    return found
+
+
+def legacy_fact_rules(text: str) -> int:
+    """The previous per-invocation time window / threshold / guideline scans."""
+    found = 0
+    for source in LEGACY_FACT_PATTERNS:
+        found += sum(1 for _ in re.compile(source, re.IGNORECASE).finditer(text))
+    for source in LEGACY_GUIDELINE_PATTERNS:
+        if re.search(source, text, re.IGNORECASE):
+            found += 1
+    return found
+
+
+def timed(label: str, repeat: int, fn, items) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<34} {elapsed * 1000:10.1f}ms  ({len(items) / elapsed:8.0f} q/s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deterministic question validators")
+    parser.add_argument("--file", type=Path, default=DATA_FILE, help="Extracted questions JSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="validate_many processes")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per timing")
+    args = parser.parse_args()
+
+    questions = json.loads(args.file.read_text())
+    vignettes = [_question_fields(q)[0] for q in questions]
+    print(f"{len(questions)} questions from {args.file.name}")
+
+    print("\nVague term rules (vignette)")
+    timed("legacy per-call compile", args.repeat, legacy_vague, vignettes)
+    vague = VagueTermValidator()
+    timed("compiled RuleSet", args.repeat, vague.validate, vignettes)
+
+    print("\nFact-checker text rules (vignette)")
+    timed("legacy per-call compile", args.repeat, legacy_fact_rules, vignettes)
+    checker = ClinicalFactChecker()
+    timed("compiled RuleSet", args.repeat, checker._run_text_rules, vignettes)
+
+    print("\nAll deterministic validators (validate_many)")
+    start = time.perf_counter()
+    inline = validate_many(questions, workers=1)
+    inline_s = time.perf_counter() - start
+    print(f"  {'inline (1 process)':<34} {inline_s * 1000:10.1f}ms")
+
+    start = time.perf_counter()
+    pooled = validate_many(questions, workers=args.workers)
+    pooled_s = time.perf_counter() - start
+    print(f"  {f'process pool ({args.workers} workers)':<34} {pooled_s * 1000:10.1f}ms")
+
+    assert [o.passed for o in inline] == [o.passed for o in pooled]
+    print(f"\n  passed {sum(o.passed for o in inline)}/{len(inline)}, "
+          f"elite {sum(o.elite.is_elite for o in inline)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
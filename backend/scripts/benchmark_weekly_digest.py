@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Weekly Digest Pipeline
+
+Compares, for one week's digests:
+- the previous per-user loop (weekly stats, weak areas, score change,
+  engagement, performance and due reviews queried user by user, then
+  rendered and sent one at a time), timed on a sample and projected
+- weekly_digest.run_weekly_digests in dry-run mode (set-based queries
+  per chunk plus pooled rendering), reporting digests/sec
+- a full run against a stub Resend client, then a rerun showing that the
+  EmailLog checkpoint skips everyone already sent
+
+Seeds a throwaway SQLite database. The Resend client is replaced by a
+local stub that sleeps for --latency-ms per call, so no network traffic
+is sent.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_weekly_digest
+
+    # Or with options:
+    python -m scripts.benchmark_weekly_digest --users 20000 --latency-ms 50 --legacy-users 200
+"""
+
+import os
+import sys
+import random
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Use a throwaway database - must be set before importing app modules
+_tmp_dir = tempfile.mkdtemp(prefix="shelfsense_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production-use")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import warnings
+
+from app.database import SessionLocal, engine, Base
+from app.models.models import (
+    User, UserSettings, UserEngagementScore, UserDailyActivity, QuestionAttempt,
+    ScheduledReview, Question
+)
+from app.services.email import email_service as email_module
+from app.services.email import weekly_digest
+from app.services.email.email_templates import render_template
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+SPECIALTIES = ["internal_medicine", "surgery", "pediatrics", "psychiatry", "neurology", "obgyn"]
+
+
+class StubResend:
+    """Resend client stand-in: every call sleeps for the configured latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        stub = self
+
+        class Emails:
+            @staticmethod
+            def send(payload):
+                stub.calls += 1
+                time.sleep(stub.latency)
+                return {"id": str(uuid.uuid4())}
+
+        class Batch:
+            @staticmethod
+            def send(payloads):
+                stub.calls += 1
+                time.sleep(stub.latency)
+                return {"data": [{"id": str(uuid.uuid4())} for _ in payloads]}
+
+        self.Emails = Emails
+        self.Batch = Batch
+
+
+def seed(num_users: int, now: datetime, rng: random.Random):
+    """Bulk-insert users with a week of attempts, the matching rollup rows, reviews and engagement."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    week_start, _ = weekly_digest.digest_week(now)
+    try:
+        questions = [{
+            "id": str(uuid.uuid4()), "vignette": "Benchmark", "answer_key": "A",
+            "choices": ["A", "B", "C", "D", "E"], "specialty": specialty, "recency_weight": 1.0
+        } for specialty in SPECIALTIES]
+        db.bulk_insert_mappings(Question, questions)
+
+        users, settings, attempts, rollup, reviews, engagement = [], [], [], [], [], []
+        for i in range(num_users):
+            user_id = str(uuid.uuid4())
+            users.append({
+                "id": user_id, "full_name": f"User {i}", "first_name": f"User{i}",
+                "email": f"user{i}@example.com", "created_at": now
+            })
+            settings.append({
+                "id": str(uuid.uuid4()), "user_id": user_id, "email_notifications": rng.random() < 0.9
+            })
+            if rng.random() < 0.3:
+                continue  # inactive this week
+
+            daily = {}
+            for _ in range(rng.randrange(5, 60)):
+                question = rng.choice(questions)
+                attempted_at = week_start + timedelta(seconds=rng.randrange(7 * 86400))
+                is_correct = rng.random() < 0.65
+                attempts.append({
+                    "id": str(uuid.uuid4()), "user_id": user_id, "question_id": question["id"],
+                    "user_answer": "A", "is_correct": is_correct, "attempted_at": attempted_at
+                })
+                key = (attempted_at.date(), question["specialty"])
+                answered, correct = daily.get(key, (0, 0))
+                daily[key] = (answered + 1, correct + is_correct)
+            for (day, specialty), (answered, correct) in daily.items():
+                rollup.append({
+                    "user_id": user_id, "day": day, "specialty": specialty,
+                    "questions_answered": answered, "questions_correct": correct,
+                    "total_time_seconds": 0, "timed_answers": 0,
+                    "confidence_sum": 0, "confidence_answers": 0, "updated_at": now
+                })
+            for _ in range(rng.choice([0, 2, 6])):
+                reviews.append({
+                    "id": str(uuid.uuid4()), "user_id": user_id, "question_id": questions[0]["id"],
+                    "scheduled_for": now - timedelta(hours=rng.randrange(1, 72)), "review_interval": "1d"
+                })
+            engagement.append({
+                "id": str(uuid.uuid4()), "user_id": user_id, "engagement_status": "active",
+                "streak_current": rng.randrange(0, 30), "streak_best": 30,
+                "last_activity_at": now - timedelta(days=rng.randrange(0, 3))
+            })
+
+        for model, rows in ((User, users), (UserSettings, settings), (QuestionAttempt, attempts),
+                            (UserDailyActivity, rollup), (ScheduledReview, reviews),
+                            (UserEngagementScore, engagement)):
+            for start in range(0, len(rows), 5000):
+                db.bulk_insert_mappings(model, rows[start:start + 5000])
+        db.commit()
+        print(f"  seeded {num_users} users, {len(attempts)} attempts, {len(rollup)} rollup rows")
+    finally:
+        db.close()
+
+
+def legacy_prepare(db, user, week_start, week_end, now):
+    """The previous per-user digest preparation (queries and render, no send)."""
+    settings = db.query(UserSettings).filter(UserSettings.user_id == user.id).first()
+    if settings and not settings.email_notifications:
+        return None
+    stats = weekly_digest.get_weekly_stats(db, user.id, week_start, week_end)
+    if stats["questions_answered"] == 0:
+        return None
+    db.query(UserEngagementScore).filter(UserEngagementScore.user_id == user.id).first()
+    weekly_digest.get_score_change(db, user.id)
+    weak_areas = weekly_digest.get_weak_areas(db, user.id, week_start, week_end)
+    reviews_due = db.query(ScheduledReview).filter(
+        ScheduledReview.user_id == user.id, ScheduledReview.scheduled_for <= now
+    ).count()
+    return render_template("weekly_digest.html", {
+        "first_name": user.first_name, "week_start": "", "week_end": "",
+        "questions_answered": stats["questions_answered"], "accuracy": stats["accuracy"],
+        "current_streak": 0, "best_streak": 0, "streak_at_risk": False,
+        "predicted_score": None, "score_change": None, "weak_areas": weak_areas,
+        "reviews_due": reviews_due, "study_url": "", "unsubscribe_url": ""
+    })
+
+
+async def run(args, now):
+    db = SessionLocal()
+    try:
+        week_start, week_end = weekly_digest.digest_week(now)
+        users = db.query(User).order_by(User.id).limit(args.legacy_users).all()
+        total_users = db.query(User).count()
+
+        print("\nPreparation and rendering (dry run)")
+        start = time.perf_counter()
+        for user in users:
+            legacy_prepare(db, user, week_start, week_end, now)
+        per_user = (time.perf_counter() - start) / max(1, len(users))
+        print(f"  {'per-user loop (projected)':<34} {per_user * total_users * 1000:10.1f}ms  "
+              f"({1 / per_user if per_user else 0:.0f} users/sec)")
+
+        result = await weekly_digest.run_weekly_digests(db, now=now, dry_run=True)
+        print(f"  {'run_weekly_digests(dry_run=True)':<34} {result.elapsed_seconds * 1000:10.1f}ms  "
+              f"({result.rendered} digests, {result.digests_per_second:.0f} digests/sec)")
+
+        stub = StubResend(args.latency_ms / 1000)
+        email_module._resend = stub
+        print(f"\nFull run ({args.latency_ms}ms per provider call)")
+        sequential = result.rendered * args.latency_ms + per_user * total_users * 1000
+        print(f"  {'per-user loop (projected)':<34} {sequential:10.1f}ms")
+        result = await weekly_digest.run_weekly_digests(db, now=now)
+        print(f"  {'run_weekly_digests':<34} {result.elapsed_seconds * 1000:10.1f}ms  "
+              f"({result.sent} sent in {stub.calls} provider calls, {result.digests_per_second:.0f} digests/sec)")
+
+        stub.calls = 0
+        rerun = await weekly_digest.run_weekly_digests(db, now=now)
+        print(f"  {'rerun (checkpoint)':<34} {rerun.elapsed_seconds * 1000:10.1f}ms  "
+              f"({rerun.already_sent} already sent, {rerun.sent} sent, {stub.calls} provider calls)")
+        assert rerun.sent == 0 and rerun.already_sent == result.sent
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the weekly digest pipeline")
+    parser.add_argument("--users", type=int, default=20_000, help="Seeded users")
+    parser.add_argument("--legacy-users", type=int, default=200, help="Users to time in the per-user loop before projecting")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Stub provider latency per call")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    print(f"Seeding {args.users} users...")
+    seed(args.users, now, rng)
+
+    asyncio.run(run(args, now))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build the Originality Corpus Snapshot
+
+Normalizes and shingles every question vignette once and writes the
+result as a new memory-mappable snapshot version (see
+app/services/originality_snapshot.py). Workers opening an
+OriginalityChecker map the current version instead of scanning the
+questions table. Run after bulk imports, or on a schedule to fold the
+delta log back into the arrays.
+
+Usage:
+    cd backend
+    python -m scripts.build_originality_snapshot
+
+Environment Variables:
+    DATABASE_URL: Database connection string
+    ORIGINALITY_SNAPSHOT_DIR: Snapshot root (default: backend/data/originality_snapshot)
+    ORIGINALITY_SNAPSHOT_KEEP_VERSIONS: Version directories to keep (default: 2)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.services.originality_checker import OriginalityChecker
+
+
+def main():
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        checker = OriginalityChecker(db)
+        path = checker.build_snapshot()
+        print(f"Snapshot written to {path} in {time.perf_counter() - start:.1f}s")
+        return 0
+
+    except Exception as e:
+        print(f"Snapshot build failed: {e}", file=sys.stderr)
+        return 1
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,10 @@ from sqlalchemy.orm import sessionmaker, Session
 os.environ["DATABASE_URL"] = "sqlite:///./test_shelfsense.db"
 os.environ["OPENAI_API_KEY"] = "test-key-not-real"
 os.environ["ENABLE_POOL_WARMING"] = "false"
+# Run post-answer side-effects inline on the test session (workers use their own sessions)
+os.environ["POST_ANSWER_PIPELINE_ENABLED"] = "false"
+# Rate-limit usage stays in memory; tests call UsageCounters.flush() explicitly
+os.environ["RATE_LIMIT_FLUSH_SECONDS"] = "0"
 
 from app.main import app
 from app.database import Base, get_db
@@ -75,6 +79,26 @@ def db() -> Generator[Session, None, None]:
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_app_cache():
+    """Clear the in-process app cache so cached per-user state doesn't leak between tests"""
+    from app.utils.cache import cache
+    from app.services import learning_snapshot, peer_distribution, question_index, review_queue, usage_counters
+    cache.clear()
+    usage_counters._usage_counters = None
+    learning_snapshot._store = learning_snapshot.InMemorySnapshotStore()
+    peer_distribution._store = peer_distribution.PeerDistributionStore()
+    review_queue._review_queue = review_queue.ReviewQueue(backend=review_queue.InMemoryReviewQueueBackend())
+    question_index._question_index = None
+    yield
+    cache.clear()
+    usage_counters._usage_counters = None
+    learning_snapshot._store = learning_snapshot.InMemorySnapshotStore()
+    peer_distribution._store = peer_distribution.PeerDistributionStore()
+    review_queue._review_queue = None
+    question_index._question_index = None
+
+
 @pytest.fixture(scope="function")
 def client(db: Session) -> Generator[TestClient, None, None]:
     """Provide FastAPI test client with database override"""
@@ -324,6 +348,45 @@ def mock_openai_explanation(sample_explanation: Dict):
     openai_module._client = None
 
 
+class StubResend:
+    """Records Resend sends instead of calling the API."""
+
+    def __init__(self):
+        self.batches = []  # one list of payloads per Batch.send / Emails.send call
+
+        stub = self
+
+        class Batch:
+            @staticmethod
+            def send(payloads):
+                stub.batches.append(payloads)
+                return {"data": [{"id": f"msg-{len(stub.batches)}-{i}"} for i in range(len(payloads))]}
+
+        class Emails:
+            @staticmethod
+            def send(payload):
+                stub.batches.append([payload])
+                return {"id": f"single-{len(stub.batches)}"}
+
+        self.Batch = Batch
+        self.Emails = Emails
+
+    @property
+    def sent(self) -> list[str]:
+        """Recipient address of every email sent, in send order"""
+        return [payload["to"][0] for batch in self.batches for payload in batch]
+
+
+@pytest.fixture
+def mock_resend():
+    """Replace the cached Resend client with a StubResend"""
+    import app.services.email.email_service as email_module
+
+    stub = StubResend()
+    with patch.object(email_module, '_resend', stub):
+        yield stub
+
+
 # =========================================================================
 # Helper Functions
 # =========================================================================
@@ -0,0 +1,96 @@
+"""
+Tests for set-based engagement classification in admin analytics.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, User, UserEngagementScore
+from app.services.admin_analytics_service import (
+    _calculate_health_distribution,
+    calculate_user_engagement_score,
+    get_users_at_risk,
+    run_user_engagement_batch,
+)
+
+
+def _make_user(db: Session, user_id: str) -> User:
+    user = User(id=user_id, full_name=user_id, first_name=user_id, email=f"{user_id}@example.com")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _answer(db: Session, user: User, question: Question, days_ago: float, count: int = 1):
+    for _ in range(count):
+        db.add(QuestionAttempt(
+            user_id=user.id,
+            question_id=question.id,
+            user_answer="D",
+            is_correct=True,
+            attempted_at=datetime.utcnow() - timedelta(days=days_ago)
+        ))
+    db.commit()
+
+
+@pytest.fixture
+def engagement_users(db: Session, test_user: User, test_question: Question):
+    """One active, one at-risk, one churned and one new user."""
+    at_risk = _make_user(db, "at-risk-user")
+    churned = _make_user(db, "churned-user")
+    _make_user(db, "new-user")
+
+    _answer(db, test_user, test_question, days_ago=1, count=6)
+    _answer(db, at_risk, test_question, days_ago=10, count=2)
+    _answer(db, churned, test_question, days_ago=40)
+    return test_user, at_risk, churned
+
+
+class TestEngagementClassification:
+    """Grouped activity queries and the materialized score table"""
+
+    @pytest.mark.integration
+    def test_distribution_on_the_fly(self, db: Session, engagement_users):
+        distribution = _calculate_health_distribution(db)
+
+        assert distribution["active"] == 1
+        assert distribution["at_risk"] == 1
+        assert distribution["churned"] == 1
+        assert distribution["new"] >= 1
+
+    @pytest.mark.integration
+    def test_single_user_score(self, db: Session, engagement_users):
+        active, _, _ = engagement_users
+
+        engagement = calculate_user_engagement_score(db, active.id)
+
+        assert engagement["engagement_status"] == "active"
+        assert engagement["engagement_score"] == 86
+        assert engagement["questions_last_7_days"] == 6
+        assert engagement["days_since_last_activity"] == 1
+        assert "no_sessions_this_week" in engagement["churn_risk_factors"]
+
+    @pytest.mark.integration
+    def test_at_risk_without_precomputed_scores(self, db: Session, engagement_users):
+        at_risk = get_users_at_risk(db)
+
+        assert [entry["user_id"] for entry in at_risk] == ["at-risk-user"]
+        assert at_risk[0]["email"] == "at-risk-user@example.com"
+        assert at_risk[0]["days_since_activity"] == 10
+
+    @pytest.mark.integration
+    def test_batch_upserts_scores(self, db: Session, engagement_users):
+        active, at_risk, _ = engagement_users
+
+        first = run_user_engagement_batch(db, batch_size=2)
+        _answer(db, at_risk, db.query(Question).first(), days_ago=0, count=5)
+        second = run_user_engagement_batch(db, batch_size=2)
+
+        assert first["users_processed"] == second["users_processed"]
+        assert db.query(UserEngagementScore).count() == second["users_processed"]
+        score = db.query(UserEngagementScore).filter(UserEngagementScore.user_id == at_risk.id).one()
+        assert score.engagement_status == "active"
+        assert score.questions_last_7_days == 5
+        assert get_users_at_risk(db) == []
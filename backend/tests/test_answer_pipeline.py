@@ -0,0 +1,170 @@
+"""
+Tests for the deferred post-answer pipeline.
+"""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.dependencies.auth import get_current_user
+from app.main import app
+from app.models.models import User, Question, ScheduledReview
+from app.services.answer_pipeline import (
+    AnswerEvent,
+    PostAnswerPipeline,
+    get_answer_effects,
+    STATUS_DONE,
+    STATUS_PENDING,
+)
+
+
+@pytest.fixture
+def pipeline_db(tmp_path):
+    """Separate committed database for worker sessions"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pipeline.db",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _event(user_id: str) -> AnswerEvent:
+    return AnswerEvent(
+        attempt_id=str(uuid.uuid4()),
+        user_id=user_id,
+        question_id=str(uuid.uuid4()),
+        is_correct=True,
+        user_answer="A",
+        source="Surgery - NBME",
+        specialty="surgery",
+        confidence_level=4,
+        concepts=["cholecystitis"]
+    )
+
+
+class TestPostAnswerPipeline:
+    """Queued and inline processing of answer side-effects"""
+
+    @pytest.mark.integration
+    def test_worker_batches_apply_effects(self, pipeline_db):
+        engine, session_factory = pipeline_db
+        pipeline = PostAnswerPipeline(
+            enabled=True, workers=2, batch_size=10, batch_wait_ms=50,
+            session_factory=session_factory, bind=engine
+        )
+        events = [_event("pipeline-user") for _ in range(12)]
+        try:
+            for event in events:
+                assert pipeline.submit(None, event) is None
+                assert get_answer_effects(event.attempt_id)["status"] in (STATUS_PENDING, STATUS_DONE)
+            assert pipeline.drain(timeout=30)
+        finally:
+            pipeline.shutdown()
+
+        for event in events:
+            result = get_answer_effects(event.attempt_id)
+            assert result["status"] == STATUS_DONE
+            assert result["user_id"] == "pipeline-user"
+
+        db = session_factory()
+        try:
+            assert db.query(ScheduledReview).filter(ScheduledReview.user_id == "pipeline-user").count() == 12
+        finally:
+            db.close()
+
+        stats = pipeline.get_stats()
+        assert stats["processed"] == 12
+        assert stats["failed"] == 0
+        assert stats["batches"] < 12
+        assert stats["queue_depth"] == 0
+
+    @pytest.mark.integration
+    def test_full_queue_runs_inline(self, pipeline_db, monkeypatch):
+        engine, session_factory = pipeline_db
+        pipeline = PostAnswerPipeline(enabled=True, queue_size=1, session_factory=session_factory, bind=engine)
+        monkeypatch.setattr(pipeline, "_ensure_started", lambda: None)
+
+        db = session_factory()
+        try:
+            assert pipeline.submit(db, _event("backpressure-user")) is None
+            effects = pipeline.submit(db, _event("backpressure-user"))
+        finally:
+            db.close()
+
+        assert effects is not None
+        assert "badges_awarded" in effects
+        stats = pipeline.get_stats()
+        assert stats["enqueued"] == 1
+        assert stats["inline"] == 1
+        assert stats["queue_depth"] == 1
+
+
+    @pytest.mark.unit
+    def test_events_sharded_by_user(self, monkeypatch):
+        bind = MagicMock()
+        bind.dialect.name = "postgresql"
+        pipeline = PostAnswerPipeline(enabled=True, workers=4, queue_size=100, bind=bind)
+        monkeypatch.setattr(pipeline, "_ensure_started", lambda: None)
+
+        users = [f"shard-user-{i}" for i in range(8)]
+        submitted = {user: [] for user in users}
+        for _ in range(3):
+            for user in users:
+                event = _event(user)
+                submitted[user].append(event.attempt_id)
+                assert pipeline.submit(None, event) is None
+
+        queued = {}
+        for shard, events in enumerate(pipeline._queues):
+            while not events.empty():
+                event = events.get_nowait()
+                assert pipeline._shard(event.user_id) == shard
+                queued.setdefault(event.user_id, []).append(event.attempt_id)
+
+        # Each user's events sit on one worker's queue, in submit order
+        assert queued == submitted
+        assert pipeline.get_stats()["queue_capacity"] == 100
+
+class TestSubmitEffectsEndpoint:
+    """Polling deferred results through the API"""
+
+    @pytest.fixture
+    def authed_client(self, client: TestClient, test_user: User) -> TestClient:
+        app.dependency_overrides[get_current_user] = lambda: test_user
+        return client
+
+    @pytest.mark.api
+    def test_submit_returns_attempt_and_effects_poll(
+        self, authed_client: TestClient, test_user: User, test_question: Question
+    ):
+        response = authed_client.post(
+            "/api/questions/submit",
+            json={
+                "user_id": test_user.id,
+                "question_id": test_question.id,
+                "user_answer": test_question.answer_key,
+                "time_spent_seconds": 90,
+                "confidence_level": 4
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["attempt_id"]
+        # Tests run the pipeline inline, so nothing is pending
+        assert data["effects_pending"] is False
+
+        poll = authed_client.get(f"/api/questions/submit/{data['attempt_id']}/effects")
+        assert poll.status_code == 200
+        assert poll.json()["status"] == STATUS_DONE
+
+    @pytest.mark.api
+    def test_poll_unknown_attempt(self, authed_client: TestClient):
+        response = authed_client.get("/api/questions/submit/does-not-exist/effects")
+        assert response.status_code == 404
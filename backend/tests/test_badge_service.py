@@ -0,0 +1,140 @@
+"""
+Tests for incremental badge evaluation.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.models import User, Question, QuestionAttempt, UserBadge, UserBadgeCounters
+from app.services.badge_service import BadgeService
+
+
+def _attempt(db: Session, user: User, question: Question, is_correct: bool, attempted_at: datetime):
+    attempt = QuestionAttempt(
+        user_id=user.id,
+        question_id=question.id,
+        user_answer="A" if is_correct else "B",
+        is_correct=is_correct,
+        attempted_at=attempted_at
+    )
+    db.add(attempt)
+    db.commit()
+    return attempt
+
+
+class TestBadgeCounters:
+    """Running counters and incremental awarding"""
+
+    @pytest.mark.integration
+    def test_rebuild_counts_runs_and_time_windows(self, db: Session, test_user: User, test_question: Question):
+        day = datetime(2026, 1, 5)
+        pattern = [True, True, False, True, True, True]
+        for i, is_correct in enumerate(pattern):
+            _attempt(db, test_user, test_question, is_correct, day + timedelta(hours=3 + i))
+
+        counters = BadgeService().rebuild_counters(db, test_user.id)
+
+        assert counters.total_answered == 6
+        assert counters.total_correct == 5
+        assert counters.current_correct_run == 3
+        assert counters.best_correct_run == 3
+        assert counters.night_owl_at == day + timedelta(hours=3)
+        assert counters.early_bird_at == day + timedelta(hours=5)
+
+    @pytest.mark.integration
+    def test_record_answer_matches_rebuild(self, db: Session, test_user: User, test_question: Question):
+        service = BadgeService()
+        service.rebuild_counters(db, test_user.id)
+
+        start = datetime(2026, 1, 5, 12)
+        for i, is_correct in enumerate([True, False, True, True]):
+            attempt = _attempt(db, test_user, test_question, is_correct, start + timedelta(minutes=i))
+            incremental = service.record_answer(db, test_user.id, is_correct, attempt.attempted_at)
+
+        snapshot = (incremental.total_answered, incremental.total_correct,
+                    incremental.current_correct_run, incremental.best_correct_run)
+        rebuilt = service.rebuild_counters(db, test_user.id)
+
+        assert snapshot == (4, 3, 2, 2)
+        assert snapshot == (rebuilt.total_answered, rebuilt.total_correct,
+                            rebuilt.current_correct_run, rebuilt.best_correct_run)
+
+    @pytest.mark.integration
+    def test_rebuild_before_increment_does_not_double_count(
+        self, db: Session, test_user: User, test_question: Question
+    ):
+        service = BadgeService()
+        start = datetime(2026, 1, 5, 12)
+        _attempt(db, test_user, test_question, True, start)
+        service.rebuild_counters(db, test_user.id)
+
+        # Rebuild lands between the attempt commit and the pipeline's +1
+        attempt = _attempt(db, test_user, test_question, True, start + timedelta(minutes=1))
+        service.rebuild_counters(db, test_user.id)
+        counters = service.record_answer(db, test_user.id, True, attempt.attempted_at)
+
+        assert (counters.total_answered, counters.current_correct_run) == (2, 2)
+
+        attempt = _attempt(db, test_user, test_question, False, start + timedelta(minutes=2))
+        counters = service.record_answer(db, test_user.id, False, attempt.attempted_at)
+
+        assert (counters.total_answered, counters.total_correct, counters.current_correct_run) == (3, 2, 0)
+
+    @pytest.mark.integration
+    def test_answer_trigger_awards_without_scanning_attempts(
+        self, db: Session, test_user: User, test_question: Question
+    ):
+        service = BadgeService()
+        db.add(UserBadgeCounters(
+            user_id=test_user.id, total_answered=49, total_correct=45,
+            current_correct_run=4, best_correct_run=4
+        ))
+        db.commit()
+        attempted_at = _attempt(db, test_user, test_question, True, datetime(2026, 1, 5, 12)).attempted_at
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            awarded = service.check_and_award_badges(db, test_user.id, trigger_context={
+                "question_answered": True,
+                "is_correct": True,
+                "attempted_at": attempted_at,
+                "streak_current": 1
+            })
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        assert {b["id"] for b in awarded} == {"questions_50", "accuracy_streak_5", "first_question"}
+        assert not any("question_attempts" in s for s in statements)
+        assert not any("study_sessions" in s for s in statements)
+
+    @pytest.mark.integration
+    def test_backfill_streams_all_users(self, db: Session, test_user: User, test_question: Question):
+        other = User(id="badge-other-user", full_name="Other", first_name="Other", email="other@badge.test")
+        db.add(other)
+        db.commit()
+        _attempt(db, test_user, test_question, True, datetime(2026, 1, 5, 12))
+        _attempt(db, other, test_question, False, datetime(2026, 1, 5, 12))
+        _attempt(db, other, test_question, True, datetime(2026, 1, 5, 13))
+
+        users = BadgeService().backfill_counters(db, batch_size=1)
+
+        assert users == 2
+        counters = {c.user_id: c for c in db.query(UserBadgeCounters).all()}
+        assert counters[test_user.id].total_correct == 1
+        assert counters[other.id].total_answered == 2
+        assert counters[other.id].current_correct_run == 1
+
+    @pytest.mark.integration
+    def test_session_trigger_only_checks_perfect_session(self, db: Session, test_user: User):
+        awarded = BadgeService().check_and_award_badges(
+            db, test_user.id, trigger_context={"session_completed": True}
+        )
+
+        assert awarded == []
+        assert db.query(UserBadge).filter(UserBadge.user_id == test_user.id).count() == 0
+        assert db.query(UserBadgeCounters).filter(UserBadgeCounters.user_id == test_user.id).count() == 0
@@ -4,6 +4,10 @@ Tests for Batch Validation Pipeline
 Validates the validators to ensure quality gates work correctly.
 """
 
+import asyncio
+import json
+import time
+
 import pytest
 from datetime import datetime
 from typing import List, Dict
@@ -14,6 +18,11 @@ from app.services.batch_validation_pipeline import (
     ValidationResult,
     BatchValidationReport
 )
+from app.services.multi_model_validator import (
+    MultiModelValidator,
+    ValidationStatus,
+    ValidatorModel
+)
 
 
 # Test fixtures
@@ -119,6 +128,27 @@ def sample_questions() -> List[Dict]:
     ]
 
 
+@pytest.fixture
+def stage1_failing_question() -> Dict:
+    """Question Stage 1 rejects: vague findings with no values, "All of the above" choice"""
+    return {
+        "id": "q_stage1_fail",
+        "vignette": "A patient is sick with elevated blood pressure. What do you do?",
+        "choices": [
+            "A. Do nothing",
+            "B. Give medicine",
+            "C. Call doctor",
+            "D. Send home",
+            "E. All of the above"
+        ],
+        "answer_key": "B",
+        "explanation": {
+            "quick_answer": "Give medicine."
+        },
+        "specialty": "internal_medicine"
+    }
+
+
 @pytest.fixture
 def mock_db(mocker):
     """Mock database session"""
@@ -360,5 +390,120 @@ class TestIntegration:
         assert report.estimated_cost < 1.0
 
 
+def fake_llm(latency: float, status: str = "ACCEPT", score: float = 90, medical_accuracy: float = 90):
+    """Fake validator model: fixed latency, canned JSON verdict, tracks concurrency."""
+    state = {"calls": 0, "in_flight": 0, "max_in_flight": 0, "cancelled": 0}
+
+    async def call(prompt: str):
+        state["calls"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        finally:
+            state["in_flight"] -= 1
+        return json.dumps({
+            "status": status,
+            "overall_score": score,
+            "medical_accuracy": medical_accuracy,
+            "distractor_quality": score,
+            "vignette_quality": score,
+            "issues": [],
+            "suggestions": []
+        })
+
+    return call, state
+
+
+class TestConcurrentValidation:
+    """Concurrent fan-out, ordering and gate cancellation with a fake LLM"""
+
+    def _batch(self, question: Dict, n: int) -> List[Dict]:
+        return [{**question, "id": f"q_{i}"} for i in range(n)]
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order_and_respect_model_limit(
+        self, sample_questions, stage1_failing_question, mock_db
+    ):
+        pipeline = BatchValidationPipeline(mock_db)
+        validator = pipeline.multi_model_validator
+        validator.model_concurrency[ValidatorModel.CLAUDE_HAIKU] = 4
+        validator._call_claude_haiku, state = fake_llm(0.01)
+
+        batch = self._batch(sample_questions[0], 12) + self._batch(stage1_failing_question, 3)
+        report = await pipeline.validate_batch(batch, enable_gates=True, concurrency=16)
+
+        assert report.total_questions == 15
+        assert report.stage_breakdown["stage1_passed"] == 12
+        assert report.stage_breakdown["stage2_passed"] == 12
+        assert state["calls"] == 12
+        assert state["max_in_flight"] == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_speeds_up_llm_bound_batch(self, sample_questions, mock_db):
+        pipeline = BatchValidationPipeline(mock_db)
+        pipeline.multi_model_validator._call_claude_haiku, _ = fake_llm(0.1)
+        batch = self._batch(sample_questions[0], 16)
+
+        start = time.perf_counter()
+        await pipeline.validate_batch(batch, enable_gates=False, concurrency=1)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = await pipeline.validate_batch(batch, enable_gates=False, concurrency=8)
+        concurrent = time.perf_counter() - start
+
+        assert report.stage_breakdown["stage2_passed"] == 16
+        assert sequential / concurrent > 2
+
+    @pytest.mark.asyncio
+    async def test_stop_gate_cancels_in_flight_validations(self, sample_questions, mock_db):
+        pipeline = BatchValidationPipeline(mock_db)
+        pipeline.multi_model_validator._call_claude_haiku, state = fake_llm(
+            0.01, status="REJECT", score=20, medical_accuracy=10
+        )
+        batch = self._batch(sample_questions[0], 200)
+
+        report = await pipeline.validate_batch(batch, enable_gates=True, concurrency=8)
+
+        stop = [f for f in report.quality_gate_failures if f["action"] == "STOP_GENERATION"]
+        assert len(stop) == 1
+        assert report.critical_issues_count == pipeline.MAX_CRITICAL_ISSUES + 1
+        assert report.rejected == pipeline.MAX_CRITICAL_ISSUES + 1
+        assert state["calls"] < len(batch)
+        assert state["cancelled"] > 0
+        assert state["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_multi_model_batch_stops_on_reject_streak(self, sample_questions):
+        validator = MultiModelValidator(model_concurrency={ValidatorModel.CLAUDE_HAIKU: 4})
+        validator._call_claude_haiku, state = fake_llm(0.01, status="REJECT", score=20)
+
+        results = await validator.validate_batch(sample_questions[:1] * 50, stop_on_reject_streak=5)
+
+        assert len(results) == 5
+        assert all(r.status == ValidationStatus.REJECT for r in results)
+        assert state["calls"] < 50
+        assert state["max_in_flight"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_multi_model_indexed_batch_maps_results_to_input(self, sample_questions):
+        validator = MultiModelValidator(model_concurrency={ValidatorModel.CLAUDE_HAIKU: 4})
+        validator._call_claude_haiku, _ = fake_llm(0.01)
+
+        pairs = await validator.validate_batch_indexed(self._batch(sample_questions[0], 10))
+        assert [i for i, _ in pairs] == list(range(10))
+        assert all(result.status == ValidationStatus.ACCEPT for _, result in pairs)
+
+        validator._call_claude_haiku, _ = fake_llm(0.01, status="REJECT", score=20)
+        pairs = await validator.validate_batch_indexed(sample_questions[:1] * 50, stop_on_reject_streak=5)
+        indices = [i for i, _ in pairs]
+        assert len(indices) == 5
+        assert indices == sorted(set(indices))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
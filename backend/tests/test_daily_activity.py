@@ -0,0 +1,91 @@
+"""
+Tests for the per-user daily activity rollup.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, User, UserDailyActivity
+from app.services.daily_activity import (
+    backfill_daily_activity,
+    get_current_streak,
+    get_daily_activity,
+    record_daily_activity,
+)
+from app.services.email.weekly_digest import get_weekly_stats
+
+
+def _attempt(db: Session, user: User, question: Question, is_correct: bool, days_ago: int = 0,
+             time_spent: int = 60, confidence: int = None):
+    attempted_at = datetime.utcnow() - timedelta(days=days_ago)
+    db.add(QuestionAttempt(
+        user_id=user.id,
+        question_id=question.id,
+        user_answer="D" if is_correct else "A",
+        is_correct=is_correct,
+        time_spent_seconds=time_spent,
+        confidence_level=confidence,
+        attempted_at=attempted_at
+    ))
+    record_daily_activity(db, user.id, question.specialty, is_correct, time_spent, confidence, attempted_at)
+    db.commit()
+
+
+class TestDailyActivityRollup:
+    """Incremental maintenance, backfill and reads"""
+
+    @pytest.mark.integration
+    def test_record_updates_one_row_per_day(self, db: Session, test_user: User, test_question: Question):
+        _attempt(db, test_user, test_question, True, time_spent=30, confidence=4)
+        _attempt(db, test_user, test_question, False, time_spent=90)
+        _attempt(db, test_user, test_question, True, days_ago=2)
+
+        days = get_daily_activity(db, test_user.id)
+
+        assert [d.questions_answered for d in days] == [1, 2]
+        today = days[-1]
+        assert today.questions_correct == 1
+        assert today.avg_time_seconds == pytest.approx(60)
+        assert (today.confidence_sum, today.confidence_answers) == (4, 1)
+        assert db.query(UserDailyActivity).filter(UserDailyActivity.user_id == test_user.id).count() == 2
+
+    @pytest.mark.integration
+    def test_specialty_filter_and_range(self, db: Session, test_user: User, test_question: Question):
+        other = Question(
+            vignette="Other", answer_key="A", choices=["A", "B"], specialty="surgery"
+        )
+        db.add(other)
+        db.commit()
+        _attempt(db, test_user, test_question, True)
+        _attempt(db, test_user, other, False)
+        _attempt(db, test_user, other, True, days_ago=40)
+
+        surgery = get_daily_activity(db, test_user.id, specialty="surgery")
+        recent = get_daily_activity(db, test_user.id, start_day=(datetime.utcnow() - timedelta(days=30)).date())
+
+        assert [d.questions_answered for d in surgery] == [1, 1]
+        assert len(recent) == 1
+        assert recent[0].questions_answered == 2
+
+    @pytest.mark.integration
+    def test_backfill_matches_incremental(self, db: Session, test_user: User, test_question: Question):
+        _attempt(db, test_user, test_question, True, confidence=3)
+        _attempt(db, test_user, test_question, False, days_ago=1)
+        _attempt(db, test_user, test_question, True, days_ago=1, time_spent=None)
+        incremental = get_daily_activity(db, test_user.id)
+
+        assert backfill_daily_activity(db, user_id=test_user.id) == 2
+        assert get_daily_activity(db, test_user.id) == incremental
+
+    @pytest.mark.integration
+    def test_streak_and_weekly_stats(self, db: Session, test_user: User, test_question: Question):
+        for days_ago in (1, 2, 3, 5):
+            _attempt(db, test_user, test_question, days_ago != 5, days_ago=days_ago)
+
+        assert get_current_streak(db, test_user.id) == 3
+
+        week_end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        stats = get_weekly_stats(db, test_user.id, week_end - timedelta(days=7), week_end)
+        assert stats == {"questions_answered": 4, "accuracy": 75, "study_days": 4, "correct_count": 3}
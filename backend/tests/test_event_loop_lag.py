@@ -0,0 +1,147 @@
+"""
+Tests for keeping the event loop free during database work
+
+Covers run_db thread offload with concurrent slow queries, the event loop
+lag monitor, and an async route that keeps serving other requests while
+its queries run.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+
+from app.database import run_db
+from app.middleware.performance_monitor import EventLoopLagMonitor, get_performance_summary
+
+SLOW_QUERY_SECONDS = 0.2
+
+
+@pytest.fixture
+def slow_engine(tmp_path):
+    """SQLite engine with a sleep(seconds) SQL function to simulate slow queries"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/slow.db",
+        connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(engine, "connect")
+    def register_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep", 1, lambda s: time.sleep(s) or s)
+
+    yield engine
+    engine.dispose()
+
+
+def slow_query(engine) -> float:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT sleep(:s)"), {"s": SLOW_QUERY_SECONDS}).scalar()
+
+
+@pytest.fixture
+async def lag_monitor():
+    monitor = EventLoopLagMonitor(interval=0.01, stall_threshold=0.05)
+    monitor.start()
+    yield monitor
+    await monitor.stop()
+
+
+class TestEventLoopLagMonitor:
+    """Lag samples and stall detection"""
+
+    async def test_blocking_call_is_a_stall(self, lag_monitor):
+        await asyncio.sleep(0.05)
+        time.sleep(SLOW_QUERY_SECONDS)  # blocks the loop
+        await asyncio.sleep(0.05)
+
+        stats = lag_monitor.get_stats()
+        assert stats["running"]
+        assert stats["stalls"] >= 1
+        assert stats["max_ms"] >= SLOW_QUERY_SECONDS * 1000 * 0.8
+
+    async def test_stop_and_reset(self, lag_monitor):
+        await asyncio.sleep(0.05)
+        assert lag_monitor.get_stats()["samples"] > 0
+
+        await lag_monitor.stop()
+        lag_monitor.reset()
+        stats = lag_monitor.get_stats()
+        assert not stats["running"]
+        assert stats["samples"] == 0 and stats["max_ms"] == 0
+
+    def test_exported_with_performance_stats(self):
+        summary = get_performance_summary()
+        assert set(summary) == {"endpoints", "slow_requests", "event_loop"}
+        assert "p95_ms" in summary["event_loop"]
+
+
+class TestRunDb:
+    """Slow queries awaited via run_db do not stall the loop"""
+
+    async def test_concurrent_slow_queries_keep_loop_responsive(self, slow_engine, lag_monitor):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*[run_db(slow_query, slow_engine) for _ in range(8)])
+        elapsed = time.perf_counter() - start
+        ticking.cancel()
+
+        assert results == [SLOW_QUERY_SECONDS] * 8
+        # Queries overlap instead of running back to back
+        assert elapsed < SLOW_QUERY_SECONDS * 4
+        assert ticks >= 5
+        assert lag_monitor.get_stats()["stalls"] == 0
+
+    async def test_inline_queries_stall_the_loop(self, slow_engine, lag_monitor):
+        await asyncio.sleep(0.02)
+        slow_query(slow_engine)
+        await asyncio.sleep(0.02)
+        assert lag_monitor.get_stats()["stalls"] >= 1
+
+    async def test_exceptions_propagate(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await run_db(fail)
+
+
+class TestAsyncRouteServing:
+    """Other requests are served while an async route waits on slow queries"""
+
+    async def test_ping_served_during_slow_requests(self, slow_engine):
+        app = FastAPI()
+
+        @app.get("/slow")
+        async def slow():
+            return {"value": await run_db(slow_query, slow_engine)}
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow_requests = [asyncio.create_task(client.get("/slow")) for _ in range(4)]
+            await asyncio.sleep(0.02)
+
+            start = time.perf_counter()
+            ping_response = await client.get("/ping")
+            ping_seconds = time.perf_counter() - start
+
+            assert ping_response.status_code == 200
+            assert ping_seconds < SLOW_QUERY_SECONDS / 2
+            assert not all(task.done() for task in slow_requests)
+
+            responses = await asyncio.gather(*slow_requests)
+            assert all(r.json() == {"value": SLOW_QUERY_SECONDS} for r in responses)
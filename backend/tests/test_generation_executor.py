@@ -0,0 +1,281 @@
+"""
+Tests for the pipelined question generation executor.
+
+Uses a fake agent with fixed step latency (no LLM or database) to cover
+the stage DAG, shared per-specialty analysis, early-abort retries,
+per-worker sessions, rate limiting and the latency histograms.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.generation_executor import (
+    STAGES,
+    GenerationExecutor,
+    RateLimiter,
+)
+
+STEP_SECONDS = 0.02
+
+CHOICES = {
+    "choices": ["A. Aspirin", "B. Heparin", "C. Alteplase", "D. Clopidogrel", "E. Nitroglycerin"],
+    "correct_answer_letter": "A",
+}
+
+
+class FakeAgent:
+    """Stands in for QuestionGenerationAgent; records which thread ran each step."""
+
+    instances = []
+    lock = threading.Lock()
+
+    def __init__(self, db, model="gpt-4o"):
+        self.db = db
+        self.model = model
+        self.calls = []
+        with FakeAgent.lock:
+            FakeAgent.instances.append(self)
+
+    def _step(self, name, value):
+        time.sleep(STEP_SECONDS)
+        with FakeAgent.lock:
+            self.calls.append((name, threading.current_thread().name, time.perf_counter()))
+        return value
+
+    def _get_example_questions(self, specialty, limit=5):
+        return self._step("examples", [{"vignette": "v", "choices": list("ABCDE"), "answer": "A"}])
+
+    def step1_analyze_examples(self, specialty, examples):
+        return self._step("analysis", {"specialty": specialty})
+
+    def step2_create_clinical_scenario(self, specialty, topic, question_type, setting, analysis, difficulty):
+        return self._step("scenario", {"specialty": specialty, "topic": topic})
+
+    def step3_generate_answer_choices(self, scenario, specialty, difficulty):
+        return self._step("choices", CHOICES)
+
+    def step4_write_vignette(self, scenario, analysis):
+        return self._step("vignette", f"  A patient with {scenario['topic']}.  ")
+
+    def step5_create_explanation(self, scenario, choices_data):
+        return self._step("explanation", {"principle": "Aspirin first"})
+
+    def step6_quality_validation(self, vignette, choices_data, explanation, scenario, specialty):
+        return self._step("validation", (True, []))
+
+    def score_clinical_scenario(self, scenario, specialty):
+        with FakeAgent.lock:
+            score = SCENARIO_SCORES.pop(0) if SCENARIO_SCORES else 0.9
+        return score, [] if score >= 0.6 else ["incomplete scenario"]
+
+    def score_answer_choices(self, choices_data):
+        return 0.8, []
+
+    def score_vignette(self, vignette, scenario):
+        return 0.85, []
+
+
+SCENARIO_SCORES = []
+
+
+def all_calls():
+    return [call for agent in FakeAgent.instances for call in agent.calls]
+
+
+@pytest.fixture
+def executor():
+    FakeAgent.instances = []
+    SCENARIO_SCORES.clear()
+    sessions = []
+
+    def session_factory():
+        session = MagicMock()
+        sessions.append(session)
+        return session
+
+    executor = GenerationExecutor(concurrency=4, llm_rpm=0, session_factory=session_factory,
+                                  agent_factory=FakeAgent)
+    executor.sessions_created = sessions
+    yield executor
+    executor.shutdown()
+
+
+class TestPipeline:
+    """Stage DAG and result shape"""
+
+    def test_generates_question_dict(self, executor):
+        question = executor.submit(specialty="Internal Medicine", topic="Acute MI").result(timeout=5)
+
+        assert question["vignette"] == "A patient with Acute MI."
+        assert question["choices"] == CHOICES["choices"]
+        assert question["answer_key"] == "A"
+        assert question["source"] == "AI Agent Generated - Internal Medicine"
+        metadata = question["metadata"]
+        assert metadata["generation_method"] == "multi_step_agent_pipelined"
+        assert metadata["quality_scores"] == {"scenario": 0.9, "choices": 0.8, "vignette": 0.85}
+        assert set(metadata["step_times"]) == {"scenario", "choices", "vignette", "explanation", "validation"}
+        assert metadata["attempts"] == 1
+
+    def test_stages_follow_dependencies(self, executor):
+        executor.submit(specialty="Surgery", topic="Appendicitis").result(timeout=5)
+
+        order = [name for name, _, _ in sorted(all_calls(), key=lambda c: c[2])]
+        assert order.index("examples") < order.index("analysis") < order.index("scenario")
+        assert order.index("choices") < order.index("explanation") < order.index("validation")
+        assert order.index("vignette") < order.index("validation")
+        # Step 4 only needs the scenario, so it runs alongside step 3
+        starts = {name: end - STEP_SECONDS for name, _, end in all_calls()}
+        assert abs(starts["vignette"] - starts["choices"]) < STEP_SECONDS
+
+    def test_questions_overlap_across_stages(self, executor):
+        start = time.perf_counter()
+        questions = executor.generate_batch(8, specialty="Pediatrics")
+        elapsed = time.perf_counter() - start
+
+        assert len(questions) == 8
+        # 8 questions x 5 per-question steps back to back would take 40 steps
+        assert elapsed < STEP_SECONDS * 40 / 2
+
+    def test_analysis_shared_per_specialty(self, executor):
+        executor.generate_batch(6, specialty="Psychiatry")
+        executor.submit(specialty="Surgery").result(timeout=5)
+
+        names = [name for name, _, _ in all_calls()]
+        assert names.count("analysis") == 2
+        assert names.count("examples") == 2
+        stats = executor.get_stats()
+        assert stats["analyses_computed"] == 2
+        assert stats["analyses_shared"] == 5
+
+
+class TestEarlyAbort:
+    """Scoring checkpoints restart from the scenario"""
+
+    def test_low_scenario_score_retries(self, executor):
+        SCENARIO_SCORES.extend([0.3])
+
+        question = executor.submit(specialty="Surgery", max_retries=2).result(timeout=5)
+
+        assert question["metadata"]["attempts"] == 2
+        names = [name for name, _, _ in all_calls()]
+        assert names.count("scenario") == 2
+        assert names.count("analysis") == 1  # Kept across retries
+        stats = executor.get_stats()
+        assert stats["aborts"]["scenario"] == 1
+        assert stats["retries"] == 1
+
+    def test_gives_up_after_max_retries(self, executor):
+        SCENARIO_SCORES.extend([0.3, 0.3])
+
+        future = executor.submit(specialty="Surgery", max_retries=1)
+        with pytest.raises(ValueError, match="after 2 attempts"):
+            future.result(timeout=5)
+
+        names = [name for name, _, _ in all_calls()]
+        assert "validation" not in names
+        assert executor.get_stats()["failed"] == 1
+
+    def test_batch_skips_failed_questions(self, executor):
+        SCENARIO_SCORES.extend([0.3, 0.3, 0.3, 0.3])
+
+        questions = executor.generate_batch(4, specialty="Surgery", max_retries=0)
+
+        assert len(questions) == 0
+        assert executor.get_stats()["failed"] == 4
+
+
+class TestWorkersAndStats:
+    """Per-worker sessions, rate limiting and stage histograms"""
+
+    def test_each_worker_has_own_session(self, executor):
+        executor.generate_batch(8, specialty="Surgery")
+
+        agents_by_thread = {}
+        for agent in FakeAgent.instances:
+            for _, thread_name, _ in agent.calls:
+                agents_by_thread.setdefault(thread_name, set()).add(id(agent))
+        assert all(len(ids) == 1 for ids in agents_by_thread.values())
+        assert len({id(agent.db) for agent in FakeAgent.instances}) == len(FakeAgent.instances)
+
+        executor.shutdown()
+        assert all(session.close.called for session in executor.sessions_created)
+
+    def test_examples_session_not_left_in_transaction(self, executor):
+        executor.generate_batch(2, specialty="Surgery")
+        executor.submit(specialty="Pediatrics").result(timeout=5)
+
+        examples_agents = [agent for agent in FakeAgent.instances
+                           if any(name == "examples" for name, _, _ in agent.calls)]
+        assert examples_agents
+        for agent in examples_agents:
+            examples_calls = sum(name == "examples" for name, _, _ in agent.calls)
+            assert agent.db.rollback.call_count == examples_calls
+
+    def test_stage_latency_histograms(self, executor):
+        executor.generate_batch(4, specialty="Surgery")
+
+        stats = executor.get_stats()
+        assert set(stats["stages"]) == set(STAGES)
+        scenario = stats["stages"]["scenario"]
+        assert scenario["count"] == 4
+        assert scenario["p50_ms"] in (10, 25)  # 20ms steps (plus sleep overshoot)
+        assert scenario["max_ms"] >= STEP_SECONDS * 1000
+        assert sum(scenario["histogram"].values()) == 4
+        assert stats["completed"] == 4 and stats["in_flight"] == 0
+
+    def test_rate_limiter_caps_calls(self):
+        limiter = RateLimiter(per_minute=600)  # 10 calls/second, burst of 10
+
+        start = time.perf_counter()
+        for _ in range(13):
+            limiter.acquire()
+        assert time.perf_counter() - start >= 0.25
+
+    def test_submit_after_shutdown_starts_again(self, executor):
+        executor.shutdown()
+        question = executor.submit(specialty="Surgery").result(timeout=5)
+        assert question["answer_key"] == "A"
+
+
+class TestCancellation:
+    """Timed-out questions stop scheduling and do not hold up the caller"""
+
+    def test_cancelled_question_starts_no_more_stages(self, executor):
+        future = executor.submit(specialty="Surgery", topic="Appendicitis")
+        time.sleep(STEP_SECONDS * 2.5)  # examples and analysis done, scenario running
+        assert future.cancel()
+        time.sleep(STEP_SECONDS * 6)
+
+        names = {name for name, _, _ in all_calls()}
+        assert "scenario" in names
+        assert not names & {"choices", "vignette", "explanation", "validation"}
+
+    def test_shutdown_without_wait_closes_sessions_later(self, executor):
+        executor.submit(specialty="Surgery")
+        time.sleep(STEP_SECONDS / 2)
+
+        start = time.perf_counter()
+        executor.shutdown(wait=False, cancel_pending=True)
+        assert time.perf_counter() - start < STEP_SECONDS
+
+        time.sleep(STEP_SECONDS * 3)
+        assert executor.sessions_created
+        assert all(session.close.called for session in executor.sessions_created)
+
+    def test_parallel_generation_timeout_returns_promptly(self, monkeypatch):
+        import concurrent.futures
+
+        from app.services.question_agent import QuestionGenerationAgent
+
+        monkeypatch.setitem(globals(), "STEP_SECONDS", 0.5)
+        FakeAgent.instances = []
+        agent = FakeAgent(MagicMock())
+
+        start = time.perf_counter()
+        with pytest.raises(concurrent.futures.TimeoutError):
+            QuestionGenerationAgent.generate_question_parallel(agent, specialty="Surgery", timeout=0.1)
+        # Waiting for the stage in flight would take until the 0.5s step ends
+        assert time.perf_counter() - start < 0.3
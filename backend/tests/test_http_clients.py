@@ -0,0 +1,128 @@
+"""
+Tests for the shared async HTTP client pools
+
+Covers client reuse per event loop, shutdown, and the async OpenAI/Ollama
+paths that ride on the pool.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.utils import http_clients
+from app.utils.http_clients import close_async_http_clients, get_async_http_client, get_pool_status
+from app.services.ollama_service import OllamaService
+from app.services.openai_service import CircuitBreakerOpenError, OpenAIService
+
+
+class TestClientPool:
+    """One long-lived client per upstream and event loop"""
+
+    async def test_client_reused_on_same_loop(self):
+        first = get_async_http_client("test-upstream")
+        second = get_async_http_client("test-upstream")
+        assert first is second
+        assert get_async_http_client("other-upstream") is not first
+        await close_async_http_clients()
+
+    async def test_close_releases_clients(self):
+        client = get_async_http_client("test-upstream")
+        assert "test-upstream" in get_pool_status()["clients"]
+
+        await close_async_http_clients()
+        assert client.is_closed
+        assert "test-upstream" not in get_pool_status()["clients"]
+        assert get_async_http_client("test-upstream") is not client
+        await close_async_http_clients()
+
+    def test_new_loop_gets_new_client(self):
+        async def grab():
+            return get_async_http_client("test-upstream")
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+        assert first is not second
+
+    def test_pool_limits_from_config(self):
+        limits = http_clients.pool_limits()
+        assert limits.max_connections == http_clients.MAX_CONNECTIONS
+        assert limits.max_keepalive_connections == http_clients.MAX_KEEPALIVE_CONNECTIONS
+
+
+class TestOllamaPooledClient:
+    """OllamaService uses the shared client instead of one per request"""
+
+    @pytest.fixture
+    def mock_transport_client(self, mocker):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path == "/api/tags":
+                return httpx.Response(200, json={"models": [{"name": "llama3.2:3b"}]})
+            lines = [{"response": "Hello"}, {"response": " world"}, {"done": True}]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+        client = httpx.AsyncClient(base_url="http://ollama.test", transport=httpx.MockTransport(handler))
+        factory = mocker.patch("app.services.ollama_service.get_async_http_client", return_value=client)
+        return client, factory, calls
+
+    async def test_generate_streams_over_shared_client(self, mock_transport_client):
+        client, factory, calls = mock_transport_client
+        service = OllamaService()
+
+        assert await service.generate("Say hello") == "Hello world"
+        assert await service.list_models() == ["llama3.2:3b"]
+        assert await service.is_available()
+
+        assert calls == ["/api/generate", "/api/tags", "/api/tags"]
+        assert all(c.args[0] == "ollama" for c in factory.call_args_list)
+        assert not client.is_closed
+        await client.aclose()
+
+
+class TestAsyncChatCompletion:
+    """achat_completion keeps chat_completion's circuit breaker and cache semantics"""
+
+    @pytest.fixture
+    def async_client(self, mocker):
+        client = MagicMock()
+        response = MagicMock()
+        response.choices[0].message.content = "ok"
+        client.chat.completions.create = AsyncMock(return_value=response)
+        mocker.patch("app.services.openai_service.get_async_openai_client", return_value=client)
+        return client
+
+    async def test_achat_completion_calls_async_client(self, async_client):
+        service = OpenAIService()
+        result = await service.achat_completion([{"role": "user", "content": "hi"}],
+                                                model="gpt-4o-mini", temperature=0.5)
+
+        assert result.choices[0].message.content == "ok"
+        kwargs = async_client.chat.completions.create.call_args.kwargs
+        assert kwargs["model"] == "gpt-4o-mini"
+        assert kwargs["temperature"] == 0.5
+        assert "cache" not in kwargs
+
+    async def test_achat_completion_respects_open_circuit(self, async_client, mocker):
+        service = OpenAIService()
+        mocker.patch.object(service.circuit_breaker, "can_execute", return_value=False)
+
+        with pytest.raises(CircuitBreakerOpenError):
+            await service.achat_completion([{"role": "user", "content": "hi"}])
+        async_client.chat.completions.create.assert_not_called()
+
+    async def test_concurrent_calls_do_not_use_threads(self, async_client, mocker):
+        to_thread = mocker.patch("asyncio.to_thread")
+        service = OpenAIService()
+
+        await asyncio.gather(*[
+            service.achat_completion([{"role": "user", "content": f"q{i}"}], temperature=0.5)
+            for i in range(20)
+        ])
+
+        assert async_client.chat.completions.create.await_count == 20
+        to_thread.assert_not_called()
@@ -0,0 +1,144 @@
+"""
+Tests for streaming item bank IRT calibration.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, User
+from app.services.irt_bank_calibration import (
+    ResponseMatrix, calibrate_item_bank, item_statistics, stream_response_matrix
+)
+from app.services.item_response_theory import IRTCalibrator
+
+NUM_USERS = 60
+
+
+def _question(db: Session, question_id: str, difficulty: str = "medium"):
+    db.add(Question(
+        id=question_id, vignette="Vignette", answer_key="A",
+        choices=["A", "B", "C", "D", "E"], difficulty_level=difficulty, recency_weight=1.0
+    ))
+
+
+@pytest.fixture
+def item_bank(db: Session):
+    """60 users of strictly increasing ability answering an easy and a hard item."""
+    for qid in ("q-easy", "q-hard", "q-filler", "q-sparse"):
+        _question(db, qid)
+    db.bulk_insert_mappings(User, [
+        {"id": f"user-{i}", "full_name": f"User {i}", "first_name": "User", "email": f"user{i}@example.com"}
+        for i in range(NUM_USERS)
+    ])
+
+    attempts = []
+    for i in range(NUM_USERS):
+        user_id = f"user-{i}"
+        # Filler attempts give user i exactly i correct answers
+        attempts += [
+            {"user_id": user_id, "question_id": "q-filler", "is_correct": j < i, "user_answer": "A"}
+            for j in range(NUM_USERS - 1)
+        ]
+        attempts.append({"user_id": user_id, "question_id": "q-easy", "is_correct": i >= 10, "user_answer": "A"})
+        attempts.append({"user_id": user_id, "question_id": "q-hard", "is_correct": i >= 40, "user_answer": "B"})
+        if i < 10:
+            attempts.append({"user_id": user_id, "question_id": "q-sparse", "is_correct": True, "user_answer": "A"})
+    db.bulk_insert_mappings(QuestionAttempt, attempts)
+    db.commit()
+    return attempts
+
+
+class TestItemStatistics:
+    """Vectorized statistics match the per-question calibrator"""
+
+    @pytest.mark.integration
+    def test_matches_calibrate_question(self, db: Session, item_bank):
+        matrix = stream_response_matrix(db, chunk_size=500)
+        stats = item_statistics(matrix)
+        calibrator = IRTCalibrator(db)
+
+        assert matrix.num_responses == len(item_bank)
+        for qid in ("q-easy", "q-hard", "q-filler"):
+            i = stats.item_ids.index(qid)
+            expected = calibrator.calibrate_question(qid)
+
+            assert stats.response_count[i] == expected.response_count
+            assert stats.p_value[i] == pytest.approx(expected.p_value)
+            assert stats.ci_lower[i] == pytest.approx(expected.confidence_interval[0])
+            assert stats.ci_upper[i] == pytest.approx(expected.confidence_interval[1])
+            assert stats.difficulty_level[i] == expected.difficulty_level
+
+        # One response per user, so no accuracy ties cross the 27% boundary
+        for qid in ("q-easy", "q-hard"):
+            expected = calibrator.calibrate_question(qid)
+            assert stats.discrimination[stats.item_ids.index(qid)] == pytest.approx(expected.discrimination_index)
+
+        assert stats.point_biserial[stats.item_ids.index("q-hard")] > 0.5
+
+    @pytest.mark.integration
+    def test_boundary_ties_share_credit(self, db: Session, item_bank):
+        """The 27% cut of q-filler falls inside one user's block of equal-accuracy rows"""
+        matrix = stream_response_matrix(db, chunk_size=500)
+        stats = item_statistics(matrix)
+
+        per_user = NUM_USERS - 1
+        n = NUM_USERS * per_user
+        group = int(n * 0.27)
+        full_users, partial = divmod(group, per_user)
+        # User i answers exactly i filler attempts correctly
+        bottom = sum(range(full_users)) + partial * full_users / per_user
+        top_user = NUM_USERS - 1 - full_users
+        top = sum(range(top_user + 1, NUM_USERS)) + partial * top_user / per_user
+
+        discrimination = stats.discrimination[stats.item_ids.index("q-filler")]
+        assert discrimination == pytest.approx((top - bottom) / group)
+
+    @pytest.mark.integration
+    def test_independent_of_row_order(self, db: Session, item_bank):
+        matrix = stream_response_matrix(db, chunk_size=500)
+        order = np.random.default_rng(0).permutation(matrix.num_responses)
+        shuffled = ResponseMatrix(
+            user_ids=matrix.user_ids,
+            item_ids=matrix.item_ids,
+            rows=matrix.rows[order],
+            cols=matrix.cols[order],
+            correct=matrix.correct[order]
+        )
+
+        expected, actual = item_statistics(matrix), item_statistics(shuffled)
+        np.testing.assert_allclose(actual.discrimination, expected.discrimination)
+        np.testing.assert_allclose(actual.point_biserial, expected.point_biserial)
+
+
+class TestCalibrateItemBank:
+    """Bulk persistence and the batch_calibrate entry point"""
+
+    @pytest.mark.integration
+    def test_persists_calibrated_items(self, db: Session, item_bank):
+        result = calibrate_item_bank(db, fit_2pl=True)
+
+        assert result.items_seen == 4
+        assert result.items_calibrated == 3
+        assert result.difficulties["q-easy"] == "easy"
+        assert result.difficulties["q-hard"] == "hard"
+        assert "q-sparse" not in result.difficulties
+        assert result.to_dict()["items_per_second"] > 0
+
+        db.expire_all()
+        hard = db.query(Question).filter(Question.id == "q-hard").one()
+        calibration = hard.extra_data["irt_calibration"]
+        assert hard.difficulty_level == "hard"
+        assert calibration["previous_difficulty"] == "medium"
+        assert calibration["response_count"] == NUM_USERS
+        assert calibration["two_pl"]["a"] > 0
+        assert calibration["two_pl"]["b"] > 0
+        assert db.query(Question).filter(Question.id == "q-sparse").one().extra_data is None
+
+    @pytest.mark.integration
+    def test_batch_calibrate_limits_to_requested_items(self, db: Session, item_bank):
+        results = IRTCalibrator(db).batch_calibrate(["q-easy", "q-sparse"])
+
+        assert results == {"q-easy": "easy"}
+        db.expire_all()
+        assert db.query(Question).filter(Question.id == "q-hard").one().extra_data is None
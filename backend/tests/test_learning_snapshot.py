@@ -0,0 +1,200 @@
+"""
+Tests for the cached user learning snapshot.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.models import User, Question, QuestionAttempt, ErrorAnalysis
+from app.services.adaptive import get_user_difficulty_target, get_weak_areas, get_performance_by_source
+from app.services import learning_snapshot
+from app.services.learning_snapshot import (
+    InMemorySnapshotStore,
+    RedisSnapshotStore,
+    get_error_counts,
+    get_learning_snapshot,
+    record_attempt_in_snapshot,
+    record_error_in_snapshot,
+    invalidate_learning_snapshot,
+)
+
+
+def _answer(db: Session, user: User, source: str, specialty: str, is_correct: bool) -> Question:
+    q = Question(
+        vignette=f"Snapshot question {source}",
+        answer_key="A",
+        choices=["A", "B", "C", "D", "E"],
+        source=source,
+        specialty=specialty,
+        recency_weight=0.8
+    )
+    db.add(q)
+    db.flush()
+    db.add(QuestionAttempt(
+        user_id=user.id,
+        question_id=q.id,
+        user_answer="A" if is_correct else "B",
+        is_correct=is_correct
+    ))
+    db.commit()
+    return q
+
+
+class TestLearningSnapshot:
+    """Snapshot aggregation and invalidation"""
+
+    @pytest.mark.integration
+    def test_build_aggregates_by_source_and_specialty(self, db: Session, test_user: User):
+        for i in range(4):
+            _answer(db, test_user, "Surgery - NBME", "surgery", is_correct=(i == 0))
+        for _ in range(2):
+            _answer(db, test_user, "Pediatrics - NBME", "pediatrics", is_correct=True)
+        db.add(ErrorAnalysis(
+            attempt_id="a", user_id=test_user.id, question_id="q",
+            error_type="knowledge_gap", explanation="x"
+        ))
+        db.commit()
+
+        snapshot = get_learning_snapshot(db, test_user.id)
+
+        assert snapshot.total == 6
+        assert snapshot.correct == 3
+        assert snapshot.by_source["Surgery - NBME"] == [4, 1]
+        assert snapshot.weak_specialties() == ["surgery"]
+        assert snapshot.error_counts == {"knowledge_gap": 1}
+
+    @pytest.mark.integration
+    def test_selectors_reuse_cached_snapshot(self, db: Session, test_user: User):
+        _answer(db, test_user, "Surgery - NBME", "surgery", is_correct=False)
+        get_learning_snapshot(db, test_user.id)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            get_user_difficulty_target(db, test_user.id)
+            get_weak_areas(db, test_user.id)
+            get_performance_by_source(db, test_user.id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        assert not any("question_attempts" in s for s in statements)
+
+    @pytest.mark.integration
+    def test_recorded_answers_patch_stored_snapshot(self, db: Session, test_user: User):
+        _answer(db, test_user, "Psychiatry - NBME", "psychiatry", is_correct=True)
+        get_learning_snapshot(db, test_user.id)
+
+        q = _answer(db, test_user, "Psychiatry - NBME", "psychiatry", is_correct=False)
+        record_attempt_in_snapshot(test_user.id, q.source, q.specialty, is_correct=False)
+        record_error_in_snapshot(test_user.id, "premature_closure")
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            snapshot = get_learning_snapshot(db, test_user.id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        assert statements == []
+        assert snapshot.total == 2
+        assert snapshot.by_source["Psychiatry - NBME"] == [2, 1]
+        assert snapshot.by_specialty["psychiatry"] == [2, 1]
+        assert snapshot.error_counts == {"premature_closure": 1}
+
+    @pytest.mark.integration
+    def test_answer_during_rebuild_is_not_lost(self, db: Session, test_user: User, monkeypatch):
+        build = learning_snapshot.build_learning_snapshot
+
+        def build_then_answer(db, user_id):
+            snapshot = build(db, user_id)
+            # Committed after the rebuild's queries ran, before it is stored
+            q = _answer(db, test_user, "Surgery - NBME", "surgery", is_correct=True)
+            record_attempt_in_snapshot(user_id, q.source, q.specialty, is_correct=True)
+            return snapshot
+
+        monkeypatch.setattr(learning_snapshot, "build_learning_snapshot", build_then_answer)
+        assert get_learning_snapshot(db, test_user.id).total == 0
+        monkeypatch.setattr(learning_snapshot, "build_learning_snapshot", build)
+
+        assert get_learning_snapshot(db, test_user.id).total == 1
+
+    @pytest.mark.integration
+    def test_error_counts_on_cold_snapshot_skip_rebuild(self, db: Session, test_user: User):
+        _answer(db, test_user, "Surgery - NBME", "surgery", is_correct=False)
+        db.add(ErrorAnalysis(
+            attempt_id="a", user_id=test_user.id, question_id="q",
+            error_type="knowledge_gap", explanation="x"
+        ))
+        db.commit()
+        user_id = test_user.id
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            counts = get_error_counts(db, user_id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        assert counts == {"knowledge_gap": 1}
+        assert len(statements) == 1 and "question_attempts" not in statements[0]
+
+    @pytest.mark.integration
+    def test_invalidate_rebuilds_from_database(self, db: Session, test_user: User):
+        get_learning_snapshot(db, test_user.id)
+        _answer(db, test_user, "Surgery - NBME", "surgery", is_correct=True)
+
+        invalidate_learning_snapshot(test_user.id)
+
+        assert get_learning_snapshot(db, test_user.id).total == 1
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return InMemorySnapshotStore()
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs lupa to run Lua scripts
+    return RedisSnapshotStore(fakeredis.FakeRedis(decode_responses=True))
+
+
+class TestSnapshotStore:
+    """Atomic deltas and versioned stores"""
+
+    @pytest.mark.unit
+    def test_concurrent_increments_are_all_applied(self, store):
+        store.store("u1", {"total": 0, "correct": 0}, store.version("u1"), 60)
+
+        def answer():
+            for _ in range(50):
+                store.increment("u1", {"total": 1, "correct": 1, "source:total:Surgery - NBME": 1}, 60)
+
+        threads = [threading.Thread(target=answer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert store.get("u1") == {"total": 200, "correct": 200, "source:total:Surgery - NBME": 200}
+
+    @pytest.mark.unit
+    def test_increment_without_snapshot_only_bumps_version(self, store):
+        store.increment("u1", {"total": 1}, 60)
+
+        assert store.get("u1") is None
+        assert store.version("u1") == 1
+
+    @pytest.mark.unit
+    def test_store_rejects_stale_version(self, store):
+        version = store.version("u1")
+        store.invalidate("u1", 60)
+
+        assert not store.store("u1", {"total": 3}, version, 60)
+        assert store.get("u1") is None
+        assert store.store("u1", {"total": 3}, store.version("u1"), 60)
+        assert store.get("u1") == {"total": 3}
@@ -0,0 +1,201 @@
+"""
+Tests for the LLM Response Cache
+
+Covers cache keys, the caching policy, the memory/SQLite backends and the
+OpenAI service integration (hits skip the API call, counters surface in
+get_status).
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from app.services.llm_response_cache import (
+    LLMResponseCache,
+    MemoryBackend,
+    SQLiteBackend,
+    response_key
+)
+from app.services.openai_service import OpenAIService
+
+MESSAGES = [
+    {"role": "system", "content": "You are a USMLE question validator."},
+    {"role": "user", "content": "Validate this question."}
+]
+
+
+def make_completion(content: str = '{"status": "ACCEPT"}', total_tokens: int = 120) -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 1700000000,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content}
+        }],
+        "usage": {"prompt_tokens": 100, "completion_tokens": total_tokens - 100, "total_tokens": total_tokens}
+    })
+
+
+class TestResponseKey:
+    """Cache keys are content addressed"""
+
+    def test_key_is_stable(self):
+        assert response_key("gpt-4o", MESSAGES, {"temperature": 0, "max_tokens": 50}) == \
+            response_key("gpt-4o", list(MESSAGES), {"max_tokens": 50, "temperature": 0})
+
+    def test_semantic_params_change_key(self):
+        base = response_key("gpt-4o", MESSAGES, {"temperature": 0})
+        assert response_key("gpt-4o-mini", MESSAGES, {"temperature": 0}) != base
+        assert response_key("gpt-4o", MESSAGES, {"temperature": 0.2}) != base
+        assert response_key("gpt-4o", MESSAGES[:1], {"temperature": 0}) != base
+        assert response_key("gpt-4o", MESSAGES, {"temperature": 0, "response_format": {"type": "json_object"}}) != base
+
+    def test_transport_params_ignored(self):
+        assert response_key("gpt-4o", MESSAGES, {"temperature": 0, "timeout": 30}) == \
+            response_key("gpt-4o", MESSAGES, {"temperature": 0})
+
+
+class TestCachePolicy:
+    """Which calls are cached"""
+
+    def test_deterministic_calls_cached_by_default(self):
+        cache = LLMResponseCache(MemoryBackend())
+        assert cache.should_cache({"temperature": 0}, None)
+        assert not cache.should_cache({"temperature": 0.7}, None)
+        assert not cache.should_cache({}, None)
+
+    def test_opt_in_and_bypass(self):
+        cache = LLMResponseCache(MemoryBackend())
+        assert cache.should_cache({"temperature": 0.7}, True)
+        assert not cache.should_cache({"temperature": 0}, False)
+        assert cache.bypassed == 1
+
+    def test_streaming_and_multiple_choices_never_cached(self):
+        cache = LLMResponseCache(MemoryBackend())
+        assert not cache.should_cache({"temperature": 0, "stream": True}, True)
+        assert not cache.should_cache({"temperature": 0, "n": 3}, True)
+
+    def test_disabled_cache(self):
+        cache = LLMResponseCache(None)
+        assert not cache.should_cache({"temperature": 0}, True)
+        assert cache.get_stats()["backend"] == "off"
+
+
+class TestBackends:
+    """Memory and SQLite backends"""
+
+    def test_memory_lru_eviction(self):
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", "1", ttl=60)
+        backend.set("b", "2", ttl=60)
+        backend.get("a")  # a is now most recently used
+        backend.set("c", "3", ttl=60)
+        assert backend.get("a") == "1"
+        assert backend.get("b") is None
+        assert backend.size() == 2
+
+    def test_memory_ttl_expiry(self, mocker):
+        backend = MemoryBackend()
+        now = time.time()
+        mocker.patch("app.services.llm_response_cache.time.time", return_value=now)
+        backend.set("a", "1", ttl=10)
+        mocker.patch("app.services.llm_response_cache.time.time", return_value=now + 11)
+        assert backend.get("a") is None
+
+    def test_sqlite_roundtrip(self, tmp_path):
+        path = str(tmp_path / "llm_cache.db")
+        SQLiteBackend(path).set("k", "value", ttl=60)
+
+        # A second connection (another worker) sees the entry
+        backend = SQLiteBackend(path)
+        assert backend.get("k") == "value"
+        assert backend.size() == 1
+        backend.clear()
+        assert backend.get("k") is None
+
+    def test_sqlite_ttl_expiry(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path / "llm_cache.db"))
+        backend.set("k", "value", ttl=-1)
+        assert backend.get("k") is None
+        assert backend.size() == 0
+
+
+class TestResponseCache:
+    """Serialization and counters"""
+
+    def test_roundtrip_counts_tokens_saved(self):
+        cache = LLMResponseCache(MemoryBackend())
+        assert cache.get("k") is None
+        cache.set("k", make_completion(total_tokens=150))
+
+        cached = cache.get("k")
+        assert cached.choices[0].message.content == '{"status": "ACCEPT"}'
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["tokens_saved"] == 150
+
+    def test_unserializable_response_not_stored(self):
+        cache = LLMResponseCache(MemoryBackend())
+        cache.set("k", MagicMock())
+        assert cache.stores == 0
+        assert cache.get("k") is None
+
+    def test_backend_errors_are_misses(self):
+        backend = MagicMock()
+        backend.get.side_effect = ConnectionError("redis down")
+        cache = LLMResponseCache(backend)
+        assert cache.get("k") is None
+        assert cache.errors == 1
+        assert cache.misses == 1
+
+
+class TestOpenAIServiceCaching:
+    """chat_completion serves repeated prompts from the cache"""
+
+    @pytest.fixture
+    def service(self, mocker):
+        service = OpenAIService()
+        mocker.patch.object(service, "response_cache", LLMResponseCache(MemoryBackend()))
+        client = MagicMock()
+        client.chat.completions.create.return_value = make_completion()
+        mocker.patch("app.services.openai_service.get_openai_client", return_value=client)
+        return service, client
+
+    def test_deterministic_call_hits_cache(self, service):
+        service, client = service
+        first = service.chat_completion(MESSAGES, model="gpt-4o", temperature=0)
+        second = service.chat_completion(MESSAGES, model="gpt-4o", temperature=0)
+
+        assert client.chat.completions.create.call_count == 1
+        assert second.choices[0].message.content == first.choices[0].message.content
+        stats = service.get_status()["response_cache"]
+        assert stats["hits"] == 1
+        assert stats["tokens_saved"] == 120
+
+    def test_sampled_call_not_cached_unless_opted_in(self, service):
+        service, client = service
+        service.chat_completion(MESSAGES, temperature=0.7)
+        service.chat_completion(MESSAGES, temperature=0.7)
+        assert client.chat.completions.create.call_count == 2
+
+        service.chat_completion(MESSAGES, temperature=0.7, cache=True, cache_ttl=60)
+        service.chat_completion(MESSAGES, temperature=0.7, cache=True)
+        assert client.chat.completions.create.call_count == 3
+
+    def test_bypass_flag(self, service):
+        service, client = service
+        service.chat_completion(MESSAGES, temperature=0)
+        service.chat_completion(MESSAGES, temperature=0, cache=False)
+        assert client.chat.completions.create.call_count == 2
+
+    def test_cache_flags_not_sent_to_api(self, service):
+        service, client = service
+        service.chat_completion(MESSAGES, temperature=0, cache=True, cache_ttl=60)
+        kwargs = client.chat.completions.create.call_args.kwargs
+        assert "cache" not in kwargs
+        assert "cache_ttl" not in kwargs
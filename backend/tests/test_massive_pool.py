@@ -0,0 +1,150 @@
+"""
+Tests for massive pool claims and statistics.
+"""
+
+import threading
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import User, Question, QuestionAttempt
+from app.services.massive_pool import (
+    POOL_STATUS_POOLED,
+    claim_pool_questions,
+    get_detailed_pool_stats,
+    get_pool_source,
+    normalize_specialty,
+)
+from app.services.question_pool import QuestionPoolManager
+from tests.conftest import TestingSessionLocal
+
+
+def _pool_question(specialty: str, difficulty: str, **kwargs) -> Question:
+    return Question(
+        id=kwargs.pop("id", str(uuid.uuid4())),
+        vignette=f"Pool vignette {specialty} {difficulty}",
+        answer_key="A",
+        choices=["A", "B", "C", "D", "E"],
+        source=get_pool_source(specialty, difficulty),
+        specialty=normalize_specialty(specialty),
+        difficulty_level=difficulty,
+        pool_status=POOL_STATUS_POOLED,
+        recency_weight=1.0,
+        **kwargs
+    )
+
+
+class TestClaimPoolQuestions:
+    """Atomic claim path"""
+
+    @pytest.mark.integration
+    def test_claim_batch_for_prefetch(self, db: Session, test_user: User):
+        for _ in range(5):
+            db.add(_pool_question("Surgery", "hard"))
+        db.commit()
+
+        claimed = claim_pool_questions(db, test_user.id, "Surgery", "hard", count=3)
+
+        assert len(claimed) == 3
+        assert all(q.pool_status == "claimed" for q in claimed)
+        assert all(q.source == "AI Generated - Surgery - hard" for q in claimed)
+        assert len(claim_pool_questions(db, test_user.id, "Surgery", "hard", count=10)) == 2
+
+    @pytest.mark.integration
+    def test_claim_excludes_answered(self, db: Session, test_user: User):
+        answered = _pool_question("Pediatrics", "easy")
+        db.add(answered)
+        db.add(QuestionAttempt(
+            user_id=test_user.id,
+            question_id=answered.id,
+            user_answer="A",
+            is_correct=True
+        ))
+        db.commit()
+
+        assert claim_pool_questions(db, test_user.id, "Pediatrics", "easy") == []
+
+    @pytest.mark.integration
+    def test_instant_question_claimed_once(self, db: Session, test_user: User, monkeypatch):
+        manager = QuestionPoolManager()
+        monkeypatch.setattr(manager, "_check_and_replenish", lambda specialty: None)
+        manager.add_to_pool(db, {
+            "vignette": "Instant pool vignette",
+            "answer_key": "A",
+            "choices": ["A", "B", "C", "D", "E"],
+        }, "Internal Medicine")
+
+        question = manager.get_instant_question(db, "Internal Medicine", user_id=test_user.id)
+
+        assert question.pool_status == "claimed"
+        assert question.source == "AI Generated - Internal Medicine"
+        assert manager.get_instant_question(db, "Internal Medicine") is None
+
+    @pytest.mark.integration
+    def test_stats_count_only_pooled(self, db: Session):
+        db.add(_pool_question("Psychiatry", "medium"))
+        db.add(_pool_question("Psychiatry", "medium", rejected=True))
+        claimed = _pool_question("Psychiatry", "medium")
+        claimed.pool_status = "claimed"
+        db.add(claimed)
+        db.commit()
+
+        stats = get_detailed_pool_stats(db)
+
+        assert stats["by_specialty"]["Psychiatry"]["medium"] == 1
+
+
+class TestConcurrentClaims:
+    """Hammer the claim path from many threads"""
+
+    @pytest.mark.integration
+    def test_no_double_serves_with_50_threads(self):
+        pool_size = 100
+        threads = 50
+        claims_per_thread = 4
+        run_id = uuid.uuid4().hex[:8]
+
+        setup = TestingSessionLocal()
+        question_ids = [f"claim-{run_id}-{i}" for i in range(pool_size)]
+        for qid in question_ids:
+            setup.add(_pool_question("Family Medicine", "medium", id=qid))
+        setup.commit()
+        setup.close()
+
+        served = []
+        errors = []
+        served_lock = threading.Lock()
+        start = threading.Barrier(threads)
+
+        def worker(n: int):
+            db = TestingSessionLocal()
+            try:
+                start.wait()
+                for _ in range(claims_per_thread):
+                    claimed = claim_pool_questions(db, f"user-{run_id}-{n}", "Family Medicine", "medium")
+                    with served_lock:
+                        served.extend(q.id for q in claimed)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        try:
+            for t in workers:
+                t.start()
+            for t in workers:
+                t.join()
+
+            assert not errors
+            duplicates = [qid for qid, n in Counter(served).items() if n > 1]
+            assert duplicates == []
+            # 200 requests against 100 questions: every question served exactly once
+            assert sorted(served) == sorted(question_ids)
+        finally:
+            cleanup = TestingSessionLocal()
+            cleanup.query(Question).filter(Question.id.in_(question_ids)).delete(synchronize_session=False)
+            cleanup.commit()
+            cleanup.close()
@@ -0,0 +1,202 @@
+"""
+Tests for the originality checker's shingle index and corpus snapshot.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Question
+from app.services.originality_checker import OriginalityChecker
+from app.services.originality_snapshot import open_snapshot, write_snapshot
+from app.services.shingle_index import ShingleIndex
+
+
+BASE_VIGNETTE = (
+    "A 45-year-old man comes to the emergency department because of crushing chest pain "
+    "radiating to the left arm for 2 hours. He has a history of hypertension and "
+    "hyperlipidemia. Pulse is 110/min and blood pressure is 150/90 mm Hg. An ECG shows "
+    "ST-segment elevation in leads II, III and aVF. Which of the following is the most "
+    "likely diagnosis?"
+)
+
+OTHER_VIGNETTE = (
+    "A 7-year-old girl is brought to the clinic by her mother because of a sore throat and "
+    "fever for three days. She has a sandpaper-like rash on her trunk and a strawberry "
+    "tongue. Her younger brother recently had similar symptoms. Which of the following is "
+    "the most appropriate next step in management?"
+)
+
+
+def _checker(corpus: dict, **kwargs) -> OriginalityChecker:
+    checker = OriginalityChecker(db=None, **kwargs)
+    documents = []
+    for q_id, vignette in corpus.items():
+        text = checker._normalize_text(vignette)
+        documents.append((q_id, text))
+    checker._index.add_many(documents)
+    checker._corpus_loaded = True
+    return checker
+
+
+class TestShingleIndex:
+    """Phrase postings and LSH candidates"""
+
+    @pytest.mark.unit
+    def test_phrase_matches_counts_shared_phrases(self):
+        index = ShingleIndex(phrase_size=3)
+        index.add_many([("a", "one two three four five"), ("b", "six seven eight nine")])
+
+        counts, positions, total = index.phrase_matches("zero one two three four".split())
+
+        assert total == 3
+        assert counts == {"a": 2}
+        assert positions["a"] == [1, 2]
+
+    @pytest.mark.unit
+    def test_incremental_add_is_searchable_before_merge(self):
+        index = ShingleIndex(phrase_size=3, merge_threshold=1000)
+        index.add_many([("a", "one two three four")])
+        index.add("b", "alpha beta gamma delta")
+
+        counts, _, _ = index.phrase_matches("alpha beta gamma".split())
+
+        assert counts == {"b": 1}
+        assert index.get_stats()["pending_delta"] > 0
+
+    @pytest.mark.unit
+    def test_readd_replaces_previous_entry(self):
+        index = ShingleIndex(phrase_size=3)
+        index.add_many([("a", "one two three four")])
+        index.add("a", "alpha beta gamma delta")
+
+        assert len(index) == 1
+        assert index.phrase_matches("one two three".split())[0] == {}
+        assert index.phrase_matches("alpha beta gamma".split())[0] == {"a": 1}
+
+    @pytest.mark.unit
+    def test_most_similar_identical_text(self):
+        index = ShingleIndex()
+        words = "the quick brown fox jumps over the lazy dog again".split()
+        index.add_many([("a", " ".join(words)), ("b", "completely unrelated words in this other text")])
+
+        best_id, score = index.most_similar(words)
+
+        assert best_id == "a"
+        assert score == pytest.approx(1.0)
+
+
+    @pytest.mark.unit
+    def test_minhash_is_exact_mod_mersenne_prime(self):
+        index = ShingleIndex(num_perm=16, bands=4)
+        hashes = np.array([0, 1, 12345, (1 << 32) - 1, (1 << 64) - 1], dtype=np.uint64)
+        prime = (1 << 61) - 1
+
+        expected = [
+            min(((int(hi) << 32 | int(lo)) * (int(h) & 0xFFFFFFFF) + int(b)) % prime & 0xFFFFFFFF
+                for h in hashes)
+            for hi, lo, b in zip(index._perm_a_hi[:, 0], index._perm_a_lo[:, 0], index._perm_b[:, 0])
+        ]
+
+        assert index._minhash(hashes).tolist() == expected
+
+
+class TestOriginalityChecker:
+    """End-to-end checks against an in-memory corpus"""
+
+    @pytest.mark.asyncio
+    async def test_exact_copy_flagged(self):
+        checker = _checker({"q1": BASE_VIGNETTE, "q2": OTHER_VIGNETTE})
+
+        result = await checker.check_originality({"vignette": BASE_VIGNETTE})
+
+        assert not result.is_original
+        assert result.matched_question_id == "q1"
+        assert result.method_used == "exact_phrase"
+        assert result.details["matched_phrases"]
+
+    @pytest.mark.asyncio
+    async def test_unrelated_question_passes(self):
+        checker = _checker({"q1": BASE_VIGNETTE})
+
+        result = await checker.check_originality({"vignette": OTHER_VIGNETTE})
+
+        assert result.is_original
+        assert result.similarity_score < checker.similarity_threshold
+
+    @pytest.mark.asyncio
+    async def test_add_to_corpus_detects_later_duplicate(self):
+        checker = _checker({"q1": OTHER_VIGNETTE})
+        checker.add_to_corpus("q-new", BASE_VIGNETTE)
+
+        result = await checker.check_originality({"vignette": BASE_VIGNETTE})
+
+        assert not result.is_original
+        assert result.matched_question_id == "q-new"
+        assert checker.get_stats()["index"]["documents"] == 2
+
+
+class TestCorpusSnapshot:
+    """Persisted, memory-mapped corpus"""
+
+    @pytest.mark.unit
+    def test_roundtrip_preserves_matches_and_texts(self, tmp_path):
+        index = ShingleIndex(phrase_size=3)
+        index.add_many([("a", "one two three four five"), ("b", "six seven eight nine")])
+        index.add("c", "alpha beta gamma delta")
+        index.add("a", "ten eleven twelve thirteen")  # Replaces the base entry
+
+        write_snapshot(index, root=str(tmp_path))
+        snapshot = open_snapshot(index.get_params(), root=str(tmp_path))
+
+        reopened = snapshot.index
+        assert len(reopened) == 3
+        assert reopened.get_text("c") == "alpha beta gamma delta"
+        assert reopened.phrase_matches("ten eleven twelve".split())[0] == {"a": 1}
+        assert reopened.phrase_matches("one two three".split())[0] == {}
+        assert reopened.get_stats()["appended_documents"] == 0
+
+    @pytest.mark.unit
+    def test_param_mismatch_is_ignored(self, tmp_path):
+        index = ShingleIndex()
+        index.add_many([("a", "one two three four five six seven eight nine")])
+        write_snapshot(index, root=str(tmp_path))
+
+        assert open_snapshot(ShingleIndex(ngram_size=3).get_params(), root=str(tmp_path)) is None
+        assert open_snapshot(index.get_params(), root=str(tmp_path / "missing")) is None
+
+    @pytest.mark.asyncio
+    async def test_checker_opens_snapshot_and_replays_delta(self, db: Session, tmp_path):
+        builder = _checker({"q1": OTHER_VIGNETTE}, snapshot_dir=str(tmp_path))
+        # Watermark in the future: no catch-up rows from the shared test database
+        write_snapshot(builder._index, watermark=datetime.utcnow() + timedelta(days=1), root=str(tmp_path))
+
+        writer = OriginalityChecker(db, snapshot_dir=str(tmp_path))
+        assert await writer.load_corpus() == 1
+        writer.add_to_corpus("q-new", BASE_VIGNETTE)
+
+        reader = OriginalityChecker(db, snapshot_dir=str(tmp_path))
+        assert await reader.load_corpus() == 2
+        result = await reader.check_originality({"vignette": BASE_VIGNETTE})
+
+        assert not result.is_original
+        assert result.matched_question_id == "q-new"
+        assert reader.get_stats()["snapshot_version"] == writer.get_stats()["snapshot_version"]
+
+    @pytest.mark.asyncio
+    async def test_build_snapshot_from_database(self, db: Session, tmp_path):
+        question = Question(vignette=BASE_VIGNETTE, answer_key="A", choices=["A", "B", "C", "D", "E"])
+        db.add(question)
+        db.commit()
+
+        path = OriginalityChecker(db, snapshot_dir=str(tmp_path)).build_snapshot()
+        assert path.startswith(str(tmp_path))
+
+        checker = OriginalityChecker(db, snapshot_dir=str(tmp_path))
+        await checker.load_corpus()
+        result = await checker.check_originality({"vignette": BASE_VIGNETTE})
+
+        assert not result.is_original
+        assert result.matched_question_id == question.id
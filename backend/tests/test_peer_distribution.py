@@ -0,0 +1,121 @@
+"""
+Tests for the precomputed peer distribution store.
+"""
+
+import random
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, User
+from app.services.peer_distribution import (
+    FenwickHistogram,
+    METRIC_EDGES,
+    PeerDistributionStore,
+    specialties_for_source,
+)
+
+
+def _store(rows, assessments=()) -> PeerDistributionStore:
+    store = PeerDistributionStore()
+    store.load(rows, assessments)
+    return store
+
+
+class TestFenwickHistogram:
+    """Prefix counts and quantiles over fixed buckets"""
+
+    @pytest.mark.unit
+    def test_count_below_matches_sorted_scan(self):
+        rng = random.Random(7)
+        values = [round(rng.uniform(0, 100), 1) for _ in range(2000)]
+        hist = FenwickHistogram(METRIC_EDGES["accuracy"])
+        for value in values:
+            hist.add(value)
+
+        for probe in (0, 12.3, 50, 87.5, 100):
+            assert hist.count_below(probe) == sum(1 for v in values if v < probe)
+        assert hist.quantile(0.5) == sorted(values)[len(values) // 2]
+
+    @pytest.mark.unit
+    def test_remove_restores_counts(self):
+        hist = FenwickHistogram(METRIC_EDGES["questions_answered"])
+        hist.add(15)
+        hist.add(4000)
+        hist.add(15, -1)
+
+        assert hist.count == 1
+        assert hist.count_below(4000) == 0
+        assert hist.mean == pytest.approx(4000)
+
+
+class TestPeerDistributionStore:
+    """Percentiles, summaries and incremental updates"""
+
+    @pytest.mark.unit
+    def test_specialties_match_source_substring(self):
+        assert specialties_for_source("Surgery Shelf - NBME 5") == ["Surgery"]
+        assert specialties_for_source("internal medicine") == ["Internal Medicine"]
+        assert specialties_for_source(None) == []
+
+    @pytest.mark.unit
+    def test_peers_need_minimum_answers(self):
+        store = _store([
+            ("u1", "Surgery", 10, 5),
+            ("u2", "Pediatrics", 20, 18),
+            ("u3", "Surgery", 9, 9),
+        ])
+
+        assert store.peer_count("accuracy") == 2
+        assert store.percentile("accuracy", 60.0) == 50
+        assert store.summary("accuracy")["mean"] == pytest.approx(70.0)
+        assert store.bucket_counts("accuracy", [0, 50, 60, 70, 80, 90]) == [0, 1, 0, 0, 0, 1]
+        # Platform totals include users below the peer threshold
+        assert store.platform_totals("Surgery") == (19, 14)
+
+    @pytest.mark.unit
+    def test_record_answer_moves_user_between_buckets(self):
+        store = _store([("u1", "Surgery", 9, 0), ("u2", "Surgery", 10, 10)])
+        assert store.peer_count("accuracy") == 1
+
+        store.record_answer("u1", True, "Surgery Shelf")
+
+        assert store.peer_count("accuracy") == 2
+        assert store.peer_count("accuracy", "Surgery") == 2
+        assert store.percentile("accuracy", 100.0) == 50
+        assert store.platform_totals("Surgery") == (20, 11)
+
+    @pytest.mark.unit
+    def test_record_before_build_is_ignored(self):
+        store = PeerDistributionStore()
+        store.record_answer("u1", True, "Surgery")
+        store.record_assessment("a1", 70.0)
+
+        assert store.peer_count("accuracy") == 0
+        assert store.percentile("accuracy", 50.0) is None
+
+    @pytest.mark.unit
+    def test_assessment_scores_are_replaced_not_duplicated(self):
+        store = _store([], [("a1", 60.0), ("a2", 80.0)])
+        store.record_assessment("a1", 90.0)
+
+        assert store.peer_count("assessment_score") == 2
+        assert store.percentile("assessment_score", 85.0) == 50
+
+    @pytest.mark.integration
+    def test_rebuild_from_database(self, db: Session, test_user: User, test_question: Question):
+        for i in range(12):
+            db.add(QuestionAttempt(
+                user_id=test_user.id,
+                question_id=test_question.id,
+                user_answer="D" if i % 4 else "A",
+                is_correct=bool(i % 4)
+            ))
+        db.commit()
+
+        store = PeerDistributionStore()
+        store.rebuild(db)
+
+        assert store.peer_count("accuracy") == 1
+        assert store.summary("accuracy")["median"] == pytest.approx(75.0)
+        assert store.platform_totals("Internal Medicine") == (12, 9)
@@ -0,0 +1,116 @@
+"""
+Tests for the in-memory massive pool serving index.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import User, Question, QuestionAttempt
+from app.services.massive_pool import get_pool_source, normalize_specialty, POOL_STATUS_POOLED
+from app.services.pool_index import PoolServingIndex, AnsweredSet
+
+
+def _add_pool_questions(db: Session, specialty: str, difficulty: str, count: int) -> list[Question]:
+    questions = []
+    for i in range(count):
+        q = Question(
+            vignette=f"Pool vignette {specialty} {difficulty} {i}",
+            answer_key="A",
+            choices=["A", "B", "C", "D", "E"],
+            source=get_pool_source(specialty, difficulty),
+            specialty=normalize_specialty(specialty),
+            difficulty_level=difficulty,
+            pool_status=POOL_STATUS_POOLED,
+            recency_weight=1.0
+        )
+        db.add(q)
+        questions.append(q)
+    db.commit()
+    return questions
+
+
+class TestAnsweredSet:
+    """Bitset behaviour"""
+
+    @pytest.mark.unit
+    def test_add_and_contains(self):
+        answered = AnsweredSet(8)
+        answered.add(3)
+        answered.add(100)  # Grows past initial size
+
+        assert 3 in answered
+        assert 100 in answered
+        assert 4 not in answered
+        assert 5000 not in answered
+
+
+class TestPoolServingIndex:
+    """Serving from the in-memory index"""
+
+    @pytest.mark.integration
+    def test_pick_claims_question(self, db: Session, test_user: User):
+        questions = _add_pool_questions(db, "Surgery", "medium", 3)
+        index = PoolServingIndex()
+
+        question = index.pick(db, test_user.id, "Surgery", "medium")
+
+        assert question is not None
+        assert question.id in {q.id for q in questions}
+        assert question.source == "AI Generated - Surgery - medium"
+        assert question.pool_status == "claimed"
+        assert question.pool_claimed_by == test_user.id
+
+    @pytest.mark.integration
+    def test_pick_skips_answered_questions(self, db: Session, test_user: User):
+        questions = _add_pool_questions(db, "Pediatrics", "easy", 2)
+        db.add(QuestionAttempt(
+            user_id=test_user.id,
+            question_id=questions[0].id,
+            user_answer="A",
+            is_correct=True
+        ))
+        db.commit()
+        index = PoolServingIndex()
+
+        first = index.pick(db, test_user.id, "Pediatrics", "easy")
+        second = index.pick(db, test_user.id, "Pediatrics", "easy")
+
+        assert first.id == questions[1].id
+        assert second is None
+
+    @pytest.mark.integration
+    def test_record_answer_updates_cached_set(self, db: Session, test_user: User):
+        question = _add_pool_questions(db, "Psychiatry", "hard", 1)[0]
+        index = PoolServingIndex()
+
+        # Empty bucket - loads test_user's answered set without claiming anything
+        assert index.pick(db, test_user.id, "Family Medicine", "hard") is None
+
+        index.record_answer(test_user.id, question.id)
+
+        assert index.pick(db, test_user.id, "Psychiatry", "hard") is None
+        assert index.pick(db, "another-user", "Psychiatry", "hard").id == question.id
+
+    @pytest.mark.integration
+    def test_stale_entry_is_dropped(self, db: Session, test_user: User):
+        questions = _add_pool_questions(db, "Emergency Medicine", "medium", 1)
+        index = PoolServingIndex()
+        index.rebuild(db)
+
+        # Another worker claims the row behind the index's back
+        questions[0].pool_status = "claimed"
+        db.commit()
+
+        assert index.pick(db, test_user.id, "Emergency Medicine", "medium") is None
+        assert index.get_stats()["stale_claims"] == 1
+
+    @pytest.mark.integration
+    def test_add_question_after_load(self, db: Session, test_user: User):
+        index = PoolServingIndex()
+        index.rebuild(db)
+        question = _add_pool_questions(db, "Preventive Medicine", "easy", 1)[0]
+
+        index.add_question(question.id, "Preventive Medicine", "easy")
+
+        served = index.pick_any(db, test_user.id)
+        assert served is not None
@@ -560,34 +560,31 @@ class TestGenerateQuestionWithAgent:
 class TestGenerateQuestionsBatch:
     """Tests for batch question generation"""
 
-    @patch("app.services.question_agent.QuestionGenerationAgent")
-    def test_respects_count_limit(self, MockAgent, db):
+    @patch("app.services.question_agent.get_generation_executor")
+    def test_respects_count_limit(self, mock_get_executor, db):
         """Test that batch generation respects count limit"""
-        mock_agent = MagicMock()
-        mock_agent.generate_question.return_value = MOCK_QUESTION_RESPONSE
-        MockAgent.return_value = mock_agent
+        mock_executor = MagicMock()
+        mock_executor.generate_batch.return_value = [MOCK_QUESTION_RESPONSE] * 10
+        mock_get_executor.return_value = mock_executor
 
         # Request more than max (10)
         results = generate_questions_batch(db, count=15)
 
         # Should be capped at 10
-        assert mock_agent.generate_question.call_count <= 10
+        mock_executor.generate_batch.assert_called_once_with(10, None, "medium", max_retries=1)
+        assert len(results) == 10
 
-    @patch("app.services.question_agent.QuestionGenerationAgent")
-    def test_handles_partial_failures(self, MockAgent, db):
-        """Test that batch handles some failures gracefully"""
-        mock_agent = MagicMock()
-        # First call succeeds, second fails, third succeeds
-        mock_agent.generate_question.side_effect = [
-            MOCK_QUESTION_RESPONSE,
-            Exception("Generation failed"),
-            MOCK_QUESTION_RESPONSE
-        ]
-        MockAgent.return_value = mock_agent
+    @patch("app.services.question_agent.get_generation_executor")
+    def test_runs_through_pipelined_executor(self, mock_get_executor, db):
+        """Test that batch generation hands the questions to the stage pipeline"""
+        mock_executor = MagicMock()
+        mock_executor.generate_batch.return_value = [MOCK_QUESTION_RESPONSE, MOCK_QUESTION_RESPONSE]
+        mock_get_executor.return_value = mock_executor
 
-        results = generate_questions_batch(db, count=3)
+        results = generate_questions_batch(db, count=3, specialty="Surgery", difficulty="hard")
 
-        # Should return only successful generations
+        # Failed questions are dropped by the executor
+        mock_executor.generate_batch.assert_called_once_with(3, "Surgery", "hard", max_retries=1)
         assert len(results) == 2
 
 
@@ -0,0 +1,154 @@
+"""
+Tests for the bucketed question sampling index.
+"""
+
+import random
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, QuestionAttempt, User
+from app.services.question_index import BucketSampler, QuestionSamplingIndex
+
+
+def _questions(db: Session, prefix: str, difficulty: str, count: int, specialty: str = "surgery"):
+    db.bulk_insert_mappings(Question, [
+        {"id": f"{prefix}-{i}", "vignette": "Vignette", "answer_key": "A",
+         "choices": ["A", "B", "C", "D", "E"], "difficulty_level": difficulty,
+         "specialty": specialty, "content_status": "active", "rejected": False, "recency_weight": 1.0}
+        for i in range(count)
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def bank(db: Session):
+    _questions(db, "easy", "easy", 30)
+    _questions(db, "medium", "medium", 60, specialty="internal_medicine")
+    _questions(db, "hard", "hard", 40)
+    _questions(db, "unleveled", None, 10)
+
+
+class TestBucketSampler:
+    """Sparse Fisher-Yates over several arrays"""
+
+    @pytest.mark.unit
+    def test_draws_each_id_once(self):
+        sampler = BucketSampler([array("I", [0, 1, 2]), array("I"), array("I", [3, 4, 5, 6])], random.Random(7))
+
+        drawn = [sampler.draw() for _ in range(7)]
+
+        assert sorted(drawn) == list(range(7))
+        assert sampler.remaining == 0
+        assert sampler.draw() is None
+
+
+class TestAssessmentIndex:
+    """Difficulty mix, seen-question exclusion and stale ids"""
+
+    @pytest.mark.integration
+    def test_selection_follows_difficulty_mix(self, db: Session, bank):
+        selected = QuestionSamplingIndex().select_assessment(db, 40, rng=random.Random(1))
+
+        mix = Counter(qid.split("-")[0] for qid in selected)
+        assert len(set(selected)) == 40
+        assert mix == {"easy": 8, "medium": 20, "hard": 12}
+
+    @pytest.mark.integration
+    def test_prefers_unseen_questions(self, db: Session, bank, test_user: User):
+        db.bulk_insert_mappings(QuestionAttempt, [
+            {"user_id": test_user.id, "question_id": f"easy-{i}", "is_correct": True} for i in range(25)
+        ])
+        db.commit()
+
+        selected = QuestionSamplingIndex().select_assessment(db, 40, user_id=test_user.id, rng=random.Random(2))
+
+        easy = [qid for qid in selected if qid.startswith("easy")]
+        assert sorted(easy) == [f"easy-{i}" for i in range(25, 30)]
+        assert len(selected) == 40
+
+    @pytest.mark.integration
+    def test_replaces_questions_archived_since_rebuild(self, db: Session, bank):
+        index = QuestionSamplingIndex()
+        index.rebuild(db)
+        db.query(Question).filter(Question.difficulty_level == "hard").update(
+            {"content_status": "archived"}, synchronize_session=False
+        )
+        db.commit()
+
+        selected = index.select_assessment(db, 40, rng=random.Random(3))
+
+        assert len(selected) == 40
+        assert not any(qid.startswith("hard") for qid in selected)
+        assert index.get_stats()["stale_removed"] > 0
+
+    @pytest.mark.integration
+    def test_small_bank_returns_everything(self, db: Session):
+        _questions(db, "easy", "easy", 5)
+
+        assert sorted(QuestionSamplingIndex().select_assessment(db, 40)) == [f"easy-{i}" for i in range(5)]
+
+
+class TestSessionPools:
+    """Study session pools sampled from the index"""
+
+    @pytest.mark.integration
+    def test_sample_filters_buckets(self, db: Session, bank):
+        index = QuestionSamplingIndex()
+
+        hard_pool = index.sample(db, 200, difficulties=["hard", "medium"])
+        surgery_pool = index.sample(db, 200, specialties=["surgery"])
+
+        assert len(hard_pool) == 100
+        assert {qid.split("-")[0] for qid in hard_pool} == {"hard", "medium"}
+        assert not any(qid.startswith("medium") for qid in surgery_pool)
+        assert index.get_stats()["selection_latency_ms"]["session"]["count"] == 2
+
+    @pytest.mark.integration
+    def test_session_pool_excludes_recent_attempts(self, db: Session, bank, test_user: User):
+        from app.services.study_modes import _build_question_pool
+
+        db.bulk_insert_mappings(QuestionAttempt, [
+            {"user_id": test_user.id, "question_id": "easy-0", "is_correct": True,
+             "attempted_at": datetime.utcnow() - timedelta(days=1)},
+            {"user_id": test_user.id, "question_id": "easy-1", "is_correct": True,
+             "attempted_at": datetime.utcnow() - timedelta(days=30)},
+        ])
+        db.commit()
+
+        pool = _build_question_pool(db, test_user.id, 40, specialty="Surgery", difficulty="easy")
+
+        assert sorted(pool) == sorted(f"easy-{i}" for i in range(1, 30))
+
+    @pytest.mark.integration
+    def test_attempt_history_loaded_once_and_kept_current(self, db: Session, bank, test_user: User):
+        user_id = test_user.id
+        db.bulk_insert_mappings(QuestionAttempt, [
+            {"user_id": user_id, "question_id": "hard-0", "is_correct": True,
+             "attempted_at": datetime.utcnow() - timedelta(days=1)},
+        ])
+        db.commit()
+        index = QuestionSamplingIndex()
+        index.sample(db, 40, user_id=user_id, difficulties=["hard"])
+        index.record_answer(user_id, "hard-1", datetime.utcnow())
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            pool = index.sample(db, 40, user_id=user_id, difficulties=["hard"],
+                                exclude_since=datetime.utcnow() - timedelta(days=7))
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+        assert sorted(pool) == sorted(f"hard-{i}" for i in range(2, 40))
+        assert not any("question_attempts" in s for s in statements)
+        assert index.get_stats()["history_loads"] == 1
+
+        index.invalidate_user(user_id)
+        index.sample(db, 40, user_id=user_id, difficulties=["hard"])
+        assert index.get_stats()["history_loads"] == 2
@@ -0,0 +1,145 @@
+"""
+Tests for the question full-text search index.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base
+from app.models.models import Question
+from app.services import question_search
+from app.services.question_search import count_matching, ensure_search_index, match_terms, search_questions
+
+VIGNETTES = {
+    "mi": ("A 62-year-old man has crushing chest pain radiating to the left arm.", "NBME 8 - Internal Medicine"),
+    "pe": ("A 30-year-old woman has pleuritic chest pain and tachycardia after a long flight.", "NBME 9 - Internal Medicine"),
+    "kawasaki": ("A 3-year-old boy has fever for 6 days, conjunctivitis and a strawberry tongue.", "NBME 7 - Pediatrics"),
+    "appy": ("A 19-year-old man has periumbilical pain migrating to the right lower quadrant.", "AI Generated - Surgery"),
+}
+
+
+@pytest.fixture
+def search_index(db: Session):
+    ensure_search_index(db.get_bind().engine)
+    db.bulk_insert_mappings(Question, [
+        {"id": f"search-{key}", "vignette": vignette, "source": source, "answer_key": "A",
+         "choices": ["A", "B", "C", "D", "E"], "content_status": "active", "rejected": False}
+        for key, (vignette, source) in VIGNETTES.items()
+    ])
+    db.flush()
+
+
+def _ids(db: Session, *criteria):
+    return {q.id for q in db.query(Question).filter(Question.id.like("search-%"), *criteria)}
+
+
+class TestMatchTerms:
+    """Indexed filters match like the ILIKE filters they replace"""
+
+    @pytest.mark.integration
+    def test_phrase_and_prefix_matching(self, db: Session, search_index):
+        assert question_search.search_backend(db) == "sqlite"
+        assert _ids(db, match_terms(db, ["chest pain"])) == {"search-mi", "search-pe"}
+        assert _ids(db, match_terms(db, ["Chest Pai"])) == {"search-mi", "search-pe"}
+        assert _ids(db, match_terms(db, ["pain chest"])) == set()
+
+    @pytest.mark.integration
+    def test_all_and_any_modes(self, db: Session, search_index):
+        assert _ids(db, match_terms(db, ["chest", "flight"])) == {"search-pe"}
+        assert _ids(db, match_terms(db, ["strawberry", "quadrant"], mode="any")) == {"search-kawasaki", "search-appy"}
+
+    @pytest.mark.integration
+    def test_source_column(self, db: Session, search_index):
+        assert _ids(db, match_terms(db, ["Internal Medicine"], col="source")) == {"search-mi", "search-pe"}
+        assert _ids(db, match_terms(db, ["Pediatrics"], col="source")) == {"search-kawasaki"}
+
+    @pytest.mark.integration
+    def test_index_follows_updates_and_deletes(self, db: Session, search_index):
+        question = db.query(Question).get("search-appy")
+        question.vignette = "A 19-year-old man has hematuria after a marathon."
+        db.flush()
+        assert _ids(db, match_terms(db, ["quadrant"])) == set()
+        assert _ids(db, match_terms(db, ["hematuria"])) == {"search-appy"}
+
+        db.delete(question)
+        db.flush()
+        assert _ids(db, match_terms(db, ["hematuria"])) == set()
+
+    @pytest.mark.integration
+    def test_ilike_fallback_without_index(self, db: Session, search_index, mocker):
+        mocker.patch.dict(question_search._available, {str(db.get_bind().engine.url): None})
+        assert _ids(db, match_terms(db, ["chest pain"])) == {"search-mi", "search-pe"}
+        assert _ids(db, match_terms(db, ["100%"])) == set()
+
+    @pytest.mark.integration
+    def test_ensure_search_index_refreshes_cached_lookup(self, db: Session, search_index, mocker):
+        engine = db.get_bind().engine
+        mocker.patch.dict(question_search._available, {str(engine.url): None})
+        assert question_search.search_backend(db) is None
+
+        ensure_search_index(engine)
+        assert question_search.search_backend(db) == "sqlite"
+
+
+class TestSqliteIndexKeys:
+    """FTS rows are keyed independently of questions' implicit rowid"""
+
+    @pytest.fixture
+    def file_engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+        Base.metadata.create_all(bind=engine)
+        yield engine
+        engine.dispose()
+
+    def _add(self, session: Session, ids):
+        session.bulk_insert_mappings(Question, [
+            {"id": qid, "vignette": VIGNETTES[qid.split("-")[1]][0], "source": VIGNETTES[qid.split("-")[1]][1],
+             "answer_key": "A", "choices": ["A", "B", "C", "D", "E"]}
+            for qid in ids
+        ])
+        session.commit()
+
+    @pytest.mark.integration
+    def test_results_survive_rowid_renumbering(self, file_engine):
+        """VACUUM may renumber rowids of a table without an INTEGER PRIMARY KEY"""
+        ensure_search_index(file_engine)
+        session = sessionmaker(bind=file_engine)()
+        self._add(session, [f"search-{key}" for key in VIGNETTES])
+        session.execute(text("UPDATE questions SET rowid = 1000 - rowid"))
+        session.commit()
+
+        assert {q.id for q in session.query(Question).filter(match_terms(session, ["chest pain"]))} == {
+            "search-mi", "search-pe"
+        }
+        assert [qid for qid, _ in search_questions(session, "quadrant")] == ["search-appy"]
+        session.close()
+
+
+class TestSearchApis:
+    """Term counts and ranked search"""
+
+    @pytest.mark.integration
+    def test_count_matching(self, db: Session, search_index):
+        assert count_matching(db, ["chest"], Question.id.like("search-%")) == 2
+        assert count_matching(db, ["chest", "tachycardia"], Question.id.like("search-%")) == 1
+
+    @pytest.mark.integration
+    def test_ranked_search(self, db: Session, search_index):
+        ranked = search_questions(db, "chest pain", filters=[Question.id.like("search-%")])
+        assert {qid for qid, _ in ranked} == {"search-mi", "search-pe"}
+        assert ranked[0][1] >= ranked[1][1]
+        assert search_questions(db, "  ") == []
+
+    @pytest.mark.integration
+    def test_admin_list_orders_by_rank(self, db: Session, search_index):
+        from app.routers.admin import list_questions
+
+        ranked = [qid for qid, _ in search_questions(db, "chest pain")]
+        first = list_questions(search="chest pain", specialty=None, content_status="active",
+                               page=1, per_page=1, admin=None, db=db)
+        second = list_questions(search="chest pain", specialty=None, content_status="active",
+                                page=2, per_page=1, admin=None, db=db)
+
+        assert first.total == 2
+        assert [q.id for q in first.questions + second.questions] == ranked
@@ -22,7 +22,9 @@ from app.services.question_validators import (
     check_testwiseness,
     check_distractor_quality,
     validate_question,
+    validate_many,
 )
+from app.services.validation_rules import Rule, RuleSet
 
 
 class TestClinicalFactChecker:
@@ -317,3 +319,85 @@ class TestEdgeCases:
         ]
         passed, issues = validate_question(vignette, choices, "A")
         assert isinstance(passed, bool)
+
+
+class TestRuleSet:
+    """Tests for the compiled rule engine shared by the validators"""
+
+    def test_only_triggered_rules_are_candidates(self):
+        """Rules whose trigger literal is absent should be skipped"""
+        rules = RuleSet([
+            Rule("jnc", r"JNC\s*7", ("jnc",)),
+            Rule("atp", r"ATP\s*III", ("atp",)),
+            Rule("number", r"\d+"),
+        ])
+        assert [r.name for r in rules.candidates("Per jnc 7")] == ["jnc", "number"]
+        assert [r.name for r in rules.candidates("")] == ["number"]
+
+    def test_overlapping_and_prefix_triggers(self):
+        """Overlapping triggers and triggers that prefix each other are all found"""
+        rules = RuleSet([
+            Rule("elevated", r"elevated\s+\w+", ("elevated",)),
+            Rule("significant", r"significantly elevated", ("significantly elevated",)),
+            Rule("hypo", r"hypotens", ("hypotens",)),
+            Rule("hypotensive", r"hypotensive", ("hypotensive",)),
+        ])
+        text = "Significantly ELEVATED lactate; patient is hypotensive"
+        names = [rule.name for rule, _ in rules.search(text)]
+        assert names == ["elevated", "significant", "hypo", "hypotensive"]
+
+    def test_matches_follow_declaration_order(self):
+        """finditer groups matches by rule in declaration order"""
+        rules = RuleSet([
+            Rule("b", r"b\d", ("b",)),
+            Rule("a", r"a\d", ("a",)),
+        ])
+        found = [(rule.name, m.group(0)) for rule, m in rules.finditer("a1 b1 a2 b2")]
+        assert found == [("b", "b1"), ("b", "b2"), ("a", "a1"), ("a", "a2")]
+        assert rules.first("a1 b1").name == "b"
+        assert rules.count("a1 b1 a2") == 3
+
+
+class TestValidateMany:
+    """Tests for batch deterministic validation"""
+
+    def test_matches_individual_validators(self):
+        """validate_many should agree with the single-question validators"""
+        questions = [
+            {
+                "id": "q1",
+                "vignette": "A 45-year-old man is hypotensive and tachycardic. What is the next step?",
+                "choices": ["A. Fluids", "B. Fluids", "C. Epinephrine", "D. Observe", "E. Surgery"],
+                "answer_key": "A",
+            },
+            {
+                "id": "q2",
+                "vignette": {
+                    "demographics": "TBD",
+                    "presentation": "A 60-year-old woman has BP 150/90 mmHg. Which drug is most appropriate?",
+                },
+                "choices": [
+                    {"id": "A", "text": "Lisinopril"},
+                    {"id": "B", "text": "Warfarin"},
+                    {"id": "C", "text": "Aspirin"},
+                    {"id": "D", "text": "Metformin"},
+                    {"id": "E", "text": "Insulin"},
+                ],
+                "correct_answer": "A",
+            },
+        ]
+
+        outcomes = validate_many(questions, workers=1)
+
+        assert [o.question_id for o in outcomes] == ["q1", "q2"]
+        assert outcomes[0].passed is False
+        expected = QuestionQualityValidator().validate_question(
+            questions[0]["vignette"], questions[0]["choices"], "A"
+        )
+        assert outcomes[0].quality == expected
+        assert outcomes[1].quality.passed == validate_question(
+            questions[1]["vignette"]["presentation"],
+            [f"{c['id']}. {c['text']}" for c in questions[1]["choices"]],
+            "A",
+        )[0]
+        assert 0 <= outcomes[1].elite.score <= 100
@@ -0,0 +1,122 @@
+"""
+Tests for hourly reminder targeting and bulk notification fan-out.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    EmailLog, PushSubscription, Question, ScheduledReview, User, UserEngagementScore, UserSettings
+)
+from app.services.email import email_service as email_module
+from app.services.email.email_service import EmailService, OutgoingEmail
+from app.services.reminder_targeting import get_active_subscriptions, get_reminder_targets
+from app.utils.fanout import chunked, gather_bounded
+
+
+def _user(db: Session, user_id: str, reminder_time: str = "09:00", email_notifications: bool = True) -> User:
+    user = User(id=user_id, full_name=user_id, first_name=user_id, email=f"{user_id}@example.com")
+    db.add(user)
+    db.add(UserSettings(
+        user_id=user_id, daily_reminder=True, email_notifications=email_notifications,
+        reminder_time=reminder_time
+    ))
+    db.commit()
+    return user
+
+
+def _due_reviews(db: Session, user: User, question: Question, count: int):
+    for _ in range(count):
+        db.add(ScheduledReview(
+            user_id=user.id, question_id=question.id, review_interval="1d",
+            scheduled_for=datetime.utcnow() - timedelta(hours=1)
+        ))
+    db.commit()
+
+
+class TestReminderTargeting:
+    """One-query recipient selection"""
+
+    @pytest.mark.unit
+    def test_reminder_hour_follows_reminder_time(self):
+        settings = UserSettings(reminder_time="07:30")
+        assert settings.reminder_hour == 7
+
+        settings.reminder_time = "not a time"
+        assert settings.reminder_hour is None
+
+    @pytest.mark.integration
+    def test_email_targets_need_due_reviews(self, db: Session, test_question: Question):
+        due = _user(db, "due-user")
+        _user(db, "nothing-due")
+        other_hour = _user(db, "other-hour", reminder_time="10:00")
+        opted_out = _user(db, "opted-out", email_notifications=False)
+        for user in (due, other_hour, opted_out):
+            _due_reviews(db, user, test_question, 2)
+
+        targets = get_reminder_targets(db, 9, channel="email")
+
+        assert [(t.user_id, t.review_count) for t in targets] == [("due-user", 2)]
+
+    @pytest.mark.integration
+    def test_push_targets_include_streak_flags(self, db: Session, test_question: Question):
+        now = datetime.utcnow()
+        subscribed = _user(db, "subscribed")
+        _user(db, "no-subscription")
+        db.add(PushSubscription(user_id=subscribed.id, endpoint="https://push.example/1", p256dh_key="k", auth_key="a"))
+        db.add(UserEngagementScore(
+            user_id=subscribed.id, streak_current=4, last_activity_at=now - timedelta(days=1)
+        ))
+        db.commit()
+
+        targets = get_reminder_targets(db, 9, channel="push", now=now)
+
+        assert len(targets) == 1
+        assert targets[0].review_count == 0
+        assert targets[0].current_streak == 4
+        assert targets[0].streak_at_risk
+        assert list(get_active_subscriptions(db, ["subscribed", "no-subscription"])) == ["subscribed"]
+
+
+class TestFanOut:
+    """Bounded concurrency and batched email sends"""
+
+    @pytest.mark.asyncio
+    async def test_gather_bounded_limits_concurrency(self):
+        running = peak = 0
+
+        async def worker(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if item == 3:
+                raise RuntimeError("boom")
+            return item * 2
+
+        results = await gather_bounded(list(range(10)), worker, concurrency=3)
+
+        assert peak == 3
+        assert results[3] is None
+        assert results[4] == 8
+        assert [len(batch) for batch in chunked(list(range(10)), 4)] == [4, 4, 2]
+
+    @pytest.mark.asyncio
+    async def test_send_bulk_batches_and_logs(self, db: Session, test_user: User, mock_resend, monkeypatch):
+        monkeypatch.setattr(email_module, "EMAIL_BATCH_SIZE", 2)
+        messages = [
+            OutgoingEmail(test_user.id, f"user{i}@example.com", "Subject", "<p>Hi</p>")
+            for i in range(5)
+        ]
+
+        sent = await EmailService().send_bulk(db, "reminder", messages)
+
+        assert sent == [True] * 5
+        assert [len(batch) for batch in mock_resend.batches] == [2, 2, 1]
+        logs = db.query(EmailLog).filter(EmailLog.user_id == test_user.id).all()
+        assert len(logs) == 5
+        assert {log.status for log in logs} == {"sent"}
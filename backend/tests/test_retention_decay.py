@@ -0,0 +1,83 @@
+"""
+Tests for vectorized concept retention decay.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import ConceptRetention, User
+from app.services.learning_engine import calculate_memory_strength, get_concepts_needing_review
+from app.services.retention_decay import current_retention, decay_concept_retentions, predict_retention
+
+
+def _concept(db: Session, user: User, concept: str, stability: float, days_ago, stored: float = 1.0):
+    now = datetime.utcnow()
+    row = ConceptRetention(
+        user_id=user.id, concept=concept, specialty="Internal Medicine", stability=stability,
+        last_reviewed=now - timedelta(days=days_ago) if days_ago is not None else None,
+        predicted_retention=stored, memory_strength=stored, total_exposures=1
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+class TestPredictRetention:
+    """Forgetting curve over arrays"""
+
+    @pytest.mark.unit
+    def test_matches_scalar_formula(self):
+        stability = np.array([0.5, 1.0, 5.0, 30.0, 90.0])
+        days = np.array([0.0, 1.0, 3.5, 10.0, 200.0])
+
+        expected = [calculate_memory_strength(s, d) for s, d in zip(stability, days)]
+
+        assert np.allclose(predict_retention(stability, days), expected)
+
+    @pytest.mark.unit
+    def test_skips_unreviewed_rows(self):
+        now = datetime.utcnow()
+        rows = [("a", 2.0, now - timedelta(days=2)), ("b", 2.0, None), ("c", None, now)]
+
+        keys, retention, days = current_retention(rows, now)
+
+        assert keys == ["a", "c"]
+        assert retention[0] == pytest.approx(np.exp(-1.0))
+        assert retention[1] == 1.0
+        assert days[0] == pytest.approx(2.0)
+
+
+class TestDecayConceptRetentions:
+    """Chunked refresh of stored retention"""
+
+    @pytest.mark.integration
+    def test_writes_only_changed_rows(self, db: Session, test_user: User):
+        now = datetime.utcnow()
+        stale = _concept(db, test_user, "stale", 2.0, 4)
+        current = _concept(db, test_user, "current", 2.0, 0)
+        _concept(db, test_user, "never", 2.0, None)
+
+        result = decay_concept_retentions(db, user_id=test_user.id, now=now, batch_size=1)
+
+        assert result["records_scanned"] == 2
+        assert result["records_updated"] == 1
+        db.refresh(stale)
+        db.refresh(current)
+        assert stale.predicted_retention == pytest.approx(np.exp(-2.0), abs=1e-3)
+        assert stale.memory_strength == stale.predicted_retention
+        assert current.predicted_retention == 1.0
+
+    @pytest.mark.integration
+    def test_needing_review_sorted_by_urgency(self, db: Session, test_user: User):
+        _concept(db, test_user, "fresh", 10.0, 1)
+        _concept(db, test_user, "fading", 2.0, 1)
+        _concept(db, test_user, "forgotten", 1.0, 5)
+
+        concepts = get_concepts_needing_review(db, test_user.id, min_retention=0.7)
+
+        assert [c["concept"] for c in concepts] == ["forgotten", "fading"]
+        assert concepts[0]["current_retention"] == pytest.approx(np.exp(-5.0), abs=1e-3)
+        assert get_concepts_needing_review(db, test_user.id, limit=1)[0]["concept"] == "forgotten"
@@ -0,0 +1,144 @@
+"""
+Tests for stored SM-2 state, bulk review scheduling and the due-review queue.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import Question, ScheduledReview, User
+from app.services.learning_engine import schedule_personalized_reviews
+from app.services.review_queue import ReviewHeap, get_review_queue
+from app.services.spaced_repetition import (
+    DEFAULT_EASE_FACTOR,
+    ReviewEvent,
+    get_todays_reviews,
+    parse_interval,
+    schedule_reviews,
+)
+from app.services.study_modes import _get_due_reviews
+
+
+def _questions(db: Session, count: int):
+    questions = [
+        Question(id=f"queue-q{i}", vignette=f"Vignette {i}", answer_key="A",
+                 choices=["A", "B", "C", "D", "E"], source="Surgery")
+        for i in range(count)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return questions
+
+
+class TestReviewHeap:
+    """Priority structure behind the queues"""
+
+    @pytest.mark.unit
+    def test_due_in_order_with_reschedules(self):
+        heap = ReviewHeap([("a", 30.0), ("b", 10.0), ("c", 20.0), ("d", 50.0)])
+        heap.schedule("c", 60.0)  # moved later, old entry goes stale
+        heap.schedule("d", 5.0)
+        heap.remove("b")
+
+        assert heap.due(40.0) == ["d", "a"]
+        assert heap.due(100.0, limit=3) == ["d", "a", "c"]
+        assert heap.next_due() == ("d", 5.0)
+        assert len(heap) == 3
+
+    @pytest.mark.unit
+    def test_parse_interval(self):
+        assert parse_interval("3d") == 3
+        assert parse_interval("2.5d") == 2.5
+        assert parse_interval("12h") == 0.5
+        assert parse_interval("bogus") == 1.0
+
+
+class TestBulkScheduling:
+    """schedule_reviews / schedule_personalized_reviews"""
+
+    @pytest.mark.integration
+    def test_batch_stores_state_and_reuses_ease(self, db: Session, test_user: User):
+        q1, q2 = _questions(db, 2)
+
+        reviews = schedule_reviews(db, [
+            ReviewEvent(test_user.id, q1.id, is_correct=False),
+            ReviewEvent(test_user.id, q2.id, is_correct=True, time_seconds=90),
+            # A second answer for q1 in the same batch applies on top of the first
+            ReviewEvent(test_user.id, q1.id, is_correct=False),
+        ])
+
+        assert reviews[0] is reviews[2]
+        assert db.query(ScheduledReview).filter(ScheduledReview.user_id == test_user.id).count() == 2
+        first = reviews[0]
+        assert first.times_reviewed == 2
+        assert first.interval_days == 1
+        # Two failures lower the ease factor twice and it is stored
+        assert first.ease_factor < DEFAULT_EASE_FACTOR - 0.5
+        assert first.stability > first.interval_days
+
+    @pytest.mark.integration
+    def test_personalized_batch_writes_numeric_interval(self, db: Session, test_user: User):
+        (question,) = _questions(db, 1)
+
+        (review,) = schedule_personalized_reviews(db, [
+            ReviewEvent(test_user.id, question.id, is_correct=True, specialty="surgery", confidence_level=5)
+        ])
+
+        assert review.interval_days == pytest.approx(1.2)
+        assert review.review_interval == "1.2d"
+        assert review.ease_factor == 2.5
+        assert review.learning_stage == "Learning"
+
+
+class TestDueQueue:
+    """Due reads served from the per-user queue"""
+
+    @pytest.mark.integration
+    def test_due_reads_follow_scheduling(self, db: Session, test_user: User):
+        questions = _questions(db, 3)
+        now = datetime.utcnow()
+        for i, question in enumerate(questions):
+            db.add(ScheduledReview(
+                user_id=test_user.id, question_id=question.id, review_interval="1d",
+                scheduled_for=now - timedelta(hours=3 - i)
+            ))
+        db.commit()
+
+        assert _get_due_reviews(db, test_user.id) == ["queue-q0", "queue-q1", "queue-q2"]
+        assert [r.question_id for r in get_todays_reviews(db, test_user.id)] == ["queue-q0", "queue-q1", "queue-q2"]
+
+        # Answering pushes q1 out; the loaded queue is updated without a reload
+        loads = get_review_queue().get_stats()["loads"]
+        schedule_reviews(db, [ReviewEvent(test_user.id, "queue-q1", is_correct=True)])
+
+        assert _get_due_reviews(db, test_user.id) == ["queue-q0", "queue-q2"]
+        assert get_review_queue().count_due(db, test_user.id) == 2
+        assert get_review_queue().size(db, test_user.id) == 3
+        assert get_review_queue().get_stats()["loads"] == loads
+
+    @pytest.mark.integration
+    def test_stale_queue_entries_not_served(self, db: Session, test_user: User):
+        questions = _questions(db, 2)
+        now = datetime.utcnow()
+        reviews = [
+            ScheduledReview(user_id=test_user.id, question_id=question.id, review_interval="1d",
+                            scheduled_for=now - timedelta(hours=1))
+            for question in questions
+        ]
+        db.add_all(reviews)
+        db.commit()
+        assert _get_due_reviews(db, test_user.id) == ["queue-q0", "queue-q1"]
+
+        # Rescheduled without writing through (e.g. by another process)
+        reviews[0].scheduled_for = now + timedelta(days=1)
+        db.commit()
+
+        assert _get_due_reviews(db, test_user.id) == ["queue-q1"]
+        assert get_review_queue().get_stats()["stale"] == 1
+        assert get_review_queue().due(db, test_user.id) == ["queue-q1"]
+
+    @pytest.mark.integration
+    def test_user_without_reviews(self, db: Session, test_user: User):
+        assert get_todays_reviews(db, test_user.id) == []
+        assert _get_due_reviews(db, test_user.id) == []
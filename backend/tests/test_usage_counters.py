@@ -0,0 +1,219 @@
+"""
+Tests for rate-limit usage counters and the burst limiter.
+"""
+
+import threading
+from datetime import date, datetime
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.middleware import rate_limiter
+from app.middleware.rate_limiter import OpenAIBurstLimiter, RateLimitMiddleware
+from app.models.models import DailyUsage, User
+from app.services.usage_counters import (
+    InMemoryCounterBackend,
+    RedisCounterBackend,
+    TokenBucket,
+    UsageCounters,
+)
+
+
+def _counters(db: Session = None) -> UsageCounters:
+    return UsageCounters(
+        backend=InMemoryCounterBackend(),
+        flush_interval=0,
+        session_factory=(lambda: db) if db is not None else None
+    )
+
+
+class TestCounterBackend:
+    """Atomic check-and-increment"""
+
+    @pytest.mark.unit
+    def test_consume_stops_at_limit(self):
+        backend = InMemoryCounterBackend()
+
+        results = [backend.consume("k", 1, 3, 60) for _ in range(5)]
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False, False]
+        assert backend.get_many(["k", "missing"]) == [3, 0]
+
+    @pytest.mark.unit
+    def test_redis_script_matches_memory_backend(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # fakeredis needs lupa to run Lua scripts
+        backend = RedisCounterBackend(fakeredis.FakeRedis(decode_responses=True))
+
+        results = [backend.consume("k", 1, 2, 60) for _ in range(3)]
+
+        assert results == [(True, 1), (True, 2), (False, 2)]
+        assert backend.add("k", -1, 60) == 1
+        assert backend.get_many(["k"]) == [1]
+
+
+class TestUsageCounters:
+    """Daily limits, local fast paths and write-behind"""
+
+    @pytest.mark.unit
+    def test_denial_is_cached_locally(self):
+        counters = _counters()
+
+        assert counters.consume("u1", "ai_chat_messages", limit=1) == (True, 1)
+        assert counters.consume("u1", "ai_chat_messages", limit=1)[0] is False
+        assert counters.consume("u1", "ai_chat_messages", limit=1)[0] is False
+
+        stats = counters.get_stats()
+        assert stats["denied"] == 1
+        assert stats["denied_local"] == 1
+
+    @pytest.mark.unit
+    def test_refund_restores_allowance(self):
+        counters = _counters()
+        counters.consume("u1", "ai_chat_messages", limit=1)
+        counters.consume("u1", "ai_chat_messages", limit=1)  # Denied and cached
+
+        counters.refund("u1", "ai_chat_messages")
+
+        assert counters.consume("u1", "ai_chat_messages", limit=1)[0] is True
+
+    @pytest.mark.unit
+    def test_unlimited_usage_is_counted_locally(self):
+        counters = _counters()
+
+        for _ in range(3):
+            assert counters.consume("u1", "questions_answered", limit=None) == (True, None)
+
+        assert counters.get_usage("u1", ["questions_answered"]) == {"questions_answered": 3}
+
+    @pytest.mark.integration
+    def test_flush_writes_daily_usage(self, db: Session, test_user: User):
+        counters = _counters(db)
+        counters.seed_today(test_user.id, db)
+        counters.consume(test_user.id, "ai_chat_messages", limit=10)
+        counters.consume(test_user.id, "ai_chat_messages", limit=10)
+        counters.consume(test_user.id, "questions_answered", limit=None)
+
+        assert counters.flush(db) == 1
+
+        today = datetime.combine(date.today(), datetime.min.time())
+        usage = db.query(DailyUsage).filter(
+            DailyUsage.user_id == test_user.id,
+            DailyUsage.date >= today
+        ).one()
+        assert usage.ai_chat_messages == 2
+        assert usage.questions_answered == 1
+
+        # Totals never go backwards (e.g. after a counter backend restart)
+        usage.ai_chat_messages = 7
+        db.commit()
+        counters.consume(test_user.id, "ai_chat_messages", limit=10)
+        counters.flush(db)
+        db.refresh(usage)
+        assert usage.ai_chat_messages == 7
+
+    @pytest.mark.integration
+    def test_counters_seeded_from_daily_usage(self, db: Session, test_user: User):
+        """A restarted process picks up today's recorded usage"""
+        db.add(DailyUsage(
+            id="seeded-usage",
+            user_id=test_user.id,
+            date=datetime.combine(date.today(), datetime.min.time()),
+            ai_chat_messages=9
+        ))
+        db.flush()
+        counters = _counters(db)
+        counters.seed_today(test_user.id, db)
+
+        assert counters.consume(test_user.id, "ai_chat_messages", limit=10) == (True, 10)
+        assert counters.consume(test_user.id, "ai_chat_messages", limit=10)[0] is False
+        assert counters.get_usage(test_user.id, ["ai_chat_messages"]) == {"ai_chat_messages": 10}
+
+    @pytest.mark.unit
+    def test_seed_never_lowers_a_counter(self):
+        backend = InMemoryCounterBackend()
+        backend.consume("k", 5, None, 60)
+
+        backend.seed("k", 3, 60)
+        backend.seed("fresh", 4, 60)
+
+        assert backend.get_many(["k", "fresh"]) == [5, 4]
+
+    @pytest.mark.integration
+    def test_tier_is_cached(self, db: Session, test_user: User):
+        counters = _counters(db)
+
+        assert counters.get_tier(test_user.id, db) == "free"
+        assert counters.get_tier(test_user.id, db) == "free"
+        assert counters.get_stats()["tier_lookups"] == 1
+
+        counters.invalidate_tier(test_user.id)
+        counters.get_tier(test_user.id, db)
+        assert counters.get_stats()["tier_lookups"] == 2
+
+
+class TestBurstLimiter:
+    """Local token bucket + shared per-minute window"""
+
+    @pytest.mark.unit
+    def test_token_bucket(self):
+        bucket = TokenBucket(2)
+
+        assert bucket.take()
+        assert bucket.take()
+        assert not bucket.take()
+        assert bucket.wait_time() >= 1
+
+    @pytest.mark.unit
+    def test_window_is_shared_between_limiters(self):
+        counters = _counters()
+        worker_a = OpenAIBurstLimiter(counters)
+        worker_b = OpenAIBurstLimiter(counters)
+
+        for _ in range(5):
+            assert worker_a.can_make_request("u1", "free") == (True, 0)
+            worker_a.record_request("u1")
+
+        allowed, wait = worker_b.can_make_request("u1", "free")
+        assert not allowed
+        assert wait > 0
+        assert worker_b.get_remaining("u1", "free") == 0
+
+        worker_b.clear_user("u1")
+        assert worker_b.can_make_request("u1", "free")[0] is True
+
+
+class TestRateLimitMiddleware:
+    """Counter calls from the async middleware"""
+
+    @pytest.mark.unit
+    def test_counter_calls_run_off_event_loop(self, monkeypatch):
+        counters = _counters()
+        counters._tiers.set("u1", "free")
+        monkeypatch.setattr(counters, "seed_today", lambda user_id, db=None: None)
+        threads = []
+        backend = counters.backend
+        consume, add = backend.consume, backend.add
+        monkeypatch.setattr(backend, "consume", lambda *args: threads.append(
+            threading.current_thread().name) or consume(*args))
+        monkeypatch.setattr(backend, "add", lambda *args: threads.append(
+            threading.current_thread().name) or add(*args))
+        monkeypatch.setattr(rate_limiter, "get_usage_counters", lambda: counters)
+        monkeypatch.setattr(RateLimitMiddleware, "_extract_user_id", lambda self, request: "u1")
+
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware)
+
+        @app.post("/api/chat")
+        def chat():
+            raise HTTPException(status_code=500)
+
+        response = TestClient(app).post("/api/chat")
+
+        assert response.status_code == 500
+        # consume, then the refund for the failed request
+        assert len(threads) >= 2
+        assert all(name.startswith("db-offload") for name in threads)
+        assert counters.get_usage("u1", ["ai_chat_messages"]) == {"ai_chat_messages": 0}
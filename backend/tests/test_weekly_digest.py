@@ -0,0 +1,112 @@
+"""
+Tests for the set-based, resumable weekly digest pipeline.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    EmailLog, Question, QuestionAttempt, ScheduledReview, User, UserEngagementScore, UserSettings
+)
+from app.services.daily_activity import record_daily_activity
+from app.services.email import weekly_digest
+from app.services.email.weekly_digest import (
+    digest_week, get_digest_recipients, get_weak_areas, load_digest_details, run_weekly_digests
+)
+
+
+NOW = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0)
+WEEK_START, WEEK_END = digest_week(NOW)
+
+
+def _user(db: Session, user_id: str, email_notifications: bool = True) -> User:
+    user = User(id=user_id, full_name=user_id, first_name=user_id, email=f"{user_id}@example.com")
+    db.add(user)
+    db.add(UserSettings(user_id=user_id, email_notifications=email_notifications))
+    db.commit()
+    return user
+
+
+def _answer(db: Session, user: User, question: Question, correct: int, total: int, days_ago: int = 2):
+    attempted_at = WEEK_END - timedelta(days=days_ago, hours=1)
+    for i in range(total):
+        is_correct = i < correct
+        db.add(QuestionAttempt(
+            user_id=user.id, question_id=question.id, user_answer="D" if is_correct else "A",
+            is_correct=is_correct, attempted_at=attempted_at
+        ))
+        record_daily_activity(db, user.id, question.specialty, is_correct, attempted_at=attempted_at)
+    db.commit()
+
+
+class TestDigestQueries:
+    """Set-based recipient and detail loading"""
+
+    @pytest.mark.integration
+    def test_recipients_need_activity_and_email_enabled(self, db: Session, test_question: Question):
+        active = _user(db, "active")
+        _user(db, "idle")
+        opted_out = _user(db, "opted-out", email_notifications=False)
+        _answer(db, active, test_question, correct=3, total=4)
+        _answer(db, active, test_question, correct=1, total=1, days_ago=3)
+        _answer(db, opted_out, test_question, correct=1, total=1)
+        # Outside the window
+        _answer(db, opted_out, test_question, correct=1, total=1, days_ago=9)
+
+        recipients = get_digest_recipients(db, WEEK_START, WEEK_END)
+
+        assert [(r.user_id, r.questions_answered, r.accuracy, r.study_days) for r in recipients] == [
+            ("active", 5, 80, 2)
+        ]
+
+    @pytest.mark.integration
+    def test_details_match_per_user_queries(self, db: Session, test_question: Question):
+        user = _user(db, "details")
+        _answer(db, user, test_question, correct=2, total=6)
+        db.add(ScheduledReview(
+            user_id=user.id, question_id=test_question.id, review_interval="1d",
+            scheduled_for=NOW - timedelta(hours=1)
+        ))
+        db.add(UserEngagementScore(
+            user_id=user.id, streak_current=3, streak_best=8, last_activity_at=NOW - timedelta(days=1)
+        ))
+        db.commit()
+
+        [digest] = load_digest_details(db, get_digest_recipients(db, WEEK_START, WEEK_END), WEEK_START, WEEK_END, NOW)
+
+        assert digest.weak_areas == get_weak_areas(db, user.id, WEEK_START, WEEK_END)
+        assert digest.weak_areas == [{"name": "Internal Medicine - Test", "accuracy": 33, "attempts": 6}]
+        assert digest.reviews_due == 1
+        assert (digest.current_streak, digest.best_streak, digest.streak_at_risk) == (3, 8, True)
+
+
+class TestDigestRun:
+    """Bulk sending, checkpointing and dry runs"""
+
+    @pytest.mark.asyncio
+    async def test_run_sends_once_and_resumes(self, db: Session, test_question: Question, mock_resend, monkeypatch):
+        monkeypatch.setattr(weekly_digest, "render_template", lambda name, context: "<p>Digest</p>")
+        for i in range(3):
+            _answer(db, _user(db, f"user-{i}"), test_question, correct=1, total=2)
+
+        first = await run_weekly_digests(db, now=NOW, chunk_size=2)
+        rerun = await run_weekly_digests(db, now=NOW, chunk_size=2)
+
+        assert (first.eligible, first.sent, first.failed) == (3, 3, 0)
+        assert sorted(mock_resend.sent) == ["user-0@example.com", "user-1@example.com", "user-2@example.com"]
+        assert (rerun.eligible, rerun.already_sent, rerun.sent) == (0, 3, 0)
+        assert db.query(EmailLog).filter(EmailLog.email_type == "digest").count() == 3
+
+    @pytest.mark.asyncio
+    async def test_dry_run_renders_without_sending(self, db: Session, test_question: Question, mock_resend, monkeypatch):
+        monkeypatch.setattr(weekly_digest, "render_template", lambda name, context: "<p>Digest</p>")
+        _answer(db, _user(db, "dry"), test_question, correct=1, total=1)
+
+        result = await run_weekly_digests(db, now=NOW, dry_run=True)
+
+        assert (result.rendered, result.sent) == (1, 0)
+        assert result.digests_per_second > 0
+        assert mock_resend.sent == []
+        assert db.query(EmailLog).count() == 0